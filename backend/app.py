@@ -8,7 +8,7 @@ import os
 import sys
 import logging
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 
@@ -43,20 +43,24 @@ def create_app():
     DEBUG = os.getenv("FLASK_DEBUG", "0") == "1"
     app.config["DEBUG"] = DEBUG
 
-    # SQLite (EB-safe) - Use a defined path or fallback to local
-    db_env = os.getenv("DATABASE_URL")
-    if db_env:
-        if db_env.startswith("sqlite://"):
-            app.config["SQLALCHEMY_DATABASE_URI"] = db_env
-        else:
-            # If it's just a path, make it a sqlite URI
-            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_env}"
-    else:
-        default_db_path = os.path.join(BASE_DIR, "app.db")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{default_db_path}"
+    # Database - DATABASE_URL is a PostgreSQL/SQLite URL or a SQLite file path
+    # (EB-safe local file by default); pool and pragma settings in backend/database.py
+    from backend.database import database_url, engine_options
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url(
+        os.getenv("DATABASE_URL"), os.path.join(BASE_DIR, "app.db")
+    )
+    # JSON columns use the response codec (backend/services/serialization.py)
+    from backend.services.serialization import init_serialization, column_json_options
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+        **column_json_options()
+    }
     
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # Schema at startup: migrate | create_all | none (see backend/database.py)
+    app.config["DB_SCHEMA_MODE"] = os.getenv("DB_SCHEMA_MODE")
+
     # Uploads
     upload_path = os.path.join(BASE_DIR, "uploads")
     resume_upload_path = os.path.join(upload_path, "resumes")
@@ -65,6 +69,64 @@ def create_app():
     app.config["UPLOAD_FOLDER"] = upload_path
     app.config["RESUME_UPLOAD_FOLDER"] = resume_upload_path
 
+    # Upload limits - request bodies over MAX_CONTENT_LENGTH are rejected before
+    # being read; large files go through the chunked upload endpoints instead
+    chunked_upload_path = os.path.join(upload_path, "incoming")
+    os.makedirs(chunked_upload_path, exist_ok=True)
+    app.config["CHUNKED_UPLOAD_FOLDER"] = chunked_upload_path
+    app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))
+    app.config["MAX_UPLOAD_SIZE"] = int(os.getenv("MAX_UPLOAD_SIZE", 10 * 1024 * 1024))
+    app.config["UPLOAD_CHUNK_SIZE"] = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+    app.config["UPLOAD_EXPIRY_SECONDS"] = int(os.getenv("UPLOAD_EXPIRY_SECONDS", 24 * 60 * 60))
+
+    # Bulk import - parser worker processes (defaults to the CPU count) and rows per commit
+    bulk_workers = os.getenv("BULK_IMPORT_WORKERS")
+    app.config["BULK_IMPORT_WORKERS"] = int(bulk_workers) if bulk_workers else None
+    app.config["BULK_IMPORT_BATCH_SIZE"] = int(os.getenv("BULK_IMPORT_BATCH_SIZE", 32))
+    # Bulk import bodies (ZIP archives, NDJSON/CSV files) replace MAX_CONTENT_LENGTH
+    app.config["BULK_IMPORT_MAX_SIZE"] = int(os.getenv("BULK_IMPORT_MAX_SIZE", 200 * 1024 * 1024))
+
+    # All-pairs match matrix - largest resumes x job descriptions grid per request
+    app.config["MATCH_MATRIX_MAX_PAIRS"] = int(os.getenv("MATCH_MATRIX_MAX_PAIRS", 100000))
+
+    # Write-behind scan storage (off by default) - rows are spooled to disk and
+    # batch-inserted by a background thread; see backend/services/write_behind.py
+    app.config["WRITE_BEHIND_ENABLED"] = os.getenv("WRITE_BEHIND_ENABLED", "0") == "1"
+    app.config["WRITE_BEHIND_SPOOL_FOLDER"] = os.getenv("WRITE_BEHIND_SPOOL_FOLDER", os.path.join(BASE_DIR, "data", "spool"))
+    app.config["WRITE_BEHIND_FLUSH_MS"] = int(os.getenv("WRITE_BEHIND_FLUSH_MS", 200))
+    app.config["WRITE_BEHIND_MAX_ROWS"] = int(os.getenv("WRITE_BEHIND_MAX_ROWS", 100))
+    app.config["WRITE_BEHIND_FSYNC"] = os.getenv("WRITE_BEHIND_FSYNC", "1") == "1"
+
+    # Retention (compactor off by default) - old scans are archived and stale
+    # match scores pruned in small batches; see backend/services/retention.py
+    app.config["RETENTION_ENABLED"] = os.getenv("RETENTION_ENABLED", "0") == "1"
+    app.config["SCAN_RETENTION_DAYS"] = int(os.getenv("SCAN_RETENTION_DAYS", 180))
+    app.config["MATCH_SCORE_RETENTION_DAYS"] = int(os.getenv("MATCH_SCORE_RETENTION_DAYS", 365))
+    app.config["RETENTION_BATCH_SIZE"] = int(os.getenv("RETENTION_BATCH_SIZE", 200))
+    app.config["RETENTION_BATCH_PAUSE_MS"] = int(os.getenv("RETENTION_BATCH_PAUSE_MS", 50))
+    app.config["RETENTION_INTERVAL_SECONDS"] = int(os.getenv("RETENTION_INTERVAL_SECONDS", 3600))
+
+    # Response compression - gzip/brotli for text-like bodies of at least
+    # MIN_SIZE bytes; see backend/middleware/response_compression.py
+    app.config["RESPONSE_COMPRESSION_ENABLED"] = os.getenv("RESPONSE_COMPRESSION_ENABLED", "1") == "1"
+    app.config["RESPONSE_COMPRESSION_MIN_SIZE"] = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", 1024))
+    app.config["RESPONSE_COMPRESSION_LEVEL"] = int(os.getenv("RESPONSE_COMPRESSION_LEVEL", 6))
+    app.config["RESPONSE_BROTLI_QUALITY"] = int(os.getenv("RESPONSE_BROTLI_QUALITY", 4))
+
+    # Rate limiting - token buckets per user and per IP; RATE_LIMIT_BACKEND=sqlite
+    # shares them between workers; see backend/services/rate_limiter.py
+    app.config["RATE_LIMIT_ENABLED"] = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    app.config["RATE_LIMIT_BACKEND"] = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    app.config["RATE_LIMIT_STORAGE"] = os.getenv("RATE_LIMIT_STORAGE", os.path.join(BASE_DIR, "data", "rate_limits.db"))
+    app.config["RATE_LIMIT_MAX_REQUESTS"] = int(os.getenv("RATE_LIMIT_MAX_REQUESTS", 60))
+    app.config["RATE_LIMIT_WINDOW_MINUTES"] = float(os.getenv("RATE_LIMIT_WINDOW_MINUTES", 1))
+    app.config["RATE_LIMIT_IP_FACTOR"] = float(os.getenv("RATE_LIMIT_IP_FACTOR", 4))
+
+    # Reverse proxies in front of gunicorn whose X-Forwarded-For is trusted
+    # (0 when clients connect directly). request.remote_addr - and so the per-IP
+    # rate limit bucket - is the client address these proxies report.
+    app.config["PROXY_FIX_X_FOR"] = int(os.getenv("PROXY_FIX_X_FOR", 0))
+
     # JWT
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=1)
     app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(days=7)
@@ -75,10 +137,33 @@ def create_app():
     CORS(app, resources={r"/api/*": {
         "origins": "*",
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "Content-Range"],
+        "expose_headers": ["Retry-After"]
     }})
     JWTManager(app)
 
+    # orjson-backed jsonify() / get_json(), MessagePack for clients that ask
+    init_serialization(app)
+
+    if app.config["PROXY_FIX_X_FOR"]:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
+    # Per-route body limits (bulk import) on top of MAX_CONTENT_LENGTH
+    from backend.middleware.request_limits import init_request_limits
+    init_request_limits(app)
+
+    if app.config["RESPONSE_COMPRESSION_ENABLED"]:
+        from backend.middleware.response_compression import init_response_compression
+        init_response_compression(app)
+
+    if app.config["RATE_LIMIT_ENABLED"]:
+        try:
+            from backend.services.rate_limiter import init_rate_limiter
+            init_rate_limiter(app)
+        except Exception as e:
+            logger.error(f"Rate limiter failed to start, requests are not limited: {e}")
+
     # ---------------- HEALTH ----------------
     @app.route("/health")
     def health():
@@ -88,6 +173,20 @@ def create_app():
             timestamp=datetime.utcnow().isoformat()
         ), 200
 
+    @app.errorhandler(413)
+    def request_too_large(e):
+        limit = request.max_content_length
+        if limit == app.config["MAX_CONTENT_LENGTH"]:
+            message = "Request too large. Use the chunked upload endpoints for large files."
+        else:
+            # Bulk import routes have their own, larger limit
+            message = "Request too large. Split the import into smaller files."
+        return jsonify({
+            "success": False,
+            "message": message,
+            "max_content_length": limit
+        }), 413
+
     # ---------------- HARD API TEST ----------------
     @app.route("/api/ping")
     def ping():
@@ -126,13 +225,30 @@ def create_app():
     # ---------------- DATABASE ----------------
     try:
         from backend.models import db
-        db.init_app(app)
-        with app.app_context():
-            db.create_all()
-        logger.info("Database initialized")
+        from backend.database import init_database
+        schema_mode = init_database(app, db)
+        logger.info(f"Database initialized (schema mode: {schema_mode})")
     except Exception as e:
         logger.warning(f"Database skipped: {e}")
 
+    # ---------------- WRITE-BEHIND ----------------
+    if app.config["WRITE_BEHIND_ENABLED"]:
+        try:
+            from backend.services.write_behind import init_write_behind
+            init_write_behind(app)
+            logger.info("Write-behind scan storage enabled")
+        except Exception as e:
+            logger.error(f"Write-behind failed to start, scans are stored synchronously: {e}")
+
+    # ---------------- RETENTION ----------------
+    if app.config["RETENTION_ENABLED"]:
+        try:
+            from backend.services.retention import init_retention
+            init_retention(app)
+            logger.info("Retention compactor enabled")
+        except Exception as e:
+            logger.error(f"Retention compactor failed to start: {e}")
+
     # ---------------- AUTH BLUEPRINT (PHASE 1) ----------------
     try:
         from backend.routes.us05_auth_routes import auth_bp
@@ -209,6 +325,24 @@ def create_app():
     except Exception as e:
         logger.error(f"History blueprint failed: {e}")
 
+    # ---------------- ADMIN BLUEPRINT ----------------
+    try:
+        from backend.routes.admin_routes import admin_bp
+        app.register_blueprint(admin_bp)
+        logger.info("Admin blueprint registered")
+    except Exception as e:
+        logger.error(f"Admin blueprint failed: {e}")
+
+    # ---------------- SKILL TAXONOMY ----------------
+    # Compile (once across workers) and map the skill matcher; SIGHUP reloads it
+    try:
+        from backend.services.skill_taxonomy import get_matcher, install_reload_signal
+        logger.info(f"Skill taxonomy v{get_matcher().version} loaded")
+        if install_reload_signal():
+            logger.info("Skill taxonomy reloads on SIGHUP")
+    except Exception as e:
+        logger.error(f"Skill taxonomy failed to load: {e}")
+
     return app
 
 
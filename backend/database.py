@@ -0,0 +1,353 @@
+"""
+Database Setup
+Engine configuration, SQLAlchemy binding and schema migrations
+
+DATABASE_URL may be a full URL (postgresql://..., the postgres:// form some
+hosts hand out, or sqlite:///...) or a bare path to a SQLite file.
+
+PostgreSQL connections come from a pool with pre-ping and a server-side
+statement timeout:
+
+    DB_POOL_SIZE (5), DB_MAX_OVERFLOW (10), DB_POOL_TIMEOUT (30 s),
+    DB_POOL_RECYCLE (1800 s), DB_STATEMENT_TIMEOUT_MS (30000)
+
+SQLite connections get pragmas on connect: WAL journaling so readers never
+block the writer, a busy timeout so concurrent writers wait instead of
+failing with "database is locked", synchronous=NORMAL (safe under WAL, one
+fsync per checkpoint instead of per commit) and a memory-mapped read window:
+
+    DB_BUSY_TIMEOUT_MS (5000), DB_MMAP_SIZE (268435456), DB_JOURNAL_MODE (wal)
+
+Compare concurrent writers under the default and the tuned SQLite settings:
+
+    python -m backend.database benchmark --workers 8 --scans 200
+
+Schema changes are Alembic migrations in backend/migrations (Flask-Migrate):
+
+    flask --app backend.app:create_app db upgrade                  # apply pending migrations
+    flask --app backend.app:create_app db migrate -m "<change>"    # new revision after a model change
+
+What happens at startup is chosen by DB_SCHEMA_MODE:
+
+    migrate    - apply pending migrations, one process at a time; the default
+                 for SQLite files, where the app and the database share a host
+    create_all - db.create_all() for throwaway databases (tests, demos)
+    none       - leave the schema alone; the deploy step runs `flask db upgrade`
+                 once (the default for server databases such as PostgreSQL)
+
+Databases created by the old create_all() startup have tables but no
+alembic_version table; they are stamped at the baseline revision first, so
+upgrading them only applies the later changes.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import multiprocessing
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    from flask_migrate import Migrate, upgrade, stamp
+    MIGRATE_AVAILABLE = True
+except ImportError:
+    MIGRATE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+BASELINE_REVISION = '0001_baseline'
+SCHEMA_MODES = ('migrate', 'create_all', 'none')
+
+# pg_advisory_lock key serializing migrations across app servers
+_PG_MIGRATION_LOCK = 7_342_001
+
+
+def database_url(value, default_path):
+    """
+    Normalize DATABASE_URL into a SQLAlchemy URL
+
+    Args:
+        value: DATABASE_URL (URL, bare SQLite path, or None)
+        default_path: SQLite file used when value is empty
+
+    Returns:
+        str: SQLAlchemy database URL
+    """
+    value = (value or '').strip()
+    if not value:
+        return f"sqlite:///{default_path}"
+    if value.startswith('postgres://'):
+        # Heroku-style scheme; SQLAlchemy only accepts postgresql://
+        return 'postgresql://' + value[len('postgres://'):]
+    if '://' in value:
+        return value
+    return f"sqlite:///{value}"
+
+
+def engine_options(url, env=None):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URL
+
+    Args:
+        url: SQLAlchemy database URL
+        env: Mapping to read settings from (defaults to os.environ)
+
+    Returns:
+        dict: Keyword arguments for create_engine
+    """
+    env = os.environ if env is None else env
+
+    if url.startswith('sqlite'):
+        # Python's sqlite3 waits this long for a lock on its own, before any pragma runs
+        return {'connect_args': {'timeout': int(env.get('DB_BUSY_TIMEOUT_MS', 5000)) / 1000}}
+
+    options = {
+        'pool_size': int(env.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(env.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(env.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(env.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True,
+    }
+    if url.startswith('postgresql'):
+        timeout_ms = int(env.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+        options['connect_args'] = {'options': f'-c statement_timeout={timeout_ms}'}
+    return options
+
+
+def sqlite_pragmas(env=None):
+    """PRAGMA name -> value applied to every new SQLite connection"""
+    env = os.environ if env is None else env
+    return {
+        'journal_mode': env.get('DB_JOURNAL_MODE', 'wal'),
+        'busy_timeout': int(env.get('DB_BUSY_TIMEOUT_MS', 5000)),
+        'synchronous': 'NORMAL',
+        'mmap_size': int(env.get('DB_MMAP_SIZE', 256 * 1024 * 1024)),
+    }
+
+
+def install_sqlite_pragmas(engine, pragmas=None):
+    """Run the pragmas on each connection the engine opens (no-op for other databases)"""
+    if engine.dialect.name != 'sqlite':
+        return False
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    return True
+
+
+def default_schema_mode(database_uri):
+    """Startup schema mode when DB_SCHEMA_MODE is not set"""
+    return 'migrate' if database_uri.startswith('sqlite') else 'none'
+
+
+def init_database(app, db):
+    """
+    Bind db to app, register Flask-Migrate and apply the startup schema mode
+
+    Args:
+        app: Flask application
+        db: Flask-SQLAlchemy instance
+
+    Returns:
+        str: The schema mode that was applied
+    """
+    db.init_app(app)
+    if MIGRATE_AVAILABLE:
+        Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True, compare_type=True)
+
+    mode = app.config.get('DB_SCHEMA_MODE') or default_schema_mode(app.config['SQLALCHEMY_DATABASE_URI'])
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"DB_SCHEMA_MODE must be one of {', '.join(SCHEMA_MODES)}, got {mode!r}")
+
+    with app.app_context():
+        install_sqlite_pragmas(db.engine)
+
+        if mode == 'migrate' and not MIGRATE_AVAILABLE:
+            logger.warning("Flask-Migrate is not installed; creating tables with create_all instead")
+            mode = 'create_all'
+
+        if mode == 'create_all':
+            db.create_all()
+        elif mode == 'migrate':
+            upgrade_database(db.engine)
+    return mode
+
+
+def upgrade_database(engine):
+    """Stamp a pre-migration database if needed, then upgrade to head (app context required)"""
+    with _migration_lock(engine):
+        if is_unversioned_database(engine):
+            logger.info(f"Existing database without migration history; stamping {BASELINE_REVISION}")
+            stamp(directory=MIGRATIONS_DIR, revision=BASELINE_REVISION)
+        upgrade(directory=MIGRATIONS_DIR)
+
+
+def is_unversioned_database(engine):
+    """True for databases created by create_all() before migrations existed"""
+    tables = set(inspect(engine).get_table_names())
+    return 'users' in tables and 'alembic_version' not in tables
+
+
+@contextmanager
+def _migration_lock(engine):
+    """Let one process migrate while the others wait (then find nothing to do)"""
+    if engine.dialect.name == 'postgresql':
+        with engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': _PG_MIGRATION_LOCK})
+            try:
+                yield
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _PG_MIGRATION_LOCK})
+        return
+
+    database = engine.url.database if engine.dialect.name == 'sqlite' else None
+    if not database or database == ':memory:' or fcntl is None:
+        yield
+        return
+
+    with open(f'{database}.migrate.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ---------------- CONCURRENT WRITE BENCHMARK ----------------
+
+# 'default' is what the app ran with before: sqlite3's rollback journal,
+# synchronous=FULL and its 5 second lock wait
+BENCHMARK_MODES = ('default', 'tuned')
+
+
+def _benchmark_worker(job):
+    """One worker process recording scans; returns (ok, locked, latencies)"""
+    url, mode, user_id, scans = job
+    if mode == 'tuned':
+        engine = create_engine(url, **engine_options(url))
+        install_sqlite_pragmas(engine)
+    else:
+        engine = create_engine(url)
+
+    ok, locked, latencies = 0, 0, []
+    for i in range(scans):
+        started = time.perf_counter()
+        score = float((user_id * 31 + i * 17) % 100)
+        try:
+            # Same shape as a scan: read recent history, insert the scan, bump the rollup
+            with engine.begin() as connection:
+                connection.execute(text(
+                    'SELECT id, overall_match_score FROM scan_history WHERE user_id = :user_id '
+                    'ORDER BY created_at DESC, id DESC LIMIT 20'
+                ), {'user_id': user_id}).fetchall()
+                connection.execute(text(
+                    'INSERT INTO scan_history (user_id, overall_match_score, scan_type, created_at) '
+                    "VALUES (:user_id, :score, 'stored', CURRENT_TIMESTAMP)"
+                ), {'user_id': user_id, 'score': score})
+                connection.execute(text(
+                    'UPDATE user_stats SET scan_count = scan_count + 1, score_sum = score_sum + :score '
+                    'WHERE user_id = :user_id'
+                ), {'user_id': user_id, 'score': score})
+            ok += 1
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            locked += 1
+    engine.dispose()
+    return ok, locked, latencies
+
+
+def _benchmark_database(directory, mode):
+    """Fresh SQLite file with the scan tables and one stats row per worker"""
+    from backend.models import db, User, ScanHistory, UserStats
+
+    path = os.path.join(directory, f'benchmark_{mode}.db')
+    url = f'sqlite:///{path}'
+    engine = create_engine(url)
+    db.metadata.create_all(engine, tables=[User.__table__, ScanHistory.__table__, UserStats.__table__])
+    engine.dispose()
+    return url
+
+
+def benchmark(workers=8, scans=200, directory=None):
+    """
+    Run the same concurrent scan workload under each SQLite mode
+
+    Returns:
+        list: (mode, stats dict) per mode
+    """
+    directory = directory or tempfile.mkdtemp(prefix='dr_resume_db_bench_')
+    os.makedirs(directory, exist_ok=True)
+    rows = []
+    for mode in BENCHMARK_MODES:
+        url = _benchmark_database(directory, mode)
+        engine = create_engine(url)
+        with engine.begin() as connection:
+            for user_id in range(1, workers + 1):
+                connection.execute(text(
+                    'INSERT INTO user_stats (user_id, resume_count, job_description_count, scan_count, score_sum, '
+                    'excellent_count, good_count, fair_count, poor_count) VALUES (:user_id, 0, 0, 0, 0, 0, 0, 0, 0)'
+                ), {'user_id': user_id})
+        engine.dispose()
+
+        started = time.perf_counter()
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_benchmark_worker, [(url, mode, user_id, scans) for user_id in range(1, workers + 1)])
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for _, _, worker_latencies in results for latency in worker_latencies)
+        ok = sum(result[0] for result in results)
+        stats = {
+            'scans_ok': ok,
+            'database_locked': sum(result[1] for result in results),
+            'scans_per_second': round(ok / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+        }
+        rows.append((mode, stats))
+
+    print(f"{workers} workers x {scans} scans")
+    for mode, stats in rows:
+        print(
+            f"{mode:<8} ok {stats['scans_ok']:>6}   locked {stats['database_locked']:>5}   "
+            f"{stats['scans_per_second']:>8.1f} scans/s   p50 {stats['p50_ms']} ms   p95 {stats['p95_ms']} ms"
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Database maintenance tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    bench_cmd = sub.add_parser('benchmark', help='Concurrent scan writes under default vs tuned SQLite settings')
+    bench_cmd.add_argument('--workers', type=int, default=8)
+    bench_cmd.add_argument('--scans', type=int, default=200, help='Scans recorded per worker')
+    bench_cmd.add_argument('--directory', default=None, help='Where to create the benchmark databases')
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark(args.workers, args.scans, args.directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,9 @@ from functools import wraps
 from flask import jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, verify_jwt_in_request
 from backend.models import User, db
+from backend.services.rate_limiter import get_rate_limiter
+import math
+import sqlite3
 import logging
 
 # Set up logging
@@ -146,16 +149,58 @@ def admin_required(f):
     
     return decorated_function
 
-def rate_limit_check(max_requests=100, window_minutes=60):
+def _rate_limit_identity():
+    """JWT identity of the request, or None when no token was verified"""
+    user_id = getattr(request, 'current_user_id', None)
+    if user_id is None:
+        try:
+            user_id = get_jwt_identity()
+        except RuntimeError:  # route without jwt_required
+            user_id = None
+    return user_id
+
+def rate_limit_check(max_requests=None, window_minutes=None, cost=1, scope='api'):
     """
-    Simple rate limiting decorator
+    Token bucket rate limiting decorator (see backend/services/rate_limiter.py)
+    
+    Takes `cost` tokens from the caller's user and IP buckets; answers 429
+    with Retry-After when either is short. Place it below the JWT decorator
+    so the user is known. When the bucket store fails (e.g. a locked or
+    unwritable SQLite file) the error is logged and the request goes through.
+    
+    Args:
+        max_requests: User bucket capacity in tokens (default: RATE_LIMIT_MAX_REQUESTS)
+        window_minutes: Time to refill an empty bucket (default: RATE_LIMIT_WINDOW_MINUTES)
+        cost: Tokens one call takes; heavy routes cost more than lists
+        scope: Bucket family; routes with the same scope share one allowance
     """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # For now, just log the request
-            # In production, implement proper rate limiting with Redis
-            logger.info(f"API call to {f.__name__} from user {getattr(request, 'current_user_id', 'anonymous')}")
+            limiter = get_rate_limiter()
+            if limiter is None:
+                return f(*args, **kwargs)
+            
+            user_id = _rate_limit_identity()
+            buckets = limiter.buckets(user_id, request.remote_addr, scope, max_requests, window_minutes)
+            try:
+                result = limiter.hit(buckets, cost)
+            except sqlite3.Error as e:
+                # Like a limiter that failed to start: serve the request unlimited
+                logger.error(f"Rate limit store error in {f.__name__}, request not limited: {e}")
+                return f(*args, **kwargs)
+            if not result.allowed:
+                retry_after = max(1, math.ceil(result.retry_after))
+                logger.warning(f"Rate limited {f.__name__} | User: {user_id or 'anonymous'} | "
+                               f"IP: {request.remote_addr} | Retry after {retry_after}s")
+                response = jsonify({
+                    'success': False,
+                    'message': 'Too many requests, please slow down',
+                    'error': 'rate_limited',
+                    'retry_after': retry_after
+                })
+                response.headers['Retry-After'] = str(retry_after)
+                return response, 429
             return f(*args, **kwargs)
         return decorated_function
     return decorator
@@ -199,8 +244,8 @@ def monitored_route(f):
     """Route with access logging"""
     return log_api_access(f)
 
-def rate_limited_route(max_requests=100, window_minutes=60):
-    """Route with rate limiting"""
+def rate_limited_route(max_requests=None, window_minutes=None, cost=1, scope='api'):
+    """Route with token bucket rate limiting"""
     def decorator(f):
-        return rate_limit_check(max_requests, window_minutes)(f)
+        return rate_limit_check(max_requests, window_minutes, cost, scope)(f)
     return decorator
@@ -0,0 +1,62 @@
+"""
+Request Body Limits
+Per-route overrides of MAX_CONTENT_LENGTH
+
+MAX_CONTENT_LENGTH rejects oversized bodies of every route before they are
+read; single resumes larger than that go through the chunked upload endpoints.
+Routes that take whole archives or record files in one request (bulk import)
+name their own limit with @body_limit:
+
+    @upload_bp.route('/bulk/resumes', methods=['POST'])
+    @jwt_required()
+    @body_limit('BULK_IMPORT_MAX_SIZE')
+    def bulk_import_resumes(): ...
+
+Installed by create_app().
+"""
+
+from flask import current_app, request, abort
+from flask.wrappers import Request
+
+
+def body_limit(config_key):
+    """
+    Let a view accept bodies up to app.config[config_key] bytes
+
+    Must be the innermost decorator: functools.wraps copies the marker to the
+    decorators applied above it.
+    """
+    def decorator(f):
+        f.body_limit_key = config_key
+        return f
+    return decorator
+
+
+class LimitedRequest(Request):
+    """Request whose max_content_length honours the view's @body_limit"""
+
+    @property
+    def max_content_length(self):
+        if not current_app:
+            return None
+        view = current_app.view_functions.get(self.endpoint) if self.endpoint else None
+        key = getattr(view, 'body_limit_key', None)
+        return current_app.config[key] if key else current_app.config['MAX_CONTENT_LENGTH']
+
+
+def reject_oversized_body():
+    """
+    Answer 413 from the declared Content-Length before the view runs
+
+    Views catch Exception around their form parsing, which would otherwise
+    turn werkzeug's 413 into a 500.
+    """
+    limit = request.max_content_length
+    if limit is not None and request.content_length is not None and request.content_length > limit:
+        abort(413)
+
+
+def init_request_limits(app):
+    """Install LimitedRequest and the early Content-Length check on the app"""
+    app.request_class = LimitedRequest
+    app.before_request(reject_oversized_body)
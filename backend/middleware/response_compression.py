@@ -0,0 +1,246 @@
+"""
+Response Compression Middleware
+gzip / brotli encoding of API and page responses
+
+Installed by create_app(). A response is compressed when the client accepts
+an encoding, its type is text-like (JSON, HTML, CSS, JS, SVG, ...), it is not
+already encoded and it is at least RESPONSE_COMPRESSION_MIN_SIZE bytes.
+Brotli (optional `brotli` package) is preferred over gzip when the client
+accepts both with the same quality.
+
+Generator (streamed) responses are compressed chunk by chunk, flushing after
+every chunk so the client still receives each part as it is produced.
+
+Static assets are served from precompressed `<file>.br` / `<file>.gz`
+siblings when those exist, so nothing is compressed per request:
+
+    python -m backend.middleware.response_compression precompress backend/static
+
+A compressed body is a different representation: strong ETags are turned
+into weak ones, which If-None-Match (weak comparison) still matches.
+"""
+
+import os
+import sys
+import gzip
+import zlib
+import argparse
+import logging
+import mimetypes
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+    'application/vnd.api+json', 'application/problem+json', 'application/msgpack',
+)
+
+# Precompressed sibling suffix per encoding
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def _is_compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+class ResponseCompressor:
+    """
+    Negotiates and applies Content-Encoding on outgoing responses
+
+    Args:
+        min_size (int): Smallest body (bytes) worth compressing
+        gzip_level (int): zlib level 1-9
+        brotli_quality (int): brotli quality 0-11
+    """
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE, gzip_level=DEFAULT_GZIP_LEVEL,
+                 brotli_quality=DEFAULT_BROTLI_QUALITY):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            min_size=config.get('RESPONSE_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE),
+            gzip_level=config.get('RESPONSE_COMPRESSION_LEVEL', DEFAULT_GZIP_LEVEL),
+            brotli_quality=config.get('RESPONSE_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY)
+        )
+
+    @staticmethod
+    def encodings():
+        """Encodings this process can produce, preferred first"""
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    @classmethod
+    def negotiate(cls, accept_encodings, available=None):
+        """
+        Best encoding the client accepts
+
+        Args:
+            accept_encodings: request.accept_encodings
+            available: Encodings to choose from, preferred first (default: encodings())
+
+        Returns:
+            str or None: 'br', 'gzip' or None for identity
+        """
+        best, best_quality = None, 0
+        for encoding in available or cls.encodings():
+            quality = accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _skip(self, response):
+        return (
+            response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or 'no-transform' in response.headers.get('Cache-Control', '')
+            or not _is_compressible(response.mimetype)
+        )
+
+    def compress(self, data, encoding):
+        """Whole body in one call"""
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def compress_stream(self, chunks, encoding):
+        """Generator body, flushed after every chunk"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            for chunk in chunks:
+                if chunk:
+                    yield compressor.process(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                    yield compressor.flush()
+            yield compressor.finish()
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            for chunk in chunks:
+                if chunk:
+                    yield compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                    yield compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+
+    def __call__(self, response):
+        """after_request hook"""
+        response.vary.add('Accept-Encoding')
+        if self._skip(response):
+            return response
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self.compress_stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self.compress(data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def serve_precompressed_static(app):
+    """
+    Replace the static view with one that serves `<file>.br` / `<file>.gz`
+    when the client accepts the encoding and the sibling exists
+    """
+    static_view = app.view_functions.get('static')
+    if static_view is None:
+        return
+
+    def static(filename):
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            if not request.accept_encodings[encoding]:
+                continue
+            variant = filename + suffix
+            if os.path.isfile(os.path.join(app.static_folder, variant)):
+                response = send_from_directory(app.static_folder, variant,
+                                               mimetype=mimetypes.guess_type(filename)[0])
+                response.headers['Content-Encoding'] = encoding
+                response.vary.add('Accept-Encoding')
+                return response
+        return static_view(filename=filename)
+
+    app.view_functions['static'] = static
+
+
+def init_response_compression(app):
+    """Install the compression hook and the precompressed static view"""
+    app.after_request(ResponseCompressor.from_config(app.config))
+    serve_precompressed_static(app)
+
+
+# ---------------- PRECOMPRESSION ----------------
+
+def precompress(folder, min_size=DEFAULT_MIN_SIZE, force=False):
+    """
+    Write `.gz` (and `.br` when brotli is installed) siblings for text-like assets
+
+    Variants are rewritten only when older than their source unless force is set.
+
+    Returns:
+        int: Number of files written
+    """
+    written = 0
+    for root, _, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith(tuple(PRECOMPRESSED_SUFFIXES.values())):
+                continue
+            if not _is_compressible(mimetypes.guess_type(name)[0]) or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as source:
+                data = source.read()
+            variants = {'.gz': lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants['.br'] = lambda: brotli.compress(data, quality=11)
+            for suffix, build in variants.items():
+                target = path + suffix
+                if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                with open(target, 'wb') as out:
+                    out.write(build())
+                written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Response compression tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    precompress_cmd = sub.add_parser('precompress', help='Write .gz/.br siblings of static assets')
+    precompress_cmd.add_argument('folder', nargs='?',
+                                 default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static'))
+    precompress_cmd.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE)
+    precompress_cmd.add_argument('--force', action='store_true', help='Rewrite up-to-date variants too')
+
+    args = parser.parse_args(argv)
+    if args.command == 'precompress':
+        written = precompress(args.folder, args.min_size, args.force)
+        print(f"Wrote {written} precompressed files{'' if brotli is not None else ' (gzip only, brotli not installed)'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Baseline schema (the tables create_all() built before migrations)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+Databases created before migrations were introduced already have exactly
+these tables; backend/database.py stamps them at this revision instead of
+running it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_email_verified', sa.Boolean(), nullable=True),
+    sa.Column('email_verification_token', sa.String(length=255), nullable=True),
+    sa.Column('email_verification_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('free_scans_remaining', sa.Integer(), nullable=False),
+    sa.Column('total_scans_used', sa.Integer(), nullable=False),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_table('job_descriptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('company_name', sa.String(length=255), nullable=True),
+    sa.Column('job_text', sa.Text(), nullable=False),
+    sa.Column('keywords_extracted', sa.Boolean(), nullable=True),
+    sa.Column('technical_skills', sa.Text(), nullable=True),
+    sa.Column('soft_skills', sa.Text(), nullable=True),
+    sa.Column('other_keywords', sa.Text(), nullable=True),
+    sa.Column('keyword_count', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('word_count', sa.Integer(), nullable=True),
+    sa.Column('character_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('resumes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('original_filename', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('file_type', sa.String(length=10), nullable=False),
+    sa.Column('extracted_text', sa.Text(), nullable=True),
+    sa.Column('keywords_extracted', sa.Boolean(), nullable=True),
+    sa.Column('technical_skills', sa.Text(), nullable=True),
+    sa.Column('soft_skills', sa.Text(), nullable=True),
+    sa.Column('other_keywords', sa.Text(), nullable=True),
+    sa.Column('keyword_count', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('upload_status', sa.String(length=20), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('match_scores',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('job_description_id', sa.Integer(), nullable=False),
+    sa.Column('overall_score', sa.Float(), nullable=False),
+    sa.Column('technical_score', sa.Float(), nullable=True),
+    sa.Column('soft_skills_score', sa.Float(), nullable=True),
+    sa.Column('other_keywords_score', sa.Float(), nullable=True),
+    sa.Column('total_resume_keywords', sa.Integer(), nullable=True),
+    sa.Column('total_jd_keywords', sa.Integer(), nullable=True),
+    sa.Column('matched_keywords', sa.Integer(), nullable=True),
+    sa.Column('algorithm_used', sa.String(length=50), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_description_id'], ['job_descriptions.id'], ),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('resume_suggestions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('jd_id', sa.Integer(), nullable=False),
+    sa.Column('suggestion_type', sa.String(length=50), nullable=False),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('keywords', sa.JSON(), nullable=True),
+    sa.Column('action', sa.Text(), nullable=True),
+    sa.Column('examples', sa.JSON(), nullable=True),
+    sa.Column('tier', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['jd_id'], ['job_descriptions.id'], ),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('scan_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=True),
+    sa.Column('job_description_id', sa.Integer(), nullable=True),
+    sa.Column('resume_text', sa.Text(), nullable=True),
+    sa.Column('job_description_text', sa.Text(), nullable=True),
+    sa.Column('overall_match_score', sa.Float(), nullable=False),
+    sa.Column('category_scores', sa.JSON(), nullable=True),
+    sa.Column('detailed_analysis', sa.JSON(), nullable=True),
+    sa.Column('recommendations', sa.JSON(), nullable=True),
+    sa.Column('keyword_analysis', sa.JSON(), nullable=True),
+    sa.Column('ats_compatibility', sa.Float(), nullable=True),
+    sa.Column('scan_type', sa.String(length=20), nullable=True),
+    sa.Column('algorithm_used', sa.String(length=50), nullable=True),
+    sa.Column('scan_duration', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_description_id'], ['job_descriptions.id'], ),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('scan_history')
+    op.drop_table('resume_suggestions')
+    op.drop_table('match_scores')
+    op.drop_table('resumes')
+    op.drop_table('job_descriptions')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,65 @@
+"""Normalized keyword tables
+
+Revision ID: 0002_keyword_tables
+Revises: 0001_baseline
+Create Date: 2026-10-18 09:05:00.000000
+
+Development databases built by create_all() while these models were being
+added may already have the tables, so each step checks the live schema
+first. Keyword links are not backfilled here; documents are re-linked
+lazily on their next match.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_keyword_tables'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'keywords' not in tables:
+        op.create_table('keywords',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('term', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('term')
+        )
+
+    if 'resume_keywords' not in tables:
+        op.create_table('resume_keywords',
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.SmallInteger(), nullable=False),
+        sa.Column('keyword_id', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['keyword_id'], ['keywords.id'], ),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('resume_id', 'category', 'keyword_id')
+        )
+        op.create_index('ix_resume_keywords_keyword_resume', 'resume_keywords', ['keyword_id', 'resume_id'])
+
+    if 'job_description_keywords' not in tables:
+        op.create_table('job_description_keywords',
+        sa.Column('job_description_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.SmallInteger(), nullable=False),
+        sa.Column('keyword_id', sa.Integer(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['job_description_id'], ['job_descriptions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['keyword_id'], ['keywords.id'], ),
+        sa.PrimaryKeyConstraint('job_description_id', 'category', 'keyword_id')
+        )
+        op.create_index('ix_job_description_keywords_keyword_jd', 'job_description_keywords', ['keyword_id', 'job_description_id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_description_keywords_keyword_jd', table_name='job_description_keywords')
+    op.drop_table('job_description_keywords')
+    op.drop_index('ix_resume_keywords_keyword_resume', table_name='resume_keywords')
+    op.drop_table('resume_keywords')
+    op.drop_table('keywords')
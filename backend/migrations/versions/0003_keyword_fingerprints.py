@@ -0,0 +1,36 @@
+"""Keyword fingerprint bitsets on resumes and job descriptions
+
+Revision ID: 0003_keyword_fingerprints
+Revises: 0002_keyword_tables
+Create Date: 2026-10-18 09:06:00.000000
+
+The columns are nullable: fingerprints of existing documents are computed
+lazily on their next match, not backfilled here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_keyword_fingerprints'
+down_revision = '0002_keyword_tables'
+branch_labels = None
+depends_on = None
+
+FINGERPRINT_COLUMNS = ('technical_skills_fingerprint', 'soft_skills_fingerprint', 'other_keywords_fingerprint')
+
+
+def upgrade():
+    for table in ('resumes', 'job_descriptions'):
+        existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name in FINGERPRINT_COLUMNS:
+                if name not in existing:
+                    batch_op.add_column(sa.Column(name, sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    for table in ('resumes', 'job_descriptions'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name in reversed(FINGERPRINT_COLUMNS):
+                batch_op.drop_column(name)
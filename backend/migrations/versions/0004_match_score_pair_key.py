@@ -0,0 +1,43 @@
+"""One match score per (user, resume, job description)
+
+Revision ID: 0004_match_score_pair_key
+Revises: 0003_keyword_fingerprints
+Create Date: 2026-10-18 09:07:00.000000
+
+Recalculations upsert into the pair's row (ON CONFLICT needs this unique
+key). Duplicates from before the upsert are removed first, keeping the
+newest row of each pair.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_match_score_pair_key'
+down_revision = '0003_keyword_fingerprints'
+branch_labels = None
+depends_on = None
+
+
+def _unique_constraints(table):
+    inspector = sa.inspect(op.get_bind())
+    names = {constraint['name'] for constraint in inspector.get_unique_constraints(table)}
+    names.update(index['name'] for index in inspector.get_indexes(table) if index.get('unique'))
+    return names
+
+
+def upgrade():
+    if 'uq_match_scores_user_resume_jd' in _unique_constraints('match_scores'):
+        return
+    op.execute(
+        'DELETE FROM match_scores WHERE id NOT IN ('
+        'SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM match_scores '
+        'GROUP BY user_id, resume_id, job_description_id) AS newest)'
+    )
+    with op.batch_alter_table('match_scores', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_match_scores_user_resume_jd', ['user_id', 'resume_id', 'job_description_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('match_scores', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_match_scores_user_resume_jd', type_='unique')
@@ -0,0 +1,54 @@
+"""Per-user stats rollup and per-resume scan sums
+
+Revision ID: 0005_user_stats_rollup
+Revises: 0004_match_score_pair_key
+Create Date: 2026-10-18 09:08:00.000000
+
+user_stats rows are not backfilled here: a user's row is built from
+scan_history the first time it is read (backfill_user_stats). The resume
+scan sums start at 0 and are folded in by the same backfill.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_user_stats_rollup'
+down_revision = '0004_match_score_pair_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'user_stats' not in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.create_table('user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('resume_count', sa.Integer(), nullable=False),
+        sa.Column('job_description_count', sa.Integer(), nullable=False),
+        sa.Column('scan_count', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('score_max', sa.Float(), nullable=True),
+        sa.Column('score_min', sa.Float(), nullable=True),
+        sa.Column('excellent_count', sa.Integer(), nullable=False),
+        sa.Column('good_count', sa.Integer(), nullable=False),
+        sa.Column('fair_count', sa.Integer(), nullable=False),
+        sa.Column('poor_count', sa.Integer(), nullable=False),
+        sa.Column('last_scan_at', sa.DateTime(), nullable=True),
+        sa.Column('last_scan_score', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+        )
+
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('resumes')}
+    if 'scan_count' not in existing:
+        with op.batch_alter_table('resumes', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('scan_count', sa.Integer(), nullable=False, server_default='0'))
+            batch_op.add_column(sa.Column('scan_score_sum', sa.Float(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_column('scan_score_sum')
+        batch_op.drop_column('scan_count')
+    op.drop_table('user_stats')
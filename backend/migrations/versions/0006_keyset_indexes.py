@@ -0,0 +1,40 @@
+"""Indexes backing keyset pagination of the list endpoints
+
+Revision ID: 0006_keyset_indexes
+Revises: 0005_user_stats_rollup
+Create Date: 2026-10-18 09:09:00.000000
+
+Each list filters on user_id and orders by created_at (or score) with id as
+the tie-breaker, so (user_id, sort column, id) serves both the filter and
+the ORDER BY ... LIMIT without a sort step.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_keyset_indexes'
+down_revision = '0005_user_stats_rollup'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_resumes_user_created', 'resumes', ['user_id', 'created_at', 'id']),
+    ('ix_job_descriptions_user_created', 'job_descriptions', ['user_id', 'created_at', 'id']),
+    ('ix_match_scores_user_created', 'match_scores', ['user_id', 'created_at', 'id']),
+    ('ix_scan_history_user_created', 'scan_history', ['user_id', 'created_at', 'id']),
+    ('ix_scan_history_user_score', 'scan_history', ['user_id', 'overall_match_score', 'id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,80 @@
+"""Composite and partial indexes for the route queries
+
+Revision ID: 0007_route_indexes
+Revises: 0006_keyset_indexes
+Create Date: 2026-10-18 09:10:00.000000
+
+Every list/lookup route filters on user_id (plus is_active for documents and
+match scores) and orders by created_at or score, with id as the keyset
+tie-breaker. The partial indexes only cover active rows, which is all the
+routes ever read; they replace the full-table keyset indexes of 0006 on
+resumes, job descriptions and match scores. The plain resume/job description
+indexes serve the backref loads issued when a document is deleted.
+test_query_plans.py checks the plans.
+
+On PostgreSQL the indexes are built CONCURRENTLY so writes keep flowing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_route_indexes'
+down_revision = '0006_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+ACTIVE_ROWS = {
+    'sqlite_where': sa.text('is_active = 1'),
+    'postgresql_where': sa.text('is_active = true')
+}
+
+# (name, table, columns, partial on active rows)
+INDEXES = [
+    ('ix_resumes_user_active_created', 'resumes', ['user_id', 'created_at', 'id'], True),
+    ('ix_job_descriptions_user_active_created', 'job_descriptions', ['user_id', 'created_at', 'id'], True),
+    ('ix_match_scores_user_active_created', 'match_scores', ['user_id', 'created_at', 'id'], True),
+    ('ix_match_scores_resume', 'match_scores', ['resume_id'], False),
+    ('ix_match_scores_job_description', 'match_scores', ['job_description_id'], False),
+    ('ix_scan_history_resume', 'scan_history', ['resume_id'], False),
+    ('ix_scan_history_job_description', 'scan_history', ['job_description_id'], False),
+    ('ix_resume_suggestions_user_created', 'resume_suggestions', ['user_id', 'created_at'], False),
+    ('ix_resume_suggestions_resume', 'resume_suggestions', ['resume_id'], False),
+    ('ix_resume_suggestions_jd', 'resume_suggestions', ['jd_id'], False),
+]
+
+# Full-table keyset indexes (0006) the partial ones replace
+SUPERSEDED = [
+    ('ix_resumes_user_created', 'resumes', ['user_id', 'created_at', 'id']),
+    ('ix_job_descriptions_user_created', 'job_descriptions', ['user_id', 'created_at', 'id']),
+    ('ix_match_scores_user_created', 'match_scores', ['user_id', 'created_at', 'id']),
+]
+
+
+def _index_names(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    existing = {table: _index_names(table) for table in {table for _, table, _, _ in INDEXES}}
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, partial in INDEXES:
+            if name in existing[table]:
+                continue
+            options = dict(ACTIVE_ROWS) if partial else {}
+            if concurrently:
+                options['postgresql_concurrently'] = True
+            op.create_index(name, table, columns, **options)
+
+        for name, table, _ in SUPERSEDED:
+            if name in existing[table]:
+                op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in SUPERSEDED:
+        op.create_index(name, table, columns)
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,42 @@
+"""Public ids for write-behind scan history and suggestion rows
+
+Revision ID: 0008_public_ids
+Revises: 0007_route_indexes
+Create Date: 2026-10-18 09:20:00.000000
+
+Rows queued by the write-behind buffer (backend/services/write_behind.py)
+get their token before they have an integer id. The unique index serves
+token lookups and lets a replayed spool skip rows that were already
+inserted. Existing rows keep a NULL public_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_public_ids'
+down_revision = '0007_route_indexes'
+branch_labels = None
+depends_on = None
+
+TABLES = {
+    'scan_history': 'ix_scan_history_public_id',
+    'resume_suggestions': 'ix_resume_suggestions_public_id',
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, index in TABLES.items():
+        if 'public_id' not in {column['name'] for column in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('public_id', sa.String(length=36), nullable=True))
+        if index not in {existing['name'] for existing in inspector.get_indexes(table)}:
+            op.create_index(index, table, ['public_id'], unique=True)
+
+
+def downgrade():
+    for table, index in TABLES.items():
+        op.drop_index(index, table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('public_id')
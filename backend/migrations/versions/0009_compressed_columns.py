@@ -0,0 +1,138 @@
+"""Compressed storage for the large text and JSON columns
+
+Revision ID: 0009_compressed_columns
+Revises: 0008_public_ids
+Create Date: 2026-10-18 09:30:00.000000
+
+Resume text, job description text, the scan text snapshots and three of the
+scan analysis documents become binary columns holding compressed values
+(backend/services/compression.py). category_scores stays plain JSON: the
+history list reads it with JSON functions in SQL. The recommendation count
+the history list shows moves to its own column, since SQL can no longer
+look inside the compressed document.
+
+Existing rows are converted in id order, BATCH_SIZE rows at a time. Values
+that already carry the compression header are left alone, so an interrupted
+upgrade can simply be run again.
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.services.compression import get_codec, MARKER
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_compressed_columns'
+down_revision = '0008_public_ids'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# table -> {column: 'text' | 'json'}
+COLUMNS = {
+    'resumes': {'extracted_text': 'text'},
+    'job_descriptions': {'job_text': 'text'},
+    'scan_history': {
+        'resume_text': 'text',
+        'job_description_text': 'text',
+        'detailed_analysis': 'json',
+        'recommendations': 'json',
+        'keyword_analysis': 'json',
+    },
+}
+
+
+def _columns(table):
+    return {column['name']: column for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _raw_bytes(value):
+    return value.encode('utf-8') if isinstance(value, str) else bytes(value)
+
+
+def _batches(table, names):
+    """Rows of (id, *names), BATCH_SIZE at a time in id order"""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, *[table.c[name] for name in names])
+            .where(table.c.id > last_id).order_by(table.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _compress_rows(table_name, kinds):
+    codec = get_codec()
+    names = list(kinds)
+    extra = [sa.column('recommendations_count', sa.Integer)] if table_name == 'scan_history' else []
+    table = sa.table(table_name, sa.column('id', sa.Integer),
+                     *[sa.column(name, sa.LargeBinary) for name in names], *extra)
+
+    for rows in _batches(table, names):
+        for row in rows:
+            values = {}
+            for name, value in zip(names, row[1:]):
+                if value is None:
+                    continue
+                data = _raw_bytes(value)
+                if data[:1] == bytes([MARKER]):
+                    continue  # converted by an earlier run
+                if kinds[name] == 'json':
+                    document = json.loads(data)
+                    if name == 'recommendations':
+                        values['recommendations_count'] = len(document) if isinstance(document, list) else 0
+                    # Empty documents are stored as NULL (see CompressedJSON)
+                    data = json.dumps(document).encode('utf-8') if document not in (None, {}, []) else None
+                values[name] = codec.compress(data) if data is not None else None
+            if values:
+                op.get_bind().execute(table.update().where(table.c.id == row[0]).values(**values))
+
+
+def upgrade():
+    if 'recommendations_count' not in _columns('scan_history'):
+        with op.batch_alter_table('scan_history') as batch_op:
+            batch_op.add_column(sa.Column('recommendations_count', sa.Integer(), server_default='0', nullable=False))
+
+    for table, kinds in COLUMNS.items():
+        existing = _columns(table)
+        pending = [name for name in kinds if not isinstance(existing[name]['type'], sa.LargeBinary)]
+        if pending:
+            with op.batch_alter_table(table) as batch_op:
+                for name in pending:
+                    batch_op.alter_column(
+                        name, type_=sa.LargeBinary(), existing_type=existing[name]['type'],
+                        existing_nullable=existing[name]['nullable'],
+                        postgresql_using=f"convert_to({name}::text, 'UTF8')"
+                    )
+        _compress_rows(table, kinds)
+
+
+def downgrade():
+    codec = get_codec()
+    for table_name, kinds in COLUMNS.items():
+        names = list(kinds)
+        table = sa.table(table_name, sa.column('id', sa.Integer), *[sa.column(name, sa.LargeBinary) for name in names])
+        for rows in _batches(table, names):
+            for row in rows:
+                values = {name: codec.decompress(value) for name, value in zip(names, row[1:]) if value is not None}
+                if values:
+                    op.get_bind().execute(table.update().where(table.c.id == row[0]).values(**values))
+
+        existing = _columns(table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            for name, kind in kinds.items():
+                batch_op.alter_column(
+                    name, type_=sa.JSON() if kind == 'json' else sa.Text(), existing_type=sa.LargeBinary(),
+                    existing_nullable=existing[name]['nullable'],
+                    postgresql_using=f"convert_from({name}, 'UTF8')" + ('::json' if kind == 'json' else '')
+                )
+
+    with op.batch_alter_table('scan_history') as batch_op:
+        batch_op.drop_column('recommendations_count')
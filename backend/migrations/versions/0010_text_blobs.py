@@ -0,0 +1,145 @@
+"""Content-addressed text blobs for the scan text snapshots
+
+Revision ID: 0010_text_blobs
+Revises: 0009_compressed_columns
+Create Date: 2026-10-18 14:00:00.000000
+
+scan_history.resume_text / job_description_text move into text_blobs, one
+row per distinct text keyed by its sha256, and scan_history keeps the hashes.
+Existing snapshots are hashed in id order, BATCH_SIZE scans at a time; the
+first compressed value seen for a text becomes the blob content as is.
+"""
+import hashlib
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.services.compression import get_codec, MARKER
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_text_blobs'
+down_revision = '0009_compressed_columns'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# scan_history text column -> hash column
+TEXT_COLUMNS = {
+    'resume_text': 'resume_text_hash',
+    'job_description_text': 'job_description_text_hash',
+}
+
+UNREFERENCED = sa.text('ref_count <= 0')
+
+
+def _columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _move_texts_to_blobs():
+    bind = op.get_bind()
+    codec = get_codec()
+    scans = sa.table('scan_history', sa.column('id', sa.Integer),
+                     *[sa.column(name, sa.LargeBinary) for name in TEXT_COLUMNS],
+                     *[sa.column(name, sa.String) for name in TEXT_COLUMNS.values()])
+    blobs = sa.table('text_blobs', sa.column('hash', sa.String), sa.column('content', sa.LargeBinary),
+                     sa.column('size', sa.Integer), sa.column('ref_count', sa.Integer),
+                     sa.column('created_at', sa.DateTime))
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(scans.c.id, *[scans.c[name] for name in TEXT_COLUMNS])
+            .where(scans.c.id > last_id).order_by(scans.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+
+        references, contents, updates = Counter(), {}, []
+        for row in rows:
+            hashes = {}
+            for name, value in zip(TEXT_COLUMNS, row[1:]):
+                if value is None:
+                    continue
+                stored = value.encode('utf-8') if isinstance(value, str) else bytes(value)
+                text = codec.decompress(stored).decode('utf-8')
+                blob_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+                references[blob_hash] += 1
+                if blob_hash not in contents:
+                    compressed = stored if stored[:1] == bytes([MARKER]) else codec.compress(stored)
+                    contents[blob_hash] = (compressed, len(text))
+                hashes[TEXT_COLUMNS[name]] = blob_hash
+            if hashes:
+                updates.append({'b_id': row[0], **{column: hashes.get(column) for column in TEXT_COLUMNS.values()}})
+
+        if not references:
+            continue
+        existing = set(bind.execute(sa.select(blobs.c.hash).where(blobs.c.hash.in_(list(references)))).scalars())
+        for blob_hash in existing:
+            bind.execute(blobs.update().where(blobs.c.hash == blob_hash).values(
+                ref_count=blobs.c.ref_count + references[blob_hash]))
+        new_rows = [{'hash': blob_hash, 'content': contents[blob_hash][0], 'size': contents[blob_hash][1],
+                     'ref_count': count, 'created_at': sa.func.now()}
+                    for blob_hash, count in references.items() if blob_hash not in existing]
+        for new_row in new_rows:
+            bind.execute(blobs.insert().values(**new_row))
+        bind.execute(
+            scans.update().where(scans.c.id == sa.bindparam('b_id')).values(
+                **{column: sa.bindparam(column) for column in TEXT_COLUMNS.values()}),
+            updates
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'text_blobs' not in sa.inspect(bind).get_table_names():
+        op.create_table('text_blobs',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('released_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('hash')
+        )
+        op.create_index('ix_text_blobs_released', 'text_blobs', ['released_at'], unique=False,
+                        sqlite_where=UNREFERENCED, postgresql_where=UNREFERENCED)
+
+    existing = _columns('scan_history')
+    if 'resume_text_hash' not in existing:
+        with op.batch_alter_table('scan_history') as batch_op:
+            for column in TEXT_COLUMNS.values():
+                batch_op.add_column(sa.Column(column, sa.String(length=64), nullable=True))
+                batch_op.create_foreign_key(f'fk_scan_history_{column}', 'text_blobs', [column], ['hash'])
+                batch_op.create_index(f'ix_scan_history_{column}', [column], unique=False)
+
+    if 'resume_text' in existing:
+        _move_texts_to_blobs()
+        with op.batch_alter_table('scan_history') as batch_op:
+            for name in TEXT_COLUMNS:
+                batch_op.drop_column(name)
+
+
+def downgrade():
+    with op.batch_alter_table('scan_history') as batch_op:
+        for name in TEXT_COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.LargeBinary(), nullable=True))
+
+    # Blob contents use the same compressed format the columns held
+    for name, column in TEXT_COLUMNS.items():
+        op.execute(f"UPDATE scan_history SET {name} = "
+                   f"(SELECT content FROM text_blobs WHERE text_blobs.hash = scan_history.{column}) "
+                   f"WHERE {column} IS NOT NULL")
+
+    with op.batch_alter_table('scan_history') as batch_op:
+        for column in TEXT_COLUMNS.values():
+            batch_op.drop_index(f'ix_scan_history_{column}')
+            batch_op.drop_constraint(f'fk_scan_history_{column}', type_='foreignkey')
+            batch_op.drop_column(column)
+
+    op.drop_index('ix_text_blobs_released', table_name='text_blobs')
+    op.drop_table('text_blobs')
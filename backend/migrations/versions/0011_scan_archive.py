@@ -0,0 +1,68 @@
+"""Scan history archive for the retention compactor
+
+Revision ID: 0011_scan_archive
+Revises: 0010_text_blobs
+Create Date: 2026-10-18 17:00:00.000000
+
+Adds scan_history_archive and scan_history.archived_at. Nothing is archived
+here; the compactor (backend/services/retention.py) does that in batches.
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.services.compression import get_codec
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_scan_archive'
+down_revision = '0010_text_blobs'
+branch_labels = None
+depends_on = None
+
+UNARCHIVED = sa.text('archived_at IS NULL')
+
+ANALYSIS_FIELDS = ('detailed_analysis', 'recommendations', 'keyword_analysis')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'scan_history_archive' not in inspector.get_table_names():
+        op.create_table('scan_history_archive',
+        sa.Column('scan_id', sa.Integer(), nullable=False),
+        sa.Column('document', sa.LargeBinary(), nullable=True),
+        sa.Column('has_detailed_analysis', sa.Boolean(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['scan_id'], ['scan_history.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('scan_id')
+        )
+
+    if 'archived_at' not in {column['name'] for column in inspector.get_columns('scan_history')}:
+        with op.batch_alter_table('scan_history') as batch_op:
+            batch_op.add_column(sa.Column('archived_at', sa.DateTime(), nullable=True))
+        op.create_index('ix_scan_history_unarchived_created', 'scan_history', ['created_at', 'id'], unique=False,
+                        sqlite_where=UNARCHIVED, postgresql_where=UNARCHIVED)
+
+
+def _restore_analysis_documents():
+    """Put archived analysis documents back into scan_history (text snapshots are not restored)"""
+    bind = op.get_bind()
+    codec = get_codec()
+    archive = sa.table('scan_history_archive', sa.column('scan_id', sa.Integer), sa.column('document', sa.LargeBinary))
+    scans = sa.table('scan_history', sa.column('id', sa.Integer),
+                     *[sa.column(field, sa.LargeBinary) for field in ANALYSIS_FIELDS])
+    for scan_id, stored in bind.execute(sa.select(archive.c.scan_id, archive.c.document)).all():
+        document = json.loads(codec.decompress(stored)) if stored is not None else {}
+        values = {field: codec.compress(json.dumps(document[field]).encode('utf-8'))
+                  for field in ANALYSIS_FIELDS if document.get(field) not in (None, {}, [])}
+        if values:
+            bind.execute(scans.update().where(scans.c.id == scan_id).values(**values))
+
+
+def downgrade():
+    _restore_analysis_documents()
+    op.drop_index('ix_scan_history_unarchived_created', table_name='scan_history')
+    with op.batch_alter_table('scan_history') as batch_op:
+        batch_op.drop_column('archived_at')
+    op.drop_table('scan_history_archive')
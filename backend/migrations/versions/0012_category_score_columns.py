@@ -0,0 +1,67 @@
+"""Category score columns on scan_history
+
+Revision ID: 0012_category_score_columns
+Revises: 0011_scan_archive
+Create Date: 2026-10-18 19:00:00.000000
+
+The four category scores the history list shows get their own Float columns
+with (user_id, score, id) indexes, so lists can sort and filter on them and
+the dashboard can average them in SQL. Existing rows are backfilled from the
+category_scores JSON in id ranges of BATCH_SIZE scans.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_category_score_columns'
+down_revision = '0011_scan_archive'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# scan_history column -> category_scores key
+CATEGORY_SCORE_COLUMNS = {
+    'technical_score': 'technical_skills',
+    'soft_skills_score': 'soft_skills',
+    'experience_score': 'experience_match',
+    'education_score': 'education_match',
+}
+
+
+def _backfill_scores():
+    bind = op.get_bind()
+    scans = sa.table('scan_history', sa.column('id', sa.Integer), sa.column('category_scores', sa.JSON),
+                     *[sa.column(column, sa.Float) for column in CATEGORY_SCORE_COLUMNS])
+    max_id = bind.execute(sa.select(sa.func.max(scans.c.id))).scalar() or 0
+    for start in range(0, max_id, BATCH_SIZE):
+        bind.execute(
+            scans.update()
+            .where(scans.c.id > start, scans.c.id <= start + BATCH_SIZE, scans.c.category_scores.isnot(None))
+            .values(**{column: sa.func.coalesce(scans.c.category_scores[key].as_float(), 0.0)
+                       for column, key in CATEGORY_SCORE_COLUMNS.items()})
+        )
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('scan_history')}
+    if 'technical_score' in existing:
+        return
+
+    with op.batch_alter_table('scan_history') as batch_op:
+        for column in CATEGORY_SCORE_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Float(), server_default='0', nullable=False))
+
+    _backfill_scores()
+
+    for column in CATEGORY_SCORE_COLUMNS:
+        op.create_index(f'ix_scan_history_user_{column}', 'scan_history', ['user_id', column, 'id'], unique=False)
+
+
+def downgrade():
+    for column in CATEGORY_SCORE_COLUMNS:
+        op.drop_index(f'ix_scan_history_user_{column}', table_name='scan_history')
+    with op.batch_alter_table('scan_history') as batch_op:
+        for column in CATEGORY_SCORE_COLUMNS:
+            batch_op.drop_column(column)
@@ -0,0 +1,37 @@
+"""Reset keyword fingerprints stored as id-wide bitsets
+
+Revision ID: 0013_fingerprint_sketches
+Revises: 0012_category_score_columns
+Create Date: 2026-10-19 09:00:00.000000
+
+Fingerprints are now a fixed-width sketch followed by the exact keyword ids
+(see services/keyword_fingerprint.py). Bitsets in the old layout are cleared;
+like the fingerprints added by 0003 they are rebuilt from the keyword links
+on the document's next match.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013_fingerprint_sketches'
+down_revision = '0012_category_score_columns'
+branch_labels = None
+depends_on = None
+
+FINGERPRINT_COLUMNS = ('technical_skills_fingerprint', 'soft_skills_fingerprint', 'other_keywords_fingerprint')
+
+
+def _reset_fingerprints():
+    for name in ('resumes', 'job_descriptions'):
+        table = sa.table(name, *[sa.column(column, sa.LargeBinary) for column in FINGERPRINT_COLUMNS])
+        op.get_bind().execute(table.update().values(**{column: None for column in FINGERPRINT_COLUMNS}))
+
+
+def upgrade():
+    _reset_fingerprints()
+
+
+def downgrade():
+    # The old code cannot read the new layout either
+    _reset_fingerprints()
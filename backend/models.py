@@ -5,9 +5,30 @@ from datetime import datetime
 import re
 import os
 import json
+import uuid
+import hashlib
+from collections import Counter
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import deferred, undefer_group, joinedload, validates
+from backend.services import keyword_fingerprint
+from backend.services.compression import CompressedText, CompressedJSON
+from backend.services.fieldsets import Fieldset, Field
 
 db = SQLAlchemy()
 
+# Partial index predicate: only active (not soft-deleted) rows are indexed.
+# Every query on these indexes filters is_active == True, which SQLAlchemy
+# renders as the same literal the planners match against.
+ACTIVE_ROWS = {
+    'sqlite_where': db.text('is_active = 1'),
+    'postgresql_where': db.text('is_active = true')
+}
+
+
+def new_public_id():
+    """Client-visible token for a row whose integer id may not exist yet"""
+    return str(uuid.uuid4())
+
 def get_current_user_id():
     """Helper function to get current user ID as integer from JWT"""
     from flask_jwt_extended import get_jwt_identity
@@ -182,17 +203,44 @@ class User(db.Model):
             'is_admin': self.is_admin(),
             'is_active': self.is_active,
             'is_email_verified': self.is_email_verified,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'resume_count': len(self.resumes),
-            'job_description_count': len(self.job_descriptions)
+            'last_login': self.last_login,
+            'created_at': self.created_at,
+            'resume_count': self.get_stats().resume_count,
+            'job_description_count': self.get_stats().job_description_count
         }
     
+    def get_stats(self):
+        """Rollup counters for this user (see UserStats)"""
+        stats = getattr(self, '_stats', None)
+        if stats is None:
+            stats = self._stats = UserStats.for_user(self.id)
+        return stats
+
+    def claim_free_scan(self):
+        """
+        Take one free scan with a conditional UPDATE, without committing
+
+        The caller commits it in the same transaction as the scan it pays for,
+        so a failed scan never consumes quota and concurrent scans cannot both
+        take the last free scan.
+
+        Returns:
+            bool: False when no free scans are left
+        """
+        result = db.session.execute(
+            db.update(User).where(
+                User.id == self.id, User.free_scans_remaining > 0
+            ).values(
+                free_scans_remaining=User.free_scans_remaining - 1,
+                total_scans_used=User.total_scans_used + 1
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.expire(self, ['free_scans_remaining', 'total_scans_used'])
+        return result.rowcount == 1
+
     def use_free_scan(self):
-        """Use one free scan and update counters"""
-        if self.free_scans_remaining > 0:
-            self.free_scans_remaining -= 1
-            self.total_scans_used += 1
+        """Use one free scan and commit it on its own"""
+        if self.claim_free_scan():
             db.session.commit()
             return True
         return False
@@ -215,6 +263,10 @@ class User(db.Model):
 
 class Resume(db.Model):
     __tablename__ = 'resumes'
+    __table_args__ = (
+        # A user's active resumes, newest first (lists, latest resume, keyset pagination)
+        db.Index('ix_resumes_user_active_created', 'user_id', 'created_at', 'id', **ACTIVE_ROWS),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -225,8 +277,8 @@ class Resume(db.Model):
     file_size = db.Column(db.Integer, nullable=False)
     file_type = db.Column(db.String(10), nullable=False)
     
-    # Parsed content
-    extracted_text = db.Column(db.Text)
+    # Parsed content (stored compressed)
+    extracted_text = db.Column(CompressedText)
     
     # NEW: Keyword analysis (US-05)
     keywords_extracted = db.Column(db.Boolean, default=False)
@@ -234,6 +286,11 @@ class Resume(db.Model):
     soft_skills = db.Column(db.Text)       # JSON string of soft skills
     other_keywords = db.Column(db.Text)    # JSON string of other keywords
     keyword_count = db.Column(db.Integer, default=0)
+
+    # Keyword id sketches per category (see services/keyword_fingerprint.py)
+    technical_skills_fingerprint = db.Column(db.LargeBinary)
+    soft_skills_fingerprint = db.Column(db.LargeBinary)
+    other_keywords_fingerprint = db.Column(db.LargeBinary)
     
     # Metadata
     title = db.Column(db.String(255))
@@ -244,6 +301,13 @@ class Resume(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Scan rollup for the "top performing resume" card (maintained with UserStats)
+    scan_count = db.Column(db.Integer, default=0, nullable=False)
+    scan_score_sum = db.Column(db.Float, default=0.0, nullable=False)
+
+    # Normalized keywords (mirrors the JSON columns above)
+    keyword_links = db.relationship('ResumeKeyword', lazy=True, cascade='all, delete-orphan')
     
     def __init__(self, user_id, original_filename, file_path, file_size, file_type, title=None):
         self.user_id = user_id
@@ -292,6 +356,7 @@ class Resume(db.Model):
         
         self.keyword_count = total_keywords
         self.keywords_extracted = True
+        self.sync_keyword_links()
     
     def get_keywords(self):
         """Get extracted keywords as Python objects"""
@@ -300,27 +365,61 @@ class Resume(db.Model):
             'soft_skills': json.loads(self.soft_skills) if self.soft_skills else [],
             'other_keywords': json.loads(self.other_keywords) if self.other_keywords else []
         }
+
+    def sync_keyword_links(self):
+        """Rebuild the normalized keyword links from the JSON keyword columns"""
+        links = build_keyword_links(self.get_keywords())
+        self.keyword_links = [
+            ResumeKeyword(keyword_id=keyword_id, category=category, weight=weight)
+            for category, keyword_id, weight in links
+        ]
+        set_keyword_fingerprints(self, links)
+
+    def get_keyword_ids(self):
+        """
+        Get interned keyword ids per category without parsing the JSON columns
+
+        Rows extracted before the keyword tables existed are linked on first use
+        (the caller's commit persists them).
+
+        Returns:
+            dict: category -> sorted list of keyword ids
+        """
+        if self.id is not None:
+            ids = ResumeKeyword.ids_for(self.id)
+            if ids or not self.keywords_extracted:
+                return ids
+        self.sync_keyword_links()
+        return keyword_ids_by_category(self.keyword_links)
+
+    def get_fingerprints(self):
+        """Keyword fingerprints per category, built on first use for older rows"""
+        return get_keyword_fingerprints(self)
     
-    def to_dict(self, include_keywords=False):
-        """Convert resume object to dictionary"""
-        data = {
-            'id': self.id,
-            'user_id': self.user_id,
-            'original_filename': self.original_filename,
-            'file_size': self.file_size,
-            'file_size_formatted': self.get_file_size_formatted(),
-            'file_type': self.file_type,
-            'title': self.title,
-            'is_active': self.is_active,
-            'upload_status': self.upload_status,
-            'error_message': self.error_message,
-            'has_extracted_text': bool(self.extracted_text),
-            'text_length': len(self.extracted_text) if self.extracted_text else 0,
-            'keywords_extracted': self.keywords_extracted,
-            'keyword_count': self.keyword_count,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    # API fields of to_dict() and the columns each reads (?fields= whitelist)
+    API_FIELDS = Fieldset({
+        'id': 'id',
+        'user_id': 'user_id',
+        'original_filename': 'original_filename',
+        'file_size': 'file_size',
+        'file_size_formatted': Field('file_size', value=lambda resume: resume.get_file_size_formatted()),
+        'file_type': 'file_type',
+        'title': 'title',
+        'is_active': 'is_active',
+        'upload_status': 'upload_status',
+        'error_message': 'error_message',
+        'has_extracted_text': Field('extracted_text', value=lambda resume: bool(resume.extracted_text)),
+        'text_length': Field('extracted_text',
+                             value=lambda resume: len(resume.extracted_text) if resume.extracted_text else 0),
+        'keywords_extracted': 'keywords_extracted',
+        'keyword_count': 'keyword_count',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at'
+    })
+    
+    def to_dict(self, include_keywords=False, fields=None):
+        """Convert resume object to dictionary (only `fields` of API_FIELDS when given)"""
+        data = self.API_FIELDS.serialize(self, fields)
         
         if include_keywords:
             data['keywords'] = self.get_keywords()
@@ -332,6 +431,10 @@ class Resume(db.Model):
 
 class JobDescription(db.Model):
     __tablename__ = 'job_descriptions'
+    __table_args__ = (
+        # A user's active job descriptions, newest first
+        db.Index('ix_job_descriptions_user_active_created', 'user_id', 'created_at', 'id', **ACTIVE_ROWS),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -339,7 +442,7 @@ class JobDescription(db.Model):
     # Job Description Content
     title = db.Column(db.String(255), nullable=False)
     company_name = db.Column(db.String(255))
-    job_text = db.Column(db.Text, nullable=False)
+    job_text = deferred(db.Column(CompressedText, nullable=False), group='text')  # compressed, loaded on access
 
     # NEW: Keyword analysis (US-05)
     keywords_extracted = db.Column(db.Boolean, default=False)
@@ -348,6 +451,11 @@ class JobDescription(db.Model):
     other_keywords = db.Column(db.Text)    # JSON string of other keywords
     keyword_count = db.Column(db.Integer, default=0)
 
+    # Keyword id sketches per category (see services/keyword_fingerprint.py)
+    technical_skills_fingerprint = db.Column(db.LargeBinary)
+    soft_skills_fingerprint = db.Column(db.LargeBinary)
+    other_keywords_fingerprint = db.Column(db.LargeBinary)
+
     # Metadata
     is_active = db.Column(db.Boolean, default=True)
     word_count = db.Column(db.Integer, default=0)
@@ -357,6 +465,9 @@ class JobDescription(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Normalized keywords (mirrors the JSON columns above)
+    keyword_links = db.relationship('JobDescriptionKeyword', lazy=True, cascade='all, delete-orphan')
+
     def __init__(self, user_id, title, job_text, company_name=None):
         self.user_id = user_id
         self.title = title.strip()
@@ -391,6 +502,7 @@ class JobDescription(db.Model):
 
         self.keyword_count = total_keywords
         self.keywords_extracted = True
+        self.sync_keyword_links()
 
     def get_keywords(self):
         """Get extracted keywords as Python objects"""
@@ -400,6 +512,33 @@ class JobDescription(db.Model):
             'other_keywords': json.loads(self.other_keywords) if self.other_keywords else []
         }
 
+    def sync_keyword_links(self):
+        """Rebuild the normalized keyword links from the JSON keyword columns"""
+        links = build_keyword_links(self.get_keywords())
+        self.keyword_links = [
+            JobDescriptionKeyword(keyword_id=keyword_id, category=category, weight=weight)
+            for category, keyword_id, weight in links
+        ]
+        set_keyword_fingerprints(self, links)
+
+    def get_keyword_ids(self):
+        """
+        Get interned keyword ids per category without parsing the JSON columns
+
+        Returns:
+            dict: category -> sorted list of keyword ids
+        """
+        if self.id is not None:
+            ids = JobDescriptionKeyword.ids_for(self.id)
+            if ids or not self.keywords_extracted:
+                return ids
+        self.sync_keyword_links()
+        return keyword_ids_by_category(self.keyword_links)
+
+    def get_fingerprints(self):
+        """Keyword fingerprints per category, built on first use for older rows"""
+        return get_keyword_fingerprints(self)
+
     @staticmethod
     def validate_job_description(title, job_text, company_name=None):
         """Validate job description data"""
@@ -427,21 +566,24 @@ class JobDescription(db.Model):
 
         return errors
 
-    def to_dict(self, include_text=False, include_keywords=False):
-        """Convert job description object to dictionary"""
-        data = {
-            'id': self.id,
-            'user_id': self.user_id,
-            'title': self.title,
-            'company_name': self.company_name,
-            'is_active': self.is_active,
-            'word_count': self.word_count,
-            'character_count': self.character_count,
-            'keywords_extracted': self.keywords_extracted,
-            'keyword_count': self.keyword_count,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    # API fields of to_dict() and the columns each reads (?fields= whitelist)
+    API_FIELDS = Fieldset({
+        'id': 'id',
+        'user_id': 'user_id',
+        'title': 'title',
+        'company_name': 'company_name',
+        'is_active': 'is_active',
+        'word_count': 'word_count',
+        'character_count': 'character_count',
+        'keywords_extracted': 'keywords_extracted',
+        'keyword_count': 'keyword_count',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at'
+    })
+
+    def to_dict(self, include_text=False, include_keywords=False, fields=None):
+        """Convert job description object to dictionary (only `fields` of API_FIELDS when given)"""
+        data = self.API_FIELDS.serialize(self, fields)
 
         # Include full text only if requested (for detailed view)
         if include_text:
@@ -457,11 +599,246 @@ class JobDescription(db.Model):
         return f'<JobDescription {self.title} by User {self.user_id}>'
 
 
+# Keyword categories stored as small integer codes in the link tables
+KEYWORD_CATEGORIES = ('technical_skills', 'soft_skills', 'other_keywords')
+
+
+class Keyword(db.Model):
+    """
+    Keyword dictionary - every distinct normalized keyword is stored once
+    and referenced by integer id from the resume/job description link tables
+    """
+    __tablename__ = 'keywords'
+
+    MAX_LENGTH = 255
+
+    id = db.Column(db.Integer, primary_key=True)
+    term = db.Column(db.String(MAX_LENGTH), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def normalize(term):
+        """Canonical form used for matching (same rule the matcher always applied)"""
+        return str(term).lower().strip()[:Keyword.MAX_LENGTH]
+
+    @classmethod
+    def intern_many(cls, terms):
+        """
+        Get ids for terms, inserting the ones not seen before
+
+        Concurrent writers interning the same new term are safe: the insert
+        ignores conflicts on the unique term and ids are read back afterwards.
+
+        Args:
+            terms: Iterable of raw keywords
+
+        Returns:
+            dict: normalized term -> keyword id
+        """
+        normalized = {cls.normalize(term) for term in terms if term is not None}
+        normalized.discard('')
+        if not normalized:
+            return {}
+
+        ids = cls._lookup(normalized)
+        missing = normalized - ids.keys()
+        if missing:
+            _insert_ignoring_conflicts(cls, [{'term': term, 'created_at': datetime.utcnow()} for term in sorted(missing)], 'term')
+            ids.update(cls._lookup(missing))
+        return ids
+
+    @classmethod
+    def _lookup(cls, terms):
+        ids = {}
+        terms = list(terms)
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(terms), 500):
+            rows = db.session.query(cls.term, cls.id).filter(cls.term.in_(terms[start:start + 500]))
+            ids.update(rows.all())
+        return ids
+
+    def __repr__(self):
+        return f'<Keyword {self.term}>'
+
+
+class ResumeKeyword(db.Model):
+    """Link between a resume and the keywords extracted from it"""
+    __tablename__ = 'resume_keywords'
+    __table_args__ = (
+        db.Index('ix_resume_keywords_keyword_resume', 'keyword_id', 'resume_id'),
+    )
+
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True)
+    category = db.Column(db.SmallInteger, primary_key=True)  # index into KEYWORD_CATEGORIES
+    keyword_id = db.Column(db.Integer, db.ForeignKey('keywords.id'), primary_key=True)
+    weight = db.Column(db.Float, default=1.0, nullable=False)
+
+    keyword = db.relationship('Keyword')
+
+    @classmethod
+    def ids_for(cls, resume_id):
+        rows = db.session.query(cls.category, cls.keyword_id).filter(cls.resume_id == resume_id)
+        return keyword_ids_by_category(rows.all())
+
+
+class JobDescriptionKeyword(db.Model):
+    """Link between a job description and the keywords extracted from it"""
+    __tablename__ = 'job_description_keywords'
+    __table_args__ = (
+        db.Index('ix_job_description_keywords_keyword_jd', 'keyword_id', 'job_description_id'),
+    )
+
+    job_description_id = db.Column(db.Integer, db.ForeignKey('job_descriptions.id', ondelete='CASCADE'), primary_key=True)
+    category = db.Column(db.SmallInteger, primary_key=True)  # index into KEYWORD_CATEGORIES
+    keyword_id = db.Column(db.Integer, db.ForeignKey('keywords.id'), primary_key=True)
+    weight = db.Column(db.Float, default=1.0, nullable=False)
+
+    keyword = db.relationship('Keyword')
+
+    @classmethod
+    def ids_for(cls, job_description_id):
+        rows = db.session.query(cls.category, cls.keyword_id).filter(cls.job_description_id == job_description_id)
+        return keyword_ids_by_category(rows.all())
+
+
+def build_keyword_links(keywords):
+    """
+    Intern a get_keywords() dict into link rows
+
+    Keywords that normalize to the same term within a category are folded into
+    one link whose weight counts the occurrences.
+
+    Returns:
+        list: (category code, keyword id, weight) tuples
+    """
+    ids = Keyword.intern_many(term for category in KEYWORD_CATEGORIES for term in keywords.get(category) or [])
+    links = []
+    for code, category in enumerate(KEYWORD_CATEGORIES):
+        weights = {}
+        for term in keywords.get(category) or []:
+            keyword_id = ids.get(Keyword.normalize(term))
+            if keyword_id is not None:
+                weights[keyword_id] = weights.get(keyword_id, 0) + 1
+        links.extend((code, keyword_id, float(weight)) for keyword_id, weight in weights.items())
+    return links
+
+
+def set_keyword_fingerprints(document, links):
+    """Store per-category keyword fingerprints for link rows from build_keyword_links"""
+    for code, category in enumerate(KEYWORD_CATEGORIES):
+        ids = [keyword_id for link_code, keyword_id, _ in links if link_code == code]
+        setattr(document, f'{category}_fingerprint', keyword_fingerprint.encode(ids))
+
+
+def get_keyword_fingerprints(document):
+    """
+    Decoded keyword fingerprints of a resume or job description
+
+    Returns:
+        dict: category -> keyword_fingerprint.Fingerprint
+    """
+    blobs = [getattr(document, f'{category}_fingerprint') for category in KEYWORD_CATEGORIES]
+    if any(blob is None for blob in blobs):
+        # Not computed yet (extracted before fingerprints existed)
+        document.sync_keyword_links()
+        blobs = [getattr(document, f'{category}_fingerprint') for category in KEYWORD_CATEGORIES]
+    return {category: keyword_fingerprint.decode(blob) for category, blob in zip(KEYWORD_CATEGORIES, blobs)}
+
+
+def keyword_ids_by_category(links):
+    """Group (category, keyword_id) rows or link objects into sorted id lists per category"""
+    grouped = {category: [] for category in KEYWORD_CATEGORIES}
+    found = False
+    for link in links:
+        category, keyword_id = (link.category, link.keyword_id) if hasattr(link, 'keyword_id') else link
+        grouped[KEYWORD_CATEGORIES[category]].append(keyword_id)
+        found = True
+    if not found:
+        return {}
+    return {category: sorted(ids) for category, ids in grouped.items()}
+
+
+def _dialect_insert(connection=None):
+    """INSERT construct supporting ON CONFLICT for the bound database, if any"""
+    dialect = (connection if connection is not None else db.session.get_bind()).dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def _insert_ignoring_conflicts(model, rows, conflict_column):
+    """Bulk insert rows, skipping those that collide on a unique column"""
+    insert = _dialect_insert()
+    if insert is not None:
+        db.session.execute(insert(model).values(rows).on_conflict_do_nothing(index_elements=[conflict_column]))
+        return
+
+    from sqlalchemy.exc import IntegrityError
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(db.insert(model).values(**row))
+        except IntegrityError:
+            pass
+
+
+def upsert_rows(model, rows, conflict_columns, batch_size=500):
+    """
+    Insert rows or update the existing ones matching conflict_columns
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE per batch where the database
+    supports it. Columns missing from a row keep their current value on update.
+
+    Args:
+        model: Mapped class with a unique constraint over conflict_columns
+        rows: List of column -> value dicts (all with the same keys)
+        conflict_columns: Column names of the unique constraint
+        batch_size: Rows per statement (keeps SQLite under its parameter limit)
+    """
+    if not rows:
+        return
+
+    insert = _dialect_insert()
+    update_columns = [key for key in rows[0] if key not in conflict_columns and key != 'created_at']
+
+    if insert is None:
+        for row in rows:
+            existing = model.query.filter_by(**{key: row[key] for key in conflict_columns}).first()
+            if existing:
+                for key in update_columns:
+                    setattr(existing, key, row[key])
+            else:
+                db.session.add(model(**row))
+        db.session.flush()
+        return
+
+    for start in range(0, len(rows), batch_size):
+        statement = insert(model).values(rows[start:start + batch_size])
+        statement = statement.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={key: statement.excluded[key] for key in update_columns}
+        )
+        db.session.execute(statement)
+
+
 class MatchScore(db.Model):
     """
     US-06: Model for storing resume-job description matching scores
     """
     __tablename__ = 'match_scores'
+    __table_args__ = (
+        # One score per pair; recalculations upsert into it
+        db.UniqueConstraint('user_id', 'resume_id', 'job_description_id', name='uq_match_scores_user_resume_jd'),
+        # Recent match history (active scores only)
+        db.Index('ix_match_scores_user_active_created', 'user_id', 'created_at', 'id', **ACTIVE_ROWS),
+        # Backref loads when a resume / job description is deleted
+        db.Index('ix_match_scores_resume', 'resume_id'),
+        db.Index('ix_match_scores_job_description', 'job_description_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -505,8 +882,8 @@ class MatchScore(db.Model):
             'other_keywords_score': round(self.other_keywords_score, 2),
             'matched_keywords': self.matched_keywords,
             'algorithm_used': self.algorithm_used,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
         if include_details:
@@ -535,32 +912,236 @@ class MatchScore(db.Model):
         return f'<MatchScore {self.overall_score}% for Resume {self.resume_id} vs JD {self.job_description_id}>'
 
 
+def text_hash(text):
+    """Content address of a text: sha256 hex digest of its UTF-8 bytes"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TextBlob(db.Model):
+    """
+    Content-addressed text shared by the scans that snapshot it
+
+    A user scans the same resume many times; each scan references one row
+    here instead of embedding its own copy. ref_count is the number of
+    scan_history columns pointing at the row and is kept in the same
+    transaction as the scans (intern_text_blobs / release_text_blobs).
+    Rows left without references are deleted later by the sweeper in
+    backend/services/text_blobs.py, so rescanning a text soon after finds it.
+    """
+    __tablename__ = 'text_blobs'
+    __table_args__ = (
+        # Sweeper candidates: only unreferenced rows are indexed
+        db.Index('ix_text_blobs_released', 'released_at',
+                 sqlite_where=db.text('ref_count <= 0'), postgresql_where=db.text('ref_count <= 0')),
+    )
+
+    hash = db.Column(db.String(64), primary_key=True)  # text_hash(content)
+    content = db.Column(CompressedText, nullable=False)
+    size = db.Column(db.Integer, nullable=False)  # characters
+    ref_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    released_at = db.Column(db.DateTime)  # when ref_count last dropped to 0
+
+    def __repr__(self):
+        return f'<TextBlob {self.hash[:12]} refs={self.ref_count}>'
+
+
+def _add_blob_references(connection, references, contents):
+    """Increment ref_count per hash, inserting the rows that do not exist yet"""
+    table = TextBlob.__table__
+    hashes = list(references)
+    existing = set()
+    for start in range(0, len(hashes), 500):
+        existing.update(connection.execute(
+            db.select(table.c.hash).where(table.c.hash.in_(hashes[start:start + 500]))).scalars())
+
+    if existing:
+        connection.execute(
+            table.update().where(table.c.hash == db.bindparam('b_hash')).values(
+                ref_count=table.c.ref_count + db.bindparam('b_refs'), released_at=None),
+            [{'b_hash': blob_hash, 'b_refs': references[blob_hash]} for blob_hash in existing]
+        )
+
+    # Only texts not stored yet are compressed and sent
+    now = datetime.utcnow()
+    rows = [{'hash': blob_hash, 'content': contents[blob_hash], 'size': len(contents[blob_hash]),
+             'ref_count': references[blob_hash], 'created_at': now}
+            for blob_hash in hashes if blob_hash not in existing and blob_hash in contents]
+    insert = _dialect_insert(connection)
+    for start in range(0, len(rows), 500):
+        batch = rows[start:start + 500]
+        if insert is None:
+            connection.execute(table.insert(), batch)
+            continue
+        # Another transaction may have inserted the same text meanwhile
+        statement = insert(table).values(batch)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['hash'],
+            set_={'ref_count': table.c.ref_count + statement.excluded.ref_count, 'released_at': None}
+        ))
+
+
+def intern_text_blobs(connection, texts):
+    """
+    Store texts in text_blobs if absent and take one reference per occurrence
+
+    Args:
+        connection: Connection inside the transaction that stores the referencing rows
+        texts: Iterable of str or None
+
+    Returns:
+        list: Hash of each text (None for None), in order
+    """
+    texts = list(texts)
+    hashes = [text_hash(text) if text is not None else None for text in texts]
+    references = Counter(blob_hash for blob_hash in hashes if blob_hash is not None)
+    if references:
+        contents = {blob_hash: text for blob_hash, text in zip(hashes, texts) if blob_hash is not None}
+        _add_blob_references(connection, references, contents)
+    return hashes
+
+
+def release_text_blobs(connection, hashes):
+    """
+    Drop one reference per hash; rows reaching zero are left for the sweeper
+
+    Args:
+        connection: Connection inside the transaction that removes the referencing rows
+        hashes: Iterable of hashes (None entries are skipped)
+    """
+    references = Counter(blob_hash for blob_hash in hashes if blob_hash is not None)
+    by_count = {}
+    for blob_hash, count in references.items():
+        by_count.setdefault(count, []).append(blob_hash)
+
+    table = TextBlob.__table__
+    now = datetime.utcnow()
+    for count, group in by_count.items():
+        for start in range(0, len(group), 500):
+            connection.execute(table.update().where(table.c.hash.in_(group[start:start + 500])).values(
+                ref_count=table.c.ref_count - count,
+                released_at=db.case((table.c.ref_count - count <= 0, now), else_=table.c.released_at)
+            ))
+
+
+# ScanHistory text snapshot attribute -> (hash column, blob relationship)
+SCAN_TEXT_COLUMNS = {
+    'resume_text': ('resume_text_hash', 'resume_blob'),
+    'job_description_text': ('job_description_text_hash', 'job_description_blob'),
+}
+
+
+def store_scan_texts(connection, rows):
+    """
+    Replace the text snapshots in ScanHistory insert values with blob hashes
+
+    For Core inserts (write-behind, bulk loads); ORM inserts are handled by
+    the before_flush hook.
+
+    Args:
+        connection: Connection inside the transaction that inserts the rows
+        rows: List of column -> value dicts, changed in place
+    """
+    for attribute, (column, _) in SCAN_TEXT_COLUMNS.items():
+        hashes = intern_text_blobs(connection, [row.pop(attribute, None) for row in rows])
+        for row, blob_hash in zip(rows, hashes):
+            if blob_hash is not None or column not in row:
+                row[column] = blob_hash
+
+
+def _recommendations_count(context):
+    # Column default: works for ORM flushes and Core (write-behind) inserts alike
+    recommendations = context.get_current_parameters().get('recommendations')
+    return len(recommendations) if isinstance(recommendations, list) else 0
+
+
+# ScanHistory score column -> its key in the category_scores document
+CATEGORY_SCORE_COLUMNS = {
+    'technical_score': 'technical_skills',
+    'soft_skills_score': 'soft_skills',
+    'experience_score': 'experience_match',
+    'education_score': 'education_match',
+}
+
+
+def category_score(category_scores, key):
+    """One category's score from a category_scores document (0.0 when missing)"""
+    value = (category_scores or {}).get(key) if isinstance(category_scores, dict) else None
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _category_score_default(key):
+    # Column default for Core inserts; ORM writes go through ScanHistory._set_category_scores
+    return lambda context: category_score(context.get_current_parameters().get('category_scores'), key)
+
+
 class ScanHistory(db.Model):
     """
     Scan History Model - Stores detailed scan results and analysis
     This replaces the need to use MatchScore for history tracking
     """
     __tablename__ = 'scan_history'
+    __table_args__ = (
+        # Keyset pagination of history by date or by score
+        db.Index('ix_scan_history_user_created', 'user_id', 'created_at', 'id'),
+        db.Index('ix_scan_history_user_score', 'user_id', 'overall_match_score', 'id'),
+        # Backref loads when a resume / job description is deleted
+        db.Index('ix_scan_history_resume', 'resume_id'),
+        db.Index('ix_scan_history_job_description', 'job_description_id'),
+        # Lookups by token and idempotent replay of write-behind rows
+        db.Index('ix_scan_history_public_id', 'public_id', unique=True),
+        # Reference checks of the text blob sweeper
+        db.Index('ix_scan_history_resume_text_hash', 'resume_text_hash'),
+        db.Index('ix_scan_history_job_description_text_hash', 'job_description_text_hash'),
+        # Keyset pagination, range filters and averages per category score
+        *[db.Index(f'ix_scan_history_user_{column}', 'user_id', column, 'id') for column in CATEGORY_SCORE_COLUMNS],
+        # Retention compactor candidates: only rows not archived yet are indexed
+        db.Index('ix_scan_history_unarchived_created', 'created_at', 'id',
+                 sqlite_where=db.text('archived_at IS NULL'), postgresql_where=db.text('archived_at IS NULL')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(36), default=new_public_id)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
     # Resume and Job Description info (can be null for real-time scans)
     resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=True)
     job_description_id = db.Column(db.Integer, db.ForeignKey('job_descriptions.id'), nullable=True)
 
-    # Raw text content (for real-time scans)
-    resume_text = db.Column(db.Text, nullable=True)
-    job_description_text = db.Column(db.Text, nullable=True)
+    # Raw text content (for real-time scans) - stored once per distinct text in
+    # text_blobs and exposed as the resume_text / job_description_text properties
+    resume_text_hash = db.Column(db.String(64), db.ForeignKey('text_blobs.hash'), nullable=True)
+    job_description_text_hash = db.Column(db.String(64), db.ForeignKey('text_blobs.hash'), nullable=True)
 
-    # Scan results - stored as JSON
+    # Scan results - JSON, deferred until a detail view asks for them. The
+    # documents are stored compressed; category_scores stays plain JSON because
+    # the history list reads it with JSON functions in SQL.
     overall_match_score = db.Column(db.Float, nullable=False)
-    category_scores = db.Column(db.JSON, nullable=True)  # technical, soft_skills, experience, etc.
-    detailed_analysis = db.Column(db.JSON, nullable=True)  # matched_skills, missing_skills, etc.
-    recommendations = db.Column(db.JSON, nullable=True)  # AI recommendations
-    keyword_analysis = db.Column(db.JSON, nullable=True)  # keyword density, etc.
+    category_scores = deferred(db.Column(db.JSON, nullable=True), group='analysis')  # technical, soft_skills, experience, etc.
+    detailed_analysis = deferred(db.Column(CompressedJSON, nullable=True), group='analysis')  # matched_skills, missing_skills, etc.
+    recommendations = deferred(db.Column(CompressedJSON, nullable=True), group='analysis')  # AI recommendations
+    keyword_analysis = deferred(db.Column(CompressedJSON, nullable=True), group='analysis')  # keyword density, etc.
+    recommendations_count = db.Column(db.Integer, default=_recommendations_count, nullable=False, server_default='0')
     ats_compatibility = db.Column(db.Float, default=0.0)
 
+    # Copies of the category_scores entries (CATEGORY_SCORE_COLUMNS), kept in
+    # sync on write so lists can sort, filter and average on them in SQL
+    technical_score = db.Column(db.Float, default=_category_score_default('technical_skills'),
+                                nullable=False, server_default='0')
+    soft_skills_score = db.Column(db.Float, default=_category_score_default('soft_skills'),
+                                  nullable=False, server_default='0')
+    experience_score = db.Column(db.Float, default=_category_score_default('experience_match'),
+                                 nullable=False, server_default='0')
+    education_score = db.Column(db.Float, default=_category_score_default('education_match'),
+                                nullable=False, server_default='0')
+
+    # Set when the retention compactor moved the documents and text snapshots
+    # to scan_history_archive; the summary columns above stay
+    archived_at = db.Column(db.DateTime, nullable=True)
+
     # Metadata
     scan_type = db.Column(db.String(20), default='realtime')  # 'realtime' or 'stored'
     algorithm_used = db.Column(db.String(50), default='llm_enhanced')
@@ -574,14 +1155,103 @@ class ScanHistory(db.Model):
     user = db.relationship('User', backref=db.backref('scan_history', lazy=True))
     resume = db.relationship('Resume', backref=db.backref('scan_history', lazy=True))
     job_description = db.relationship('JobDescription', backref=db.backref('scan_history', lazy=True))
+    resume_blob = db.relationship('TextBlob', foreign_keys=[resume_text_hash])
+    job_description_blob = db.relationship('TextBlob', foreign_keys=[job_description_text_hash])
+    archive = db.relationship('ScanArchive', uselist=False, cascade='all, delete-orphan')
+
+    # Moved to the archive by the retention compactor
+    ANALYSIS_FIELDS = ('detailed_analysis', 'recommendations', 'keyword_analysis')
+    ARCHIVED_FIELDS = ANALYSIS_FIELDS + ('resume_text', 'job_description_text')
+
+    def _get_text(self, attribute):
+        column, relationship = SCAN_TEXT_COLUMNS[attribute]
+        # Text assigned on this object (possibly not flushed yet)
+        cached = self.__dict__.get('_texts', {}).get(attribute)
+        if cached is not None and cached[0] == getattr(self, column):
+            return cached[1]
+        blob = getattr(self, relationship)
+        if blob is not None:
+            return blob.content
+        return self.archived_details().get(attribute) if self.archived_at is not None else None
+
+    def _set_text(self, attribute, text):
+        column, _ = SCAN_TEXT_COLUMNS[attribute]
+        blob_hash = text_hash(text) if text is not None else None
+        self.__dict__.setdefault('_texts', {})[attribute] = (blob_hash, text)
+        setattr(self, column, blob_hash)  # the blob row is stored by the before_flush hook
+
+    @property
+    def resume_text(self):
+        return self._get_text('resume_text')
+
+    @resume_text.setter
+    def resume_text(self, text):
+        self._set_text('resume_text', text)
+
+    @property
+    def job_description_text(self):
+        return self._get_text('job_description_text')
+
+    @job_description_text.setter
+    def job_description_text(self, text):
+        self._set_text('job_description_text', text)
+
+    # Deferred columns load on first access, one SELECT per group. Detail
+    # endpoints load them up front with query.options(*ScanHistory.with_details())
+    @classmethod
+    def with_details(cls, *groups):
+        """
+        Loader options for the given groups (default: analysis)
+
+        'analysis' undefers the analysis JSON columns and joins the archive
+        row of archived scans; 'text' joins the text snapshots' blobs.
+        """
+        options = []
+        for group in groups or ('analysis',):
+            if group == 'text':
+                options += [joinedload(cls.resume_blob), joinedload(cls.job_description_blob)]
+            elif group == 'analysis':
+                options += [undefer_group(group), joinedload(cls.archive)]
+            else:
+                options.append(undefer_group(group))
+        return options
+
+    @validates('category_scores')
+    def _set_category_scores(self, key, category_scores):
+        for column, score_key in CATEGORY_SCORE_COLUMNS.items():
+            setattr(self, column, category_score(category_scores, score_key))
+        return category_scores
+
+    def archived_details(self):
+        """ARCHIVED_FIELDS of an archived scan, read back from its archive row"""
+        document = self.archive.document if self.archive is not None else None
+        return {field: (document or {}).get(field) for field in self.ARCHIVED_FIELDS}
+
+    def analysis_details(self):
+        """
+        The scan's analysis documents, wherever they are stored
+
+        Returns:
+            dict: detailed_analysis, recommendations and keyword_analysis
+                  (None when missing)
+        """
+        if self.archived_at is not None:
+            archived = self.archived_details()
+            return {field: archived[field] for field in self.ANALYSIS_FIELDS}
+        return {field: getattr(self, field) for field in self.ANALYSIS_FIELDS}
 
     def get_score_category(self):
         """Get score category for color coding"""
-        if self.overall_match_score >= 80:
+        return ScanHistory.score_category_for(self.overall_match_score)
+
+    @staticmethod
+    def score_category_for(score):
+        """Score category for a raw overall score (for projected query rows)"""
+        if score >= 80:
             return 'excellent'
-        elif self.overall_match_score >= 60:
+        elif score >= 60:
             return 'good'
-        elif self.overall_match_score >= 40:
+        elif score >= 40:
             return 'fair'
         else:
             return 'poor'
@@ -590,6 +1260,7 @@ class ScanHistory(db.Model):
         """Convert scan history object to dictionary"""
         data = {
             'id': self.id,
+            'public_id': self.public_id,
             'user_id': self.user_id,
             'resume_id': self.resume_id,
             'job_description_id': self.job_description_id,
@@ -599,16 +1270,18 @@ class ScanHistory(db.Model):
             'scan_type': self.scan_type,
             'algorithm_used': self.algorithm_used,
             'scan_duration': self.scan_duration,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
         if include_details:
+            details = self.analysis_details()
             data.update({
                 'category_scores': self.category_scores or {},
-                'detailed_analysis': self.detailed_analysis or {},
-                'recommendations': self.recommendations or [],
-                'keyword_analysis': self.keyword_analysis or {},
+                'detailed_analysis': details['detailed_analysis'] or {},
+                'recommendations': details['recommendations'] or [],
+                'keyword_analysis': details['keyword_analysis'] or {},
+                'archived': self.archived_at is not None,
                 'resume_title': self.resume.title if self.resume else 'Real-time Scan',
                 'job_title': self.job_description.title if self.job_description else 'Real-time Scan',
                 'company_name': self.job_description.company_name if self.job_description else None
@@ -620,14 +1293,44 @@ class ScanHistory(db.Model):
         return f'<ScanHistory {self.overall_match_score}% for User {self.user_id}>'
 
 
+class ScanArchive(db.Model):
+    """
+    Documents of a scan past the retention period
+
+    The retention compactor (backend/services/retention.py) moves a scan's
+    analysis documents and text snapshots here as one compressed document
+    and clears them from scan_history, which keeps only summary columns.
+    Detail endpoints read them back from here.
+    """
+    __tablename__ = 'scan_history_archive'
+
+    scan_id = db.Column(db.Integer, db.ForeignKey('scan_history.id', ondelete='CASCADE'), primary_key=True)
+    document = db.Column(CompressedJSON, nullable=True)  # ScanHistory.ARCHIVED_FIELDS
+    has_detailed_analysis = db.Column(db.Boolean, default=False, nullable=False)  # for the history list
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ScanArchive scan={self.scan_id}>'
+
+
 class Suggestion(db.Model):
     """
     Resume Suggestions Model - Stores individual suggestion recommendations
     Schema matches your exact specification
     """
     __tablename__ = 'resume_suggestions'
+    __table_args__ = (
+        # Suggestion history, newest first
+        db.Index('ix_resume_suggestions_user_created', 'user_id', 'created_at'),
+        # Backref loads when a resume / job description is deleted
+        db.Index('ix_resume_suggestions_resume', 'resume_id'),
+        db.Index('ix_resume_suggestions_jd', 'jd_id'),
+        # Idempotent replay of write-behind rows
+        db.Index('ix_resume_suggestions_public_id', 'public_id', unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(36), default=new_public_id)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
     jd_id = db.Column(db.Integer, db.ForeignKey('job_descriptions.id'), nullable=False)
@@ -670,10 +1373,316 @@ class Suggestion(db.Model):
             'action': self.action,
             'examples': self.examples or [],
             'tier': self.tier,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
         return f'<Suggestion {self.suggestion_type} ({self.priority}) for Resume {self.resume_id}>'
 
 
+class UserStats(db.Model):
+    """
+    Per-user dashboard rollup
+
+    Maintained in the same transaction as the rows it summarizes by the
+    after_flush hook below, so dashboards read one row instead of
+    aggregating the user's whole history. Users without a row (created
+    before the table existed) are backfilled on first read or write.
+    """
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+
+    resume_count = db.Column(db.Integer, default=0, nullable=False)
+    job_description_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Scans
+    scan_count = db.Column(db.Integer, default=0, nullable=False)
+    score_sum = db.Column(db.Float, default=0.0, nullable=False)
+    score_max = db.Column(db.Float)
+    score_min = db.Column(db.Float)
+    excellent_count = db.Column(db.Integer, default=0, nullable=False)  # 80-100%
+    good_count = db.Column(db.Integer, default=0, nullable=False)       # 60-79%
+    fair_count = db.Column(db.Integer, default=0, nullable=False)       # 40-59%
+    poor_count = db.Column(db.Integer, default=0, nullable=False)       # 0-39%
+    last_scan_at = db.Column(db.DateTime)
+    last_scan_score = db.Column(db.Float)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    BUCKET_COLUMNS = {'excellent': 'excellent_count', 'good': 'good_count', 'fair': 'fair_count', 'poor': 'poor_count'}
+
+    @property
+    def average_score(self):
+        return self.score_sum / self.scan_count if self.scan_count else 0
+
+    @classmethod
+    def for_user(cls, user_id, persist=False):
+        """
+        Get the rollup row, backfilling it from the source tables if missing
+
+        Args:
+            user_id: User to summarize
+            persist: Commit a backfilled row (for read-only requests)
+        """
+        stats = db.session.get(cls, user_id)
+        if stats is None:
+            backfill_user_stats(db.session.connection(), user_id)
+            stats = db.session.get(cls, user_id)
+            if persist:
+                db.session.commit()
+        return stats
+
+    @classmethod
+    def dashboard_row(cls, user_id, since, *extra_columns):
+        """
+        Stats, top performing resume and scans since a date in one statement
+
+        Args:
+            user_id: Owner of the stats
+            since (datetime): Start of the recent scans window
+            *extra_columns: Additional scalar subqueries to select
+
+        Returns:
+            Row: (UserStats, top_resume_id, top_resume_title, top_resume_filename,
+                  top_resume_scan_count, top_resume_score_sum, recent_scans,
+                  *extra_columns)
+        """
+        top = db.session.query(Resume.id).filter(
+            Resume.user_id == user_id, Resume.is_active == True, Resume.scan_count > 0
+        ).order_by((Resume.scan_score_sum / Resume.scan_count).desc(), Resume.id).limit(1).scalar_subquery()
+        recent = db.session.query(db.func.count(ScanHistory.id)).filter(
+            ScanHistory.user_id == user_id, ScanHistory.created_at >= since
+        ).scalar_subquery()
+
+        return db.session.query(
+            cls, Resume.id, Resume.title, Resume.original_filename,
+            Resume.scan_count, Resume.scan_score_sum, recent, *extra_columns
+        ).outerjoin(Resume, Resume.id == top).filter(cls.user_id == user_id).first()
+
+    def __repr__(self):
+        return f'<UserStats user={self.user_id} scans={self.scan_count}>'
+
+
+# ---------------- ROLLUP MAINTENANCE ----------------
+
+def backfill_user_stats(connection, user_id):
+    """Recompute a user's rollup (and per-resume scan sums) from the source tables"""
+    scans = ScanHistory.__table__
+    resumes = Resume.__table__
+    score = scans.c.overall_match_score
+
+    def bucket_count(condition):
+        return db.func.coalesce(db.func.sum(db.case((condition, 1), else_=0)), 0)
+
+    aggregate = connection.execute(db.select(
+        db.func.count(scans.c.id),
+        db.func.coalesce(db.func.sum(score), 0.0),
+        db.func.max(score),
+        db.func.min(score),
+        bucket_count(score >= 80),
+        bucket_count(db.and_(score >= 60, score < 80)),
+        bucket_count(db.and_(score >= 40, score < 60)),
+        bucket_count(score < 40)
+    ).where(scans.c.user_id == user_id)).one()
+    last = connection.execute(
+        db.select(scans.c.created_at, score).where(scans.c.user_id == user_id)
+        .order_by(scans.c.created_at.desc(), scans.c.id.desc()).limit(1)
+    ).first()
+    resume_count = connection.execute(db.select(db.func.count()).select_from(resumes).where(
+        resumes.c.user_id == user_id, resumes.c.is_active == True)).scalar()
+    jd_count = connection.execute(db.select(db.func.count()).select_from(JobDescription.__table__).where(
+        JobDescription.user_id == user_id, JobDescription.is_active == True)).scalar()
+
+    resume_scans = db.select(db.func.count(scans.c.id)).where(scans.c.resume_id == resumes.c.id).scalar_subquery()
+    resume_sum = db.select(db.func.coalesce(db.func.sum(score), 0.0)).where(scans.c.resume_id == resumes.c.id).scalar_subquery()
+    connection.execute(resumes.update().where(resumes.c.user_id == user_id).values(
+        scan_count=resume_scans, scan_score_sum=resume_sum))
+
+    values = {
+        'resume_count': resume_count,
+        'job_description_count': jd_count,
+        'scan_count': aggregate[0],
+        'score_sum': float(aggregate[1]),
+        'score_max': aggregate[2],
+        'score_min': aggregate[3],
+        'excellent_count': aggregate[4],
+        'good_count': aggregate[5],
+        'fair_count': aggregate[6],
+        'poor_count': aggregate[7],
+        'last_scan_at': last[0] if last else None,
+        'last_scan_score': last[1] if last else None,
+        'updated_at': datetime.utcnow()
+    }
+    table = UserStats.__table__
+    insert = _dialect_insert(connection)
+    if insert is not None:
+        # A scan committed meanwhile may have created the row already
+        connection.execute(insert(table).values(user_id=user_id, **values).on_conflict_do_update(
+            index_elements=['user_id'], set_=values))
+    elif connection.execute(table.update().where(table.c.user_id == user_id).values(**values)).rowcount == 0:
+        connection.execute(table.insert().values(user_id=user_id, **values))
+
+
+def apply_scan_rows(connection, user_id, scans):
+    """
+    Add new scans to a user's rollup with atomic increments
+
+    Args:
+        connection: Connection inside the transaction that inserted the scans
+        user_id: Owner of the scans
+        scans: Iterable of (overall_match_score, created_at, resume_id)
+
+    Returns:
+        bool: False when the user has no rollup row yet (caller backfills)
+    """
+    scans = list(scans)
+    if not scans:
+        return True
+
+    table = UserStats.__table__
+    scores = [score for score, _, _ in scans]
+    last_score, last_at, _ = max(scans, key=lambda scan: scan[1])
+    buckets = {column: 0 for column in UserStats.BUCKET_COLUMNS.values()}
+    for score in scores:
+        buckets[UserStats.BUCKET_COLUMNS[ScanHistory.score_category_for(score)]] += 1
+
+    is_latest = db.or_(table.c.last_scan_at.is_(None), table.c.last_scan_at <= last_at)
+    values = {
+        'scan_count': table.c.scan_count + len(scores),
+        'score_sum': table.c.score_sum + sum(scores),
+        'score_max': db.case((db.or_(table.c.score_max.is_(None), table.c.score_max < max(scores)),
+                              db.literal(max(scores), db.Float)), else_=table.c.score_max),
+        'score_min': db.case((db.or_(table.c.score_min.is_(None), table.c.score_min > min(scores)),
+                              db.literal(min(scores), db.Float)), else_=table.c.score_min),
+        'last_scan_score': db.case((is_latest, db.literal(last_score, db.Float)), else_=table.c.last_scan_score),
+        'last_scan_at': db.case((is_latest, db.literal(last_at, db.DateTime)), else_=table.c.last_scan_at),
+        'updated_at': datetime.utcnow()
+    }
+    values.update({column: getattr(table.c, column) + count for column, count in buckets.items() if count})
+    if connection.execute(table.update().where(table.c.user_id == user_id).values(**values)).rowcount == 0:
+        return False
+
+    per_resume = {}
+    for score, _, resume_id in scans:
+        if resume_id is not None:
+            count, total = per_resume.get(resume_id, (0, 0.0))
+            per_resume[resume_id] = (count + 1, total + score)
+    resumes = Resume.__table__
+    for resume_id, (count, total) in per_resume.items():
+        connection.execute(resumes.update().where(resumes.c.id == resume_id).values(
+            scan_count=resumes.c.scan_count + count, scan_score_sum=resumes.c.scan_score_sum + total))
+    return True
+
+
+def _user_stats_after_flush(session, flush_context):
+    """Fold the rows written by this flush into the affected users' rollups"""
+    count_deltas = {}   # user_id -> {'resume_count': n, 'job_description_count': n}
+    new_scans = {}      # user_id -> [(score, created_at, resume_id)]
+    recompute = set()   # users whose rollup cannot be updated incrementally
+
+    def bump(user_id, column, delta):
+        counts = count_deltas.setdefault(int(user_id), {})
+        counts[column] = counts.get(column, 0) + delta
+
+    for obj in session.new:
+        if isinstance(obj, ScanHistory):
+            new_scans.setdefault(int(obj.user_id), []).append(
+                (obj.overall_match_score, obj.created_at, obj.resume_id))
+        elif isinstance(obj, Resume) and obj.is_active is not False:
+            bump(obj.user_id, 'resume_count', 1)
+        elif isinstance(obj, JobDescription) and obj.is_active is not False:
+            bump(obj.user_id, 'job_description_count', 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, (ScanHistory, Resume)):
+            recompute.add(int(obj.user_id))
+        elif isinstance(obj, JobDescription) and obj.is_active is not False:
+            bump(obj.user_id, 'job_description_count', -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, (ScanHistory, Resume, JobDescription)) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        watched = ('overall_match_score', 'resume_id', 'user_id', 'created_at') if isinstance(obj, ScanHistory) \
+            else ('is_active', 'user_id')
+        if any(state.attrs[name].history.has_changes() for name in watched):
+            recompute.add(int(obj.user_id))
+            for old_user in state.attrs.user_id.history.deleted:
+                if old_user is not None:
+                    recompute.add(int(old_user))
+
+    users = set(count_deltas) | set(new_scans) | recompute
+    if not users:
+        return
+
+    connection = session.connection()
+    table = UserStats.__table__
+    for user_id in users:
+        if user_id in recompute:
+            backfill_user_stats(connection, user_id)
+            continue
+
+        counts = count_deltas.get(user_id, {})
+        applied = apply_scan_rows(connection, user_id, new_scans.get(user_id, []))
+        if applied and counts:
+            applied = connection.execute(table.update().where(table.c.user_id == user_id).values(
+                updated_at=datetime.utcnow(),
+                **{column: getattr(table.c, column) + delta for column, delta in counts.items()}
+            )).rowcount > 0
+        if not applied:
+            # No rollup yet: build it from the tables, which include this flush
+            backfill_user_stats(connection, user_id)
+
+    # Loaded UserStats objects are now stale
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, UserStats) and obj.user_id in users:
+            session.expire(obj)
+
+
+event.listen(db.session, 'after_flush', _user_stats_after_flush)
+
+
+def _text_blobs_before_flush(session, flush_context, instances):
+    """Store and reference-count the text blobs of the scans in this flush"""
+    added, contents, released = Counter(), {}, []
+
+    def track(obj, column, attribute):
+        history = inspect(obj).attrs[column].history
+        released.extend(blob_hash for blob_hash in history.deleted if blob_hash is not None)
+        for blob_hash in history.added:
+            if blob_hash is None:
+                continue
+            added[blob_hash] += 1
+            cached = obj.__dict__.get('_texts', {}).get(attribute)
+            if cached is not None and cached[0] == blob_hash:
+                contents[blob_hash] = cached[1]
+
+    for obj in session.new:
+        if isinstance(obj, ScanHistory):
+            for attribute, (column, _) in SCAN_TEXT_COLUMNS.items():
+                track(obj, column, attribute)
+    for obj in session.dirty:
+        if isinstance(obj, ScanHistory) and session.is_modified(obj):
+            for attribute, (column, _) in SCAN_TEXT_COLUMNS.items():
+                track(obj, column, attribute)
+    for obj in session.deleted:
+        if isinstance(obj, ScanHistory):
+            released.extend(getattr(obj, column) for column, _ in SCAN_TEXT_COLUMNS.values())
+
+    if not added and not released:
+        return
+    connection = session.connection()
+    if added:
+        _add_blob_references(connection, added, contents)
+    if released:
+        release_text_blobs(connection, released)
+
+    # Loaded TextBlob objects now have a stale ref_count
+    touched = set(added) | set(released)
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, TextBlob) and obj.hash in touched:
+            session.expire(obj)
+
+
+event.listen(db.session, 'before_flush', _text_blobs_before_flush)
@@ -0,0 +1,64 @@
+"""
+Admin Routes
+Operational endpoints for administrators
+"""
+
+from flask import Blueprint, jsonify
+from backend.middleware.auth_middleware import admin_required, monitored_route
+from backend.services.skill_taxonomy import get_matcher, reload_matcher
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Create blueprint for admin routes
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+
+@admin_bp.route('/skill_taxonomy', methods=['GET'])
+@admin_required
+def get_skill_taxonomy_info():
+    """Get the version of the skill taxonomy served by this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'taxonomy': get_matcher().info()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Error reading skill taxonomy',
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/skill_taxonomy/reload', methods=['POST'])
+@admin_required
+@monitored_route
+def reload_skill_taxonomy():
+    """
+    Recompile (if changed) and swap in the skill taxonomy
+    Other workers pick up the new compiled artifact on their next file check
+    """
+    try:
+        previous = get_matcher().info()
+        current = reload_matcher().info()
+        reloaded = current['source_sha256'] != previous['source_sha256']
+
+        logger.info(f"Skill taxonomy reload requested: v{previous['version']} -> v{current['version']}")
+
+        return jsonify({
+            'success': True,
+            'message': 'Skill taxonomy reloaded' if reloaded else 'Skill taxonomy unchanged',
+            'reloaded': reloaded,
+            'previous': previous,
+            'taxonomy': current
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Error reloading skill taxonomy',
+            'error': str(e)
+        }), 500
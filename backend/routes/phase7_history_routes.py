@@ -5,23 +5,44 @@ Provides scan history, individual scan details, and dashboard summary
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, Resume, JobDescription, ScanHistory
-from sqlalchemy import desc, func
+from backend.models import db, User, ScanHistory, UserStats
+from backend.services.history_queries import scan_summaries
+from backend.services.conditional_get import Validators, not_modified_response
+from backend.services.pagination import PaginationError, parse_page_args, paginate, page_info
+from backend.services.fieldsets import Fieldset, Field, FieldsetError
+from backend.services.write_behind import get_write_behind
+from backend.services.rate_limiter import COST_LIST
+from backend.middleware.auth_middleware import rate_limited_route
 from datetime import datetime, timedelta
 
 # Create blueprint for Phase 7 history routes
 phase7_bp = Blueprint('phase7_history', __name__, url_prefix='/api')
 
 
+# ?fields= whitelist of the scans list; the titles need the resume/JD joins
+SCAN_LIST_FIELDS = Fieldset({
+    'id': 'id',
+    'score': Field('overall_match_score', value=lambda scan: round(scan.overall_match_score, 2)),
+    'score_category': Field('overall_match_score',
+                            value=lambda scan: ScanHistory.score_category_for(scan.overall_match_score)),
+    'created_at': 'created_at',
+    'resume_title': Field('resume_title',
+                          value=lambda scan: scan.resume_title if scan.resume_found is not None else 'Real-time Scan'),
+    'job_title': Field('job_title', value=lambda scan: scan.job_title if scan.job_found is not None
+                       else 'Real-time Job Description')
+})
+
+
 @phase7_bp.route('/scans', methods=['GET'])
 @jwt_required()
+@rate_limited_route(cost=COST_LIST)
 def get_scans_list():
     """
     PHASE 7.1 - HISTORY LIST API
     
-    GET /api/scans
+    GET /api/scans?limit=<n>&cursor=<next_cursor>&fields=<names>
     Returns lightweight list of scans for logged-in user
-    Sorted by created_at DESC
+    Sorted by created_at DESC, one keyset page at a time
     """
     try:
         current_user_id = get_jwt_identity()
@@ -33,33 +54,27 @@ def get_scans_list():
                 'message': 'User not found'
             }), 404
         
-        # Get all scans for user, sorted by created_at DESC
-        scans = ScanHistory.query.filter_by(
-            user_id=current_user_id
-        ).order_by(ScanHistory.created_at.desc()).all()
-        
-        # Format lightweight payload
-        scans_list = []
-        for scan in scans:
-            # Get resume and JD details (if available)
-            resume = Resume.query.get(scan.resume_id) if scan.resume_id else None
-            job_description = JobDescription.query.get(scan.job_description_id) if scan.job_description_id else None
-            
-            scans_list.append({
-                'id': scan.id,
-                'score': round(scan.overall_match_score, 2),
-                'score_category': scan.get_score_category(),
-                'created_at': scan.created_at.isoformat() if scan.created_at else None,
-                'resume_title': resume.title if resume else 'Real-time Scan',
-                'job_title': job_description.title if job_description else 'Real-time Job Description'
-            })
+        limit, cursor = parse_page_args(request.args, default_limit=50)
+        fields = SCAN_LIST_FIELDS.parse(request.args)
+        labels = fields is None or 'resume_title' in fields or 'job_title' in fields
+        
+        # One page of scans (with resume/JD titles joined in when shown), newest first
+        scans, next_cursor = paginate(
+            scan_summaries(user.id, labels=labels), ScanHistory.created_at, ScanHistory.id, limit, cursor
+        )
         
         return jsonify({
             'success': True,
-            'count': len(scans_list),
-            'scans': scans_list
+            'count': user.get_stats().scan_count,  # total across all pages
+            'scans': [SCAN_LIST_FIELDS.serialize(scan, fields) for scan in scans],
+            **page_info(limit, next_cursor)
         }), 200
         
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         current_app.logger.error(f"Error getting scans list: {str(e)}")
         return jsonify({
@@ -75,12 +90,18 @@ def get_scan_detail(scan_id):
     """
     PHASE 7.2 - SINGLE SCAN DETAIL API
     
-    GET /api/scan/<id>
-    Returns full details of a specific scan
+    GET /api/scan/<id>?fields=<names>
+    Returns full details of a specific scan (or just the requested fields)
     Validates scan belongs to logged-in user
     """
     try:
         current_user_id = get_jwt_identity()
+        
+        # Revalidation only needs the scan's version columns
+        not_modified = scan_not_modified(id=scan_id, user_id=current_user_id)
+        if not_modified is not None:
+            return not_modified
+        
         user = User.query.get(current_user_id)
         
         if not user:
@@ -89,8 +110,9 @@ def get_scan_detail(scan_id):
                 'message': 'User not found'
             }), 404
         
-        # Get scan and validate ownership
-        scan = ScanHistory.query.filter_by(
+        # Get scan and validate ownership (documents only when requested)
+        fields = SCAN_DETAIL_FIELDS.parse(request.args)
+        scan = ScanHistory.query.options(*scan_detail_options(fields)).filter_by(
             id=scan_id,
             user_id=current_user_id
         ).first()
@@ -101,52 +123,60 @@ def get_scan_detail(scan_id):
                 'message': 'Scan not found'
             }), 404
         
-        # Get detailed analysis
-        detailed_analysis = scan.detailed_analysis or {}
-        category_scores = scan.category_scores or {}
-        recommendations = scan.recommendations or []
-        keyword_analysis = scan.keyword_analysis or {}
-        
-        # Generate summary if not present
-        summary = "Scan completed successfully."
-        if detailed_analysis.get('matched_count', 0) > 0:
-            matched_count = detailed_analysis.get('matched_count', 0)
-            missing_count = detailed_analysis.get('missing_count', 0)
-            
-            if scan.overall_match_score >= 80:
-                summary = f"Excellent match! Your resume aligns well with the job requirements. You have {matched_count} matching skills."
-            elif scan.overall_match_score >= 60:
-                summary = f"Good match! Your resume covers most requirements. Consider adding: {', '.join(detailed_analysis.get('missing_skills', [])[:3])}."
-            elif scan.overall_match_score >= 40:
-                summary = f"Fair match. Your resume has {matched_count} matching skills but is missing key requirements."
-            else:
-                summary = f"Low match. Consider strengthening your resume with these skills: {', '.join(detailed_analysis.get('missing_skills', [])[:5])}."
-        
-        # Return full details
+        return scan_detail_response(scan, fields)
+        
+    except FieldsetError as e:
         return jsonify({
-            'success': True,
-            'scan': {
-                'id': scan.id,
-                'resume_id': scan.resume_id,
-                'job_description_id': scan.job_description_id,
-                'score': round(scan.overall_match_score, 2),
-                'overall_match_score': round(scan.overall_match_score, 2), # Frontend looks for this
-                'score_category': scan.get_score_category(),
-                'category_scores': category_scores,
-                'detailed_analysis': detailed_analysis,
-                'matched_skills': detailed_analysis.get('matched_skills', []),
-                'missing_skills': detailed_analysis.get('missing_skills', []),
-                'summary': detailed_analysis.get('summary', summary),
-                'recommendations': recommendations,
-                'keyword_analysis': keyword_analysis,
-                'ats_compatibility': round(scan.ats_compatibility, 2),
-                'scan_type': scan.scan_type,
-                'algorithm_used': scan.algorithm_used,
-                'scan_duration': scan.scan_duration,
-                'created_at': scan.created_at.isoformat() if scan.created_at else None
-            }
-        }), 200
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Error getting scan detail: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to retrieve scan details',
+            'error': str(e)
+        }), 500
+
+
+@phase7_bp.route('/scan/<string:scan_token>', methods=['GET'])
+@jwt_required()
+def get_scan_detail_by_token(scan_token):
+    """
+    GET /api/scan/<public_id>
+    Same as the detail API, for the token a write-behind scan returns before
+    its row has an id. A row still queued in this worker is flushed first.
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        
+        buffer = get_write_behind()
+        if buffer is not None and buffer.is_pending(scan_token):
+            buffer.flush()
+        
+        not_modified = scan_not_modified(public_id=scan_token, user_id=current_user_id)
+        if not_modified is not None:
+            return not_modified
+        
+        fields = SCAN_DETAIL_FIELDS.parse(request.args)
+        scan = ScanHistory.query.options(*scan_detail_options(fields)).filter_by(
+            public_id=scan_token,
+            user_id=current_user_id
+        ).first()
+        
+        if not scan:
+            return jsonify({
+                'success': False,
+                'message': 'Scan not found'
+            }), 404
+        
+        return scan_detail_response(scan, fields)
         
+    except FieldsetError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         current_app.logger.error(f"Error getting scan detail: {str(e)}")
         return jsonify({
@@ -156,6 +186,96 @@ def get_scan_detail(scan_id):
         }), 500
 
 
+def scan_validators(scan):
+    """Validators of a scan detail; archiving changes the payload's 'archived' flag"""
+    return Validators.for_resource(
+        request, 'scan', scan.id, scan.updated_at, scan.archived_at,
+        last_modified=max(filter(None, (scan.updated_at, scan.archived_at)), default=None)
+    )
+
+
+def scan_not_modified(**filters):
+    """304 response when the client's copy of a scan is current (one indexed lookup)"""
+    version_query = db.session.query(
+        ScanHistory.id, ScanHistory.updated_at, ScanHistory.archived_at
+    ).filter_by(**filters)
+    return not_modified_response(request, version_query, scan_validators)
+
+
+def scan_summary_text(scan, detailed_analysis):
+    """Stored summary, or one generated from the score and skill counts"""
+    if 'summary' in detailed_analysis:
+        return detailed_analysis['summary']
+    summary = "Scan completed successfully."
+    if detailed_analysis.get('matched_count', 0) > 0:
+        matched_count = detailed_analysis.get('matched_count', 0)
+        
+        if scan.overall_match_score >= 80:
+            summary = f"Excellent match! Your resume aligns well with the job requirements. You have {matched_count} matching skills."
+        elif scan.overall_match_score >= 60:
+            summary = f"Good match! Your resume covers most requirements. Consider adding: {', '.join(detailed_analysis.get('missing_skills', [])[:3])}."
+        elif scan.overall_match_score >= 40:
+            summary = f"Fair match. Your resume has {matched_count} matching skills but is missing key requirements."
+        else:
+            summary = f"Low match. Consider strengthening your resume with these skills: {', '.join(detailed_analysis.get('missing_skills', [])[:5])}."
+    return summary
+
+
+def _analysis(scan):
+    # Analysis documents, read back from the archive for old scans
+    return scan.analysis_details()['detailed_analysis'] or {}
+
+
+# ?fields= whitelist of the scan detail (PHASE 7.2 payload). Fields reading
+# the analysis documents need them undeferred (SCAN_ANALYSIS_FIELDS); the
+# rest are served from plain columns.
+SCAN_DETAIL_FIELDS = Fieldset({
+    'id': 'id',
+    'public_id': 'public_id',
+    'resume_id': 'resume_id',
+    'job_description_id': 'job_description_id',
+    'score': Field('overall_match_score', value=lambda scan: round(scan.overall_match_score, 2)),
+    'overall_match_score': Field('overall_match_score',  # Frontend looks for this
+                                 value=lambda scan: round(scan.overall_match_score, 2)),
+    'score_category': Field('overall_match_score', value=lambda scan: scan.get_score_category()),
+    'category_scores': Field('category_scores', value=lambda scan: scan.category_scores or {}),
+    'detailed_analysis': Field('detailed_analysis', value=_analysis),
+    'matched_skills': Field('detailed_analysis', value=lambda scan: _analysis(scan).get('matched_skills', [])),
+    'missing_skills': Field('detailed_analysis', value=lambda scan: _analysis(scan).get('missing_skills', [])),
+    'summary': Field('detailed_analysis', 'overall_match_score',
+                     value=lambda scan: scan_summary_text(scan, _analysis(scan))),
+    'recommendations': Field('recommendations',
+                             value=lambda scan: scan.analysis_details()['recommendations'] or []),
+    'keyword_analysis': Field('keyword_analysis',
+                              value=lambda scan: scan.analysis_details()['keyword_analysis'] or {}),
+    'ats_compatibility': Field('ats_compatibility', value=lambda scan: round(scan.ats_compatibility, 2)),
+    'scan_type': 'scan_type',
+    'algorithm_used': 'algorithm_used',
+    'scan_duration': 'scan_duration',
+    'archived': Field('archived_at', value=lambda scan: scan.archived_at is not None),
+    'created_at': 'created_at'
+})
+
+SCAN_ANALYSIS_FIELDS = ('category_scores', 'detailed_analysis', 'matched_skills', 'missing_skills', 'summary',
+                        'recommendations', 'keyword_analysis')
+
+
+def scan_detail_options(fields):
+    """Loader options for the requested detail fields"""
+    if fields is None or any(name in SCAN_ANALYSIS_FIELDS for name in fields):
+        return ScanHistory.with_details()
+    # updated_at / archived_at feed the validators
+    return [SCAN_DETAIL_FIELDS.load_only(ScanHistory, fields, ScanHistory.updated_at, ScanHistory.archived_at)]
+
+
+def scan_detail_response(scan, fields=None):
+    """Full details of one scan (PHASE 7.2 payload), or the requested fields"""
+    return scan_validators(scan).apply(jsonify({
+        'success': True,
+        'scan': SCAN_DETAIL_FIELDS.serialize(scan, fields)
+    })), 200
+
+
 @phase7_bp.route('/dashboard/summary', methods=['GET'])
 @jwt_required()
 def get_dashboard_summary():
@@ -175,22 +295,12 @@ def get_dashboard_summary():
                 'message': 'User not found'
             }), 404
         
-        # Get total scans
-        total_scans = ScanHistory.query.filter_by(user_id=current_user_id).count()
-        
-        # Calculate average score
-        avg_score_result = db.session.query(
-            func.avg(ScanHistory.overall_match_score)
-        ).filter_by(user_id=current_user_id).scalar()
-        
-        average_score = round(avg_score_result, 2) if avg_score_result else 0
-        
-        # Get last scan score
-        last_scan = ScanHistory.query.filter_by(
-            user_id=current_user_id
-        ).order_by(ScanHistory.created_at.desc()).first()
+        # Totals come from the per-user rollup (one primary-key lookup)
+        stats = UserStats.for_user(user.id, persist=True)
         
-        last_scan_score = round(last_scan.overall_match_score, 2) if last_scan else 0
+        total_scans = stats.scan_count
+        average_score = round(stats.average_score, 2)
+        last_scan_score = round(stats.last_scan_score, 2) if stats.last_scan_score is not None else 0
         
         # Get scan balance
         scan_balance = user.get_scan_status()
@@ -1,8 +1,15 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models import db, User, JobDescription
+from backend.services.pagination import PaginationError, parse_page_args, paginate, page_info
+from backend.services.conditional_get import Validators, not_modified_response
+from backend.services.fieldsets import FieldsetError
 from backend.services.keyword_parser import KeywordParser
 from backend.services.file_parser import FileParser
+from backend.services.bulk_import_service import BulkImportService
+from backend.middleware.request_limits import body_limit
+from backend.middleware.auth_middleware import rate_limited_route
+from backend.services.rate_limiter import COST_BULK, COST_NLP
 from datetime import datetime
 
 # Create blueprint for job description routes
@@ -12,8 +19,12 @@ jd_bp = Blueprint('job_descriptions', __name__, url_prefix='/api')
 keyword_parser = KeywordParser()
 file_parser = FileParser()
 
+# ?fields= whitelist of the job description detail: the list fields plus the text
+JOB_DESCRIPTION_DETAIL_FIELDS = JobDescription.API_FIELDS.extend({'job_text': 'job_text'})
+
 @jd_bp.route('/upload_jd', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)  # also charges POST /jd, which calls this view
 def upload_job_description():
     """
     Upload/create a new job description
@@ -153,6 +164,61 @@ def upload_job_description():
             'error': str(e)
         }), 500
 
+@jd_bp.route('/bulk/job_descriptions', methods=['POST'])
+@jwt_required()
+@rate_limited_route(cost=COST_BULK)
+@body_limit('BULK_IMPORT_MAX_SIZE')
+def bulk_import_job_descriptions():
+    """
+    Import many job descriptions at once
+    Expected: multipart/form-data with 'file' as NDJSON (.ndjson/.jsonl) or CSV
+    Each record: title, job_text (or description), optional company_name (or company)
+    Returns a per-record report
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+
+        if not user:
+            return jsonify({
+                'success': False,
+                'message': 'User not found'
+            }), 404
+
+        if 'file' not in request.files or request.files['file'].filename == '':
+            return jsonify({
+                'success': False,
+                'message': 'No import file provided'
+            }), 400
+
+        upload = request.files['file']
+
+        try:
+            report = BulkImportService.from_config(current_app.config).import_job_descriptions(
+                current_user_id, upload.stream, upload.filename
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+
+        current_app.logger.info(f"Bulk job description import for user {current_user_id}: {report['summary']}")
+
+        return jsonify({
+            'success': True,
+            'message': f"Imported {report['summary']['imported']} of {report['summary']['total']} job descriptions",
+            **report
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Bulk import failed. Please try again.',
+            'error': str(e)
+        }), 500
+
 # Alias for /upload_jd to match Phase 4 spec
 @jd_bp.route('/jd', methods=['POST'])
 @jwt_required()
@@ -202,21 +268,37 @@ def get_latest_job_description():
 @jd_bp.route('/job_descriptions', methods=['GET'])
 @jwt_required()
 def get_user_job_descriptions():
-    """Get all job descriptions for the current user"""
+    """Get the current user's job descriptions, newest first (?limit=&cursor=&fields=)"""
     try:
         current_user_id = get_jwt_identity()
         
-        job_descriptions = JobDescription.query.filter_by(
-            user_id=current_user_id,
-            is_active=True
-        ).order_by(JobDescription.created_at.desc()).all()
+        user = User.query.get(current_user_id)
+        if not user:
+            return jsonify({
+                'success': False,
+                'message': 'User not found'
+            }), 404
+
+        limit, cursor = parse_page_args(request.args, default_limit=50)
+        fields = JobDescription.API_FIELDS.parse(request.args)
+        
+        query = JobDescription.query.filter_by(user_id=user.id, is_active=True)
+        if fields is not None:
+            query = query.options(JobDescription.API_FIELDS.load_only(JobDescription, fields, JobDescription.created_at))
+        job_descriptions, next_cursor = paginate(query, JobDescription.created_at, JobDescription.id, limit, cursor)
         
         return jsonify({
             'success': True,
-            'job_descriptions': [jd.to_dict() for jd in job_descriptions],
-            'count': len(job_descriptions)
+            'job_descriptions': [jd.to_dict(fields=fields) for jd in job_descriptions],
+            'count': user.get_stats().job_description_count,  # total across all pages
+            **page_info(limit, next_cursor)
         }), 200
         
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -224,14 +306,36 @@ def get_user_job_descriptions():
             'error': str(e)
         }), 500
 
+def job_description_validators(job_description):
+    """Validators of a job description detail (every change bumps updated_at)"""
+    return Validators.for_resource(request, 'job_description', job_description.id, job_description.updated_at,
+                                   last_modified=job_description.updated_at)
+
+
 @jd_bp.route('/job_descriptions/<int:jd_id>', methods=['GET'])
 @jwt_required()
 def get_job_description_details(jd_id):
-    """Get detailed information about a specific job description"""
+    """Get detailed information about a specific job description (?fields= for a subset)"""
     try:
         current_user_id = get_jwt_identity()
         
-        job_description = JobDescription.query.filter_by(
+        # Revalidation only needs the version columns, not job_text
+        not_modified = not_modified_response(request, db.session.query(
+            JobDescription.id, JobDescription.updated_at
+        ).filter_by(
+            id=jd_id,
+            user_id=current_user_id,
+            is_active=True
+        ), job_description_validators)
+        if not_modified is not None:
+            return not_modified
+        
+        fields = JOB_DESCRIPTION_DETAIL_FIELDS.parse(request.args)
+        query = JobDescription.query
+        if fields is not None:
+            query = query.options(JOB_DESCRIPTION_DETAIL_FIELDS.load_only(JobDescription, fields,
+                                                                          JobDescription.updated_at))
+        job_description = query.filter_by(
             id=jd_id,
             user_id=current_user_id,
             is_active=True
@@ -243,11 +347,21 @@ def get_job_description_details(jd_id):
                 'message': 'Job description not found'
             }), 404
         
-        return jsonify({
+        if fields is not None:
+            job_description_data = JOB_DESCRIPTION_DETAIL_FIELDS.serialize(job_description, fields)
+        else:
+            job_description_data = job_description.to_dict(include_text=True)
+        
+        return job_description_validators(job_description).apply(jsonify({
             'success': True,
-            'job_description': job_description.to_dict(include_text=True)
-        }), 200
+            'job_description': job_description_data
+        })), 200
         
+    except FieldsetError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -257,6 +371,7 @@ def get_job_description_details(jd_id):
 
 @jd_bp.route('/job_descriptions/<int:jd_id>', methods=['PUT'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)
 def update_job_description(jd_id):
     """Update a job description"""
     try:
@@ -372,6 +487,7 @@ def delete_job_description(jd_id):
 
 @jd_bp.route('/job_descriptions/<int:jd_id>/duplicate', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)
 def duplicate_job_description(jd_id):
     """Create a copy of an existing job description"""
     try:
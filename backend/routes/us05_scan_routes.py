@@ -5,7 +5,10 @@ POST /api/scan - Main scan endpoint with free scan limits
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, Resume, JobDescription, ScanHistory
+from backend.models import db, User, Resume, JobDescription
+from backend.services.write_behind import save_scan
+from backend.services.rate_limiter import COST_NLP
+from backend.middleware.auth_middleware import rate_limited_route
 from datetime import datetime
 import time
 import json
@@ -23,6 +26,7 @@ suggestions_service = DynamicSuggestionsService()
 
 @scan_bp.route('/scan', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)
 def perform_scan():
     """
     Phase 5: AI Scan Endpoint
@@ -145,20 +149,6 @@ def perform_scan():
                 'message': 'Resume text and job description text are required. Please provide both.'
             }), 400
         
-        # PHASE 6.3: DECREMENT LOGIC - Use free scan BEFORE processing
-        # This ensures we don't process if scan fails
-        if not user.is_premium():
-            scan_used = user.use_free_scan()
-            if not scan_used:
-                return jsonify({
-                    'success': False,
-                    'message': 'Failed to use free scan. Please try again.',
-                    'scan_balance': user.get_scan_status()
-                }), 400
-            current_app.logger.info(f"✅ Free scan used. Remaining: {user.free_scans_remaining}")
-        else:
-            current_app.logger.info(f"✅ Premium user - no scan limit")
-        
         # Track scan duration
         scan_start_time = time.time()
         
@@ -196,8 +186,20 @@ def perform_scan():
             scan_duration = time.time() - scan_start_time
             
             # PHASE 5.5: RESULT STORAGE
-            scan_history = ScanHistory(
-                user_id=current_user_id,
+            # PHASE 6.3: DECREMENT LOGIC - the free scan is charged in the same
+            # transaction as the history row, only once the analysis succeeded
+            is_premium = user.is_premium()
+            if not is_premium and not user.claim_free_scan():
+                # A concurrent scan took the last free scan
+                db.session.rollback()
+                return jsonify({
+                    'success': False,
+                    'message': 'Free scan limit exceeded. Upgrade to continue.',
+                    'scan_balance': user.get_scan_status()
+                }), 403
+
+            scan_values = dict(
+                user_id=user.id,
                 resume_id=resume.id if resume else None,
                 job_description_id=job_description.id if job_description else None,
                 resume_text=resume_text[:5000] if resume_text else None,  # Store first 5000 chars
@@ -212,16 +214,19 @@ def perform_scan():
                 algorithm_used='llm_enhanced',
                 scan_duration=scan_duration
             )
+            scan_id, scan_token = save_scan(scan_values, charged=not is_premium)
             
-            db.session.add(scan_history)
-            db.session.commit()
-            
-            current_app.logger.info(f"✅ Enhanced Scan completed. ID: {scan_history.id}, Score: {overall_score:.2f}%")
+            current_app.logger.info(f"✅ Enhanced Scan completed. ID: {scan_id}, Score: {overall_score:.2f}%")
+            if is_premium:
+                current_app.logger.info(f"✅ Premium user - no scan limit")
+            else:
+                current_app.logger.info(f"✅ Free scan used. Remaining: {user.free_scans_remaining}")
             
             # PHASE 5.6: RESPONSE RETURN (PHASE 6.6: Include scan balance)
             return jsonify({
                 'success': True,
-                'scan_id': scan_history.id,
+                'scan_id': scan_id,
+                'scan_token': scan_token,
                 'score': round(overall_score, 2),
                 'matched_skills': [s['skill'] if isinstance(s, dict) else s for s in detailed_analysis.get('matched_skills', [])],
                 'missing_skills': [s['skill'] if isinstance(s, dict) else s for s in detailed_analysis.get('missing_skills', [])],
@@ -234,12 +239,8 @@ def perform_scan():
             }), 200
             
         except Exception as matching_error:
-            # If matching fails, restore the scan count for non-premium users
-            if not user.is_premium():
-                user.free_scans_remaining += 1
-                user.total_scans_used -= 1
-                db.session.commit()
-                current_app.logger.warning(f"⚠️ Scan failed, count restored")
+            # Nothing was committed, so the free scan was not charged
+            db.session.rollback()
             
             current_app.logger.error(f"❌ Matching error: {matching_error}")
             import traceback
@@ -263,6 +264,7 @@ def perform_scan():
             }), 500
         
     except Exception as e:
+        db.session.rollback()
         import traceback
         traceback.print_exc()
         current_app.logger.error(f"SCAN FAILED: {str(e)}")
@@ -2,8 +2,16 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 from backend.models import db, User, Resume
+from backend.services.pagination import PaginationError, parse_page_args, paginate, page_info
+from backend.services.conditional_get import Validators, not_modified_response
+from backend.services.fieldsets import Field, FieldsetError
 from backend.services.file_parser import FileParser
 from backend.services.keyword_parser import KeywordParser
+from backend.services.chunked_upload_service import ChunkedUploadService, ChunkedUploadError
+from backend.services.bulk_import_service import BulkImportService
+from backend.middleware.request_limits import body_limit
+from backend.middleware.auth_middleware import rate_limited_route
+from backend.services.rate_limiter import COST_BULK, COST_NLP
 import os
 import uuid
 from datetime import datetime
@@ -14,8 +22,62 @@ upload_bp = Blueprint('upload', __name__, url_prefix='/api')
 # Initialize keyword parser
 keyword_parser = KeywordParser()
 
+# ?fields= whitelist of the resume detail: the list fields plus the text
+RESUME_DETAIL_FIELDS = Resume.API_FIELDS.extend({'extracted_text': Field('extracted_text')})
+
+def _process_saved_resume(user_id, file_path, original_filename, file_type, title):
+    """
+    Create the resume record for a stored file, then parse it and extract keywords
+
+    Returns:
+        tuple: (resume: Resume, success: bool, parse_error: str)
+    """
+    file_size = os.path.getsize(file_path)
+
+    # Create resume record
+    resume = Resume(
+        user_id=user_id,
+        original_filename=original_filename,
+        file_path=file_path,
+        file_size=file_size,
+        file_type=file_type,
+        title=title or original_filename
+    )
+
+    db.session.add(resume)
+    db.session.commit()
+
+    # Parse file in background (for now, we'll do it synchronously)
+    success, extracted_text, parse_error = FileParser.parse_resume_file(file_path, file_type)
+
+    if success:
+        resume.extracted_text = extracted_text
+        resume.upload_status = 'completed'
+
+        # US-05: Automatically extract keywords after successful text extraction
+        try:
+            keywords = keyword_parser.extract_keywords(extracted_text)
+            resume.set_keywords(
+                technical_skills=keywords['technical_skills'],
+                soft_skills=keywords['soft_skills'],
+                other_keywords=keywords['other_keywords']
+            )
+            current_app.logger.info(f"Keywords automatically extracted for resume {resume.id}")
+        except Exception as keyword_error:
+            current_app.logger.error(f"Failed to extract keywords for resume {resume.id}: {keyword_error}")
+            # Don't fail the upload if keyword extraction fails
+
+    else:
+        resume.upload_status = 'failed'
+        resume.error_message = parse_error
+
+    db.session.commit()
+
+    return resume, success, parse_error
+
 @upload_bp.route('/upload_resume', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)
 def upload_resume():
     """
     Upload and parse resume file
@@ -74,46 +136,10 @@ def upload_resume():
         
         # Save file
         file.save(file_path)
-        file_size = os.path.getsize(file_path)
         
-        # Create resume record
-        resume = Resume(
-            user_id=current_user_id,
-            original_filename=original_filename,
-            file_path=file_path,
-            file_size=file_size,
-            file_type=file_type,
-            title=title or original_filename
+        resume, success, parse_error = _process_saved_resume(
+            current_user_id, file_path, original_filename, file_type, title
         )
-        
-        db.session.add(resume)
-        db.session.commit()
-        
-        # Parse file in background (for now, we'll do it synchronously)
-        success, extracted_text, parse_error = FileParser.parse_resume_file(file_path, file_type)
-        
-        if success:
-            resume.extracted_text = extracted_text
-            resume.upload_status = 'completed'
-
-            # US-05: Automatically extract keywords after successful text extraction
-            try:
-                keywords = keyword_parser.extract_keywords(extracted_text)
-                resume.set_keywords(
-                    technical_skills=keywords['technical_skills'],
-                    soft_skills=keywords['soft_skills'],
-                    other_keywords=keywords['other_keywords']
-                )
-                current_app.logger.info(f"Keywords automatically extracted for resume {resume.id}")
-            except Exception as keyword_error:
-                current_app.logger.error(f"Failed to extract keywords for resume {resume.id}: {keyword_error}")
-                # Don't fail the upload if keyword extraction fails
-
-        else:
-            resume.upload_status = 'failed'
-            resume.error_message = parse_error
-
-        db.session.commit()
 
         # Note: Suggestions are now generated manually by clicking buttons, not automatically
 
@@ -170,24 +196,296 @@ def upload_resume():
             }
         }), 500
 
+# ---------------- CHUNKED / RESUMABLE UPLOAD ----------------
+
+def _chunked_upload_service():
+    return ChunkedUploadService.from_config(current_app.config)
+
+def _chunked_upload_error(e):
+    return jsonify({
+        'success': False,
+        'message': e.message,
+        **e.details
+    }), e.status_code
+
+@upload_bp.route('/upload_resume/init', methods=['POST'])
+@jwt_required()
+def init_chunked_upload():
+    """
+    Start a resumable resume upload
+    Expected: JSON with 'filename', 'total_size' and optional 'title'
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+
+        status = _chunked_upload_service().init_upload(
+            current_user_id,
+            data.get('filename', ''),
+            data.get('total_size'),
+            data.get('title', '')
+        )
+
+        return jsonify({
+            'success': True,
+            'message': 'Upload initialized',
+            'upload': status
+        }), 201
+
+    except ChunkedUploadError as e:
+        return _chunked_upload_error(e)
+    except Exception as e:
+        current_app.logger.error(f"❌ Chunked upload init error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Error initializing upload',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/upload_resume/<upload_id>', methods=['PUT'])
+@jwt_required()
+def upload_resume_chunk(upload_id):
+    """
+    Upload one byte range of a resumable upload
+    Expected: raw bytes body with 'Content-Range: bytes start-end/total'
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        service = _chunked_upload_service()
+
+        start, end, _ = ChunkedUploadService.parse_content_range(request.headers.get('Content-Range'))
+        length = end - start + 1
+
+        # Reject oversized or mismatched chunks before reading the body
+        if request.content_length is not None and request.content_length != length:
+            return jsonify({
+                'success': False,
+                'message': 'Content-Length does not match Content-Range'
+            }), 400
+
+        status = service.write_chunk(upload_id, current_user_id, start, length, request.stream)
+
+        return jsonify({
+            'success': True,
+            'upload': status
+        }), 200
+
+    except ChunkedUploadError as e:
+        return _chunked_upload_error(e)
+    except Exception as e:
+        current_app.logger.error(f"❌ Chunked upload error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Error storing upload chunk',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/upload_resume/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_chunked_upload_status(upload_id):
+    """Get the received offset of a resumable upload"""
+    try:
+        current_user_id = get_jwt_identity()
+        status = _chunked_upload_service().get_status(upload_id, current_user_id)
+
+        return jsonify({
+            'success': True,
+            'upload': status
+        }), 200
+
+    except ChunkedUploadError as e:
+        return _chunked_upload_error(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Error fetching upload status',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/upload_resume/<upload_id>', methods=['DELETE'])
+@jwt_required()
+def abort_chunked_upload(upload_id):
+    """Cancel a resumable upload"""
+    try:
+        current_user_id = get_jwt_identity()
+        _chunked_upload_service().abort(upload_id, current_user_id)
+
+        return jsonify({
+            'success': True,
+            'message': 'Upload cancelled'
+        }), 200
+
+    except ChunkedUploadError as e:
+        return _chunked_upload_error(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Error cancelling upload',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/upload_resume/<upload_id>/finalize', methods=['POST'])
+@jwt_required()
+@rate_limited_route(cost=COST_NLP)
+def finalize_chunked_upload(upload_id):
+    """
+    Complete a resumable upload and parse the resume
+    Expected: optional JSON with 'sha256' checksum of the whole file
+    """
+    file_path = None
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+
+        if not user:
+            return jsonify({
+                'success': False,
+                'message': 'User not found'
+            }), 404
+
+        data = request.get_json(silent=True) or {}
+        upload = _chunked_upload_service().finalize(
+            upload_id,
+            current_user_id,
+            current_app.config['RESUME_UPLOAD_FOLDER'],
+            expected_sha256=data.get('sha256')
+        )
+        file_path = upload['file_path']
+
+        resume, success, parse_error = _process_saved_resume(
+            current_user_id, file_path, upload['original_filename'],
+            upload['file_type'], upload['title']
+        )
+
+        return jsonify({
+            'success': True,
+            'message': 'Resume uploaded and processed successfully' if success else 'Resume uploaded but parsing failed',
+            'resume': resume.to_dict(include_keywords=True),
+            'sha256': upload['sha256'],
+            'parsing_success': success,
+            'parsing_error': parse_error if not success else None,
+            'keywords_extracted': resume.keywords_extracted if success else False
+        }), 201
+
+    except ChunkedUploadError as e:
+        return _chunked_upload_error(e)
+    except Exception as e:
+        current_app.logger.error(f"❌ Chunked upload finalize error: {str(e)}")
+        db.session.rollback()
+
+        # Clean up file if it was moved into storage
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+        return jsonify({
+            'success': False,
+            'message': 'Upload failed. Please try again.',
+            'error': str(e)
+        }), 500
+
+# ---------------- BULK IMPORT ----------------
+
+@upload_bp.route('/bulk/resumes', methods=['POST'])
+@jwt_required()
+@rate_limited_route(cost=COST_BULK)
+@body_limit('BULK_IMPORT_MAX_SIZE')
+def bulk_import_resumes():
+    """
+    Import many resumes from a ZIP archive
+    Expected: multipart/form-data with 'archive' ZIP file
+    Returns a per-file report
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+
+        if not user:
+            return jsonify({
+                'success': False,
+                'message': 'User not found'
+            }), 404
+
+        if 'archive' not in request.files or request.files['archive'].filename == '':
+            return jsonify({
+                'success': False,
+                'message': 'No ZIP archive provided'
+            }), 400
+
+        archive = request.files['archive']
+        if not archive.filename.lower().endswith('.zip'):
+            return jsonify({
+                'success': False,
+                'message': 'Only ZIP archives are supported for bulk resume import'
+            }), 400
+
+        try:
+            report = BulkImportService.from_config(current_app.config).import_resumes(
+                current_user_id,
+                archive.stream,
+                current_app.config['RESUME_UPLOAD_FOLDER'],
+                current_app.config.get('MAX_UPLOAD_SIZE', 10 * 1024 * 1024)
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+
+        current_app.logger.info(f"📦 Bulk resume import for user {current_user_id}: {report['summary']}")
+
+        return jsonify({
+            'success': True,
+            'message': f"Imported {report['summary']['imported']} of {report['summary']['total']} files",
+            **report
+        }), 201
+
+    except Exception as e:
+        current_app.logger.error(f"❌ Bulk resume import error: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Bulk import failed. Please try again.',
+            'error': str(e)
+        }), 500
+
 @upload_bp.route('/resumes', methods=['GET'])
 @jwt_required()
 def get_user_resumes():
-    """Get all resumes for the current user"""
+    """Get the current user's resumes, newest first (?limit=&cursor=&fields=)"""
     try:
         current_user_id = get_jwt_identity()
         
-        resumes = Resume.query.filter_by(
-            user_id=current_user_id,
-            is_active=True
-        ).order_by(Resume.created_at.desc()).all()
+        user = User.query.get(current_user_id)
+        if not user:
+            return jsonify({
+                'success': False,
+                'message': 'User not found'
+            }), 404
+
+        limit, cursor = parse_page_args(request.args, default_limit=50)
+        fields = Resume.API_FIELDS.parse(request.args)
+        
+        # Only the requested fields' columns are read (extracted_text is the heavy one)
+        query = Resume.query.filter_by(user_id=user.id, is_active=True)
+        if fields is not None:
+            query = query.options(Resume.API_FIELDS.load_only(Resume, fields, Resume.created_at))
+        resumes, next_cursor = paginate(query, Resume.created_at, Resume.id, limit, cursor)
         
         return jsonify({
             'success': True,
-            'resumes': [resume.to_dict() for resume in resumes],
-            'count': len(resumes)
+            'resumes': [resume.to_dict(fields=fields) for resume in resumes],
+            'count': user.get_stats().resume_count,  # total across all pages
+            **page_info(limit, next_cursor)
         }), 200
         
+    except (PaginationError, FieldsetError) as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -195,14 +493,33 @@ def get_user_resumes():
             'error': str(e)
         }), 500
 
+def resume_validators(resume):
+    """Validators of a resume detail (every change bumps updated_at)"""
+    return Validators.for_resource(request, 'resume', resume.id, resume.updated_at,
+                                   last_modified=resume.updated_at)
+
+
 @upload_bp.route('/resumes/<int:resume_id>', methods=['GET'])
 @jwt_required()
 def get_resume_details(resume_id):
-    """Get detailed information about a specific resume"""
+    """Get detailed information about a specific resume (?fields= for a subset)"""
     try:
         current_user_id = get_jwt_identity()
         
-        resume = Resume.query.filter_by(
+        # Revalidation only needs the version columns, not extracted_text
+        not_modified = not_modified_response(request, db.session.query(Resume.id, Resume.updated_at).filter_by(
+            id=resume_id,
+            user_id=current_user_id,
+            is_active=True
+        ), resume_validators)
+        if not_modified is not None:
+            return not_modified
+        
+        fields = RESUME_DETAIL_FIELDS.parse(request.args)
+        query = Resume.query
+        if fields is not None:
+            query = query.options(RESUME_DETAIL_FIELDS.load_only(Resume, fields, Resume.updated_at))
+        resume = query.filter_by(
             id=resume_id,
             user_id=current_user_id,
             is_active=True
@@ -214,17 +531,25 @@ def get_resume_details(resume_id):
                 'message': 'Resume not found'
             }), 404
         
-        resume_data = resume.to_dict()
-        
-        # Include extracted text if available
-        if resume.extracted_text:
-            resume_data['extracted_text'] = resume.extracted_text
+        if fields is not None:
+            resume_data = RESUME_DETAIL_FIELDS.serialize(resume, fields)
+        else:
+            resume_data = resume.to_dict()
+            
+            # Include extracted text if available
+            if resume.extracted_text:
+                resume_data['extracted_text'] = resume.extracted_text
         
-        return jsonify({
+        return resume_validators(resume).apply(jsonify({
             'success': True,
             'resume': resume_data
-        }), 200
+        })), 200
         
+    except FieldsetError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
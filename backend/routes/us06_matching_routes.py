@@ -5,9 +5,12 @@ API endpoints for calculating and retrieving resume-job description matching sco
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, Resume, JobDescription, MatchScore, ScanHistory
+from backend.models import db, User, Resume, JobDescription, MatchScore
 from backend.services.matching_service import MatchingService
 from backend.services.enhanced_matching_service import RealTimeLLMService
+from backend.services.write_behind import save_scan
+from backend.services.rate_limiter import COST_MATCH, COST_MATRIX, COST_NLP
+from backend.middleware.auth_middleware import rate_limited_route
 from datetime import datetime
 import time
 
@@ -21,6 +24,7 @@ realtime_llm_service = RealTimeLLMService()
 
 @matching_bp.route('/calculate_match', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_MATCH)
 def calculate_match_score():
     """
     Calculate matching score between resume and job description
@@ -80,8 +84,65 @@ def calculate_match_score():
         }), 500
 
 
+@matching_bp.route('/calculate_match/matrix', methods=['POST'])
+@jwt_required()
+@rate_limited_route(cost=COST_MATRIX)
+def calculate_match_matrix():
+    """
+    Calculate matching scores for every resume x job description pair of the user
+    Optional JSON payload (omit to use all active resumes and job descriptions):
+    {
+        "resume_ids": [1, 2],
+        "job_description_ids": [3, 4, 5]
+    }
+    matrix[i][j] is the overall score of resumes[i] against job_descriptions[j]
+    """
+    try:
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True) or {}
+        
+        resume_ids = data.get('resume_ids')
+        job_description_ids = data.get('job_description_ids')
+        for name, ids in (('resume_ids', resume_ids), ('job_description_ids', job_description_ids)):
+            if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+                return jsonify({
+                    'success': False,
+                    'message': f'{name} must be a list of integer IDs'
+                }), 400
+        
+        try:
+            result = matching_service.calculate_match_matrix(
+                user_id=current_user_id,
+                resume_ids=resume_ids,
+                job_description_ids=job_description_ids,
+                max_pairs=current_app.config.get('MATCH_MATRIX_MAX_PAIRS')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': 'Match matrix too large; select fewer resumes or job descriptions',
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': f"Calculated {result['pair_count']} match scores",
+            **result
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in calculate_match_matrix: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Error calculating match matrix',
+            'error': str(e)
+        }), 500
+
+
 @matching_bp.route('/analyze_realtime', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)
 def analyze_realtime():
     """
     Real-time analysis of resume text against job description text
@@ -126,15 +187,6 @@ def analyze_realtime():
                 'message': 'Both resume_text and job_description_text are required'
             }), 400
 
-        # Use one free scan before performing analysis
-        scan_used = user.use_free_scan()
-        if not scan_used:
-            return jsonify({
-                'success': False,
-                'message': 'Failed to use free scan. Please try again.',
-                'scan_status': user.get_scan_status()
-            }), 400
-
         # Track scan duration
         scan_start_time = time.time()
 
@@ -147,11 +199,7 @@ def analyze_realtime():
         scan_duration = time.time() - scan_start_time
 
         if not analysis_result['success']:
-            # If analysis fails, restore the scan count
-            user.free_scans_remaining += 1
-            user.total_scans_used -= 1
-            db.session.commit()
-
+            # Nothing is charged for a failed analysis
             return jsonify({
                 'success': False,
                 'message': 'Failed to perform real-time analysis',
@@ -159,37 +207,38 @@ def analyze_realtime():
                 'scan_status': user.get_scan_status()
             }), 400
 
-        # Save scan results to ScanHistory
-        try:
-            scan_history = ScanHistory(
-                user_id=current_user_id,
-                resume_text=resume_text[:5000],  # Store first 5000 chars for reference
-                job_description_text=job_description_text[:5000],  # Store first 5000 chars for reference
-                overall_match_score=analysis_result.get('overall_match_score', 0),
-                category_scores=analysis_result.get('category_scores', {}),
-                detailed_analysis=analysis_result.get('detailed_analysis', {}),
-                recommendations=analysis_result.get('recommendations', []),
-                keyword_analysis=analysis_result.get('keyword_analysis', {}),
-                ats_compatibility=analysis_result.get('ats_compatibility', 0),
-                scan_type='realtime',
-                algorithm_used='llm_enhanced',
-                scan_duration=scan_duration
-            )
-
-            db.session.add(scan_history)
-            db.session.commit()
-
-            current_app.logger.info(f"Scan history saved with ID {scan_history.id} for user {current_user_id}")
-
-            # Add scan history ID to response
-            analysis_result['scan_history_id'] = scan_history.id
-
-        except Exception as save_error:
-            current_app.logger.error(f"Failed to save scan history: {save_error}")
-            # Don't fail the request if saving history fails
-            pass
+        # Charge the free scan and save the results in one transaction
+        if not user.is_premium() and not user.claim_free_scan():
+            # A concurrent scan took the last free scan
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': 'No free scans remaining. Please upgrade to premium for unlimited scans.',
+                'scan_status': user.get_scan_status()
+            }), 403
 
-        current_app.logger.info(f"Real-time analysis completed for user {current_user_id}, scan used: {scan_used}")
+        scan_id, scan_token = save_scan(dict(
+            user_id=user.id,
+            resume_text=resume_text[:5000],  # Store first 5000 chars for reference
+            job_description_text=job_description_text[:5000],  # Store first 5000 chars for reference
+            overall_match_score=analysis_result.get('overall_match_score', 0),
+            category_scores=analysis_result.get('category_scores', {}),
+            detailed_analysis=analysis_result.get('detailed_analysis', {}),
+            recommendations=analysis_result.get('recommendations', []),
+            keyword_analysis=analysis_result.get('keyword_analysis', {}),
+            ats_compatibility=analysis_result.get('ats_compatibility', 0),
+            scan_type='realtime',
+            algorithm_used='llm_enhanced',
+            scan_duration=scan_duration
+        ), charged=not user.is_premium())
+
+        current_app.logger.info(f"Scan history saved with ID {scan_id} for user {current_user_id}")
+
+        # Add scan history ID to response
+        analysis_result['scan_history_id'] = scan_id
+        analysis_result['scan_token'] = scan_token
+
+        current_app.logger.info(f"Real-time analysis completed for user {current_user_id}, scan used: {not user.is_premium()}")
 
         return jsonify({
             'success': True,
@@ -199,6 +248,7 @@ def analyze_realtime():
         }), 200
 
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"Error in analyze_realtime: {e}")
         return jsonify({
             'success': False,
@@ -237,6 +287,7 @@ def get_scan_status():
 
 @matching_bp.route('/enhanced_match', methods=['POST'])
 @jwt_required()
+@rate_limited_route(cost=COST_NLP)
 def calculate_enhanced_match():
     """
     Calculate enhanced matching score using the new LLM service
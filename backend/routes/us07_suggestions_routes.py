@@ -6,8 +6,10 @@ API endpoints for generating keyword suggestions and recommendations
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models import User, Resume, JobDescription, MatchScore, Suggestion
-from backend.middleware.auth_middleware import protected_route, premium_route, monitored_route
+from backend.middleware.auth_middleware import protected_route, premium_route, monitored_route, rate_limited_route
 from backend.services.dynamic_suggestions_service import DynamicSuggestionsService
+from backend.services.pagination import PaginationError, parse_page_args, paginate, page_info
+from backend.services.rate_limiter import COST_MATCH, COST_NLP
 try:
     from backend.services.premium_suggestions_service import PremiumSuggestionsService
     premium_service = PremiumSuggestionsService()
@@ -29,6 +31,7 @@ dynamic_suggestions_service = DynamicSuggestionsService()
 
 @suggestions_bp.route('/basic_suggestions', methods=['POST'])
 @protected_route
+@rate_limited_route(cost=COST_MATCH)
 def generate_basic_suggestions():
     """
     Generate basic suggestions by identifying missing keywords
@@ -139,6 +142,7 @@ def generate_basic_suggestions():
 
 @suggestions_bp.route('/premium_suggestions', methods=['POST'])
 @protected_route
+@rate_limited_route(cost=COST_NLP)
 @monitored_route
 def generate_premium_suggestions():
     """
@@ -317,6 +321,9 @@ def get_suggestion_history():
 def get_available_suggestions():
     """
     Get available resume-JD combinations for generating suggestions
+    
+    Both lists are keyset-paginated independently:
+    ?limit=<n>&resumes_cursor=<token>&job_descriptions_cursor=<token>
     """
     try:
         # Get current user
@@ -329,17 +336,19 @@ def get_available_suggestions():
                 'message': 'User not found'
             }), 404
         
-        # Get all active resumes (prioritize those with extracted keywords)
-        resumes = Resume.query.filter_by(
-            user_id=user.id,
-            is_active=True
-        ).all()
+        limit, _ = parse_page_args(request.args, default_limit=50)
 
-        # Get all active job descriptions (prioritize those with extracted keywords)
-        job_descriptions = JobDescription.query.filter_by(
-            user_id=user.id,
-            is_active=True
-        ).all()
+        # One page of active resumes, newest first
+        resumes, resumes_cursor = paginate(
+            Resume.query.filter_by(user_id=user.id, is_active=True),
+            Resume.created_at, Resume.id, limit, request.args.get('resumes_cursor')
+        )
+
+        # One page of active job descriptions, newest first
+        job_descriptions, job_descriptions_cursor = paginate(
+            JobDescription.query.filter_by(user_id=user.id, is_active=True),
+            JobDescription.created_at, JobDescription.id, limit, request.args.get('job_descriptions_cursor')
+        )
         
         resume_list = []
         for resume in resumes:
@@ -363,13 +372,22 @@ def get_available_suggestions():
                 'created_date': jd.created_at.isoformat()
             })
         
+        # Totals come from the rollup, not the current page
+        stats = user.get_stats()
         return jsonify({
             'success': True,
             'resumes': resume_list,
             'job_descriptions': jd_list,
-            'total_combinations': len(resume_list) * len(jd_list)
+            'total_combinations': stats.resume_count * stats.job_description_count,
+            'resumes_page': page_info(limit, resumes_cursor),
+            'job_descriptions_page': page_info(limit, job_descriptions_cursor)
         }), 200
 
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error in get_available_suggestions: {e}")
         return jsonify({
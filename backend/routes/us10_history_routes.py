@@ -5,31 +5,94 @@ API endpoints for retrieving user's scan history, statistics, and dashboard data
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, Resume, JobDescription, MatchScore, ScanHistory
+from backend.models import User, Resume, JobDescription, MatchScore, ScanHistory, UserStats, CATEGORY_SCORE_COLUMNS
+from backend.services.history_queries import (scan_summaries, analysis_summary_columns, category_average_columns,
+                                              history_version)
+from backend.services.conditional_get import Validators
+from backend.services.pagination import PaginationError, parse_page_args, paginate, page_info
+from backend.services.rate_limiter import COST_LIST
+from backend.middleware.auth_middleware import rate_limited_route
 from sqlalchemy import desc, func
+from sqlalchemy.orm import load_only
 from datetime import datetime, timedelta
 import json
 
 # Create blueprint for history routes
 history_bp = Blueprint('history', __name__, url_prefix='/api')
 
+# Keyset-paginated sort orders (each backed by a (user_id, column, id) index)
+HISTORY_SORT_COLUMNS = {
+    'created_at': ScanHistory.created_at,
+    'overall_score': ScanHistory.overall_match_score,
+    'overall_match_score': ScanHistory.overall_match_score,
+    **{column: getattr(ScanHistory, column) for column in CATEGORY_SCORE_COLUMNS}
+}
+
+
+def category_score_filters(args):
+    """
+    min_<category>/max_<category> query parameters as filter conditions
+
+    Args:
+        args: Request query parameters
+
+    Returns:
+        list: Conditions on the CATEGORY_SCORE_COLUMNS
+
+    Raises:
+        ValueError: When a bound is not a number
+    """
+    conditions = []
+    for column in CATEGORY_SCORE_COLUMNS:
+        for bound, compare in (('min', '__ge__'), ('max', '__le__')):
+            value = args.get(f'{bound}_{column}')
+            if value in (None, ''):
+                continue
+            try:
+                conditions.append(getattr(getattr(ScanHistory, column), compare)(float(value)))
+            except ValueError:
+                raise ValueError(f'{bound}_{column} must be a number')
+    return conditions
+
 
 @history_bp.route('/history', methods=['GET'])
 @jwt_required()
+@rate_limited_route(cost=COST_LIST)
 def get_scan_history():
     """
-    Get user's complete scan history with pagination
+    Get user's complete scan history with keyset pagination
     
     Query Parameters:
-    - page: Page number (default: 1)
-    - per_page: Items per page (default: 10, max: 50)
-    - sort_by: Sort field (default: 'created_at')
+    - limit (or per_page): Items per page (default: 10, max: 50)
+    - cursor: next_cursor from the previous page
+    - sort_by: 'created_at' (default), 'overall_score', 'technical_score',
+      'soft_skills_score', 'experience_score' or 'education_score'
     - sort_order: Sort order 'asc' or 'desc' (default: 'desc')
     - filter_score: Filter by score range 'excellent', 'good', 'fair', 'poor'
+    - min_<category>/max_<category>: Category score bounds, e.g.
+      min_technical_score=70 (categories as in sort_by)
+    
+    Responses carry an ETag and Last-Modified; a request whose validators are
+    still current gets 304 after the single version lookup.
     """
     try:
         # Get current user
         current_user_id = get_jwt_identity()
+        
+        # The rollup row doubles as the list's version
+        version = history_version(current_user_id)
+        validators = None
+        if version is not None:
+            stats, resumes_updated, job_descriptions_updated = version
+            validators = Validators.for_resource(
+                request, 'history', stats.user_id, stats.updated_at, stats.scan_count,
+                resumes_updated, job_descriptions_updated,
+                last_modified=max(filter(None, (stats.updated_at, resumes_updated, job_descriptions_updated)),
+                                  default=None)
+            )
+            if validators.is_current(request):
+                return validators.not_modified()
+        
         user = User.query.get(current_user_id)
         
         if not user:
@@ -39,14 +102,30 @@ def get_scan_history():
             }), 404
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 10, type=int), 50)
+        limit, cursor = parse_page_args(request.args, default_limit=10, max_limit=50)
         sort_by = request.args.get('sort_by', 'created_at')
+        if sort_by not in HISTORY_SORT_COLUMNS:
+            sort_by = 'created_at'
+        sort_column = HISTORY_SORT_COLUMNS[sort_by]
         sort_order = request.args.get('sort_order', 'desc')
         filter_score = request.args.get('filter_score', None)
+        try:
+            category_filters = category_score_filters(request.args)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
         
-        # Build query
-        query = db.session.query(ScanHistory).filter_by(user_id=current_user_id)
+        # Build query (resume/JD labels joined in; the analysis JSON is summarized
+        # in SQL instead of being loaded)
+        query = scan_summaries(
+            current_user_id,
+            *analysis_summary_columns(),
+            ScanHistory.ats_compatibility,
+            ScanHistory.algorithm_used,
+            ScanHistory.scan_duration
+        )
 
         # Apply score filter
         if filter_score:
@@ -58,88 +137,89 @@ def get_scan_history():
                 query = query.filter(ScanHistory.overall_match_score >= 40, ScanHistory.overall_match_score < 60)
             elif filter_score == 'poor':
                 query = query.filter(ScanHistory.overall_match_score < 40)
+        if category_filters:
+            query = query.filter(*category_filters)
 
-        # Apply sorting
-        if sort_by == 'overall_score':
-            sort_column = ScanHistory.overall_match_score
-        elif hasattr(ScanHistory, sort_by):
-            sort_column = getattr(ScanHistory, sort_by)
-        else:
-            sort_column = ScanHistory.created_at
+        # Sort and fetch one page; the cursor is bound to the sort key
+        scans, next_cursor = paginate(
+            query, sort_column, ScanHistory.id, limit, cursor,
+            descending=sort_order != 'asc', sort_key=sort_by
+        )
 
-        if sort_order == 'asc':
-            query = query.order_by(sort_column.asc())
+        # Totals come from the rollup instead of a COUNT over the history;
+        # category bounds have no rollup and are counted on their index
+        if version is None:
+            stats = user.get_stats()
+        if category_filters:
+            total_items = query.with_entities(func.count(ScanHistory.id)).order_by(None).scalar()
+        elif filter_score in UserStats.BUCKET_COLUMNS:
+            total_items = getattr(stats, UserStats.BUCKET_COLUMNS[filter_score])
         else:
-            query = query.order_by(sort_column.desc())
-        
-        # Paginate results
-        pagination = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+            total_items = stats.scan_count
         
         # Format scan history
         scan_history = []
-        for scan in pagination.items:
-            # Get resume and job description details (if available)
-            resume = Resume.query.get(scan.resume_id) if scan.resume_id else None
-            job_description = JobDescription.query.get(scan.job_description_id) if scan.job_description_id else None
-
-            # Extract category scores
-            category_scores = scan.category_scores or {}
+        for scan in scans:
+            # Resume and job description labels come from the joined row
+            resume = scan.resume_found is not None
+            job_description = scan.job_found is not None
 
             scan_data = {
                 'id': scan.id,
                 'match_score': round(scan.overall_match_score, 2),
-                'score_category': scan.get_score_category(),
-                'technical_score': round(category_scores.get('technical_skills', 0), 2),
-                'soft_skills_score': round(category_scores.get('soft_skills', 0), 2),
-                'experience_score': round(category_scores.get('experience_match', 0), 2),
-                'education_score': round(category_scores.get('education_match', 0), 2),
+                'score_category': ScanHistory.score_category_for(scan.overall_match_score),
+                'technical_score': round(scan.technical_score, 2),
+                'soft_skills_score': round(scan.soft_skills_score, 2),
+                'experience_score': round(scan.experience_score, 2),
+                'education_score': round(scan.education_score, 2),
                 'ats_compatibility': round(scan.ats_compatibility, 2),
                 'scan_type': scan.scan_type,
                 'algorithm_used': scan.algorithm_used,
                 'scan_duration': scan.scan_duration,
                 'created_at': scan.created_at.isoformat() if scan.created_at else None,
                 'resume': {
-                    'id': resume.id if resume else None,
-                    'title': resume.title if resume else 'Real-time Scan',
-                    'filename': resume.original_filename if resume else 'Real-time Resume',
-                    'upload_date': resume.created_at.isoformat() if resume and resume.created_at else None
+                    'id': scan.resume_found if resume else None,
+                    'title': scan.resume_title if resume else 'Real-time Scan',
+                    'filename': scan.resume_filename if resume else 'Real-time Resume',
+                    'upload_date': scan.resume_created_at.isoformat() if resume and scan.resume_created_at else None
                 },
                 'job_description': {
-                    'id': job_description.id if job_description else None,
-                    'title': job_description.title if job_description else 'Real-time Job Description',
-                    'company_name': job_description.company_name if job_description else 'Real-time Analysis',
-                    'created_date': job_description.created_at.isoformat() if job_description and job_description.created_at else None
+                    'id': scan.job_found if job_description else None,
+                    'title': scan.job_title if job_description else 'Real-time Job Description',
+                    'company_name': scan.company_name if job_description else 'Real-time Analysis',
+                    'created_date': scan.job_created_at.isoformat() if job_description and scan.job_created_at else None
                 },
-                'has_detailed_analysis': bool(scan.detailed_analysis),
-                'has_recommendations': bool(scan.recommendations),
-                'recommendations_count': len(scan.recommendations) if scan.recommendations else 0,
+                'has_detailed_analysis': bool(scan.has_detailed_analysis),
+                'has_recommendations': scan.recommendations_count > 0,
+                'recommendations_count': scan.recommendations_count,
                 'suggestions_available': True,  # All scans can generate suggestions
                 'premium_suggestions_available': True  # Premium available for all users
             }
             scan_history.append(scan_data)
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'scan_history': scan_history,
             'pagination': {
-                'page': pagination.page,
-                'per_page': pagination.per_page,
-                'total_pages': pagination.pages,
-                'total_items': pagination.total,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
+                **page_info(limit, next_cursor),
+                'per_page': limit,
+                'total_items': total_items,
+                'has_next': next_cursor is not None,
+                'has_prev': cursor is not None
             },
             'filters': {
                 'sort_by': sort_by,
                 'sort_order': sort_order,
                 'filter_score': filter_score
             }
-        }), 200
+        })
+        return (validators.apply(response) if validators is not None else response), 200
         
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         current_app.logger.error(f"Error getting scan history: {str(e)}")
         return jsonify({
@@ -166,70 +246,50 @@ def get_dashboard_stats():
                 'message': 'User not found'
             }), 404
         
-        # Get basic counts
-        total_resumes = Resume.query.filter_by(user_id=current_user_id, is_active=True).count()
-        total_job_descriptions = JobDescription.query.filter_by(user_id=current_user_id, is_active=True).count()
-        total_scans = ScanHistory.query.filter_by(user_id=current_user_id).count()
-
-        # Get score statistics
-        score_stats = db.session.query(
-            func.avg(ScanHistory.overall_match_score).label('avg_score'),
-            func.max(ScanHistory.overall_match_score).label('max_score'),
-            func.min(ScanHistory.overall_match_score).label('min_score')
-        ).filter_by(user_id=current_user_id).first()
-
-        # Get score distribution
-        excellent_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score >= 80).count()
-        good_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score >= 60, ScanHistory.overall_match_score < 80).count()
-        fair_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score >= 40, ScanHistory.overall_match_score < 60).count()
-        poor_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score < 40).count()
-
-        # Get recent activity (last 7 days)
+        # One statement: rollup row + top performing resume + 7-day count
+        # + category score averages
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        recent_scans = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.created_at >= seven_days_ago).count()
+        averages = category_average_columns(user.id)
+        row = UserStats.dashboard_row(user.id, seven_days_ago, *averages)
+        if row is None:
+            UserStats.for_user(user.id, persist=True)
+            row = UserStats.dashboard_row(user.id, seven_days_ago, *averages)
 
-        # Get top performing resume (only for stored resumes, not real-time scans)
-        top_resume_query = db.session.query(
-            Resume.id,
-            Resume.title,
-            Resume.original_filename,
-            func.avg(ScanHistory.overall_match_score).label('avg_score'),
-            func.count(ScanHistory.id).label('scan_count')
-        ).join(ScanHistory).filter(
-            Resume.user_id == current_user_id,
-            Resume.is_active == True,
-            ScanHistory.resume_id.isnot(None)  # Only stored resumes, not real-time scans
-        ).group_by(Resume.id).order_by(func.avg(ScanHistory.overall_match_score).desc()).first()
-        
+        stats, top_id, top_title, top_filename, top_scan_count, top_score_sum, recent_scans, *category_averages = row
+
+        # Top performing resume (only stored resumes, not real-time scans)
         top_resume = None
-        if top_resume_query:
+        if top_id is not None:
             top_resume = {
-                'id': top_resume_query.id,
-                'title': top_resume_query.title or 'Untitled Resume',
-                'filename': top_resume_query.original_filename,
-                'average_score': round(top_resume_query.avg_score, 2),
-                'scan_count': top_resume_query.scan_count
+                'id': top_id,
+                'title': top_title or 'Untitled Resume',
+                'filename': top_filename,
+                'average_score': round(top_score_sum / top_scan_count, 2),
+                'scan_count': top_scan_count
             }
         
         return jsonify({
             'success': True,
             'stats': {
-                'total_resumes': total_resumes,
-                'total_job_descriptions': total_job_descriptions,
-                'total_scans': total_scans,
+                'total_resumes': stats.resume_count,
+                'total_job_descriptions': stats.job_description_count,
+                'total_scans': stats.scan_count,
                 'recent_scans_7_days': recent_scans,
                 'score_statistics': {
-                    'average_score': round(score_stats.avg_score, 2) if score_stats.avg_score else 0,
-                    'highest_score': round(score_stats.max_score, 2) if score_stats.max_score else 0,
-                    'lowest_score': round(score_stats.min_score, 2) if score_stats.min_score else 0
+                    'average_score': round(stats.average_score, 2),
+                    'highest_score': round(stats.score_max, 2) if stats.score_max else 0,
+                    'lowest_score': round(stats.score_min, 2) if stats.score_min else 0
                 },
                 'score_distribution': {
-                    'excellent': excellent_count,  # 80-100%
-                    'good': good_count,           # 60-79%
-                    'fair': fair_count,           # 40-59%
-                    'poor': poor_count            # 0-39%
+                    'excellent': stats.excellent_count,  # 80-100%
+                    'good': stats.good_count,            # 60-79%
+                    'fair': stats.fair_count,            # 40-59%
+                    'poor': stats.poor_count             # 0-39%
                 },
-                'top_performing_resume': top_resume
+                'top_performing_resume': top_resume,
+                'category_averages': {
+                    column.name: round(value or 0.0, 1) for column, value in zip(averages, category_averages)
+                }
             }
         }), 200
         
@@ -259,19 +319,25 @@ def get_recent_activity():
                 'message': 'User not found'
             }), 404
         
-        # Get recent scans (last 5)
-        recent_scans = db.session.query(ScanHistory).filter_by(
-            user_id=current_user_id
-        ).order_by(ScanHistory.created_at.desc()).limit(5).all()
+        # Get recent scans (last 5) with resume/JD labels joined in
+        recent_scans = scan_summaries(current_user_id).order_by(
+            ScanHistory.created_at.desc()
+        ).limit(5).all()
 
         # Get recent resumes (last 3)
-        recent_resumes = Resume.query.filter_by(
+        recent_resumes = Resume.query.options(load_only(
+            Resume.id, Resume.title, Resume.original_filename,
+            Resume.keywords_extracted, Resume.keyword_count, Resume.created_at
+        )).filter_by(
             user_id=current_user_id,
             is_active=True
         ).order_by(Resume.created_at.desc()).limit(3).all()
 
         # Get recent job descriptions (last 3)
-        recent_jds = JobDescription.query.filter_by(
+        recent_jds = JobDescription.query.options(load_only(
+            JobDescription.id, JobDescription.title, JobDescription.company_name,
+            JobDescription.keywords_extracted, JobDescription.keyword_count, JobDescription.created_at
+        )).filter_by(
             user_id=current_user_id,
             is_active=True
         ).order_by(JobDescription.created_at.desc()).limit(3).all()
@@ -279,16 +345,16 @@ def get_recent_activity():
         # Format recent scans
         formatted_scans = []
         for scan in recent_scans:
-            resume = Resume.query.get(scan.resume_id) if scan.resume_id else None
-            job_description = JobDescription.query.get(scan.job_description_id) if scan.job_description_id else None
+            resume = scan.resume_found is not None
+            job_description = scan.job_found is not None
 
             formatted_scans.append({
                 'id': scan.id,
                 'match_score': round(scan.overall_match_score, 2),
-                'score_category': scan.get_score_category(),
-                'resume_title': resume.title if resume else 'Real-time Scan',
-                'job_title': job_description.title if job_description else 'Real-time Job Description',
-                'company_name': job_description.company_name if job_description else 'Real-time Analysis',
+                'score_category': ScanHistory.score_category_for(scan.overall_match_score),
+                'resume_title': scan.resume_title if resume else 'Real-time Scan',
+                'job_title': scan.job_title if job_description else 'Real-time Job Description',
+                'company_name': scan.company_name if job_description else 'Real-time Analysis',
                 'scan_type': scan.scan_type,
                 'created_at': scan.created_at.isoformat() if scan.created_at else None
             })
@@ -6,120 +6,59 @@ Implements the exact algorithm specified with regex patterns, normalization, and
 
 import re
 from typing import Dict, List, Set, Tuple
+from backend.services.skill_taxonomy import get_matcher
 
 class AdvancedKeywordExtractor:
     """Advanced keyword extraction with comprehensive pattern matching"""
 
     def __init__(self):
         """Initialize the advanced keyword extractor"""
+        # Keyword lists, variations and priorities come from the shared skill taxonomy
+        self.scope = 'advanced'
 
-        # Simple keyword normalization mapping
-        self.keyword_variations = {
-            'c#': ['c#', 'csharp', 'c sharp'],
-            'asp.net': ['asp.net', 'aspnet', 'asp net'],
-            'javascript': ['javascript', 'js'],
-            'typescript': ['typescript', 'ts'],
-            'sql server': ['sql server', 'sqlserver', 'mssql'],
-            'entity framework': ['entity framework', 'ef', 'ef core'],
-        }
+    @property
+    def TECH_KEYWORDS(self) -> List[str]:
+        return get_matcher().terms(self.scope, 'technical')
 
-        # Priority levels for keywords
-        self.priority_keywords = {
-            'critical': ['c#', 'asp.net', 'sql server', 'javascript', 'python', 'java'],
-            'high': ['typescript', 'angular', 'react', 'node.js', 'mongodb'],
-            'medium': ['html', 'css', 'git', 'docker', 'kubernetes']
-        }
+    @property
+    def SOFT_SKILLS(self) -> List[str]:
+        return get_matcher().terms(self.scope, 'soft')
+
+    @property
+    def INDUSTRY_TERMS(self) -> List[str]:
+        return get_matcher().terms(self.scope, 'industry')
+
+    @property
+    def priority_keywords(self) -> Dict[str, List[str]]:
+        """Priority levels for keywords"""
+        return get_matcher().priorities()
 
     def get_all_variations(self, keyword: str) -> List[str]:
         """Get all variations of a keyword"""
-        keyword_lower = keyword.lower()
-        if keyword_lower in self.keyword_variations:
-            return self.keyword_variations[keyword_lower]
-        return [keyword_lower]
+        return get_matcher().variations(keyword)
 
     def normalize_keyword(self, keyword: str) -> str:
         """Normalize a keyword to its canonical form"""
-        keyword_lower = keyword.lower().strip()
-
-        # Find the canonical form
-        for canonical, variations in self.keyword_variations.items():
-            if keyword_lower in [v.lower() for v in variations]:
-                return canonical
-
-        return keyword_lower
+        return get_matcher().canonical(keyword, self.scope)
 
     def get_priority_level(self, keyword: str, context_text: str = "") -> str:
         """Get priority level of a keyword"""
-        keyword_lower = keyword.lower()
-
-        for priority, keywords in self.priority_keywords.items():
-            if keyword_lower in [k.lower() for k in keywords]:
-                return priority
-
-        return "medium"  # Default priority
-        
-        # Comprehensive technical keywords list
-        self.TECH_KEYWORDS = [
-            "asp.net core", "c#", "entity framework", "sql server", "angular", "typescript",
-            "tailwind", "rest", "jwt", "guards", "rbac", "rxjs", "ngrx",
-            "swagger", "postman", "redis", "docker", "azure", "ci/cd", "github actions",
-            "signalr", "web api", "mvc", "blazor", "razor", "linq", "dependency injection",
-            "unit testing", "integration testing", "xunit", "nunit", "moq", "iis",
-            "microservices", "authentication", "authorization", "pipes", "observables",
-            "httpclient", "bootstrap", "sass", "less", "webpack", "npm", "yarn",
-            "git", "visual studio", "vs code", "javascript", "html", "css",
-            # Additional keywords for better resume matching
-            "python", "java", "springboot", "django", "fastapi", "sql", "aws", "mongodb",
-            "kafka", "github", "mysql", "hibernate", "jquery", "opencv", "tensorflow",
-            "sqlalchemy", "orm", "pymupdf", "palm2", "llm", "google", "postgresql",
-            "spring mvc", "data jpa", "crud", "tomcat", "jasper", "jstl", "ec2", "s3", "rds",
-            "serializer", "compose", "jdbc", "scrum", "stored procedures", "cloud",
-            "certification", "full stack", "microsoft", "api", "restful", "machine learning",
-            "ai", "classification", "realtime", "event driven", "obstacle detection"
-        ]
-        
-        # Soft skills list - Enhanced for better resume detection
-        self.SOFT_SKILLS = [
-            "communication", "collaboration", "problem solving", "problem-solving", "innovation", "writing",
-            "leadership", "project management", "time management", "critical thinking",
-            "adaptability", "teamwork", "analytical", "creative", "organized",
-            # Additional patterns for resume detection
-            "team work", "team player", "independent", "self-motivated", "detail-oriented",
-            "attention to detail", "multitasking", "multi-tasking", "debugging", "troubleshooting",
-            "research", "analysis", "planning", "coordination", "mentoring", "training"
-        ]
-        
-        # Industry terms list - Enhanced for better coverage
-        self.INDUSTRY_TERMS = [
-            "high", "write", "core", "asp", "skill", "integration", "frontend", "backend",
-            "full-stack", "scalable", "secure", "responsive", "cross-platform", "performance",
-            "maintainable", "extensible", "architecture", "framework", "component",
-            "deployment", "environment", "configuration", "workflow", "agile", "devops",
-            "develop", "build", "create", "design", "implement", "maintain", "optimize",
-            # Additional industry terms for better resume matching
-            "automation", "testing", "quality", "production", "development", "software",
-            "application", "system", "platform", "solution", "service", "technology"
-        ]
+        return get_matcher().priority(keyword) or "medium"  # Default priority
     
     def extract_keywords(self, text: str, keyword_list: List[str]) -> Set[str]:
-        """Extract keywords using regex patterns with normalization"""
-        text_lower = text.lower()
-        found = set()
-        
-        for kw in keyword_list:
-            # Get all variations of the keyword
-            variations = self.get_all_variations(kw)
+        """Extract keywords (and their variations) with word-boundary matching and normalization"""
+        matcher = get_matcher()
+        wanted = {matcher.canonical(kw, self.scope) for kw in keyword_list}
 
-            for variation in variations:
-                # Create regex pattern for exact word boundary matching
-                pattern = r"\b" + re.escape(variation.lower()) + r"\b"
+        found = {hit.term for hit in matcher.find(text, self.scope) if hit.term in wanted}
+
+        # Keywords outside the taxonomy fall back to a plain regex search
+        text_lower = text.lower()
+        for kw in wanted:
+            if kw not in found and not matcher.lookup(kw):
+                if re.search(r"\b" + re.escape(kw) + r"\b", text_lower):
+                    found.add(kw)
 
-                if re.search(pattern, text_lower):
-                    # Add the canonical form
-                    canonical = self.normalize_keyword(variation)
-                    found.add(canonical)
-                    break  # Found one variation, no need to check others
-        
         return found
     
     def extract_multi_word_keywords(self, text: str) -> Set[str]:
@@ -168,7 +107,6 @@ class AdvancedKeywordExtractor:
     def extract_with_stemming(self, text: str, keyword_list: List[str]) -> Set[str]:
         """Extract keywords with basic stemming (RESTful → REST)"""
         text_lower = text.lower()
-        found = set()
         
         # Basic stemming patterns
         stemming_patterns = {
@@ -189,16 +127,7 @@ class AdvancedKeywordExtractor:
             normalized_text = re.sub(pattern, replacement, normalized_text)
         
         # Extract from normalized text
-        for kw in keyword_list:
-            variations = self.get_all_variations(kw)
-            for variation in variations:
-                pattern = r"\b" + re.escape(variation.lower()) + r"\b"
-                if re.search(pattern, normalized_text):
-                    canonical = self.normalize_keyword(variation)
-                    found.add(canonical)
-                    break
-        
-        return found
+        return self.extract_keywords(normalized_text, keyword_list)
 
     def extract_keywords_comprehensive(self, text: str) -> Dict[str, List[str]]:
         """
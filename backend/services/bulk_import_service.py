@@ -0,0 +1,442 @@
+"""
+Bulk import service for onboarding many resumes or job descriptions at once
+
+Resumes arrive as a ZIP archive, job descriptions as NDJSON or CSV. Items are
+read lazily from the upload, grouped into batches and parsed in a process pool
+(FileParser + KeywordParser.extract_keywords_batch), while the request thread
+writes the finished batches to the database with one commit per batch.
+"""
+import io
+import os
+import csv
+import json
+import uuid
+import zipfile
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.utils import secure_filename
+from backend.models import db, Resume, JobDescription
+from backend.services.file_parser import FileParser
+from backend.services.keyword_parser import KeywordParser
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Items per worker batch / database commit
+DEFAULT_BATCH_SIZE = 32
+
+# Archive safety limits
+MAX_ARCHIVE_MEMBERS = 1000
+MAX_ARCHIVE_UNCOMPRESSED_SIZE = 256 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 100
+
+# Job description import limits
+MAX_JD_ROWS = 5000
+
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+# ---------------- WORKER SIDE ----------------
+
+_worker_keyword_parser = None
+
+
+def _init_worker():
+    """Build the keyword parser once per worker process"""
+    global _worker_keyword_parser
+    _worker_keyword_parser = KeywordParser()
+
+
+def _get_worker_keyword_parser():
+    if _worker_keyword_parser is None:
+        _init_worker()
+    return _worker_keyword_parser
+
+
+def _empty_keywords():
+    return {'technical_skills': [], 'soft_skills': [], 'other_keywords': []}
+
+
+def process_resume_batch(items):
+    """
+    Parse a batch of stored resume files and extract their keywords
+
+    Args:
+        items (list): (index, file_path, file_type) tuples
+
+    Returns:
+        list: (index, success, text, error, keywords) tuples
+    """
+    parsed = []
+    for index, file_path, file_type in items:
+        try:
+            success, text, error = FileParser.parse_resume_file(file_path, file_type)
+        except Exception as e:
+            success, text, error = False, "", str(e)
+        parsed.append((index, success, text, error))
+
+    texts = [text if success else "" for _, success, text, _ in parsed]
+    try:
+        keywords = _get_worker_keyword_parser().extract_keywords_batch(texts)
+    except Exception as e:
+        logger.error(f"Batch keyword extraction failed: {e}")
+        keywords = [_empty_keywords() for _ in texts]
+
+    return [
+        (index, success, text, error, kw)
+        for (index, success, text, error), kw in zip(parsed, keywords)
+    ]
+
+
+def process_job_description_batch(items):
+    """
+    Extract keywords for a batch of job description texts
+
+    Args:
+        items (list): (index, job_text) tuples
+
+    Returns:
+        list: (index, keywords) tuples
+    """
+    texts = [job_text for _, job_text in items]
+    try:
+        keywords = _get_worker_keyword_parser().extract_keywords_batch(texts)
+    except Exception as e:
+        logger.error(f"Batch keyword extraction failed: {e}")
+        keywords = [_empty_keywords() for _ in texts]
+
+    return [(index, kw) for (index, _), kw in zip(items, keywords)]
+
+
+# ---------------- REQUEST SIDE ----------------
+
+class BulkImportService:
+    """Service for importing resumes and job descriptions in batches"""
+
+    _executor = None
+    _executor_workers = 0
+    _executor_lock = threading.Lock()
+
+    def __init__(self, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = max(1, batch_size)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the service from a Flask config mapping"""
+        return cls(
+            workers=config.get('BULK_IMPORT_WORKERS'),
+            batch_size=config.get('BULK_IMPORT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        )
+
+    # ---------------- RESUMES ----------------
+
+    def import_resumes(self, user_id, archive, resume_folder, max_file_size):
+        """
+        Import every supported resume file from a ZIP archive
+
+        Args:
+            user_id: Owner of the imported resumes
+            archive: Seekable file-like ZIP archive
+            resume_folder (str): Storage folder for extracted files
+            max_file_size (int): Per-file size limit in bytes
+
+        Returns:
+            dict: Import report with a summary and one entry per archive member
+        """
+        report = _Report()
+
+        try:
+            zf = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile:
+            raise ValueError('Uploaded file is not a valid ZIP archive')
+
+        with zf:
+            stored = self._extract_archive(zf, resume_folder, max_file_size, report)
+            pending = {}
+
+            def batches():
+                batch = []
+                for index, name, file_path, file_type in stored:
+                    pending[index] = (name, file_path, file_type)
+                    batch.append((index, file_path, file_type))
+                    if len(batch) >= self.batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+
+            try:
+                for results in self._run(process_resume_batch, batches()):
+                    resumes = []
+                    for index, success, text, error, keywords in results:
+                        name, file_path, file_type = pending.pop(index)
+                        resume = Resume(
+                            user_id=user_id,
+                            original_filename=name,
+                            file_path=file_path,
+                            file_size=os.path.getsize(file_path),
+                            file_type=file_type,
+                            title=name
+                        )
+                        if success:
+                            resume.extracted_text = text
+                            resume.upload_status = 'completed'
+                            resume.set_keywords(
+                                technical_skills=keywords['technical_skills'],
+                                soft_skills=keywords['soft_skills'],
+                                other_keywords=keywords['other_keywords']
+                            )
+                        else:
+                            resume.upload_status = 'failed'
+                            resume.error_message = error
+                        resumes.append((index, name, success, error, resume))
+
+                    self._commit_batch([resume for *_, resume in resumes])
+                    for index, name, success, error, resume in resumes:
+                        if success:
+                            report.add(index, name, 'imported', id=resume.id)
+                        else:
+                            report.add(index, name, 'failed', id=resume.id, error=error)
+            except Exception:
+                # Files extracted for batches that never reached the database
+                for _, file_path, _ in pending.values():
+                    _remove_quietly(file_path)
+                raise
+
+        return report.to_dict()
+
+    def _extract_archive(self, zf, resume_folder, max_file_size, report):
+        """Yield (index, name, file_path, file_type) for each safely extracted member"""
+        members = [info for info in zf.infolist() if not info.is_dir()]
+        if len(members) > MAX_ARCHIVE_MEMBERS:
+            raise ValueError(f'Archive contains more than {MAX_ARCHIVE_MEMBERS} files')
+
+        total_size = 0
+        os.makedirs(resume_folder, exist_ok=True)
+
+        for index, info in enumerate(members):
+            name = os.path.basename(info.filename)
+
+            # Skip OS metadata such as __MACOSX/._resume.pdf or .DS_Store
+            if not name or name.startswith('.') or '__MACOSX' in info.filename:
+                report.add(index, info.filename, 'skipped', error='Hidden or system file')
+                continue
+
+            is_valid, file_type, error = FileParser.validate_file_type(name)
+            if not is_valid:
+                report.add(index, name, 'skipped', error=error)
+                continue
+
+            if info.flag_bits & 0x1:
+                report.add(index, name, 'failed', error='Encrypted archive entries are not supported')
+                continue
+
+            if info.file_size > max_file_size:
+                report.add(index, name, 'failed', error=f'File exceeds {max_file_size} bytes')
+                continue
+
+            if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+                report.add(index, name, 'failed', error='Suspicious compression ratio')
+                continue
+
+            total_size += info.file_size
+            if total_size > MAX_ARCHIVE_UNCOMPRESSED_SIZE:
+                report.add(index, name, 'failed', error='Archive uncompressed size limit reached')
+                continue
+
+            original_filename = secure_filename(name) or f'resume.{file_type}'
+            file_path = os.path.join(resume_folder, f"{uuid.uuid4().hex}.{file_type}")
+
+            try:
+                # Header sizes can lie, so the real byte count is enforced while copying
+                with zf.open(info) as src, open(file_path, 'wb') as dst:
+                    copied = 0
+                    for block in iter(lambda: src.read(COPY_BLOCK_SIZE), b''):
+                        copied += len(block)
+                        if copied > max_file_size:
+                            raise ValueError(f'File exceeds {max_file_size} bytes')
+                        dst.write(block)
+            except Exception as e:
+                _remove_quietly(file_path)
+                report.add(index, name, 'failed', error=str(e))
+                continue
+
+            yield index, original_filename, file_path, file_type
+
+    # ---------------- JOB DESCRIPTIONS ----------------
+
+    def import_job_descriptions(self, user_id, stream, filename):
+        """
+        Import job descriptions from an NDJSON or CSV upload
+
+        Each record needs 'title' and 'job_text' (or 'description'), and may
+        include 'company_name' (or 'company').
+
+        Returns:
+            dict: Import report with a summary and one entry per record
+        """
+        report = _Report()
+        rows = {}
+
+        def batches():
+            batch = []
+            for index, record in self._iter_records(stream, filename):
+                if index >= MAX_JD_ROWS:
+                    report.add(index, None, 'skipped', error=f'Row limit of {MAX_JD_ROWS} reached')
+                    break
+
+                title = str(record.get('title') or '').strip()
+                job_text = str(record.get('job_text') or record.get('description') or '').strip()
+                company_name = str(record.get('company_name') or record.get('company') or '').strip()
+
+                errors = JobDescription.validate_job_description(title, job_text, company_name)
+                if errors:
+                    report.add(index, title or None, 'failed', error='; '.join(errors))
+                    continue
+
+                rows[index] = (title, job_text, company_name)
+                batch.append((index, job_text))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        for results in self._run(process_job_description_batch, batches()):
+            job_descriptions = []
+            for index, keywords in results:
+                title, job_text, company_name = rows.pop(index)
+                job_description = JobDescription(
+                    user_id=user_id,
+                    title=title,
+                    job_text=job_text,
+                    company_name=company_name or None
+                )
+                job_description.set_keywords(
+                    technical_skills=keywords['technical_skills'],
+                    soft_skills=keywords['soft_skills'],
+                    other_keywords=keywords['other_keywords']
+                )
+                job_descriptions.append((index, title, job_description))
+
+            self._commit_batch([jd for *_, jd in job_descriptions])
+            for index, title, job_description in job_descriptions:
+                report.add(index, title, 'imported', id=job_description.id)
+
+        return report.to_dict()
+
+    @staticmethod
+    def _iter_records(stream, filename):
+        """Yield (index, dict) records from an NDJSON or CSV byte stream"""
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+        extension = filename.lower().rsplit('.', 1)[-1] if '.' in filename else ''
+
+        if extension == 'csv':
+            for index, record in enumerate(csv.DictReader(text)):
+                yield index, {(k or '').strip().lower(): v for k, v in record.items()}
+            return
+
+        if extension not in ('ndjson', 'jsonl', 'json'):
+            raise ValueError('Unsupported file type. Upload an NDJSON (.ndjson/.jsonl) or CSV file')
+
+        index = 0
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield index, record if isinstance(record, dict) else {}
+            index += 1
+
+    # ---------------- SHARED ----------------
+
+    def _run(self, worker_fn, batches):
+        """
+        Run worker_fn over batches, yielding results in input order
+
+        At most two batches per worker are in flight, so only a bounded number
+        of parsed documents is held in memory at a time.
+        """
+        executor = self._get_executor() if self.workers > 1 else None
+
+        if executor is None:
+            for batch in batches:
+                yield worker_fn(batch)
+            return
+
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(executor.submit(worker_fn, batch))
+            if len(in_flight) >= self.workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def _get_executor(self):
+        cls = BulkImportService
+        with cls._executor_lock:
+            if cls._executor is None or cls._executor_workers != self.workers:
+                if cls._executor is not None:
+                    cls._executor.shutdown(wait=False)
+                # spawn keeps workers free of the parent's DB connections and threads
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                cls._executor_workers = self.workers
+            return cls._executor
+
+    @staticmethod
+    def _commit_batch(records):
+        """Insert one batch of new rows with a single commit"""
+        if not records:
+            return
+        try:
+            db.session.add_all(records)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for record in records:
+                if isinstance(record, Resume):
+                    _remove_quietly(record.file_path)
+            raise
+
+
+class _Report:
+    """Per-item import report"""
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, index, name, status, id=None, error=None):
+        self.items.append({
+            'index': index,
+            'name': name,
+            'status': status,
+            'id': id,
+            'error': error or None
+        })
+
+    def to_dict(self):
+        items = sorted(self.items, key=lambda item: item['index'])
+        summary = {'total': len(items), 'imported': 0, 'failed': 0, 'skipped': 0}
+        for item in items:
+            summary[item['status']] += 1
+        return {'summary': summary, 'items': items}
+
+
+def _remove_quietly(path):
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,428 @@
+"""
+Chunked upload service for resumable resume uploads
+
+An upload is a `<upload_id>.part` data file plus a `<upload_id>.json` sidecar
+in the incoming folder. Clients PUT byte ranges in order; each range is copied
+from the request stream to disk in small blocks, so worker memory stays flat
+no matter how large the file is. An interrupted upload is resumed by asking
+for its status and continuing from the reported offset.
+"""
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from werkzeug.utils import secure_filename
+from backend.services.file_parser import FileParser
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Request bodies are copied to disk in blocks of this many bytes
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# Default limits (overridable from the Flask config)
+DEFAULT_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+DEFAULT_MAX_CHUNK_SIZE = 1024 * 1024
+DEFAULT_UPLOAD_EXPIRY_SECONDS = 24 * 60 * 60
+
+
+class ChunkedUploadError(Exception):
+    """Upload protocol error carrying the HTTP status code to return"""
+
+    def __init__(self, message, status_code=400, **details):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+
+class ChunkedUploadService:
+    """Service for storing resumable uploads chunk by chunk"""
+
+    # Running SHA-256 per upload: upload_id -> (offset, hasher, last use). Only
+    # valid while the chunks of an upload keep arriving at the same worker
+    # process; finalize re-hashes the file from disk otherwise.
+    _hashers = {}
+    _hashers_lock = threading.Lock()
+
+    def __init__(self, incoming_folder, max_upload_size=DEFAULT_MAX_UPLOAD_SIZE,
+                 max_chunk_size=DEFAULT_MAX_CHUNK_SIZE,
+                 expiry_seconds=DEFAULT_UPLOAD_EXPIRY_SECONDS):
+        self.incoming_folder = incoming_folder
+        self.max_upload_size = max_upload_size
+        self.max_chunk_size = max_chunk_size
+        self.expiry_seconds = expiry_seconds
+        os.makedirs(incoming_folder, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the service from a Flask config mapping"""
+        return cls(
+            config['CHUNKED_UPLOAD_FOLDER'],
+            max_upload_size=config.get('MAX_UPLOAD_SIZE', DEFAULT_MAX_UPLOAD_SIZE),
+            max_chunk_size=config.get('UPLOAD_CHUNK_SIZE', DEFAULT_MAX_CHUNK_SIZE),
+            expiry_seconds=config.get('UPLOAD_EXPIRY_SECONDS', DEFAULT_UPLOAD_EXPIRY_SECONDS)
+        )
+
+    # ---------------- PROTOCOL ----------------
+
+    def init_upload(self, user_id, filename, total_size, title=''):
+        """
+        Register a new upload and create its empty data file
+
+        Args:
+            user_id: Owner of the upload
+            filename (str): Original file name (used for type validation)
+            total_size (int): Declared size of the complete file in bytes
+            title (str): Optional resume title
+
+        Returns:
+            dict: Upload status
+        """
+        is_valid, file_type, error = FileParser.validate_file_type(filename)
+        if not is_valid:
+            raise ChunkedUploadError(error, 400)
+
+        try:
+            total_size = int(total_size)
+        except (TypeError, ValueError):
+            raise ChunkedUploadError('total_size must be an integer', 400)
+
+        if total_size <= 0:
+            raise ChunkedUploadError('File is empty', 400)
+        if total_size > self.max_upload_size:
+            raise ChunkedUploadError(
+                f'File too large. Maximum size is {self.max_upload_size} bytes', 413,
+                max_size=self.max_upload_size
+            )
+
+        self.cleanup_stale()
+
+        upload_id = uuid.uuid4().hex
+        now = datetime.utcnow().isoformat()
+        meta = {
+            'upload_id': upload_id,
+            'user_id': str(user_id),
+            'original_filename': secure_filename(filename) or f'resume.{file_type}',
+            'file_type': file_type,
+            'title': (title or '').strip(),
+            'total_size': total_size,
+            'received': 0,
+            'created_at': now,
+            'updated_at': now
+        }
+
+        open(self._part_path(upload_id), 'wb').close()
+        self._write_meta(meta)
+        self._set_hasher(upload_id, 0, hashlib.sha256())
+
+        logger.info(f"Chunked upload {upload_id} started ({total_size} bytes)")
+        return self._status(meta)
+
+    def get_status(self, upload_id, user_id):
+        """Return the status of an upload (used to resume after interruption)"""
+        return self._status(self._load_meta(upload_id, user_id))
+
+    def write_chunk(self, upload_id, user_id, start, length, stream):
+        """
+        Append one byte range to an upload
+
+        Args:
+            upload_id (str): Upload identifier from init_upload
+            user_id: Owner of the upload
+            start (int): Offset of the first byte in this chunk
+            length (int): Number of bytes in this chunk
+            stream: File-like request body
+
+        Returns:
+            dict: Upload status after the chunk was stored
+        """
+        if length <= 0:
+            raise ChunkedUploadError('Empty chunk', 400)
+        if length > self.max_chunk_size:
+            raise ChunkedUploadError(
+                f'Chunk too large. Maximum chunk size is {self.max_chunk_size} bytes', 413,
+                max_chunk_size=self.max_chunk_size
+            )
+
+        with self._locked(upload_id):
+            meta = self._load_meta(upload_id, user_id)
+            received = meta['received']
+
+            if start != received:
+                raise ChunkedUploadError(
+                    'Chunk does not start at the current upload offset', 409,
+                    expected_offset=received
+                )
+            if start + length > meta['total_size']:
+                raise ChunkedUploadError('Chunk extends past the declared file size', 416,
+                                         expected_offset=received)
+
+            # Taken out of the cache while writing so a failed write cannot leave a
+            # hasher whose state no longer matches the stored offset
+            hasher = self._get_hasher(upload_id, received)
+            self._drop_hasher(upload_id)
+            written = 0
+
+            with open(self._part_path(upload_id), 'r+b') as part:
+                part.seek(received)
+                part.truncate()
+                while written < length:
+                    block = stream.read(min(STREAM_BLOCK_SIZE, length - written))
+                    if not block:
+                        break
+                    part.write(block)
+                    if hasher is not None:
+                        hasher.update(block)
+                    written += len(block)
+
+            # A short body (client disconnected) still advances the offset so the
+            # client can resume from whatever reached the disk
+            meta['received'] = received + written
+            meta['updated_at'] = datetime.utcnow().isoformat()
+            self._write_meta(meta)
+
+            if hasher is not None:
+                self._set_hasher(upload_id, meta['received'], hasher)
+
+            if written < length:
+                raise ChunkedUploadError('Incomplete chunk received', 400,
+                                         expected_offset=meta['received'])
+
+            return self._status(meta)
+
+    def finalize(self, upload_id, user_id, destination_folder, expected_sha256=None):
+        """
+        Verify a complete upload and move it into the storage folder
+
+        Returns:
+            dict: Upload metadata including 'file_path', 'file_size' and 'sha256'
+        """
+        with self._locked(upload_id):
+            meta = self._load_meta(upload_id, user_id)
+
+            if meta['received'] != meta['total_size']:
+                raise ChunkedUploadError('Upload is incomplete', 409,
+                                         expected_offset=meta['received'])
+
+            part_path = self._part_path(upload_id)
+            hasher = self._get_hasher(upload_id, meta['received'])
+            if hasher is None:
+                hasher = self._hash_file(part_path)
+            digest = hasher.hexdigest()
+
+            if expected_sha256 and expected_sha256.lower() != digest:
+                self._discard(upload_id)
+                raise ChunkedUploadError('Checksum mismatch, please upload the file again', 422)
+
+            os.makedirs(destination_folder, exist_ok=True)
+            file_path = os.path.join(destination_folder, f"{upload_id}.{meta['file_type']}")
+            os.replace(part_path, file_path)
+            self._discard(upload_id)
+
+            meta.update({
+                'file_path': file_path,
+                'file_size': os.path.getsize(file_path),
+                'sha256': digest
+            })
+            logger.info(f"Chunked upload {upload_id} finalized ({meta['file_size']} bytes)")
+            return meta
+
+    def abort(self, upload_id, user_id):
+        """Cancel an upload and delete its partial data"""
+        with self._locked(upload_id):
+            self._load_meta(upload_id, user_id)
+            self._discard(upload_id)
+
+    def cleanup_stale(self):
+        """
+        Delete uploads that have not received data within the expiry window
+
+        Also forgets their cached hashers (including those of uploads another
+        worker expired) and deletes lock files left without an upload.
+
+        Returns:
+            int: Number of uploads removed
+        """
+        cutoff = time.time() - self.expiry_seconds
+        removed = 0
+        self._evict_hashers(cutoff)
+
+        try:
+            entries = os.listdir(self.incoming_folder)
+        except OSError:
+            return 0
+
+        for name in entries:
+            upload_id, extension = os.path.splitext(name)
+            if extension not in ('.json', '.part', '.lock'):
+                continue
+            path = os.path.join(self.incoming_folder, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                if extension == '.json':
+                    # Under the upload's lock, so a chunk arriving meanwhile keeps it
+                    # alive; the lock file goes away once the sidecar is gone
+                    with self._locked(upload_id):
+                        if os.path.getmtime(path) < cutoff:
+                            self._discard(upload_id)
+                            removed += 1
+                elif not os.path.exists(self._meta_path(upload_id)):
+                    # Data or lock file whose upload no longer exists
+                    os.remove(path)
+            except OSError:
+                continue
+
+        if removed:
+            logger.info(f"Removed {removed} stale chunked uploads")
+        return removed
+
+    # ---------------- HELPERS ----------------
+
+    @staticmethod
+    def parse_content_range(header):
+        """
+        Parse a 'Content-Range: bytes start-end/total' header
+
+        Returns:
+            tuple: (start: int, end: int, total: int or None)
+        """
+        if not header:
+            raise ChunkedUploadError('Content-Range header is required', 400)
+
+        try:
+            unit, _, spec = header.strip().partition(' ')
+            byte_range, _, total = spec.partition('/')
+            start, _, end = byte_range.partition('-')
+            start, end = int(start), int(end)
+            total = None if total in ('', '*') else int(total)
+        except ValueError:
+            raise ChunkedUploadError('Malformed Content-Range header', 400)
+
+        if unit != 'bytes' or start < 0 or end < start:
+            raise ChunkedUploadError('Malformed Content-Range header', 400)
+
+        return start, end, total
+
+    def _status(self, meta):
+        return {
+            'upload_id': meta['upload_id'],
+            'original_filename': meta['original_filename'],
+            'total_size': meta['total_size'],
+            'received': meta['received'],
+            'next_offset': meta['received'],
+            'complete': meta['received'] == meta['total_size'],
+            'max_chunk_size': self.max_chunk_size,
+            'updated_at': meta['updated_at']
+        }
+
+    def _part_path(self, upload_id):
+        return os.path.join(self.incoming_folder, f'{upload_id}.part')
+
+    def _meta_path(self, upload_id):
+        return os.path.join(self.incoming_folder, f'{upload_id}.json')
+
+    def _load_meta(self, upload_id, user_id):
+        # Upload ids are generated hex tokens; reject anything else before touching the disk
+        if not upload_id or not all(c in '0123456789abcdef' for c in upload_id):
+            raise ChunkedUploadError('Upload not found', 404)
+
+        try:
+            with open(self._meta_path(upload_id), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            raise ChunkedUploadError('Upload not found', 404)
+
+        if meta.get('user_id') != str(user_id):
+            raise ChunkedUploadError('Upload not found', 404)
+
+        return meta
+
+    def _write_meta(self, meta):
+        path = self._meta_path(meta['upload_id'])
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def _discard(self, upload_id):
+        for path in (self._part_path(upload_id), self._meta_path(upload_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._drop_hasher(upload_id)
+
+    def _locked(self, upload_id):
+        return _UploadLock(os.path.join(self.incoming_folder, f'{upload_id}.lock'))
+
+    @staticmethod
+    def _hash_file(path):
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(STREAM_BLOCK_SIZE), b''):
+                hasher.update(block)
+        return hasher
+
+    @classmethod
+    def _get_hasher(cls, upload_id, offset):
+        with cls._hashers_lock:
+            entry = cls._hashers.get(upload_id)
+        if entry and entry[0] == offset:
+            return entry[1]
+        # Chunks landed on another worker; fall back to hashing at finalize
+        cls._drop_hasher(upload_id)
+        return None
+
+    @classmethod
+    def _set_hasher(cls, upload_id, offset, hasher):
+        with cls._hashers_lock:
+            cls._hashers[upload_id] = (offset, hasher, time.time())
+
+    @classmethod
+    def _drop_hasher(cls, upload_id):
+        with cls._hashers_lock:
+            cls._hashers.pop(upload_id, None)
+
+    @classmethod
+    def _evict_hashers(cls, cutoff):
+        with cls._hashers_lock:
+            for upload_id in [key for key, entry in cls._hashers.items() if entry[2] < cutoff]:
+                del cls._hashers[upload_id]
+
+
+class _UploadLock:
+    """Exclusive per-upload file lock so parallel PUTs cannot interleave"""
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        self.handle = open(self.path, 'a+')
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        self.handle.close()
+        # The lock file is only needed while the upload exists
+        if not os.path.exists(self.path[:-5] + '.json'):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        return False
@@ -0,0 +1,362 @@
+"""
+Transparent column compression
+
+CompressedText and CompressedJSON store their values compressed in a binary
+column and hand back plain str / JSON values. The large text and JSON columns
+(resume text, job description text, scan analysis documents) are highly
+repetitive; compressing them shrinks the database and its page-cache
+footprint.
+
+Each stored value starts with a small header: a marker byte, the codec and the
+id of the shared dictionary it was compressed with (0 for none), so the codec,
+level and dictionary can change without rewriting old rows:
+
+    COLUMN_COMPRESSION_CODEC       zstd (when the zstandard package is
+                                   installed) or zlib
+    COLUMN_COMPRESSION_LEVEL       codec level (default 3 for zstd, 6 for zlib)
+    COLUMN_COMPRESSION_DICTIONARY  path of a shared dictionary to compress
+                                   with; every *.zdict file next to it stays
+                                   available for reading older values
+
+A dictionary trained on our own documents helps most for short values (job
+descriptions, analysis JSON). Train one from the current database:
+
+    python -m backend.services.compression train --out backend/data/columns.zdict
+
+Values without the header (rows written before the columns were compressed)
+are read as plain UTF-8, so a half-converted table still reads correctly.
+"""
+import os
+import sys
+import glob
+import zlib
+import struct
+import argparse
+import logging
+import threading
+from sqlalchemy.types import TypeDecorator, LargeBinary
+from backend.services import serialization
+
+try:
+    import zstandard
+except ImportError:  # zlib only
+    zstandard = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MARKER = 0x1f
+CODEC_RAW = b'r'
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b's'
+_HEADER = struct.Struct('>BcI')  # marker, codec, dictionary id
+
+# Values shorter than this are stored raw - compression would not pay for itself
+MIN_COMPRESS_SIZE = 64
+
+# zlib only looks back 32 KB, so a longer dictionary is wasted
+ZLIB_MAX_DICTIONARY = 32 * 1024
+
+DEFAULT_DICTIONARY_SIZE = 64 * 1024
+
+
+def dictionary_id(data):
+    """Stable non-zero id of a dictionary's contents"""
+    return zlib.crc32(data) or 1
+
+
+class ColumnCodec:
+    """Compresses values with one codec/level/dictionary; reads anything"""
+
+    def __init__(self, codec=None, level=None, dictionary_path=None):
+        if codec is None:
+            codec = 'zstd' if zstandard is not None else 'zlib'
+        if codec not in ('zstd', 'zlib'):
+            raise ValueError(f"Unknown column compression codec: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed, compressing columns with zlib")
+            codec = 'zlib'
+        self.codec = codec
+        self.level = level if level is not None else (3 if codec == 'zstd' else 6)
+
+        # Every dictionary we may have to read with, by id
+        self.dictionaries = {}
+        self.dictionary = None
+        if dictionary_path:
+            for path in glob.glob(os.path.join(os.path.dirname(os.path.abspath(dictionary_path)), '*.zdict')):
+                self._load_dictionary(path)
+            self.dictionary = self._load_dictionary(dictionary_path)
+
+        self._local = threading.local()  # zstd (de)compressors are not thread-safe
+
+    @classmethod
+    def from_env(cls, env=None):
+        env = os.environ if env is None else env
+        level = env.get('COLUMN_COMPRESSION_LEVEL')
+        return cls(
+            codec=env.get('COLUMN_COMPRESSION_CODEC') or None,
+            level=int(level) if level else None,
+            dictionary_path=env.get('COLUMN_COMPRESSION_DICTIONARY') or None
+        )
+
+    def _load_dictionary(self, path):
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        dict_id = dictionary_id(data)
+        self.dictionaries[dict_id] = data
+        return dict_id
+
+    # ---------------- ENCODING ----------------
+
+    def compress(self, data):
+        """
+        Compress UTF-8 bytes into a stored value
+
+        Args:
+            data (bytes): Raw value
+
+        Returns:
+            bytes: Header plus payload
+        """
+        if len(data) < MIN_COMPRESS_SIZE:
+            return _HEADER.pack(MARKER, CODEC_RAW, 0) + data
+
+        dict_id = self.dictionary or 0
+        if self.codec == 'zstd':
+            payload = self._zstd_compressor(dict_id).compress(data)
+            codec = CODEC_ZSTD
+        else:
+            if dict_id:
+                compressor = zlib.compressobj(self.level, zdict=self.dictionaries[dict_id][-ZLIB_MAX_DICTIONARY:])
+            else:
+                compressor = zlib.compressobj(self.level)
+            payload = compressor.compress(data) + compressor.flush()
+            codec = CODEC_ZLIB
+        return _HEADER.pack(MARKER, codec, dict_id) + payload
+
+    def decompress(self, value):
+        """
+        Raw UTF-8 bytes of a stored value
+
+        Args:
+            value (bytes): Stored value, with or without a header
+
+        Returns:
+            bytes: The original data
+        """
+        value = bytes(value)
+        if len(value) < _HEADER.size or value[0] != MARKER:
+            return value  # written before the column was compressed
+
+        _, codec, dict_id = _HEADER.unpack_from(value)
+        payload = value[_HEADER.size:]
+        if codec == CODEC_RAW:
+            return payload
+        if dict_id and dict_id not in self.dictionaries:
+            raise ValueError(f"Compressed value needs dictionary {dict_id:#010x}, which is not loaded")
+        if codec == CODEC_ZLIB:
+            if dict_id:
+                decompressor = zlib.decompressobj(zdict=self.dictionaries[dict_id][-ZLIB_MAX_DICTIONARY:])
+            else:
+                decompressor = zlib.decompressobj()
+            return decompressor.decompress(payload) + decompressor.flush()
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise ValueError("Compressed value needs the zstandard package")
+            return self._zstd_decompressor(dict_id).decompress(payload)
+        raise ValueError(f"Unknown compressed value codec {codec!r}")
+
+    def _zstd_compressor(self, dict_id):
+        compressors = self._local.__dict__.setdefault('compressors', {})
+        if dict_id not in compressors:
+            dict_data = zstandard.ZstdCompressionDict(self.dictionaries[dict_id]) if dict_id else None
+            compressors[dict_id] = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+        return compressors[dict_id]
+
+    def _zstd_decompressor(self, dict_id):
+        decompressors = self._local.__dict__.setdefault('decompressors', {})
+        if dict_id not in decompressors:
+            dict_data = zstandard.ZstdCompressionDict(self.dictionaries[dict_id]) if dict_id else None
+            decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return decompressors[dict_id]
+
+
+_codec = None
+_codec_lock = threading.Lock()
+
+
+def get_codec():
+    """Process-wide codec, configured from the environment on first use"""
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = ColumnCodec.from_env()
+    return _codec
+
+
+def set_codec(codec):
+    """Replace the process-wide codec (tests, dictionary rollout); returns the old one"""
+    global _codec
+    previous, _codec = _codec, codec
+    return previous
+
+
+# ---------------- COLUMN TYPES ----------------
+
+class CompressedText(TypeDecorator):
+    """Text stored compressed in a binary column"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return get_codec().compress(value.encode('utf-8'))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):  # SQLite row written before the column was converted
+            return value
+        return get_codec().decompress(value).decode('utf-8')
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON document stored compressed in a binary column
+
+    None and empty objects/arrays are stored as SQL NULL (and read back as
+    None), so "has a document" stays a plain IS NOT NULL test in SQL.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or value == {} or value == []:
+            return None
+        return get_codec().compress(serialization.dumps(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):  # SQLite row written before the column was converted
+            return serialization.loads(value)
+        return serialization.loads(get_codec().decompress(value))
+
+
+# ---------------- DICTIONARY TRAINING ----------------
+
+def train_dictionary(samples, size=DEFAULT_DICTIONARY_SIZE):
+    """
+    Build a shared dictionary from sample values
+
+    zstd trains a real dictionary (zstandard package). Without it, the
+    dictionary is the most common lines of the samples, which is what zlib's
+    preset dictionary can use.
+
+    Args:
+        samples: Iterable of bytes values
+        size (int): Dictionary size in bytes
+
+    Returns:
+        bytes: Dictionary contents
+    """
+    samples = [sample for sample in samples if sample]
+    if not samples:
+        raise ValueError("No samples to train a dictionary from")
+    if zstandard is not None:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    counts = {}
+    for sample in samples:
+        for line in sample.splitlines(keepends=True):
+            if len(line) >= 8:
+                counts[line] = counts.get(line, 0) + 1
+    # zlib favours matches near the end of the dictionary: most common last
+    common = sorted((line for line, count in counts.items() if count > 1), key=lambda line: counts[line])
+    data = b''.join(common)
+    return data[-min(size, ZLIB_MAX_DICTIONARY):]
+
+
+# Columns compressed with these types: (table, column)
+COMPRESSED_COLUMNS = (
+    ('resumes', 'extracted_text'),
+    ('job_descriptions', 'job_text'),
+    ('text_blobs', 'content'),  # scan text snapshots
+    ('scan_history', 'detailed_analysis'),
+    ('scan_history', 'recommendations'),
+    ('scan_history', 'keyword_analysis'),
+)
+
+
+def _database_samples(url, limit):
+    from sqlalchemy import create_engine, text
+
+    codec = get_codec()
+    engine = create_engine(url)
+    samples = []
+    with engine.connect() as connection:
+        for table, column in COMPRESSED_COLUMNS:
+            rows = connection.execute(text(
+                f'SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY created_at DESC LIMIT :limit'
+            ), {'limit': limit})
+            for (value,) in rows:
+                samples.append(value.encode('utf-8') if isinstance(value, str) else codec.decompress(value))
+    engine.dispose()
+    return samples
+
+
+def column_sizes(url):
+    """Stored vs uncompressed bytes per compressed column"""
+    from sqlalchemy import create_engine, text
+
+    codec = get_codec()
+    engine = create_engine(url)
+    sizes = []
+    with engine.connect() as connection:
+        for table, column in COMPRESSED_COLUMNS:
+            stored = raw = 0
+            for (value,) in connection.execute(text(f'SELECT {column} FROM {table} WHERE {column} IS NOT NULL')):
+                data = value.encode('utf-8') if isinstance(value, str) else bytes(value)
+                stored += len(data)
+                raw += len(data if isinstance(value, str) else codec.decompress(value))
+            sizes.append((f'{table}.{column}', stored, raw))
+    engine.dispose()
+    return sizes
+
+
+def main(argv=None):
+    from backend.database import database_url
+
+    parser = argparse.ArgumentParser(description="Column compression tools")
+    parser.add_argument('--database', default=os.getenv('DATABASE_URL'), help='Database URL or SQLite path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    train_cmd = sub.add_parser('train', help='Train a shared dictionary on the stored documents')
+    train_cmd.add_argument('--out', required=True, help='Dictionary file to write (*.zdict)')
+    train_cmd.add_argument('--samples', type=int, default=2000, help='Newest rows sampled per column')
+    train_cmd.add_argument('--size', type=int, default=DEFAULT_DICTIONARY_SIZE)
+
+    sub.add_parser('stats', help='Stored vs uncompressed size of each compressed column')
+
+    args = parser.parse_args(argv)
+    url = database_url(args.database, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.db'))
+    if args.command == 'train':
+        data = train_dictionary(_database_samples(url, args.samples), args.size)
+        with open(args.out, 'wb') as handle:
+            handle.write(data)
+        print(f"Wrote {len(data)} byte dictionary {dictionary_id(data):#010x} to {args.out}")
+        print(f"Enable it with COLUMN_COMPRESSION_DICTIONARY={args.out}")
+    elif args.command == 'stats':
+        for name, stored, raw in column_sizes(url):
+            ratio = raw / stored if stored else 0
+            print(f"{name:<40} {stored:>12} stored   {raw:>12} raw   {ratio:5.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
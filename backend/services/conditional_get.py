@@ -0,0 +1,124 @@
+"""
+Conditional GET
+ETag / Last-Modified validators for API resources
+
+A handler looks up the version of the resource it serves with one indexed
+query, answers 304 Not Modified when the client's copy is current and only
+otherwise loads and serializes the payload. Requests without validators skip
+the version lookup:
+
+    def validators_for(row):
+        return Validators.for_resource(request, 'resume', row.id, row.updated_at, last_modified=row.updated_at)
+
+    not_modified = not_modified_response(request, version_query, validators_for)
+    if not_modified is not None:
+        return not_modified
+    ...
+    return validators_for(resume).apply(jsonify(payload)), 200
+
+ETags are strong: a hash of the version parts, the query string and the
+negotiated body format (which select the representation). Responses are per user, so they are marked
+private - browsers and private caches keep them, shared caches do not - and
+no-cache, so every reuse is revalidated with the server.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from flask import Response
+from backend.services.serialization import response_format
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def _http_date(value):
+    """Naive UTC datetime -> aware, whole seconds (the HTTP-date resolution)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+class Validators:
+    """ETag and Last-Modified of one representation of a resource"""
+
+    def __init__(self, etag, last_modified=None):
+        self.etag = etag
+        self.last_modified = _http_date(last_modified)
+
+    @classmethod
+    def for_resource(cls, request, kind, *version, last_modified=None):
+        """
+        Validators from a resource's version parts
+
+        Args:
+            request: Current request; its query string and response format are
+                     part of the ETag
+            kind (str): Resource type, e.g. 'scan'
+            *version: Values that change whenever the payload does (id, updated_at, ...)
+            last_modified (datetime): Last change time (naive UTC)
+
+        Returns:
+            Validators
+        """
+        parts = [kind, *[value.isoformat() if isinstance(value, datetime) else value for value in version],
+                 request.query_string.decode('latin-1'), response_format(request)]
+        digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+        return cls(digest, last_modified)
+
+    def is_current(self, request):
+        """
+        Whether the request's validators match (If-None-Match wins over If-Modified-Since)
+
+        Args:
+            request: Current request
+
+        Returns:
+            bool: True when a 304 can be returned
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since and self.last_modified:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def apply(self, response):
+        """Set ETag, Last-Modified and Cache-Control on a response"""
+        response.set_etag(self.etag)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        response.vary.add('Authorization')
+        return response
+
+    def not_modified(self):
+        """Empty 304 response carrying the validators"""
+        return self.apply(Response(status=304))
+
+
+def is_conditional(request):
+    """Whether the request carries validators worth a version lookup"""
+    return bool(request.if_none_match or request.if_modified_since)
+
+
+def not_modified_response(request, version_query, validators_for):
+    """
+    304 response when the client's copy is current
+
+    Args:
+        request: Current request
+        version_query: Query of the resource's version columns (run only for
+                       conditional requests)
+        validators_for: Callable building Validators from the version row
+
+    Returns:
+        Response or None: None when the payload has to be built (no
+                          validators sent, resource changed or not found)
+    """
+    if not is_conditional(request):
+        return None
+    version = version_query.first()
+    if version is None:
+        return None
+    validators = validators_for(version)
+    return validators.not_modified() if validators.is_current(request) else None
@@ -6,10 +6,11 @@ No hardcoded suggestions - everything is based on real keyword comparison and NL
 """
 
 import json
-import re
 from typing import Dict, List, Set, Tuple
 from backend.models import Resume, JobDescription
 from backend.services.matching_service import MatchingService
+from backend.services.nlp_pipeline import load_nlp
+from backend.services.skill_taxonomy import get_matcher
 
 class DynamicSuggestionsService:
     """Enhanced suggestions service with advanced NLP-based keyword analysis"""
@@ -21,20 +22,16 @@ class DynamicSuggestionsService:
         self.nlp = self._get_nlp_model()
 
     def _get_nlp_model(self):
-        """Get or load the spaCy model once"""
+        """Get or load the shared spaCy pipeline once (needs parser and NER)"""
         if DynamicSuggestionsService._nlp_model is not None:
-            return DynamicSuggestionsService._nlp_model
+            return DynamicSuggestionsService._nlp_model if DynamicSuggestionsService._nlp_model is not False else None
 
         try:
-            import spacy
-            try:
-                DynamicSuggestionsService._nlp_model = spacy.load('en_core_web_sm')
-            except OSError:
-                # Fallback to loading from RealTimeLLMService if already loaded there
-                from backend.services.enhanced_matching_service import RealTimeLLMService
-                DynamicSuggestionsService._nlp_model = RealTimeLLMService._nlp_model
-        except:
+            DynamicSuggestionsService._nlp_model = load_nlp('full') or False
+        except Exception:
             DynamicSuggestionsService._nlp_model = False  # Mark as unavailable
+
+        if DynamicSuggestionsService._nlp_model is False:
             print("⚠️ spaCy not available - using basic keyword analysis")
         
         return DynamicSuggestionsService._nlp_model if DynamicSuggestionsService._nlp_model is not False else None
@@ -176,39 +173,12 @@ class DynamicSuggestionsService:
 
         doc = nlp_model(text)
 
-        # Technical keywords patterns
-        tech_patterns = [
-            r'\b(?:javascript|js|typescript|ts|python|java|c#|csharp|\.net|asp\.net)\b',
-            r'\b(?:react|angular|vue|node\.js|express|django|flask|spring)\b',
-            r'\b(?:sql|mysql|postgresql|mongodb|redis|elasticsearch)\b',
-            r'\b(?:docker|kubernetes|aws|azure|gcp|jenkins|git|github)\b',
-            r'\b(?:html|css|sass|less|bootstrap|tailwind|jquery)\b',
-            r'\b(?:api|rest|graphql|microservices|oauth|jwt|swagger)\b'
-        ]
-
-        # Soft skills patterns
-        soft_patterns = [
-            r'\b(?:leadership|communication|teamwork|collaboration)\b',
-            r'\b(?:problem.solving|analytical|critical.thinking)\b',
-            r'\b(?:project.management|agile|scrum|kanban)\b',
-            r'\b(?:mentoring|coaching|training|presentation)\b'
-        ]
-
-        technical_keywords = []
-        soft_keywords = []
         other_keywords = []
 
-        text_lower = text.lower()
-
-        # Extract technical keywords
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            technical_keywords.extend(matches)
-
-        # Extract soft skills
-        for pattern in soft_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            soft_keywords.extend(matches)
+        # Technical keywords and soft skills from the shared skill taxonomy
+        matcher = get_matcher()
+        technical_keywords = [hit.text for hit in matcher.find(text, 'suggestions', 'technical')]
+        soft_keywords = [hit.text for hit in matcher.find(text, 'suggestions', 'soft')]
 
         # Extract entities and noun phrases for other keywords
         for ent in doc.ents:
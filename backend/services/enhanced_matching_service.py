@@ -6,13 +6,14 @@ import time
 from typing import Dict, List, Tuple, Set, Optional
 from datetime import datetime
 
-import spacy
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from backend.services.nlp_pipeline import load_nlp
+from backend.services.skill_taxonomy import get_matcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -52,49 +53,20 @@ class RealTimeLLMService:
             self.stop_words = {'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 
                              'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 
                              'to', 'was', 'will', 'with'}
-        
-        # Enhanced skill synonyms for intelligent matching
-        self.skill_synonyms = {
-            'javascript': ['js', 'node.js', 'nodejs', 'ecmascript', 'es6', 'typescript', 'ts', 'react', 'vue', 'angular'],
-            'python': ['py', 'python3', 'django', 'flask', 'fastapi', 'pandas', 'numpy'],
-            'artificial intelligence': ['ai', 'machine learning', 'ml', 'deep learning', 'neural networks', 'nlp'],
-            'cloud': ['aws', 'amazon web services', 'azure', 'gcp', 'google cloud', 'cloud computing'],
-            'devops': ['ci/cd', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible'],
-            'database': ['sql', 'nosql', 'mysql', 'postgresql', 'mongodb', 'redis', 'db'],
-            'project management': ['agile', 'scrum', 'kanban', 'jira', 'pmp', 'project manager'],
-            'api': ['rest', 'restful', 'graphql', 'microservices', 'web services', 'json']
-        }
 
-    def _get_nlp(self):
-        """Get or load the spaCy model once"""
-        if RealTimeLLMService._nlp_model is not None:
-            return RealTimeLLMService._nlp_model
+    @property
+    def skill_synonyms(self) -> Dict[str, List[str]]:
+        """Skill families for intelligent matching (from the shared skill taxonomy)"""
+        return get_matcher().families()
 
-        try:
+    def _get_nlp(self):
+        """Get or load the shared spaCy pipeline once (lemmatization only)"""
+        if RealTimeLLMService._nlp_model is None:
             try:
-                RealTimeLLMService._nlp_model = spacy.load('en_core_web_sm')
-                logger.info("✅ spaCy model 'en_core_web_sm' loaded successfully")
-            except OSError:
-                logger.warning("⚠️ spaCy model 'en_core_web_sm' not found locally")
-                try:
-                    import subprocess
-                    logger.info("Attempting to download spaCy model...")
-                    # Note: downloading might take time and cause a freeze if internet is slow
-                    subprocess.run(
-                        ["python", "-m", "spacy", "download", "en_core_web_sm"], 
-                        check=True,
-                        capture_output=True, 
-                        timeout=120
-                    )
-                    RealTimeLLMService._nlp_model = spacy.load('en_core_web_sm')
-                    logger.info("✅ spaCy model downloaded and loaded successfully")
-                except Exception as download_error:
-                    logger.error(f"⚠️ Could not download spaCy model: {download_error}")
-                    return None
-            return RealTimeLLMService._nlp_model
-        except Exception as e:
-            logger.error(f"⚠️ spaCy initialization failed: {e}. Using basic NLP fallback.")
-            return None
+                RealTimeLLMService._nlp_model = load_nlp('lemma')
+            except Exception as e:
+                logger.error(f"⚠️ spaCy initialization failed: {e}. Using basic NLP fallback.")
+        return RealTimeLLMService._nlp_model
 
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text for NLP analysis"""
@@ -235,33 +207,19 @@ class RealTimeLLMService:
         }
 
     def _extract_skills(self, text: str, skill_type: str) -> Dict[str, int]:
-        """Extract skills using regex patterns and frequency"""
+        """Extract skills and their frequency using the compiled skill taxonomy"""
+        matcher = get_matcher()
         skills_found = {}
-        
-        patterns = {
-            'technical': [
-                r'\b(?:python|java|javascript|js|typescript|ts|html|css|react|angular|vue|node\.js|express|django|flask|sql|nosql|mysql|postgresql|mongodb|aws|azure|gcp|docker|kubernetes|git|jenkins|ci/cd|api|rest|graphql)\b',
-                r'\b(?:c\+\+|c#|ruby|php|swift|kotlin|go|rust|scala|hadoop|spark|tensorflow|pytorch|pandas|numpy|sklearn)\b'
-            ],
-            'soft': [
-                r'\b(?:leadership|communication|teamwork|collaboration|problem solving|critical thinking|adaptability|creativity|time management|agile|scrum|mentoring|public speaking)\b'
-            ]
-        }
-        
-        for pattern in patterns.get(skill_type, []):
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                normalized = self._normalize_skill(match.lower())
-                skills_found[normalized] = skills_found.get(normalized, 0) + 1
+
+        for hit in matcher.find(text, 'realtime', skill_type):
+            normalized = matcher.family(hit.term)
+            skills_found[normalized] = skills_found.get(normalized, 0) + 1
                 
         return skills_found
 
     def _normalize_skill(self, skill: str) -> str:
         """Map synonyms to common canonical forms"""
-        for main, synonyms in self.skill_synonyms.items():
-            if skill == main or skill in synonyms:
-                return main
-        return skill
+        return get_matcher().family(skill)
 
     def _extract_experience(self, text: str) -> Dict:
         """Extract years of experience"""
@@ -0,0 +1,99 @@
+"""
+Sparse Fieldsets
+Shared ?fields= contract for list and detail endpoints
+
+Request:  ?fields=id,title,created_at   (omitted: every field)
+Response: only the requested keys; unknown fields are a 400
+
+Each endpoint serializes through a Fieldset - its whitelist of API fields,
+with the model columns every field reads. The requested fields decide both
+the columns loaded (load_only) and the keys serialized, so a dashboard card
+that renders three fields reads and receives three fields.
+"""
+
+from sqlalchemy.orm import load_only
+
+
+class FieldsetError(ValueError):
+    """Unknown field requested (reported to the client as 400)"""
+
+
+class Field:
+    """
+    One API field
+
+    Args:
+        *columns: Names of the model columns the value reads
+        value: Callable obj -> value (default: the first column's attribute)
+    """
+
+    def __init__(self, *columns, value=None):
+        self.columns = columns
+        self.value = value or (lambda obj, name=columns[0]: getattr(obj, name))
+
+
+class Fieldset:
+    """
+    Whitelist of the API fields of one representation, in output order
+
+    Args:
+        fields (dict): API field name -> Field, or a column name for fields
+                       that are a column as is
+    """
+
+    def __init__(self, fields):
+        self.fields = {name: spec if isinstance(spec, Field) else Field(spec) for name, spec in fields.items()}
+
+    def extend(self, fields):
+        """This whitelist plus more fields (e.g. a detail view's heavy columns)"""
+        return Fieldset({**self.fields, **fields})
+
+    def parse(self, args):
+        """
+        Read ?fields= from request args
+
+        Args:
+            args: request.args
+
+        Returns:
+            tuple or None: Requested names in whitelist order; None for all fields
+
+        Raises:
+            FieldsetError: When a name is not in the whitelist
+        """
+        raw = args.get('fields')
+        if raw is None or not raw.strip():
+            return None
+        requested = {name.strip() for name in raw.split(',') if name.strip()}
+        unknown = requested - set(self.fields)
+        if unknown:
+            raise FieldsetError(f"Unknown fields: {', '.join(sorted(unknown))}. "
+                                f"Allowed: {', '.join(self.fields)}")
+        return tuple(name for name in self.fields if name in requested)
+
+    def columns(self, names=None):
+        """Column names read by the given fields (all fields when None)"""
+        columns = []
+        for name in names or self.fields:
+            columns += [column for column in self.fields[name].columns if column not in columns]
+        return columns
+
+    def load_only(self, model, names=None, *always):
+        """
+        Loader option loading just the columns the fields need
+
+        Args:
+            model: Mapped class
+            names: Requested field names (None: every whitelisted field)
+            *always: Extra attributes to load regardless (sort keys, ...)
+
+        Returns:
+            Load option for Query.options()
+        """
+        columns = self.columns(names)
+        extra = [attribute for attribute in always if attribute.key not in columns]
+        return load_only(*[getattr(model, column) for column in columns], *extra)
+
+    def serialize(self, obj, names=None):
+        """Dict of the requested fields of obj (every field when names is None)"""
+        return {name: self.fields[name].value(obj) for name in (names or self.fields)}
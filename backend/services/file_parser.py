@@ -2,6 +2,9 @@
 File parsing service for extracting text from PDF and DOC files
 """
 import os
+import re
+import codecs
+import unicodedata
 import PyPDF2
 from docx import Document
 import logging
@@ -10,6 +13,20 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Text length budget (database field limits) and the suffix added when it is exceeded
+MAX_TEXT_LENGTH = 50000
+TRUNCATION_MARKER = "... [truncated]"
+
+# Plain text files are streamed in blocks of this many characters/bytes
+TEXT_CHUNK_SIZE = 64 * 1024
+
+# Null bytes (which cause PostgreSQL errors) and other control characters,
+# except newlines, tabs and carriage returns
+_CONTROL_CHAR_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]
+)
+_MULTI_SPACE_RE = re.compile(r' +')
+
 class FileParser:
     """Service for parsing resume files and extracting text content"""
     
@@ -25,8 +42,6 @@ class FileParser:
             tuple: (success: bool, text: str, error: str)
         """
         try:
-            text = ""
-            
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 
@@ -34,16 +49,8 @@ class FileParser:
                 if pdf_reader.is_encrypted:
                     return False, "", "PDF is password protected and cannot be processed"
                 
-                # Extract text from all pages
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text()
-                    
-                    if page_text:
-                        text += page_text + "\n"
-                
-                # Clean up the text
-                text = FileParser._clean_extracted_text(text)
+                # Clean page by page; pages past the length budget are never extracted
+                text = FileParser._clean_text_chunks(FileParser._iter_pdf_pages(pdf_reader))
                 
                 if not text.strip():
                     return False, "", "No readable text found in PDF. The file might be image-based or corrupted."
@@ -78,23 +85,8 @@ class FileParser:
                 doc = Document(file_path_or_file)
                 source_info = file_path_or_file
 
-            text = ""
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text += cell.text + " "
-                    text += "\n"
-            
-            # Clean up the text
-            text = FileParser._clean_extracted_text(text)
+            # Clean paragraph by paragraph, then table rows
+            text = FileParser._clean_text_chunks(FileParser._iter_docx_blocks(doc))
             
             if not text.strip():
                 return False, "", "No readable text found in DOCX file."
@@ -151,21 +143,17 @@ class FileParser:
                 # For PDF, we might need to seek(0) if it was read before
                 file_obj.seek(0)
                 pdf_reader = PyPDF2.PdfReader(file_obj)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() or ""
-                return FileParser._clean_extracted_text(text)
+                return FileParser._clean_text_chunks(FileParser._iter_pdf_pages(pdf_reader, separator=""))
                 
             elif filename.endswith('.docx'):
                 file_obj.seek(0)
                 doc = Document(file_obj)
-                text = "\n".join([para.text for para in doc.paragraphs])
-                return FileParser._clean_extracted_text(text)
+                paragraphs = (para.text + "\n" for para in doc.paragraphs)
+                return FileParser._clean_text_chunks(paragraphs)
                 
             elif filename.endswith('.txt'):
                 file_obj.seek(0)
-                text = file_obj.read().decode('utf-8', errors='ignore')
-                return FileParser._clean_extracted_text(text)
+                return FileParser._clean_text_chunks(FileParser._iter_decoded_chunks(file_obj))
                 
             else:
                 raise ValueError(f"Extrapolation of text from {filename} is not supported")
@@ -215,10 +203,7 @@ class FileParser:
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-
-            # Clean up the text
-            text = FileParser._clean_extracted_text(text)
+                text = FileParser._clean_text_chunks(FileParser._iter_text_chunks(file))
 
             if not text.strip():
                 return False, "", "No readable text found in the file."
@@ -230,8 +215,7 @@ class FileParser:
             # Try with different encoding
             try:
                 with open(file_path, 'r', encoding='latin-1') as file:
-                    text = file.read()
-                text = FileParser._clean_extracted_text(text)
+                    text = FileParser._clean_text_chunks(FileParser._iter_text_chunks(file))
                 if not text.strip():
                     return False, "", "No readable text found in the file."
                 logger.info(f"Successfully extracted {len(text)} characters from TXT (latin-1): {file_path}")
@@ -244,52 +228,122 @@ class FileParser:
             return False, "", f"Error reading text file: {str(e)}"
 
     @staticmethod
-    def _clean_extracted_text(text):
+    def _iter_pdf_pages(pdf_reader, separator="\n"):
+        """Yield the text of each PDF page, extracting pages only as they are consumed"""
+        for page in pdf_reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                yield page_text + separator
+
+    @staticmethod
+    def _iter_docx_blocks(doc):
+        """Yield DOCX paragraphs followed by table rows (cells separated by spaces)"""
+        for paragraph in doc.paragraphs:
+            paragraph_text = paragraph.text
+            if paragraph_text.strip():
+                yield paragraph_text + "\n"
+
+        for table in doc.tables:
+            for row in table.rows:
+                cells = [cell.text + " " for cell in row.cells if cell.text.strip()]
+                yield "".join(cells) + "\n"
+
+    @staticmethod
+    def _iter_text_chunks(file, chunk_size=TEXT_CHUNK_SIZE):
+        """Yield fixed-size blocks from a text-mode file"""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _iter_decoded_chunks(file_obj, chunk_size=TEXT_CHUNK_SIZE, encoding='utf-8'):
+        """Yield decoded blocks from a binary file object, dropping undecodable bytes"""
+        decoder = codecs.getincrementaldecoder(encoding)(errors='ignore')
+        while True:
+            chunk = file_obj.read(chunk_size)
+            if not chunk:
+                break
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    @staticmethod
+    def _clean_line(line):
+        """Clean a single line: control characters, unicode normalization and spacing"""
+        line = unicodedata.normalize('NFKD', line.translate(_CONTROL_CHAR_TABLE)).strip()
+        return _MULTI_SPACE_RE.sub(' ', line)
+
+    @staticmethod
+    def _clean_text_chunks(chunks, max_length=MAX_TEXT_LENGTH):
         """
-        Clean and normalize extracted text, removing problematic characters
+        Clean and normalize text streamed as chunks (pages, paragraphs or file blocks)
+
+        Produces the same result as cleaning the concatenated text in one go, but only
+        holds one chunk plus the cleaned output in memory and stops consuming chunks
+        as soon as the length budget is exceeded.
 
         Args:
-            text (str): Raw extracted text
+            chunks (iterable): Raw text fragments in document order
+            max_length (int): Length budget for the cleaned text
 
         Returns:
             str: Cleaned text safe for database storage
         """
-        if not text:
-            return ""
+        cleaned_lines = []
+        length = -1  # Length of the lines joined with newlines
+        pending = ""  # Trailing partial line carried over to the next chunk
 
-        import re
+        for chunk in chunks:
+            if not chunk:
+                continue
 
-        # Step 1: Remove null bytes and other problematic characters
-        # Remove null bytes (0x00) that cause PostgreSQL errors
-        text = text.replace('\x00', '')
+            *lines, pending = (pending + chunk).split('\n')
+            for line in lines:
+                line = FileParser._clean_line(line)
+                if line:  # Only keep non-empty lines
+                    cleaned_lines.append(line)
+                    length += len(line) + 1
+                    if length > max_length:
+                        return FileParser._truncate_lines(cleaned_lines, max_length)
 
-        # Remove other control characters except newlines, tabs, and carriage returns
-        text = re.sub(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+            # Very long lines (e.g. text files without newlines) are compacted so the
+            # carry-over stays bounded; stop once the remaining budget is certainly used
+            if len(pending) > max_length:
+                pending = FileParser._clean_line(pending + ".")[:-1]
+                if len(pending) > max_length - length + 64:
+                    cleaned_lines.append(pending)
+                    return FileParser._truncate_lines(cleaned_lines, max_length)
 
-        # Step 2: Normalize unicode characters
-        import unicodedata
-        text = unicodedata.normalize('NFKD', text)
+        line = FileParser._clean_line(pending)
+        if line:
+            cleaned_lines.append(line)
+            length += len(line) + 1
 
-        # Step 3: Remove excessive whitespace
-        lines = text.split('\n')
-        cleaned_lines = []
+        if length > max_length:
+            return FileParser._truncate_lines(cleaned_lines, max_length)
+        return '\n'.join(cleaned_lines)
 
-        for line in lines:
-            line = line.strip()
-            if line:  # Only keep non-empty lines
-                # Remove excessive spaces within the line
-                line = re.sub(r' +', ' ', line)
-                cleaned_lines.append(line)
+    @staticmethod
+    def _truncate_lines(cleaned_lines, max_length):
+        """Join cleaned lines and cut them to the length budget"""
+        return '\n'.join(cleaned_lines)[:max_length] + TRUNCATION_MARKER
+
+    @staticmethod
+    def _clean_extracted_text(text):
+        """
+        Clean and normalize extracted text, removing problematic characters
 
-        # Join lines with single newlines
-        cleaned_text = '\n'.join(cleaned_lines)
+        Args:
+            text (str): Raw extracted text
 
-        # Step 4: Ensure the text is not too long (database field limits)
-        max_length = 50000  # Reasonable limit for resume text
-        if len(cleaned_text) > max_length:
-            cleaned_text = cleaned_text[:max_length] + "... [truncated]"
+        Returns:
+            str: Cleaned text safe for database storage
+        """
+        if not text:
+            return ""
 
-        return cleaned_text
+        return FileParser._clean_text_chunks((text,))
     
     @staticmethod
     def get_file_info(file_path):
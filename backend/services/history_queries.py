@@ -0,0 +1,290 @@
+"""
+History Queries
+Projected queries for the scan history and dashboard endpoints
+
+Each scan row is returned together with the few resume and job description
+columns the list views show, fetched with outer joins in the same statement.
+This replaces per-row Resume.query.get / JobDescription.query.get lookups
+(2N+1 queries per page) and never loads extracted_text or job_text.
+
+The scan analysis JSON and text snapshots are deferred on ScanHistory; list
+queries project the columns they show (summarizing the JSON in SQL) and only
+detail endpoints load the documents. Compare the page cost of each shape:
+
+    python -m backend.services.history_queries benchmark --scans 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+from backend.models import (db, User, Resume, JobDescription, MatchScore, ScanHistory, ScanArchive, UserStats,
+                            CATEGORY_SCORE_COLUMNS, store_scan_texts)
+
+
+def scan_summaries(user_id, *extra_columns, labels=True):
+    """
+    Query of scan rows joined with their resume and job description labels
+
+    Args:
+        user_id: Owner of the scans
+        *extra_columns: Additional ScanHistory columns to select
+        labels (bool): Join the resume / job description labels (False when
+                       the caller does not show them)
+
+    Returns:
+        Query: Rows with id, resume_id, job_description_id, overall_match_score,
+               scan_type, created_at, the extra columns, and resume_* / job_*
+               / company_name labels (None when the document is gone)
+    """
+    columns = (
+        ScanHistory.id,
+        ScanHistory.resume_id,
+        ScanHistory.job_description_id,
+        ScanHistory.overall_match_score,
+        ScanHistory.scan_type,
+        ScanHistory.created_at,
+        *extra_columns
+    )
+    if not labels:
+        return db.session.query(*columns).filter(ScanHistory.user_id == user_id)
+    return db.session.query(
+        *columns,
+        Resume.id.label('resume_found'),
+        Resume.title.label('resume_title'),
+        Resume.original_filename.label('resume_filename'),
+        Resume.created_at.label('resume_created_at'),
+        JobDescription.id.label('job_found'),
+        JobDescription.title.label('job_title'),
+        JobDescription.company_name.label('company_name'),
+        JobDescription.created_at.label('job_created_at')
+    ).outerjoin(
+        Resume, ScanHistory.resume_id == Resume.id
+    ).outerjoin(
+        JobDescription, ScanHistory.job_description_id == JobDescription.id
+    ).filter(ScanHistory.user_id == user_id)
+
+
+def analysis_summary_columns():
+    """
+    What the history list shows of the deferred analysis JSON, computed in SQL
+
+    Category scores come from their own columns (CATEGORY_SCORE_COLUMNS,
+    copied from category_scores on write); the compressed documents are only
+    tested for presence
+    (for archived scans, via a flag on the archive row) and the
+    recommendation count is stored with the scan. The page never
+    transfers or deserializes the documents.
+
+    Returns:
+        list: Labeled columns - one per CATEGORY_SCORE_COLUMNS entry,
+              has_detailed_analysis and recommendations_count
+    """
+    columns = [getattr(ScanHistory, column).label(column) for column in CATEGORY_SCORE_COLUMNS]
+    archived_analysis = db.exists().where(ScanArchive.scan_id == ScanHistory.id,
+                                          ScanArchive.has_detailed_analysis == True)
+    columns.append(db.or_(
+        ScanHistory.detailed_analysis.isnot(None),
+        db.and_(ScanHistory.archived_at.isnot(None), archived_analysis)
+    ).label('has_detailed_analysis'))
+    columns.append(ScanHistory.recommendations_count.label('recommendations_count'))
+    return columns
+
+
+def history_version(user_id):
+    """
+    What the history list depends on, in one statement
+
+    The rollup row changes with every scan written or deleted; resume and job
+    description labels change with their updated_at.
+
+    Args:
+        user_id: Owner of the scans
+
+    Returns:
+        Row or None: (UserStats, latest resume updated_at, latest job
+                     description updated_at); None before the rollup exists
+    """
+    resumes_updated = db.session.query(db.func.max(Resume.updated_at)).filter(
+        Resume.user_id == user_id).scalar_subquery()
+    job_descriptions_updated = db.session.query(db.func.max(JobDescription.updated_at)).filter(
+        JobDescription.user_id == user_id).scalar_subquery()
+    return db.session.query(UserStats, resumes_updated, job_descriptions_updated).filter(
+        UserStats.user_id == user_id).first()
+
+
+def category_average_columns(user_id):
+    """
+    Average of each category score over a user's scans, as scalar subqueries
+
+    Args:
+        user_id: Owner of the scans
+
+    Returns:
+        list: One labeled subquery per CATEGORY_SCORE_COLUMNS entry (NULL
+              without scans), read from the (user_id, score, id) indexes
+    """
+    return [
+        db.session.query(db.func.avg(getattr(ScanHistory, column)))
+        .filter(ScanHistory.user_id == user_id).scalar_subquery().label(column)
+        for column in CATEGORY_SCORE_COLUMNS
+    ]
+
+
+def match_scores_with_documents(user_id):
+    """MatchScore query with the labels used by to_dict(include_details=True) eager-loaded"""
+    return MatchScore.query.options(
+        joinedload(MatchScore.resume).load_only(Resume.id, Resume.original_filename),
+        joinedload(MatchScore.job_description).load_only(
+            JobDescription.id, JobDescription.title, JobDescription.company_name
+        )
+    ).filter(MatchScore.user_id == user_id)
+
+
+# ---------------- HISTORY PAGE BENCHMARK ----------------
+
+def _benchmark_payload(i):
+    """Scan results shaped like RealTimeLLMService output"""
+    skills = [f'skill_{i}_{n}' for n in range(40)]
+    return {
+        'category_scores': {'technical_skills': 70.0 + i % 30, 'soft_skills': 55.0, 'experience_match': 61.5,
+                            'education_match': 80.0, 'ats_compatibility': 77.0},
+        'detailed_analysis': {
+            'matched_skills': [{'skill': s, 'weight': 1.0, 'category': 'technical'} for s in skills[:25]],
+            'missing_skills': [{'skill': s, 'weight': 0.8, 'category': 'technical'} for s in skills[25:]],
+            'matched_count': 25, 'missing_count': 15,
+            'summary': 'Good match! Your experience covers most requirements. ' * 4
+        },
+        'recommendations': [{'title': f'Add {s}', 'description': f'Mention {s} in your experience section. ' * 3,
+                             'priority': 'high'} for s in skills[25:35]],
+        'keyword_analysis': {s: {'resume_count': n % 4, 'jd_count': 2} for n, s in enumerate(skills)},
+        'resume_text': ('Senior Python developer with Flask, SQL and AWS experience. ' * 90)[:5000],
+        'job_description_text': ('We are hiring a backend engineer to build APIs in Python. ' * 90)[:5000]
+    }
+
+
+def _benchmark_queries(user_id):
+    """History page query per mode: what was loaded before deferral and after"""
+    return {
+        'entity': ScanHistory.query.options(*ScanHistory.with_details('analysis', 'text')).filter(
+            ScanHistory.user_id == user_id),
+        'json_columns': scan_summaries(
+            user_id, ScanHistory.category_scores, ScanHistory.detailed_analysis, ScanHistory.recommendations,
+            ScanHistory.ats_compatibility, ScanHistory.algorithm_used, ScanHistory.scan_duration),
+        'summary': scan_summaries(
+            user_id, *analysis_summary_columns(),
+            ScanHistory.ats_compatibility, ScanHistory.algorithm_used, ScanHistory.scan_duration)
+    }
+
+
+def _row_bytes(row):
+    return sum(len(value.encode('utf-8')) if isinstance(value, str) else len(value) if isinstance(value, bytes)
+               else 8 if value is not None else 0 for value in row)
+
+
+def benchmark(scans=2000, page_size=10, pages=50):
+    """
+    Bytes read and load time per history page, per query shape
+
+    'entity' and 'json_columns' are how the history endpoints loaded scans
+    before the analysis columns were deferred; 'summary' is the current
+    /api/history query. deserialize_ms is the ORM load time minus the raw
+    driver fetch of the same statement: JSON decoding and row building.
+
+    Returns:
+        list: (mode, stats dict) per mode
+    """
+    path = tempfile.mktemp(prefix='dr_resume_history_bench_', suffix='.db')
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False
+    )
+    db.init_app(app)
+
+    rows = []
+    with app.app_context():
+        db.create_all()
+        user = User('Bench', 'User', 'bench@example.com', 'Password123')
+        db.session.add(user)
+        db.session.commit()
+        scan_rows = [
+            dict(user_id=user.id, overall_match_score=float(i % 100), scan_type='realtime', **_benchmark_payload(i))
+            for i in range(scans)
+        ]
+        store_scan_texts(db.session.connection(), scan_rows)
+        db.session.execute(ScanHistory.__table__.insert(), scan_rows)
+        db.session.commit()
+
+        for mode, query in _benchmark_queries(user.id).items():
+            page = query.order_by(ScanHistory.created_at.desc(), ScanHistory.id.desc()).limit(page_size)
+            captured = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                captured.append((statement, parameters))
+
+            load_seconds = 0.0
+            event.listen(db.engine, 'before_cursor_execute', capture)
+            try:
+                for _ in range(pages):
+                    db.session.expunge_all()
+                    started = time.perf_counter()
+                    page.all()
+                    load_seconds += time.perf_counter() - started
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', capture)
+
+            # Same statement straight through the driver: bytes and raw fetch time
+            statement, parameters = captured[-1]
+            raw = db.engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                started = time.perf_counter()
+                for _ in range(pages):
+                    raw_rows = cursor.execute(statement, parameters).fetchall()
+                fetch_seconds = time.perf_counter() - started
+            finally:
+                raw.close()
+
+            load_ms = load_seconds / pages * 1000
+            fetch_ms = fetch_seconds / pages * 1000
+            rows.append((mode, {
+                'bytes_per_page': sum(_row_bytes(row) for row in raw_rows),
+                'fetch_ms': round(fetch_ms, 3),
+                'load_ms': round(load_ms, 3),
+                'deserialize_ms': round(max(load_ms - fetch_ms, 0.0), 3)
+            }))
+        db.session.remove()
+        db.engine.dispose()
+    os.remove(path)
+
+    print(f"{scans} scans, pages of {page_size}, {pages} pages per mode")
+    for mode, stats in rows:
+        print(
+            f"{mode:<13} {stats['bytes_per_page']:>9} bytes/page   fetch {stats['fetch_ms']:>7.3f} ms   "
+            f"load {stats['load_ms']:>7.3f} ms   deserialize {stats['deserialize_ms']:>7.3f} ms"
+        )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="History query tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    bench_cmd = sub.add_parser('benchmark', help='Bytes read and load time per history page, before and after deferral')
+    bench_cmd.add_argument('--scans', type=int, default=2000)
+    bench_cmd.add_argument('--page-size', type=int, default=10)
+    bench_cmd.add_argument('--pages', type=int, default=50, help='Pages loaded per mode')
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        benchmark(args.scans, args.page_size, args.pages)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Keyword Fingerprints
+Fixed-width sketches plus exact keyword ids for fast Jaccard matching
+
+A fingerprint holds the sorted interned ids (keywords.id) of a document's
+keywords in one category, preceded by a SKETCH_BITS-bit sketch: each id sets
+one bit chosen by a multiplicative hash. The sketch has the same width for
+any vocabulary size, so stored fingerprints and the stacked matrices grow with
+the number of keywords of a document, never with the largest keyword id.
+
+Two documents whose sketches share no bit have no keyword in common; only the
+pairs that do are checked against the exact id sets, so scores and match
+counts are exact. One resume can be scored against many job descriptions in a
+single vectorized pass (see score_many).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+CATEGORIES = ('technical_skills', 'soft_skills', 'other_keywords')
+
+# Weights of MatchingService._calculate_weighted_score
+CATEGORY_WEIGHTS = {'technical_skills': 0.5, 'soft_skills': 0.2, 'other_keywords': 0.3}
+
+# Blob layout: SKETCH_WORDS little-endian uint64 words | ascending uint32 keyword ids
+SKETCH_BITS = 256
+SKETCH_WORDS = SKETCH_BITS // 64
+MAX_KEYWORD_ID = 2 ** 32 - 1
+
+_WORD = np.dtype('<u8')
+_ID = np.dtype('<u4')
+_SKETCH_BYTES = SKETCH_WORDS * _WORD.itemsize
+# Fibonacci hashing: the top log2(SKETCH_BITS) bits of id * 2^64 / golden ratio
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_HASH_SHIFT = np.uint64(64 - (SKETCH_BITS.bit_length() - 1))
+
+Fingerprint = namedtuple('Fingerprint', ['sketch', 'ids'])
+EMPTY = Fingerprint(np.zeros(SKETCH_WORDS, dtype=_WORD), np.zeros(0, dtype=_ID))
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words):
+        """Set bits per element of a uint64 array (summed over the last axis)"""
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    _POPCOUNT_LUT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        """Set bits per element of a uint64 array (summed over the last axis)"""
+        as_bytes = np.ascontiguousarray(words).view(np.uint8)
+        return _POPCOUNT_LUT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def encode(keyword_ids):
+    """
+    Build a fingerprint from keyword ids
+
+    Args:
+        keyword_ids: Iterable of integer keyword ids in [0, MAX_KEYWORD_ID]
+
+    Returns:
+        bytes: Sketch words followed by the unique ids (b'' for no keywords)
+    """
+    ids = np.unique(np.fromiter(keyword_ids, dtype=np.int64))
+    if ids.size == 0:
+        return b''
+    if ids[0] < 0 or ids[-1] > MAX_KEYWORD_ID:
+        raise ValueError(f'Keyword ids must be between 0 and {MAX_KEYWORD_ID}')
+    ids = ids.astype(_ID)
+    bits = (ids.astype(np.uint64) * _HASH_MULTIPLIER) >> _HASH_SHIFT
+    sketch = np.zeros(SKETCH_WORDS, dtype=_WORD)
+    np.bitwise_or.at(sketch, bits // np.uint64(64), np.left_shift(np.uint64(1), bits % np.uint64(64)))
+    return sketch.tobytes() + ids.tobytes()
+
+
+def decode(blob):
+    """Fingerprint bytes -> Fingerprint(sketch, ids) of read-only views, no copy"""
+    if not blob:
+        return EMPTY
+    if len(blob) < _SKETCH_BYTES or (len(blob) - _SKETCH_BYTES) % _ID.itemsize:
+        raise ValueError(f'Not a keyword fingerprint ({len(blob)} bytes)')
+    return Fingerprint(np.frombuffer(blob, dtype=_WORD, count=SKETCH_WORDS),
+                       np.frombuffer(blob, dtype=_ID, offset=_SKETCH_BYTES))
+
+
+def keyword_ids(blob):
+    """Keyword ids of a fingerprint, ascending"""
+    return decode(blob).ids.tolist()
+
+
+def overlap(a, b):
+    """Number of keywords present in both fingerprints"""
+    if not len(a.ids) or not len(b.ids) or not popcount(a.sketch & b.sketch):
+        return 0
+    return int(np.intersect1d(a.ids, b.ids, assume_unique=True).size)
+
+
+def jaccard(a, b):
+    """
+    Jaccard similarity of two fingerprints as a percentage
+
+    Same semantics as MatchingService._calculate_jaccard_similarity:
+    both empty -> 100.0, one empty -> 0.0, otherwise rounded to 2 places.
+    """
+    count_a, count_b = len(a.ids), len(b.ids)
+    if not count_a and not count_b:
+        return 100.0
+    if not count_a or not count_b:
+        return 0.0
+    intersection = overlap(a, b)
+    return round(intersection / (count_a + count_b - intersection) * 100, 2)
+
+
+def _fingerprint(value):
+    return value if isinstance(value, Fingerprint) else decode(value)
+
+
+def stack_documents(fingerprints):
+    """
+    Pre-stack many documents' fingerprints for repeated scoring
+
+    Args:
+        fingerprints: list of dicts category -> fingerprint
+
+    Returns:
+        dict: category -> (sketch matrix, per-document keyword counts,
+              all ids concatenated, document index of each id)
+    """
+    stacked = {}
+    for category in CATEGORIES:
+        decoded = [_fingerprint(fp.get(category)) for fp in fingerprints]
+        counts = np.array([len(fp.ids) for fp in decoded], dtype=np.int64)
+        stacked[category] = (
+            np.array([fp.sketch for fp in decoded], dtype=_WORD).reshape(-1, SKETCH_WORDS),
+            counts,
+            np.concatenate([EMPTY.ids] + [fp.ids for fp in decoded]),
+            np.repeat(np.arange(len(decoded)), counts)
+        )
+    return stacked
+
+
+def score_many(resume_fingerprints, job_fingerprints, stacked=None):
+    """
+    Score one resume against many job descriptions at once
+
+    Args:
+        resume_fingerprints: dict category -> fingerprint (bytes or Fingerprint)
+        job_fingerprints: list of dicts category -> fingerprint
+        stacked: Optional stack_documents(job_fingerprints) to reuse across resumes
+
+    Returns:
+        dict: Arrays aligned with job_fingerprints - '<category>_score' per
+              category, 'overall_score' and 'matched_keywords'. Scores are
+              percentages rounded to 2 places like the single-pair matcher.
+    """
+    stacked = stacked or stack_documents(job_fingerprints)
+    count = len(job_fingerprints)
+    result = {'matched_keywords': np.zeros(count, dtype=np.int64)}
+    overall = np.zeros(count, dtype=np.float64)
+
+    for category in CATEGORIES:
+        resume = _fingerprint(resume_fingerprints.get(category))
+        sketches, job_counts, job_ids, owners = stacked[category]
+
+        resume_count = len(resume.ids)
+        intersection = np.zeros(count, dtype=np.int64)
+        if resume_count and job_ids.size:
+            # Sketches without a common bit share no keyword: only the other
+            # documents' ids are checked against the resume's
+            candidates = (popcount(sketches & resume.sketch) > 0)[owners]
+            shared = np.isin(job_ids[candidates], resume.ids)
+            intersection = np.bincount(owners[candidates][shared], minlength=count)
+        union = resume_count + job_counts - intersection
+
+        # Both empty -> 100; one empty -> 0 (no intersection)
+        scores = _round(np.where(union > 0, intersection / np.maximum(union, 1) * 100, 100.0))
+        result[f'{category}_score'] = scores
+        result['matched_keywords'] += intersection
+        overall += scores * CATEGORY_WEIGHTS[category]
+
+    result['overall_score'] = _round(overall)
+    return result
+
+
+def score_matrix(resume_fingerprints, job_fingerprints):
+    """
+    Score every resume against every job description
+
+    Args:
+        resume_fingerprints: list of dicts category -> fingerprint
+        job_fingerprints: list of dicts category -> fingerprint
+
+    Returns:
+        dict: Same keys as score_many, each a (resumes x job descriptions) array
+    """
+    stacked = stack_documents(job_fingerprints)
+    rows = [score_many(fp, job_fingerprints, stacked) for fp in resume_fingerprints]
+    keys = [f'{category}_score' for category in CATEGORIES] + ['overall_score', 'matched_keywords']
+    shape = (len(resume_fingerprints), len(job_fingerprints))
+    return {
+        key: np.vstack([row[key] for row in rows]) if rows else np.zeros(shape)
+        for key in keys
+    }
+
+
+def _round(values):
+    # Python's round() rather than np.round so batch and single-pair scores agree exactly
+    return np.array([round(value, 2) for value in values.tolist()], dtype=np.float64)
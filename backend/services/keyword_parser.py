@@ -6,6 +6,7 @@ import string
 import logging
 from collections import Counter
 from typing import List, Dict, Tuple, Set
+from backend.services.skill_taxonomy import get_matcher
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -23,11 +24,9 @@ except ImportError:
     NLTK_AVAILABLE = False
     logger.warning("NLTK not available. Using basic keyword extraction.")
 
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
+# spaCy itself is loaded through nlp_pipeline
+from backend.services.nlp_pipeline import SPACY_AVAILABLE, load_nlp
+if not SPACY_AVAILABLE:
     logger.warning("SpaCy not available. Using basic keyword extraction.")
 
 try:
@@ -45,92 +44,6 @@ class KeywordParser:
         self.lemmatizer = self._get_lemmatizer()
         self.nlp = None  # Load spaCy model lazily
         
-        # Comprehensive technical skills dictionary for ASP.NET + Angular Full Stack
-        self.technical_skills = {
-            'programming_languages': [
-                'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'csharp', 'php', 'ruby',
-                'go', 'rust', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell',
-                'bash', 'powershell', 'sql', 'html', 'css', 'sass', 'less', 'scss'
-            ],
-            'dotnet_frameworks': [
-                'asp.net', 'asp.net core', 'aspnet', 'aspnet core', '.net', '.net core', 'dotnet',
-                'entity framework', 'entity framework core', 'ef core', 'web api', 'mvc',
-                'blazor', 'razor', 'linq', 'signalr', 'wcf', 'wpf', 'winforms'
-            ],
-            'frontend_frameworks': [
-                'react', 'angular', 'vue', 'vue.js', 'svelte', 'ember', 'backbone',
-                'jquery', 'bootstrap', 'tailwind', 'tailwindcss', 'material-ui', 'mui',
-                'redux', 'vuex', 'rxjs', 'ngrx', 'mobx', 'recoil'
-            ],
-            'angular_specific': [
-                'angular', 'angular guards', 'guards', 'pipes', 'directives', 'services',
-                'components', 'modules', 'routing', 'httpclient', 'observables', 'rxjs',
-                'ngrx', 'angular material', 'angular cli', 'dependency injection'
-            ],
-            'databases': [
-                'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'sqlite',
-                'oracle', 'sql server', 'sqlserver', 'mssql', 'cassandra', 'dynamodb',
-                'firebase', 'couchdb', 'mariadb', 'cosmos db', 'azure sql'
-            ],
-            'authentication_security': [
-                'jwt', 'json web token', 'oauth', 'oauth2', 'saml', 'openid', 'ldap',
-                'authorization', 'authentication', 'rbac', 'role-based access control',
-                'guards', 'filters', 'authorization filters', 'angular guards', 'cors',
-                'ssl', 'tls', 'https', 'encryption', 'hashing', 'bcrypt'
-            ],
-            'cloud_devops': [
-                'aws', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'k8s',
-                'jenkins', 'gitlab', 'github actions', 'azure devops', 'terraform',
-                'ansible', 'chef', 'puppet', 'vagrant', 'ci/cd', 'devops', 'microservices',
-                'serverless', 'lambda', 'azure functions', 'containers', 'iis'
-            ],
-            'testing_tools': [
-                'unit testing', 'integration testing', 'xunit', 'nunit', 'mstest', 'moq',
-                'jasmine', 'karma', 'protractor', 'cypress', 'selenium', 'jest', 'postman',
-                'swagger', 'openapi', 'api testing', 'load testing', 'performance testing'
-            ],
-            'development_tools': [
-                'git', 'svn', 'visual studio', 'vs code', 'jira', 'confluence', 'slack',
-                'teams', 'postman', 'swagger', 'fiddler', 'resharper', 'nuget', 'npm', 'yarn'
-            ],
-            'data_science': [
-                'machine learning', 'deep learning', 'ai', 'artificial intelligence',
-                'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'jupyter',
-                'tableau', 'power bi', 'excel', 'statistics', 'data analysis',
-                'data visualization', 'big data', 'hadoop', 'spark', 'kafka'
-            ]
-        }
-        
-        self.soft_skills = [
-            'communication', 'leadership', 'teamwork', 'problem solving', 'critical thinking',
-            'creativity', 'adaptability', 'time management', 'organization', 'attention to detail',
-            'analytical', 'strategic thinking', 'project management', 'collaboration', 'mentoring',
-            'training', 'presentation', 'negotiation', 'customer service', 'sales', 'marketing',
-            'research', 'writing', 'editing', 'planning', 'coordination', 'multitasking',
-            'decision making', 'conflict resolution', 'emotional intelligence', 'empathy',
-            'patience', 'persistence', 'initiative', 'self-motivated', 'detail-oriented',
-            'results-driven', 'goal-oriented', 'innovative', 'resourceful', 'reliable'
-        ]
-        
-        # Industry-specific keywords for full-stack development
-        self.industry_keywords = [
-            # Development terms
-            'develop', 'build', 'create', 'design', 'implement', 'maintain', 'optimize',
-            'integrate', 'deploy', 'test', 'debug', 'troubleshoot', 'refactor', 'enhance',
-            'scalable', 'secure', 'performance', 'responsive', 'cross-platform', 'full-stack',
-            'frontend', 'backend', 'server-side', 'client-side', 'api', 'rest', 'restful',
-
-            # Business terms
-            'requirements', 'specifications', 'documentation', 'code review', 'best practices',
-            'standards', 'guidelines', 'methodology', 'process', 'workflow', 'pipeline',
-            'delivery', 'deployment', 'production', 'staging', 'environment', 'configuration',
-
-            # Quality terms
-            'quality', 'reliability', 'availability', 'maintainability', 'extensibility',
-            'reusability', 'modularity', 'clean code', 'solid principles', 'design patterns',
-            'architecture', 'solution', 'framework', 'library', 'component', 'service'
-        ]
-
         # Common job-related keywords
         self.job_keywords = [
             'experience', 'years', 'senior', 'junior', 'lead', 'manager', 'director',
@@ -141,6 +54,22 @@ class KeywordParser:
             'course', 'bootcamp', 'workshop', 'seminar', 'conference', 'publication'
         ]
     
+    # Skill vocabularies come from the shared skill taxonomy and follow its reloads
+
+    @property
+    def technical_skills(self) -> Dict[str, List[str]]:
+        """Technical skills grouped by area (programming_languages, databases, ...)"""
+        return get_matcher().groups('keyword_parser', 'technical')
+
+    @property
+    def soft_skills(self) -> List[str]:
+        return get_matcher().terms('keyword_parser', 'soft')
+
+    @property
+    def industry_keywords(self) -> List[str]:
+        """Industry-specific keywords for full-stack development"""
+        return get_matcher().terms('keyword_parser', 'industry')
+    
     def _get_stop_words(self) -> Set[str]:
         """Get stop words for filtering"""
         if NLTK_AVAILABLE:
@@ -181,28 +110,21 @@ class KeywordParser:
             return KeywordParser._nlp_model
 
         if SPACY_AVAILABLE:
-            try:
-                # Try to load from RealTimeLLMService if available
-                from backend.services.enhanced_matching_service import RealTimeLLMService
-                if RealTimeLLMService._nlp_model:
-                    KeywordParser._nlp_model = RealTimeLLMService._nlp_model
-                    return KeywordParser._nlp_model
-                
-                KeywordParser._nlp_model = spacy.load('en_core_web_sm')
-                return KeywordParser._nlp_model
-            except OSError:
+            KeywordParser._nlp_model = load_nlp('full')
+            if KeywordParser._nlp_model is None:
                 logger.warning("SpaCy model 'en_core_web_sm' not found. Fallback to basic extraction.")
-        return None
+        return KeywordParser._nlp_model
 
     _nlp_model = None  # Class variable to cache the model
     
-    def extract_keywords(self, text: str, max_keywords: int = 50) -> Dict[str, List[str]]:
+    def extract_keywords(self, text: str, max_keywords: int = 50, doc=None) -> Dict[str, List[str]]:
         """
         Extract keywords from text and categorize them
         
         Args:
             text (str): Input text to analyze
             max_keywords (int): Maximum number of keywords to extract
+            doc: Optional pre-parsed spaCy Doc for the cleaned text (see extract_keywords_batch)
             
         Returns:
             dict: Dictionary with categorized keywords
@@ -221,7 +143,7 @@ class KeywordParser:
             # Extract different types of keywords with improved methods
             technical_skills = self._extract_technical_skills_comprehensive(cleaned_text)
             soft_skills = self._extract_soft_skills(cleaned_text)
-            other_keywords = self._extract_industry_keywords(cleaned_text, max_keywords)
+            other_keywords = self._extract_industry_keywords(cleaned_text, max_keywords, doc=doc)
             
             # Remove duplicates and limit results (increased limits for better coverage)
             technical_skills = list(set(technical_skills))[:max_keywords//2]  # Increased from //3 to //2
@@ -244,6 +166,39 @@ class KeywordParser:
                 'other_keywords': []
             }
     
+    def extract_keywords_batch(self, texts: List[str], max_keywords: int = 50,
+                               batch_size: int = 32) -> List[Dict[str, List[str]]]:
+        """
+        Extract keywords from many texts at once
+
+        When the spaCy model is loaded, the cleaned texts are parsed together with
+        nlp.pipe instead of one nlp() call per document.
+
+        Args:
+            texts (list): Input texts to analyze
+            max_keywords (int): Maximum number of keywords per text
+            batch_size (int): Number of texts per spaCy batch
+
+        Returns:
+            list: One categorized keyword dictionary per input text
+        """
+        docs = [None] * len(texts)
+
+        if self.nlp is not None:
+            try:
+                indexed = [(i, self._clean_text(t)) for i, t in enumerate(texts) if t and t.strip()]
+                parsed = self.nlp.pipe((cleaned for _, cleaned in indexed), batch_size=batch_size)
+                for (i, _), doc in zip(indexed, parsed):
+                    docs[i] = doc
+            except Exception as e:
+                logger.error(f"Error in batched SpaCy parsing: {e}")
+                docs = [None] * len(texts)
+
+        return [
+            self.extract_keywords(text, max_keywords, doc=doc)
+            for text, doc in zip(texts, docs)
+        ]
+
     def _clean_text(self, text: str) -> str:
         """Clean and preprocess text"""
         # Convert to lowercase
@@ -352,7 +307,7 @@ class KeywordParser:
 
         return variations
 
-    def _extract_industry_keywords(self, text: str, max_keywords: int = 20) -> List[str]:
+    def _extract_industry_keywords(self, text: str, max_keywords: int = 20, doc=None) -> List[str]:
         """Extract industry-specific keywords"""
         found_keywords = []
         text_lower = text.lower()
@@ -363,7 +318,7 @@ class KeywordParser:
                 found_keywords.append(keyword)
 
         # Also extract using existing other keywords method for additional terms
-        other_keywords = self._extract_other_keywords(text, max_keywords)
+        other_keywords = self._extract_other_keywords(text, max_keywords, doc=doc)
         found_keywords.extend(other_keywords)
 
         return list(set(found_keywords))[:max_keywords]
@@ -378,7 +333,7 @@ class KeywordParser:
         
         return found_skills
     
-    def _extract_other_keywords(self, text: str, max_keywords: int = 20) -> List[str]:
+    def _extract_other_keywords(self, text: str, max_keywords: int = 20, doc=None) -> List[str]:
         """Extract other important keywords using various methods"""
         keywords = []
         
@@ -394,7 +349,7 @@ class KeywordParser:
         
         # Method 3: Use SpaCy if available
         if self.nlp:
-            spacy_keywords = self._extract_spacy_keywords(text, max_keywords)
+            spacy_keywords = self._extract_spacy_keywords(text, max_keywords, doc=doc)
             keywords.extend(spacy_keywords)
         
         # Method 4: Basic frequency analysis
@@ -462,8 +417,8 @@ class KeywordParser:
             logger.error(f"Error in NLTK extraction: {e}")
             return []
     
-    def _extract_spacy_keywords(self, text: str, max_keywords: int) -> List[str]:
-        """Extract keywords using SpaCy"""
+    def _extract_spacy_keywords(self, text: str, max_keywords: int, doc=None) -> List[str]:
+        """Extract keywords using SpaCy (reusing a pre-parsed doc when given)"""
         try:
             # Load spaCy model lazily
             if self.nlp is None:
@@ -472,7 +427,8 @@ class KeywordParser:
             if self.nlp is None:
                 return []  # spaCy not available
 
-            doc = self.nlp(text)
+            if doc is None:
+                doc = self.nlp(text)
             
             keywords = []
             for token in doc:
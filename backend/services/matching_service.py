@@ -4,8 +4,11 @@ Implements keyword matching algorithms to compare resumes with job descriptions
 """
 
 import logging
+from datetime import datetime
 from typing import Dict, List, Tuple, Set
-from backend.models import db, Resume, JobDescription, MatchScore
+from backend.models import db, Resume, JobDescription, MatchScore, KEYWORD_CATEGORIES, upsert_rows
+from backend.services import keyword_fingerprint
+from backend.services.history_queries import match_scores_with_documents
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +36,8 @@ class MatchingService:
             Dict containing matching results and score details
         """
         try:
+            user_id = int(user_id)
+            
             # Get resume and job description
             resume = Resume.query.filter_by(
                 id=resume_id,
@@ -58,24 +63,21 @@ class MatchingService:
             if not job_description.keywords_extracted:
                 raise ValueError(f"Job description {job_description_id} keywords not extracted yet")
             
-            # Get keywords
-            resume_keywords = resume.get_keywords()
-            jd_keywords = job_description.get_keywords()
+            # Keyword fingerprints: Jaccard over interned ids, no string handling
+            resume_fps = resume.get_fingerprints()
+            jd_fps = job_description.get_fingerprints()
             
             # Calculate individual category scores
-            technical_score = self._calculate_jaccard_similarity(
-                resume_keywords['technical_skills'],
-                jd_keywords['technical_skills']
+            technical_score = keyword_fingerprint.jaccard(
+                resume_fps['technical_skills'], jd_fps['technical_skills']
             )
             
-            soft_skills_score = self._calculate_jaccard_similarity(
-                resume_keywords['soft_skills'],
-                jd_keywords['soft_skills']
+            soft_skills_score = keyword_fingerprint.jaccard(
+                resume_fps['soft_skills'], jd_fps['soft_skills']
             )
             
-            other_keywords_score = self._calculate_jaccard_similarity(
-                resume_keywords['other_keywords'],
-                jd_keywords['other_keywords']
+            other_keywords_score = keyword_fingerprint.jaccard(
+                resume_fps['other_keywords'], jd_fps['other_keywords']
             )
             
             # Calculate overall score (weighted average)
@@ -84,20 +86,14 @@ class MatchingService:
             )
             
             # Count total keywords and matches
-            total_resume_keywords = (
-                len(resume_keywords['technical_skills']) +
-                len(resume_keywords['soft_skills']) +
-                len(resume_keywords['other_keywords'])
-            )
-            
-            total_jd_keywords = (
-                len(jd_keywords['technical_skills']) +
-                len(jd_keywords['soft_skills']) +
-                len(jd_keywords['other_keywords'])
-            )
+            total_resume_keywords = resume.keyword_count or 0
+            total_jd_keywords = job_description.keyword_count or 0
             
             # Count total matched keywords
-            matched_keywords = self._count_total_matches(resume_keywords, jd_keywords)
+            matched_keywords = sum(
+                keyword_fingerprint.overlap(resume_fps[category], jd_fps[category])
+                for category in KEYWORD_CATEGORIES
+            )
             
             # Save or update match score in database
             match_score = self._save_match_score(
@@ -196,38 +192,151 @@ class MatchingService:
         return total_matches
     
     def _save_match_score(self, **kwargs) -> MatchScore:
-        """Save or update match score in database"""
-        # Check if match score already exists
-        existing_score = MatchScore.query.filter_by(
+        """Save or update match score in database (single upsert on the pair)"""
+        self._upsert_match_scores([kwargs])
+        db.session.commit()
+        
+        return MatchScore.query.filter_by(
             user_id=kwargs['user_id'],
             resume_id=kwargs['resume_id'],
-            job_description_id=kwargs['job_description_id'],
-            is_active=True
-        ).first()
+            job_description_id=kwargs['job_description_id']
+        ).populate_existing().one()
+    
+    def _upsert_match_scores(self, rows: List[Dict]) -> None:
+        """Insert or update match score rows keyed by (user, resume, job description)"""
+        now = datetime.utcnow()
+        upsert_rows(
+            MatchScore,
+            [dict(row, algorithm_used='jaccard', is_active=True, created_at=now, updated_at=now) for row in rows],
+            ('user_id', 'resume_id', 'job_description_id')
+        )
+    
+    def calculate_match_matrix(self, user_id: int, resume_ids: List[int] = None,
+                               job_description_ids: List[int] = None, max_pairs: int = None) -> Dict:
+        """
+        Score every active resume against every active job description of a user
         
-        if existing_score:
-            # Update existing score
-            for key, value in kwargs.items():
-                if hasattr(existing_score, key):
-                    setattr(existing_score, key, value)
-            existing_score.algorithm_used = 'jaccard'
-            match_score = existing_score
-        else:
-            # Create new score
-            match_score = MatchScore(
-                algorithm_used='jaccard',
-                **kwargs
-            )
-            db.session.add(match_score)
+        All pairs are computed in one vectorized pass over keyword fingerprints
+        and saved with bulk upserts in a single commit.
+        
+        Args:
+            user_id: ID of the user
+            resume_ids: Limit to these resumes (default: all with keywords extracted)
+            job_description_ids: Limit to these job descriptions (default: all)
+            max_pairs: Refuse matrices larger than this many pairs
+            
+        Returns:
+            Dict with the resume and job description axes and score matrices
+        """
+        resume_query = Resume.query.filter_by(user_id=user_id, is_active=True, keywords_extracted=True)
+        if resume_ids is not None:
+            resume_query = resume_query.filter(Resume.id.in_(resume_ids))
+        jd_query = JobDescription.query.filter_by(user_id=user_id, is_active=True, keywords_extracted=True)
+        if job_description_ids is not None:
+            jd_query = jd_query.filter(JobDescription.id.in_(job_description_ids))
+        
+        resumes = resume_query.order_by(Resume.id).all()
+        job_descriptions = jd_query.order_by(JobDescription.id).all()
+        
+        pair_count = len(resumes) * len(job_descriptions)
+        if max_pairs and pair_count > max_pairs:
+            raise ValueError(f"Match matrix of {pair_count} pairs exceeds the limit of {max_pairs}")
+        
+        scores = keyword_fingerprint.score_matrix(
+            [resume.get_fingerprints() for resume in resumes],
+            [jd.get_fingerprints() for jd in job_descriptions]
+        )
         
+        rows = []
+        for i, resume in enumerate(resumes):
+            for j, jd in enumerate(job_descriptions):
+                rows.append({
+                    'user_id': user_id,
+                    'resume_id': resume.id,
+                    'job_description_id': jd.id,
+                    'overall_score': float(scores['overall_score'][i, j]),
+                    'technical_score': float(scores['technical_skills_score'][i, j]),
+                    'soft_skills_score': float(scores['soft_skills_score'][i, j]),
+                    'other_keywords_score': float(scores['other_keywords_score'][i, j]),
+                    'total_resume_keywords': resume.keyword_count or 0,
+                    'total_jd_keywords': jd.keyword_count or 0,
+                    'matched_keywords': int(scores['matched_keywords'][i, j])
+                })
+        
+        # Also persists fingerprints built for rows extracted before they existed
+        self._upsert_match_scores(rows)
         db.session.commit()
-        return match_score
+        
+        self.logger.info(f"Match matrix calculated: {len(resumes)} resumes x {len(job_descriptions)} JDs for user {user_id}")
+        
+        return {
+            'resumes': [{'id': r.id, 'title': r.title} for r in resumes],
+            'job_descriptions': [
+                {'id': jd.id, 'title': jd.title, 'company_name': jd.company_name} for jd in job_descriptions
+            ],
+            'matrix': scores['overall_score'].tolist(),
+            'category_scores': {
+                'technical_score': scores['technical_skills_score'].tolist(),
+                'soft_skills_score': scores['soft_skills_score'].tolist(),
+                'other_keywords_score': scores['other_keywords_score'].tolist()
+            },
+            'matched_keywords': scores['matched_keywords'].astype(int).tolist(),
+            'pair_count': pair_count
+        }
+    
+    def score_against_job_descriptions(self, resume_id: int, user_id: int,
+                                       job_description_ids: List[int] = None) -> List[Dict]:
+        """
+        Score one resume against many job descriptions in a single vectorized pass
+        
+        Args:
+            resume_id: ID of the resume
+            user_id: ID of the user (for security)
+            job_description_ids: Limit to these job descriptions (default: all active)
+            
+        Returns:
+            List of score dicts, best match first (nothing is saved)
+        """
+        resume = Resume.query.filter_by(id=resume_id, user_id=user_id, is_active=True).first()
+        if not resume:
+            raise ValueError(f"Resume {resume_id} not found")
+        if not resume.keywords_extracted:
+            raise ValueError(f"Resume {resume_id} keywords not extracted yet")
+        
+        query = JobDescription.query.filter_by(user_id=user_id, is_active=True, keywords_extracted=True)
+        if job_description_ids is not None:
+            query = query.filter(JobDescription.id.in_(job_description_ids))
+        job_descriptions = query.all()
+        if not job_descriptions:
+            return []
+        
+        scores = keyword_fingerprint.score_many(
+            resume.get_fingerprints(),
+            [jd.get_fingerprints() for jd in job_descriptions]
+        )
+        if db.session.dirty:
+            db.session.commit()  # persist fingerprints built for older rows
+        
+        results = [
+            {
+                'job_description_id': jd.id,
+                'job_title': jd.title,
+                'company_name': jd.company_name,
+                'overall_score': float(scores['overall_score'][i]),
+                'technical_score': float(scores['technical_skills_score'][i]),
+                'soft_skills_score': float(scores['soft_skills_score'][i]),
+                'other_keywords_score': float(scores['other_keywords_score'][i]),
+                'matched_keywords': int(scores['matched_keywords'][i])
+            }
+            for i, jd in enumerate(job_descriptions)
+        ]
+        results.sort(key=lambda r: r['overall_score'], reverse=True)
+        return results
     
     def get_match_history(self, user_id: int, limit: int = 10) -> List[Dict]:
         """Get recent match scores for a user"""
         try:
-            match_scores = MatchScore.query.filter_by(
-                user_id=user_id,
+            match_scores = match_scores_with_documents(user_id).filter_by(
                 is_active=True
             ).order_by(MatchScore.created_at.desc()).limit(limit).all()
             
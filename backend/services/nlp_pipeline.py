@@ -0,0 +1,263 @@
+"""
+Shared spaCy pipeline loader
+
+Services ask for a pipeline by profile instead of calling
+spacy.load('en_core_web_sm') themselves:
+
+    'lemma' - tokenizer, tagger, attribute_ruler, lemmatizer
+              (RealTimeLLMService text preprocessing)
+    'full'  - the above plus parser and NER
+              (noun chunks / entities in suggestions and keyword parsing)
+
+The runtime loader prefers a trimmed artifact produced by the build step,
+which drops unused components (senter) and bakes in tokenizer exceptions
+for tech terms such as "c++", "c#" and "node.js". Without the artifact it
+falls back to the stock model with the same components excluded.
+
+Build the artifact (e.g. during deployment):
+    python -m backend.services.nlp_pipeline build
+
+Compare load time and memory against the stock model:
+    python -m backend.services.nlp_pipeline benchmark
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import subprocess
+
+try:
+    import spacy
+    SPACY_AVAILABLE = True
+except ImportError:
+    SPACY_AVAILABLE = False
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BASE_MODEL = 'en_core_web_sm'
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PIPELINE_PATH = os.path.join(BASE_DIR, 'nlp_models', 'en_core_web_sm_trimmed')
+
+# Components never used by any service
+BUILD_EXCLUDE = ['senter']
+
+# Components skipped at load time for each profile
+PROFILE_EXCLUDE = {
+    'lemma': ['parser', 'ner', 'senter'],
+    'full': ['senter'],
+}
+
+# Tech terms the default English tokenizer would split apart
+TECH_TERMS = [
+    'c++', 'c#', 'f#', '.net', 'asp.net', 'vb.net', 'ado.net',
+    'node.js', 'vue.js', 'next.js', 'nuxt.js', 'react.js', 'express.js', 'd3.js',
+    'ci/cd', 'tcp/ip', 'pl/sql', 'ui/ux',
+]
+
+_models = {}
+_load_stats = {}
+_lock = threading.Lock()
+_download_attempted = False
+
+
+def get_pipeline_path():
+    """Location of the trimmed pipeline artifact (SPACY_PIPELINE_PATH overrides)"""
+    return os.getenv('SPACY_PIPELINE_PATH', DEFAULT_PIPELINE_PATH)
+
+
+def add_tech_term_exceptions(nlp, terms=TECH_TERMS):
+    """Register tokenizer special cases so tech terms stay single tokens"""
+    for term in terms:
+        for variant in {term, term.upper(), term.capitalize(), term.title()}:
+            nlp.tokenizer.add_special_case(variant, [{'ORTH': variant}])
+    return nlp
+
+
+def load_nlp(profile='full'):
+    """
+    Get the shared spaCy pipeline for a profile, loading it once per process
+
+    Args:
+        profile (str): 'lemma' or 'full'
+
+    Returns:
+        Language or None: The pipeline, or None when spaCy/the model is unavailable
+    """
+    if profile not in PROFILE_EXCLUDE:
+        raise ValueError(f"Unknown NLP profile: {profile}")
+
+    with _lock:
+        if profile in _models:
+            return _models[profile]
+
+        # A loaded 'full' pipeline also serves 'lemma' callers; no second copy
+        if profile == 'lemma' and _models.get('full') is not None:
+            return _models['full']
+
+        nlp = _load(profile)
+        _models[profile] = nlp
+        return nlp
+
+
+def get_load_stats():
+    """Load time and RSS growth per profile, for health/diagnostic output"""
+    return dict(_load_stats)
+
+
+def _load(profile):
+    global _download_attempted
+
+    if not SPACY_AVAILABLE:
+        logger.warning("SpaCy not available. Using basic NLP fallback.")
+        return None
+
+    exclude = PROFILE_EXCLUDE[profile]
+    path = get_pipeline_path()
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+
+    nlp = None
+    source = None
+    if os.path.isdir(path):
+        try:
+            nlp = spacy.load(path, exclude=exclude)
+            source = path
+        except Exception as e:
+            logger.warning(f"⚠️ Trimmed spaCy pipeline at {path} failed to load: {e}")
+
+    if nlp is None:
+        try:
+            nlp = spacy.load(BASE_MODEL, exclude=exclude)
+        except OSError:
+            if _download_attempted:
+                return None
+            _download_attempted = True
+            logger.warning(f"⚠️ spaCy model '{BASE_MODEL}' not found locally")
+            try:
+                logger.info("Attempting to download spaCy model...")
+                # Note: downloading might take time and cause a freeze if internet is slow
+                subprocess.run(
+                    [sys.executable, "-m", "spacy", "download", BASE_MODEL],
+                    check=True,
+                    capture_output=True,
+                    timeout=120
+                )
+                nlp = spacy.load(BASE_MODEL, exclude=exclude)
+            except Exception as download_error:
+                logger.error(f"⚠️ Could not download spaCy model: {download_error}")
+                return None
+        add_tech_term_exceptions(nlp)
+        source = BASE_MODEL
+
+    elapsed = time.perf_counter() - started
+    rss_delta = _rss_mb() - rss_before
+    _load_stats[profile] = {
+        'source': source,
+        'pipeline': list(nlp.pipe_names),
+        'load_seconds': round(elapsed, 3),
+        'rss_delta_mb': round(rss_delta, 1)
+    }
+    logger.info(
+        f"✅ spaCy '{profile}' pipeline loaded from {source} in {elapsed:.2f}s "
+        f"(+{rss_delta:.0f} MB RSS, components: {', '.join(nlp.pipe_names)})"
+    )
+    return nlp
+
+
+def _rss_mb():
+    """Current resident set size in MB (0 when it cannot be determined)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+    except ImportError:
+        return 0.0
+
+
+# ---------------- BUILD / BENCHMARK ----------------
+
+def build_pipeline(output_path=None, base_model=BASE_MODEL):
+    """
+    Build the trimmed pipeline artifact with to_disk
+
+    Returns:
+        str: Path the artifact was written to
+    """
+    output_path = output_path or get_pipeline_path()
+    nlp = spacy.load(base_model, exclude=BUILD_EXCLUDE)
+    add_tech_term_exceptions(nlp)
+    nlp.meta['name'] = f"{nlp.meta.get('name', 'pipeline')}_trimmed"
+    nlp.meta['description'] = f"Trimmed build of {base_model} for Dr. Resume"
+    nlp.to_disk(output_path)
+    logger.info(f"Trimmed pipeline written to {output_path} ({', '.join(nlp.pipe_names)})")
+    return output_path
+
+
+def _measure(source, exclude):
+    """Measure one load in a fresh interpreter so RSS numbers are not shared"""
+    code = (
+        "import json, time, spacy\n"
+        "from backend.services.nlp_pipeline import _rss_mb\n"
+        "before = _rss_mb(); started = time.perf_counter()\n"
+        f"nlp = spacy.load({source!r}, exclude={exclude!r})\n"
+        "elapsed = time.perf_counter() - started\n"
+        "nlp('Senior Python developer with C++, node.js and CI/CD experience.')\n"
+        "print(json.dumps({'load_seconds': round(elapsed, 3), 'rss_mb': round(_rss_mb() - before, 1)}))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(BASE_DIR))
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr else 'failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(base_model=BASE_MODEL):
+    """Compare load time and RSS of the stock model and the trimmed artifact"""
+    path = get_pipeline_path()
+    rows = [('stock', 'all components', _measure(base_model, []))]
+    for profile, exclude in PROFILE_EXCLUDE.items():
+        if os.path.isdir(path):
+            rows.append(('trimmed', profile, _measure(path, exclude)))
+        else:
+            rows.append(('trimmed', profile, {'error': f'no artifact at {path}'}))
+
+    for source, profile, stats in rows:
+        if 'error' in stats:
+            print(f"{source:<8} {profile:<16} error: {stats['error']}")
+        else:
+            print(f"{source:<8} {profile:<16} load {stats['load_seconds']:>6.2f}s   RSS +{stats['rss_mb']:>6.1f} MB")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or benchmark the trimmed spaCy pipeline")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build_cmd = sub.add_parser('build', help='Write the trimmed pipeline artifact')
+    build_cmd.add_argument('--output', default=None, help='Artifact directory')
+    build_cmd.add_argument('--base-model', default=BASE_MODEL)
+
+    bench_cmd = sub.add_parser('benchmark', help='Compare load time and RSS with the stock model')
+    bench_cmd.add_argument('--base-model', default=BASE_MODEL)
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        build_pipeline(args.output, args.base_model)
+    else:
+        benchmark(args.base_model)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Keyset (Cursor) Pagination
+Shared pagination contract for list endpoints
+
+Request:  ?limit=<n>&cursor=<opaque token from the previous page>
+Response: {"limit": n, "next_cursor": "<token>" | null, "has_more": bool}
+
+Pages are selected with a WHERE clause on (sort key, id) instead of OFFSET,
+so every page costs the same index range scan no matter how deep the user
+pages, and no COUNT query is needed. Totals, where an endpoint reports them,
+come from the user_stats rollup.
+"""
+
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class PaginationError(ValueError):
+    """Invalid limit or cursor (reported to the client as 400)"""
+
+
+def parse_page_args(args, default_limit=DEFAULT_LIMIT, max_limit=MAX_LIMIT):
+    """
+    Read limit and cursor from request args
+
+    Args:
+        args: request.args
+        default_limit: Page size when none is given
+        max_limit: Largest page size allowed
+
+    Returns:
+        tuple: (limit, cursor token or None)
+    """
+    raw_limit = args.get('limit', args.get('per_page'))
+    if raw_limit in (None, ''):
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            raise PaginationError('limit must be an integer')
+        if limit < 1:
+            raise PaginationError('limit must be at least 1')
+    return min(limit, max_limit), args.get('cursor') or None
+
+
+def encode_cursor(sort_key, value, row_id):
+    """Opaque token for the position after (value, row_id) in a sort_key ordering"""
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps([sort_key, value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, sort_key):
+    """
+    Decode a cursor produced by encode_cursor for the same ordering
+
+    Returns:
+        tuple: (value, row_id)
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+        row_id = int(row_id)
+    except (ValueError, TypeError, KeyError):
+        raise PaginationError('Invalid cursor')
+    if key != sort_key:
+        raise PaginationError('Cursor does not match the requested sort order')
+    return value, row_id
+
+
+def paginate(query, sort_column, id_column, limit, cursor=None, descending=True, sort_key=None):
+    """
+    Fetch one page of query ordered by (sort_column, id_column)
+
+    Args:
+        query: Filtered Query (entities or projected rows)
+        sort_column: Non-null column to order by (e.g. created_at)
+        id_column: Unique tie-breaker column (the primary key)
+        limit: Page size
+        cursor: Token from a previous page, or None for the first page
+        descending: Newest/highest first
+        sort_key: Name bound into the cursor (defaults to the column key)
+
+    Returns:
+        tuple: (items, next_cursor or None)
+    """
+    sort_key = sort_key or sort_column.key
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key)
+        if descending:
+            query = query.filter(or_(sort_column < value, and_(sort_column == value, id_column < row_id)))
+        else:
+            query = query.filter(or_(sort_column > value, and_(sort_column == value, id_column > row_id)))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(sort_key, getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def page_info(limit, next_cursor):
+    """Pagination fields shared by every list response"""
+    return {
+        'limit': limit,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    }
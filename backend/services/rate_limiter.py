@@ -0,0 +1,329 @@
+"""
+Token bucket rate limiting
+
+Every client has a bucket per user and per IP address. A bucket holds up to
+`capacity` tokens and refills continuously at capacity / window. A request
+takes its route's cost from both buckets at once, so an NLP-heavy scan uses
+up the allowance ten times faster than a history page. When either bucket
+is short, nothing is taken and the client gets a 429 with Retry-After: the
+seconds until both buckets hold the cost again. IP buckets are
+RATE_LIMIT_IP_FACTOR times larger because an office or NAT address is shared
+by several users.
+
+Bucket stores:
+
+- memory (default): a dict in this process. Each worker has its own buckets,
+  so N workers let a client through N times as often. Fine for a single
+  worker (the Procfile's gunicorn default).
+- sqlite: a small WAL database on local disk (RATE_LIMIT_STORAGE) shared by
+  every worker on the host. Each take is one BEGIN IMMEDIATE transaction, so
+  concurrent workers never hand out the same token twice. Every
+  SQLITE_PRUNE_EVERY takes, a worker deletes the buckets that have been idle
+  for a whole window.
+
+Routes opt in with auth_middleware.rate_limited_route(cost=...).
+
+    python -m backend.services.rate_limiter show user:42 ip:10.0.0.7
+    python -m backend.services.rate_limiter prune --idle-seconds 3600
+"""
+import os
+import sys
+import math
+import time
+import sqlite3
+import argparse
+import itertools
+import logging
+import threading
+from collections import namedtuple
+from flask import current_app
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default limits (overridable from the Flask config)
+DEFAULT_MAX_REQUESTS = 60
+DEFAULT_WINDOW_MINUTES = 1
+DEFAULT_IP_FACTOR = 4
+DEFAULT_STORAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'rate_limits.db')
+
+# Route costs in tokens
+COST_LIST = 1
+COST_MATCH = 5
+COST_NLP = 10  # scans, real-time analysis, premium suggestions
+COST_MATRIX = 20
+COST_BULK = 50  # bulk imports extract keywords for every file or record
+
+# The memory store drops full buckets once it tracks this many keys
+MAX_MEMORY_KEYS = 10000
+# Each worker prunes the SQLite store after this many of its takes
+SQLITE_PRUNE_EVERY = 1000
+
+Bucket = namedtuple('Bucket', 'key capacity refill_per_second')
+RateLimitResult = namedtuple('RateLimitResult', 'allowed remaining retry_after')
+
+
+def refill_seconds(buckets):
+    """Seconds after which all of these buckets are full again, however empty they were"""
+    return max(bucket.capacity / bucket.refill_per_second for bucket in buckets)
+
+
+def take_tokens(buckets, states, cost, now):
+    """
+    Token bucket arithmetic shared by the stores
+
+    Args:
+        buckets: Buckets to take from
+        states: key -> (tokens, updated) for the buckets seen before
+        cost: Tokens to take from every bucket (capped at its capacity)
+        now: Current time in seconds
+
+    Returns:
+        tuple: (RateLimitResult, key -> (tokens, now) to store, None when denied)
+    """
+    levels = {}
+    retry_after = 0.0
+    for bucket in buckets:
+        tokens, updated = states.get(bucket.key, (bucket.capacity, now))
+        tokens = min(bucket.capacity, tokens + max(0.0, now - updated) * bucket.refill_per_second)
+        levels[bucket.key] = tokens
+        needed = min(cost, bucket.capacity) - tokens
+        if needed > 0:
+            retry_after = max(retry_after, needed / bucket.refill_per_second)
+
+    if retry_after > 0:
+        return RateLimitResult(False, math.floor(min(levels.values())), retry_after), None
+
+    new_states = {bucket.key: (levels[bucket.key] - min(cost, bucket.capacity), now) for bucket in buckets}
+    remaining = math.floor(min(tokens for tokens, _ in new_states.values()))
+    return RateLimitResult(True, remaining, 0.0), new_states
+
+
+class MemoryBucketStore:
+    """Buckets of this process"""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def take(self, buckets, cost, now):
+        with self._lock:
+            result, new_states = take_tokens(buckets, self._states, cost, now)
+            if new_states:
+                self._states.update(new_states)
+                if len(self._states) > MAX_MEMORY_KEYS:
+                    self._drop_full(buckets, now)
+            return result
+
+    def _drop_full(self, buckets, now):
+        # Buckets idle for a whole window are full again: forgetting them changes nothing
+        self.prune(refill_seconds(buckets), now)
+
+    def peek(self, key):
+        with self._lock:
+            return self._states.get(key)
+
+    def prune(self, idle_seconds, now=None):
+        """Forget buckets not used for idle_seconds; returns how many"""
+        cutoff = (now if now is not None else time.time()) - idle_seconds
+        with self._lock:
+            stale = [key for key, (_, updated) in self._states.items() if updated < cutoff]
+            for key in stale:
+                del self._states[key]
+        return len(stale)
+
+
+class SQLiteBucketStore:
+    """
+    Buckets in a local SQLite file shared by all workers on the host
+
+    Args:
+        path (str): Database file (created with its folder when missing)
+        timeout (float): Seconds to wait for another worker's take
+        prune_every (int): Takes between deletions of idle buckets
+    """
+
+    def __init__(self, path, timeout=5.0, prune_every=SQLITE_PRUNE_EVERY):
+        self.path = path
+        self.timeout = timeout
+        self.prune_every = prune_every
+        self._takes = itertools.count(1)
+        self._local = threading.local()
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+        )
+
+    def _connection(self):
+        """One connection per thread, reopened after a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def take(self, buckets, cost, now):
+        connection = self._connection()
+        keys = [bucket.key for bucket in buckets]
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            rows = connection.execute(
+                f"SELECT key, tokens, updated FROM rate_limit_buckets WHERE key IN ({','.join('?' * len(keys))})",
+                keys
+            ).fetchall()
+            result, new_states = take_tokens(buckets, {key: (tokens, updated) for key, tokens, updated in rows},
+                                             cost, now)
+            if new_states:
+                connection.executemany(
+                    'INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                    [(key, tokens, updated) for key, (tokens, updated) in new_states.items()]
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        if next(self._takes) % self.prune_every == 0:
+            self._drop_full(buckets, now)
+        return result
+
+    def _drop_full(self, buckets, now):
+        # Outside the take's transaction: a failed prune must not refuse or
+        # unlimit the request, the next round retries it
+        try:
+            self.prune(refill_seconds(buckets), now)
+        except sqlite3.Error as e:
+            logger.warning(f"Pruning rate limit buckets failed: {e}")
+
+    def peek(self, key):
+        row = self._connection().execute('SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?',
+                                         (key,)).fetchone()
+        return tuple(row) if row else None
+
+    def prune(self, idle_seconds, now=None):
+        """Delete buckets not used for idle_seconds; returns how many"""
+        cutoff = (now if now is not None else time.time()) - idle_seconds
+        return self._connection().execute('DELETE FROM rate_limit_buckets WHERE updated < ?', (cutoff,)).rowcount
+
+
+class RateLimiter:
+    """
+    Per-user and per-IP token buckets
+
+    Args:
+        store: MemoryBucketStore or SQLiteBucketStore
+        max_requests (int): User bucket capacity in tokens
+        window_minutes (float): Time for an empty bucket to refill completely
+        ip_factor (float): IP bucket capacity as a multiple of the user bucket
+        clock: Time source in seconds (time.time; the sqlite store is shared by processes)
+    """
+
+    def __init__(self, store, max_requests=DEFAULT_MAX_REQUESTS, window_minutes=DEFAULT_WINDOW_MINUTES,
+                 ip_factor=DEFAULT_IP_FACTOR, clock=time.time):
+        self.store = store
+        self.max_requests = max_requests
+        self.window_minutes = window_minutes
+        self.ip_factor = ip_factor
+        self.clock = clock
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the limiter from the app's Flask config"""
+        backend = config.get('RATE_LIMIT_BACKEND', 'memory')
+        if backend == 'sqlite':
+            store = SQLiteBucketStore(config.get('RATE_LIMIT_STORAGE') or DEFAULT_STORAGE)
+        elif backend == 'memory':
+            store = MemoryBucketStore()
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+        return cls(
+            store,
+            max_requests=config.get('RATE_LIMIT_MAX_REQUESTS', DEFAULT_MAX_REQUESTS),
+            window_minutes=config.get('RATE_LIMIT_WINDOW_MINUTES', DEFAULT_WINDOW_MINUTES),
+            ip_factor=config.get('RATE_LIMIT_IP_FACTOR', DEFAULT_IP_FACTOR)
+        )
+
+    def buckets(self, user_id, ip_address, scope='api', max_requests=None, window_minutes=None):
+        """
+        Buckets a request takes from
+
+        Args:
+            user_id: JWT identity, or None for anonymous requests
+            ip_address: Client address, or None when unknown
+            scope: Bucket family; routes sharing a scope share their allowance
+            max_requests: User bucket capacity (default: the limiter's)
+            window_minutes: Refill time (default: the limiter's)
+
+        Returns:
+            list: Bucket tuples
+        """
+        capacity = max_requests or self.max_requests
+        window_seconds = (window_minutes or self.window_minutes) * 60
+        buckets = []
+        if user_id is not None:
+            buckets.append(Bucket(f'{scope}:user:{user_id}', capacity, capacity / window_seconds))
+        if ip_address:
+            ip_capacity = capacity * self.ip_factor
+            buckets.append(Bucket(f'{scope}:ip:{ip_address}', ip_capacity, ip_capacity / window_seconds))
+        return buckets
+
+    def hit(self, buckets, cost=1):
+        """
+        Take cost tokens from every bucket, or from none
+
+        Returns:
+            RateLimitResult: allowed, whole tokens left, seconds to wait when denied
+        """
+        if not buckets:
+            return RateLimitResult(True, None, 0.0)
+        return self.store.take(buckets, cost, self.clock())
+
+
+def init_rate_limiter(app):
+    """
+    Create the app's limiter
+
+    Returns:
+        RateLimiter: The limiter (also in app.extensions['rate_limiter'])
+    """
+    limiter = RateLimiter.from_config(app.config)
+    app.extensions['rate_limiter'] = limiter
+    return limiter
+
+
+def get_rate_limiter():
+    """The current app's limiter, or None when rate limiting is off"""
+    return current_app.extensions.get('rate_limiter')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rate limit buckets (sqlite store)")
+    parser.add_argument('--storage', default=os.getenv('RATE_LIMIT_STORAGE') or DEFAULT_STORAGE,
+                        help='Bucket database file')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    show_cmd = sub.add_parser('show', help='Stored tokens of buckets (e.g. api:user:42, api:ip:10.0.0.7)')
+    show_cmd.add_argument('keys', nargs='+')
+
+    prune_cmd = sub.add_parser('prune', help='Delete buckets idle for longer than their window')
+    prune_cmd.add_argument('--idle-seconds', type=float, default=3600)
+
+    args = parser.parse_args(argv)
+    store = SQLiteBucketStore(args.storage)
+    if args.command == 'show':
+        for key in args.keys:
+            state = store.peek(key)
+            print(f"{key}: " + ("full (not stored)" if state is None else
+                                f"{state[0]:.1f} tokens, updated {time.time() - state[1]:.0f}s ago"))
+    elif args.command == 'prune':
+        print(f"Deleted {store.prune(args.idle_seconds)} idle buckets")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Scan history retention and compaction
+
+scan_history and match_scores only ever grow. The compactor applies a
+retention policy to them:
+
+- Scans older than SCAN_RETENTION_DAYS are archived. Their analysis documents
+  and text snapshots move to scan_history_archive as one compressed document;
+  scan_history keeps the summary columns that the history lists, dashboards
+  and rollups read. Their text blob references are released (the text blob
+  sweeper deletes blobs nobody uses any more). Detail endpoints read archived
+  documents back when a scan is opened.
+- Match scores not recalculated for MATCH_SCORE_RETENTION_DAYS are deleted;
+  matching the pair again recomputes them. 0 keeps them forever.
+
+Work is done in batches of RETENTION_BATCH_SIZE rows, one short transaction
+each, with a RETENTION_BATCH_PAUSE_MS pause in between, so writers never wait
+long. With RETENTION_ENABLED=1 a background thread runs a pass every
+RETENTION_INTERVAL_SECONDS; when several workers run it, one does the work and
+the others skip that round.
+
+    python -m backend.services.retention run --scan-days 180 --match-score-days 365
+    python -m backend.services.retention stats
+"""
+import os
+import sys
+import time
+import atexit
+import argparse
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from backend.models import db, ScanHistory, ScanArchive, MatchScore, TextBlob, release_text_blobs
+from backend.services.text_blobs import sweep
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default policy (overridable from the Flask config)
+DEFAULT_SCAN_RETENTION_DAYS = 180
+DEFAULT_MATCH_SCORE_RETENTION_DAYS = 365
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_BATCH_PAUSE_MS = 50
+DEFAULT_INTERVAL_SECONDS = 3600
+
+# pg_try_advisory_lock key: one compactor at a time across workers
+_PG_RETENTION_LOCK = 7_342_002
+
+
+@contextmanager
+def _single_runner(engine):
+    """Yield True if this process may compact now, False if another one is"""
+    if engine.dialect.name == 'postgresql':
+        with engine.connect() as connection:
+            acquired = connection.execute(text('SELECT pg_try_advisory_lock(:key)'),
+                                          {'key': _PG_RETENTION_LOCK}).scalar()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _PG_RETENTION_LOCK})
+        return
+
+    database = engine.url.database if engine.dialect.name == 'sqlite' else None
+    if not database or database == ':memory:' or fcntl is None:
+        yield True
+        return
+
+    with open(f'{database}.retention.lock', 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RetentionCompactor:
+    """Archives old scans and prunes stale match scores in bounded batches"""
+
+    def __init__(self, engine, scan_days=DEFAULT_SCAN_RETENTION_DAYS,
+                 match_score_days=DEFAULT_MATCH_SCORE_RETENTION_DAYS, batch_size=DEFAULT_BATCH_SIZE,
+                 batch_pause_ms=DEFAULT_BATCH_PAUSE_MS, interval_seconds=DEFAULT_INTERVAL_SECONDS):
+        self.engine = engine
+        self.scan_days = scan_days
+        self.match_score_days = match_score_days
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause_ms / 1000.0
+        self.interval = interval_seconds
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, app):
+        """Build the compactor from the app's Flask config"""
+        config = app.config
+        with app.app_context():
+            engine = db.engine
+        return cls(
+            engine,
+            scan_days=config.get('SCAN_RETENTION_DAYS', DEFAULT_SCAN_RETENTION_DAYS),
+            match_score_days=config.get('MATCH_SCORE_RETENTION_DAYS', DEFAULT_MATCH_SCORE_RETENTION_DAYS),
+            batch_size=config.get('RETENTION_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+            batch_pause_ms=config.get('RETENTION_BATCH_PAUSE_MS', DEFAULT_BATCH_PAUSE_MS),
+            interval_seconds=config.get('RETENTION_INTERVAL_SECONDS', DEFAULT_INTERVAL_SECONDS)
+        )
+
+    # ---------------- BATCHES ----------------
+
+    def archive_scan_batch(self, connection, cutoff):
+        """
+        Archive up to batch_size scans created before cutoff
+
+        Args:
+            connection: Connection inside the batch's transaction
+            cutoff (datetime): Scans created before this are archived
+
+        Returns:
+            int: Number of scans archived
+        """
+        scans = ScanHistory.__table__
+        resume_blob = TextBlob.__table__.alias('resume_blob')
+        job_blob = TextBlob.__table__.alias('job_blob')
+        rows = connection.execute(
+            db.select(scans.c.id, scans.c.detailed_analysis, scans.c.recommendations, scans.c.keyword_analysis,
+                      scans.c.resume_text_hash, scans.c.job_description_text_hash,
+                      resume_blob.c.content.label('resume_text'), job_blob.c.content.label('job_description_text'))
+            .select_from(scans
+                         .outerjoin(resume_blob, resume_blob.c.hash == scans.c.resume_text_hash)
+                         .outerjoin(job_blob, job_blob.c.hash == scans.c.job_description_text_hash))
+            .where(scans.c.archived_at.is_(None), scans.c.created_at < cutoff)
+            .order_by(scans.c.created_at, scans.c.id).limit(self.batch_size)
+        ).all()
+        if not rows:
+            return 0
+
+        now = datetime.utcnow()
+        connection.execute(ScanArchive.__table__.insert(), [{
+            'scan_id': row.id,
+            'document': {field: getattr(row, field) for field in ScanHistory.ARCHIVED_FIELDS},
+            'has_detailed_analysis': row.detailed_analysis is not None,
+            'archived_at': now
+        } for row in rows])
+        connection.execute(scans.update().where(scans.c.id.in_([row.id for row in rows])).values(
+            detailed_analysis=None, recommendations=None, keyword_analysis=None,
+            resume_text_hash=None, job_description_text_hash=None,
+            archived_at=now, updated_at=scans.c.updated_at  # not a user edit
+        ))
+        release_text_blobs(connection, [blob_hash for row in rows
+                                        for blob_hash in (row.resume_text_hash, row.job_description_text_hash)])
+        return len(rows)
+
+    def prune_match_score_batch(self, connection, cutoff):
+        """
+        Delete up to batch_size match scores last calculated before cutoff
+
+        Returns:
+            int: Number of match scores deleted
+        """
+        table = MatchScore.__table__
+        ids = connection.execute(
+            db.select(table.c.id).where(table.c.updated_at < cutoff).order_by(table.c.id).limit(self.batch_size)
+        ).scalars().all()
+        if not ids:
+            return 0
+        connection.execute(table.delete().where(table.c.id.in_(ids)))
+        return len(ids)
+
+    def _run_batches(self, batch, cutoff, max_batches):
+        total = batches = 0
+        while not self._stop.is_set() and (max_batches is None or batches < max_batches):
+            with self.engine.begin() as connection:
+                done = batch(connection, cutoff)
+            total += done
+            batches += 1
+            if done < self.batch_size:
+                break
+            time.sleep(self.batch_pause)  # let waiting writers in
+        return total
+
+    def run_once(self, now=None, max_batches=None):
+        """
+        One retention pass
+
+        Args:
+            now (datetime): Reference time (default: utcnow)
+            max_batches (int): Stop each step after this many batches
+
+        Returns:
+            dict: archived_scans, pruned_match_scores, swept_blobs; None when
+                  another process is compacting
+        """
+        now = now or datetime.utcnow()
+        with _single_runner(self.engine) as acquired:
+            if not acquired:
+                return None
+            result = {'archived_scans': 0, 'pruned_match_scores': 0, 'swept_blobs': 0}
+            if self.scan_days:
+                result['archived_scans'] = self._run_batches(
+                    self.archive_scan_batch, now - timedelta(days=self.scan_days), max_batches)
+                # Blobs released by earlier passes, once past the sweeper's grace period
+                result['swept_blobs'] = sweep(self.engine, batch_size=self.batch_size)['deleted']
+            if self.match_score_days:
+                result['pruned_match_scores'] = self._run_batches(
+                    self.prune_match_score_batch, now - timedelta(days=self.match_score_days), max_batches)
+
+        if any(result.values()):
+            logger.info(f"Retention pass: {result}")
+        return result
+
+    # ---------------- BACKGROUND THREAD ----------------
+
+    def start(self):
+        """Run a pass every interval_seconds in a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='retention-compactor', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Retention pass failed: {e}")
+
+    def close(self):
+        """Stop the background thread (a batch in progress finishes first)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+def retention_stats(engine, scan_days=DEFAULT_SCAN_RETENTION_DAYS, now=None):
+    """Hot, archived and archivable scan counts and the match score count"""
+    scans = ScanHistory.__table__
+    cutoff = (now or datetime.utcnow()) - timedelta(days=scan_days)
+    with engine.connect() as connection:
+        row = connection.execute(db.select(
+            db.func.count(),
+            db.func.coalesce(db.func.sum(db.case((scans.c.archived_at.isnot(None), 1), else_=0)), 0),
+            db.func.coalesce(db.func.sum(db.case(
+                (db.and_(scans.c.archived_at.is_(None), scans.c.created_at < cutoff), 1), else_=0)), 0)
+        )).one()
+        match_scores = connection.execute(db.select(db.func.count()).select_from(MatchScore.__table__)).scalar()
+    return {'scans': row[0], 'archived': row[1], 'archivable': row[2], 'match_scores': match_scores}
+
+
+def init_retention(app):
+    """
+    Start the app's background compactor
+
+    Returns:
+        RetentionCompactor: The compactor (also in app.extensions['retention'])
+    """
+    compactor = RetentionCompactor.from_config(app)
+    compactor.start()
+    app.extensions['retention'] = compactor
+    atexit.register(compactor.close)
+    return compactor
+
+
+def main(argv=None):
+    from backend.database import database_url
+
+    parser = argparse.ArgumentParser(description="Scan history retention")
+    parser.add_argument('--database', default=os.getenv('DATABASE_URL'), help='Database URL or SQLite path')
+    parser.add_argument('--scan-days', type=int, default=int(os.getenv('SCAN_RETENTION_DAYS', DEFAULT_SCAN_RETENTION_DAYS)))
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = sub.add_parser('run', help='Archive old scans and prune stale match scores')
+    run_cmd.add_argument('--match-score-days', type=int,
+                         default=int(os.getenv('MATCH_SCORE_RETENTION_DAYS', DEFAULT_MATCH_SCORE_RETENTION_DAYS)))
+    run_cmd.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    run_cmd.add_argument('--batch-pause-ms', type=int, default=DEFAULT_BATCH_PAUSE_MS)
+    run_cmd.add_argument('--max-batches', type=int, default=None)
+
+    sub.add_parser('stats', help='Hot, archived and archivable scan counts')
+
+    args = parser.parse_args(argv)
+    url = database_url(args.database, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.db'))
+    engine = create_engine(url)
+    try:
+        if args.command == 'run':
+            compactor = RetentionCompactor(engine, args.scan_days, args.match_score_days,
+                                           args.batch_size, args.batch_pause_ms)
+            result = compactor.run_once(max_batches=args.max_batches)
+            print("Another process is compacting, nothing done" if result is None else
+                  f"Archived {result['archived_scans']} scans, pruned {result['pruned_match_scores']} "
+                  f"match scores, swept {result['swept_blobs']} text blobs")
+        elif args.command == 'stats':
+            stats = retention_stats(engine, args.scan_days)
+            print(f"{stats['scans']} scans: {stats['archived']} archived, {stats['archivable']} past "
+                  f"{args.scan_days} days; {stats['match_scores']} match scores")
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Serialization
+One codec for API responses, request bodies and JSON columns
+
+orjson encodes dicts, lists and datetimes natively (ISO 8601, the same text
+.isoformat() gives), several times faster than the stdlib encoder; the
+stdlib json module is used when orjson is not installed. API clients that
+send `Accept: application/msgpack` get MessagePack instead (optional
+`msgpack` package). create_app() installs FastJSONProvider, so every
+jsonify() goes through here, and passes dumps_text / loads to the engine as
+its JSON column serializer.
+"""
+
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask import has_request_context, request
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # stdlib json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # JSON only
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def default(value):
+    """
+    Encoding of the types the codecs do not handle natively
+
+    Raises:
+        TypeError: For anything else, like json.dumps
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, 'tolist'):  # numpy arrays and scalars
+        return value.tolist()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(value):
+    """Compact JSON as UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.dumps(value, default=default, option=ORJSON_OPTIONS)
+    return json.dumps(value, default=default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dumps_text(value):
+    """Compact JSON as str (SQLAlchemy's json_serializer contract)"""
+    return dumps(value).decode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def packb(value):
+    """MessagePack bytes; types without a MessagePack form are encoded as in JSON"""
+    return msgpack.packb(value, default=default, use_bin_type=True)
+
+
+def response_format(req=None):
+    """
+    'msgpack' when the client prefers application/msgpack (and msgpack is
+    installed), else 'json'
+    """
+    req = req if req is not None else request
+    if msgpack is None:
+        return 'json'
+    best = req.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE], default=JSON_MIMETYPE)
+    return 'msgpack' if best == MSGPACK_MIMETYPE else 'json'
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider on this module's codec, with MessagePack negotiation"""
+
+    mimetype = JSON_MIMETYPE
+
+    # flask_jwt_extended looks this up on the provider class
+    default = staticmethod(default)
+
+    def dumps(self, obj, **kwargs):
+        return dumps_text(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if has_request_context() and response_format(request) == 'msgpack':
+            response = self._app.response_class(packb(obj), mimetype=MSGPACK_MIMETYPE)
+        else:
+            response = self._app.response_class(dumps(obj), mimetype=self.mimetype)
+        if msgpack is not None:
+            response.vary.add('Accept')
+        return response
+
+
+def init_serialization(app):
+    """Use FastJSONProvider for jsonify() and request.get_json()"""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+
+
+def column_json_options():
+    """create_engine() keyword arguments for JSON columns"""
+    return {'json_serializer': dumps_text, 'json_deserializer': loads}
@@ -0,0 +1,521 @@
+"""
+Skill taxonomy and compiled skill matcher
+
+The skill vocabularies used by KeywordParser, AdvancedKeywordExtractor,
+RealTimeLLMService and DynamicSuggestionsService live in one versioned file,
+backend/data/skill_taxonomy.json. Each skill lists the category it has in every
+service ("scope") that uses it, plus optional aliases, keyword-parser groups
+and a priority. Skill families (synonym groups used for normalization) are
+defined next to the skills.
+
+The taxonomy is compiled into an immutable binary artifact (a sorted table of
+normalized phrase keys) that every worker memory-maps and indexes into a
+dict once per load. Only one process compiles a given taxonomy version; the
+others detect the new artifact and map it.
+
+Reloading swaps the module-level matcher in one assignment, so requests that
+already hold the old matcher finish with it. A reload happens on SIGHUP, via
+the admin endpoint, or when the taxonomy/artifact file changes on disk
+(checked at most every SKILL_TAXONOMY_CHECK_SECONDS).
+
+Compile manually:
+    python -m backend.services.skill_taxonomy compile
+"""
+import os
+import re
+import json
+import mmap
+import time
+import signal
+import struct
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter, namedtuple
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TAXONOMY_PATH = os.path.join(BASE_DIR, 'data', 'skill_taxonomy.json')
+
+CATEGORIES = ('technical', 'soft', 'industry')
+SCOPES = ('keyword_parser', 'advanced', 'realtime', 'suggestions')
+
+# Artifact layout: MAGIC | u32 header length | header JSON | records | key blob
+# Each record is (key offset, key length, entry index) into the key blob.
+MAGIC = b'DRSKM001'
+_HEADER_LEN = struct.Struct('<I')
+_RECORD = struct.Struct('<III')
+
+# Words may contain + and # (c++, c#) and be joined by . or - (node.js, full-stack);
+# a leading dot is kept for terms like .net
+_TOKEN_RE = re.compile(r'\.?[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*')
+# Parts of a compound token (react.js -> react, js; python-based -> python, based)
+_PART_RE = re.compile(r'[a-z0-9+#]+')
+
+Hit = namedtuple('Hit', ['term', 'text', 'category', 'start', 'end'])
+
+
+def tokenize(text):
+    """Lowercase word tokens with their character spans"""
+    return [(m.group(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text.lower())]
+
+
+def normalize_key(phrase):
+    """Canonical lookup key for a skill name or alias"""
+    return ' '.join(token for token, _, _ in tokenize(phrase))
+
+
+def get_taxonomy_path():
+    return os.getenv('SKILL_TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH)
+
+
+def get_artifact_path(taxonomy_path=None):
+    taxonomy_path = taxonomy_path or get_taxonomy_path()
+    return os.getenv('SKILL_MATCHER_PATH', os.path.splitext(taxonomy_path)[0] + '.skm')
+
+
+# ---------------- COMPILER ----------------
+
+def load_taxonomy(path):
+    """Read and validate a taxonomy file; returns (data, raw bytes)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw.decode('utf-8'))
+
+    if not isinstance(data.get('skills'), list):
+        raise ValueError('Taxonomy must contain a "skills" list')
+
+    seen = set()
+    for skill in data['skills']:
+        term = skill.get('term', '').strip().lower()
+        if not term:
+            raise ValueError('Every skill needs a "term"')
+        if term in seen:
+            raise ValueError(f'Duplicate skill term: {term}')
+        seen.add(term)
+        for scope, category in skill.get('scopes', {}).items():
+            if scope not in SCOPES:
+                raise ValueError(f'Unknown scope "{scope}" for skill {term}')
+            if category not in CATEGORIES:
+                raise ValueError(f'Unknown category "{category}" for skill {term}')
+
+    return data, raw
+
+
+def compile_taxonomy(taxonomy_path=None, artifact_path=None):
+    """
+    Compile the taxonomy into the binary matcher artifact (atomic replace)
+
+    Returns:
+        str: Path of the written artifact
+    """
+    taxonomy_path = taxonomy_path or get_taxonomy_path()
+    artifact_path = artifact_path or get_artifact_path(taxonomy_path)
+    data, raw = load_taxonomy(taxonomy_path)
+
+    entries = []
+    pairs = set()
+    for index, skill in enumerate(data['skills']):
+        term = skill['term'].strip().lower()
+        aliases = [a.strip().lower() for a in skill.get('aliases', [])]
+        entries.append({
+            'term': term,
+            'scopes': skill.get('scopes', {}),
+            'groups': skill.get('groups', []),
+            'aliases': aliases,
+            'priority': skill.get('priority')
+        })
+        for phrase in [term] + aliases:
+            key = normalize_key(phrase)
+            if key:
+                pairs.add((key.encode('utf-8'), index))
+
+    records = bytearray()
+    blob = bytearray()
+    max_tokens = 1
+    for key, index in sorted(pairs):
+        records += _RECORD.pack(len(blob), len(key), index)
+        blob += key
+        max_tokens = max(max_tokens, key.count(b' ') + 1)
+
+    header = json.dumps({
+        'taxonomy_version': data.get('version'),
+        'source_sha256': hashlib.sha256(raw).hexdigest(),
+        'compiled_at': datetime.utcnow().isoformat(),
+        'record_count': len(pairs),
+        'max_tokens': max_tokens,
+        'entries': entries,
+        'families': data.get('families', {})
+    }).encode('utf-8')
+
+    tmp_path = f'{artifact_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        f.write(records)
+        f.write(blob)
+    os.replace(tmp_path, artifact_path)
+
+    logger.info(f"Compiled skill taxonomy v{data.get('version')} ({len(entries)} skills, "
+                f"{len(pairs)} keys) to {artifact_path}")
+    return artifact_path
+
+
+def ensure_compiled(taxonomy_path=None, artifact_path=None):
+    """
+    Compile the artifact only if it is missing or built from another taxonomy version
+
+    A file lock makes sure concurrent workers compile at most once.
+    """
+    taxonomy_path = taxonomy_path or get_taxonomy_path()
+    artifact_path = artifact_path or get_artifact_path(taxonomy_path)
+
+    with open(taxonomy_path, 'rb') as f:
+        source_sha = hashlib.sha256(f.read()).hexdigest()
+
+    if _artifact_sha(artifact_path) == source_sha:
+        return artifact_path
+
+    with open(f'{artifact_path}.lock', 'a+') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            # Another worker may have compiled it while we waited
+            if _artifact_sha(artifact_path) != source_sha:
+                compile_taxonomy(taxonomy_path, artifact_path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    return artifact_path
+
+
+def _artifact_sha(artifact_path):
+    try:
+        with open(artifact_path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+            return json.loads(f.read(length).decode('utf-8')).get('source_sha256')
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+# ---------------- MATCHER ----------------
+
+class SkillMatcher:
+    """Immutable, memory-mapped skill matcher built from a compiled artifact"""
+
+    def __init__(self, artifact_path):
+        self.path = artifact_path
+        with open(artifact_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{artifact_path} is not a compiled skill taxonomy')
+
+        offset = len(MAGIC)
+        (header_len,) = _HEADER_LEN.unpack_from(self._mm, offset)
+        offset += _HEADER_LEN.size
+        header = json.loads(self._mm[offset:offset + header_len].decode('utf-8'))
+
+        self.version = header['taxonomy_version']
+        self.source_sha256 = header['source_sha256']
+        self.compiled_at = header['compiled_at']
+        self._entries = header['entries']
+        self._families = header['families']
+        self._count = header['record_count']
+        self._records_offset = offset + header_len
+        self._blob_offset = self._records_offset + self._count * _RECORD.size
+
+        # Keys are decoded once here; matching then joins tokens and probes the dict
+        self._index = {}
+        for i in range(self._count):
+            self._index.setdefault(self._key(i), []).append(self._entries[self._entry_index(i)])
+        # Only tokens that start some key are worth a lookup, for at most as many tokens as its longest key
+        self._ngram_limit = {}
+        for key in self._index:
+            first, length = key.split(' ', 1)[0], key.count(' ') + 1
+            self._ngram_limit[first] = max(self._ngram_limit.get(first, 1), length)
+
+        self._by_term = {entry['term']: entry for entry in self._entries}
+        self._family_of = {}
+        for main, synonyms in self._families.items():
+            for member in [main] + synonyms:
+                self._family_of.setdefault(member, main)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    # ---- key table ----
+
+    def _key(self, i):
+        key_offset, key_len, _ = _RECORD.unpack_from(self._mm, self._records_offset + i * _RECORD.size)
+        start = self._blob_offset + key_offset
+        return self._mm[start:start + key_len].decode('utf-8')
+
+    def _entry_index(self, i):
+        return _RECORD.unpack_from(self._mm, self._records_offset + i * _RECORD.size)[2]
+
+    def lookup(self, phrase):
+        """All taxonomy entries whose term or alias normalizes to phrase"""
+        return list(self._index.get(normalize_key(phrase), ()))
+
+    # ---- matching ----
+
+    def find(self, text, scope, category=None):
+        """
+        Find every skill occurrence in text for a scope
+
+        Like a set of \\b...\\b regexes, overlapping phrases are all reported
+        (e.g. "asp.net core" yields both "asp.net core" and "asp.net").
+
+        Returns:
+            list: Hit(term, text, category, start, end) in text order
+        """
+        if not text:
+            return []
+
+        lowered = text.lower()
+        tokens = self._split_compounds(tokenize(lowered), scope)
+        hits = []
+        for i, (token, start, _) in enumerate(tokens):
+            limit = self._ngram_limit.get(token)
+            if limit is None:
+                continue
+            phrase = token
+            for n in range(1, min(limit, len(tokens) - i) + 1):
+                if n > 1:
+                    phrase += ' ' + tokens[i + n - 1][0]
+                end = tokens[i + n - 1][2]
+                for entry in self._index.get(phrase, ()):
+                    entry_category = entry['scopes'].get(scope)
+                    if entry_category and (category is None or entry_category == category):
+                        hits.append(Hit(entry['term'], lowered[start:end], entry_category, start, end))
+        return hits
+
+    def _split_compounds(self, tokens, scope):
+        """
+        Replace dotted/hyphenated tokens no key of the scope uses by their parts
+
+        "node.js" and "full-stack" stay whole where the scope has them, while
+        "react.js", "python-based" or "aws-certified" still match react, python
+        and aws, as \\b...\\b regexes would.
+        """
+        key_tokens = self._cached(('key_tokens', scope), lambda: frozenset(
+            token for key, entries in self._index.items()
+            if any(scope in entry['scopes'] for entry in entries)
+            for token in key.split(' ')
+        ))
+        split = []
+        for token, start, end in tokens:
+            if token in key_tokens or not any(c in token for c in '.-'):
+                split.append((token, start, end))
+                continue
+            split.extend((m.group(), start + m.start(), start + m.end()) for m in _PART_RE.finditer(token))
+        return split
+
+    def count(self, text, scope, category=None):
+        """Occurrences per canonical term"""
+        return Counter(hit.term for hit in self.find(text, scope, category))
+
+    # ---- vocabulary ----
+
+    def terms(self, scope, category):
+        """Canonical terms of a category in a scope, in taxonomy order"""
+        return self._cached(('terms', scope, category), lambda: [
+            e['term'] for e in self._entries if e['scopes'].get(scope) == category
+        ])
+
+    def groups(self, scope, category):
+        """Terms of a category in a scope grouped by their 'groups' labels"""
+        def build():
+            grouped = {}
+            for entry in self._entries:
+                if entry['scopes'].get(scope) == category:
+                    for group in entry['groups'] or ['other']:
+                        grouped.setdefault(group, []).append(entry['term'])
+            return grouped
+        return self._cached(('groups', scope, category), build)
+
+    def variations(self, term):
+        """The term followed by its aliases"""
+        entry = self._by_term.get(term.lower().strip())
+        return [entry['term']] + entry['aliases'] if entry else [term.lower()]
+
+    def canonical(self, phrase, scope=None):
+        """Canonical term for a term or alias (the phrase itself when unknown)"""
+        phrase = phrase.lower().strip()
+        if phrase in self._by_term:
+            return phrase
+        entries = self.lookup(phrase)
+        if scope is not None:
+            entries = [e for e in entries if scope in e['scopes']] or entries
+        return entries[0]['term'] if entries else phrase
+
+    def priority(self, term):
+        entry = self._by_term.get(term.lower().strip())
+        return entry['priority'] if entry else None
+
+    def priorities(self):
+        """Priority level -> terms"""
+        def build():
+            levels = {}
+            for entry in self._entries:
+                if entry['priority']:
+                    levels.setdefault(entry['priority'], []).append(entry['term'])
+            return levels
+        return self._cached(('priorities',), build)
+
+    def families(self):
+        """Family name -> synonyms"""
+        return self._families
+
+    def family(self, term):
+        """Family a skill belongs to (the skill itself when it has none)"""
+        term = term.lower()
+        return self._family_of.get(term, term)
+
+    def info(self):
+        return {
+            'version': self.version,
+            'source_sha256': self.source_sha256,
+            'compiled_at': self.compiled_at,
+            'skills': len(self._entries),
+            'keys': self._count,
+            'artifact': self.path
+        }
+
+    def _cached(self, key, build):
+        value = self._cache.get(key)
+        if value is None:
+            with self._cache_lock:
+                value = self._cache.get(key)
+                if value is None:
+                    value = self._cache[key] = build()
+        return value
+
+
+# ---------------- SHARED INSTANCE / RELOAD ----------------
+
+_matcher = None
+_matcher_lock = threading.Lock()
+_reload_requested = False
+_last_check = 0.0
+_watched_mtimes = None
+
+
+def get_matcher():
+    """
+    Current skill matcher
+
+    Callers should fetch it once per operation and use that reference
+    throughout, so a concurrent reload never mixes two taxonomy versions.
+    """
+    global _last_check
+
+    matcher = _matcher
+    if matcher is None or _reload_requested:
+        return reload_matcher()
+
+    interval = float(os.getenv('SKILL_TAXONOMY_CHECK_SECONDS', 30))
+    now = time.monotonic()
+    if interval > 0 and now - _last_check >= interval:
+        _last_check = now
+        if _current_mtimes() != _watched_mtimes:
+            return reload_matcher()
+
+    return matcher
+
+
+def reload_matcher(force_compile=False):
+    """
+    Compile if needed and atomically swap in a matcher for the current taxonomy
+
+    Returns:
+        SkillMatcher: The active matcher
+    """
+    global _matcher, _reload_requested, _watched_mtimes, _last_check
+
+    with _matcher_lock:
+        _reload_requested = False
+        taxonomy_path = get_taxonomy_path()
+        artifact_path = get_artifact_path(taxonomy_path)
+
+        try:
+            if force_compile:
+                compile_taxonomy(taxonomy_path, artifact_path)
+            else:
+                ensure_compiled(taxonomy_path, artifact_path)
+
+            if _matcher is None or _artifact_sha(artifact_path) != _matcher.source_sha256:
+                previous = _matcher
+                _matcher = SkillMatcher(artifact_path)
+                logger.info(f"Skill taxonomy v{_matcher.version} active "
+                            f"({'reloaded' if previous else 'loaded'} from {artifact_path})")
+        except Exception as e:
+            if _matcher is None:
+                raise
+            # Keep serving the previous taxonomy if the new one is broken
+            logger.error(f"Skill taxonomy reload failed, keeping v{_matcher.version}: {e}")
+
+        _watched_mtimes = _current_mtimes()
+        _last_check = time.monotonic()
+        return _matcher
+
+
+def request_reload(*_args):
+    """Signal-safe: mark the matcher for reload on next use"""
+    global _reload_requested
+    _reload_requested = True
+
+
+def install_reload_signal():
+    """Reload the taxonomy on SIGHUP (only possible from the main thread)"""
+    if not hasattr(signal, 'SIGHUP') or threading.current_thread() is not threading.main_thread():
+        return False
+    try:
+        signal.signal(signal.SIGHUP, request_reload)
+        return True
+    except ValueError:
+        return False
+
+
+def _current_mtimes():
+    taxonomy_path = get_taxonomy_path()
+    mtimes = []
+    for path in (taxonomy_path, get_artifact_path(taxonomy_path)):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile or inspect the skill taxonomy")
+    sub = parser.add_subparsers(dest='command', required=True)
+    compile_cmd = sub.add_parser('compile', help='Compile the taxonomy into the matcher artifact')
+    compile_cmd.add_argument('--taxonomy', default=None)
+    compile_cmd.add_argument('--output', default=None)
+    sub.add_parser('info', help='Show the compiled taxonomy version')
+
+    args = parser.parse_args(argv)
+    if args.command == 'compile':
+        compile_taxonomy(args.taxonomy, args.output)
+    else:
+        print(json.dumps(SkillMatcher(ensure_compiled()).info(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Text blob maintenance
+
+Scan text snapshots live in the content-addressed text_blobs table
+(backend/models.py: TextBlob). Writes only ever increment or decrement
+ref_count; rows that drop to zero references stay until the sweeper deletes
+them, so a text scanned again shortly after is found instead of re-inserted.
+
+Before deleting, the sweeper checks scan_history itself: a blob that is
+still referenced (a drifted ref_count) gets its count repaired instead.
+
+    python -m backend.services.text_blobs sweep --grace-seconds 3600
+    python -m backend.services.text_blobs recount    # rebuild every ref_count
+    python -m backend.services.text_blobs stats
+
+Run the sweep periodically (cron) or after retention jobs that remove scans.
+"""
+import os
+import sys
+import argparse
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from backend.models import db, TextBlob, ScanHistory, SCAN_TEXT_COLUMNS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Unreferenced blobs younger than this are kept
+DEFAULT_GRACE_SECONDS = 3600
+
+# Blobs checked and deleted per transaction
+SWEEP_BATCH_SIZE = 500
+
+
+def _reference_count(blob_hash_column):
+    """Correlated count of the scan_history columns pointing at a blob"""
+    scans = ScanHistory.__table__
+    counts = [
+        db.select(db.func.count()).select_from(scans).where(scans.c[column] == blob_hash_column).scalar_subquery()
+        for column, _ in SCAN_TEXT_COLUMNS.values()
+    ]
+    total = counts[0]
+    for count in counts[1:]:
+        total = total + count
+    return total
+
+
+def sweep(engine, grace_seconds=DEFAULT_GRACE_SECONDS, batch_size=SWEEP_BATCH_SIZE):
+    """
+    Delete blobs without references, one batch per transaction
+
+    Args:
+        engine: Engine of the application database
+        grace_seconds (int): Minimum time since a blob lost its last reference
+        batch_size (int): Blobs examined per transaction
+
+    Returns:
+        dict: deleted and repaired blob counts
+    """
+    table = TextBlob.__table__
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    unreferenced = db.and_(
+        table.c.ref_count <= 0,
+        db.or_(table.c.released_at.is_(None), table.c.released_at <= cutoff)
+    )
+    deleted = repaired = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                db.select(table.c.hash, _reference_count(table.c.hash))
+                .where(unreferenced)
+                .order_by(table.c.released_at).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            orphans = [blob_hash for blob_hash, references in rows if not references]
+            for blob_hash, references in rows:
+                if references:
+                    # ref_count drifted (e.g. rows removed with Core deletes): repair it
+                    connection.execute(table.update().where(table.c.hash == blob_hash).values(
+                        ref_count=references, released_at=None))
+                    repaired += 1
+            if orphans:
+                # Re-checked in the DELETE: a scan may have taken a reference meanwhile
+                deleted += connection.execute(table.delete().where(
+                    table.c.hash.in_(orphans), table.c.ref_count <= 0)).rowcount
+
+    if deleted or repaired:
+        logger.info(f"Text blob sweep deleted {deleted} blobs, repaired {repaired} reference counts")
+    return {'deleted': deleted, 'repaired': repaired}
+
+
+def recount(engine):
+    """
+    Rebuild every blob's ref_count from scan_history
+
+    Returns:
+        int: Number of blobs whose count changed
+    """
+    table = TextBlob.__table__
+    references = _reference_count(table.c.hash)
+    with engine.begin() as connection:
+        changed = connection.execute(table.update().where(table.c.ref_count != references).values(
+            ref_count=references,
+            released_at=db.case((references == 0, datetime.utcnow()), else_=None)
+        )).rowcount
+    return changed
+
+
+def blob_stats(engine):
+    """Blob count, stored characters and scan references"""
+    table = TextBlob.__table__
+    with engine.connect() as connection:
+        row = connection.execute(db.select(
+            db.func.count(),
+            db.func.coalesce(db.func.sum(table.c.size), 0),
+            db.func.coalesce(db.func.sum(table.c.ref_count), 0),
+            db.func.coalesce(db.func.sum(db.case((table.c.ref_count <= 0, 1), else_=0)), 0)
+        )).one()
+    return {'blobs': row[0], 'characters': row[1], 'references': row[2], 'unreferenced': row[3]}
+
+
+def main(argv=None):
+    from backend.database import database_url
+
+    parser = argparse.ArgumentParser(description="Text blob maintenance")
+    parser.add_argument('--database', default=os.getenv('DATABASE_URL'), help='Database URL or SQLite path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sweep_cmd = sub.add_parser('sweep', help='Delete blobs no scan references')
+    sweep_cmd.add_argument('--grace-seconds', type=int, default=DEFAULT_GRACE_SECONDS)
+    sweep_cmd.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE)
+
+    sub.add_parser('recount', help='Rebuild every ref_count from scan_history')
+    sub.add_parser('stats', help='Blob and reference totals')
+
+    args = parser.parse_args(argv)
+    url = database_url(args.database, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.db'))
+    engine = create_engine(url)
+    try:
+        if args.command == 'sweep':
+            result = sweep(engine, args.grace_seconds, args.batch_size)
+            print(f"Deleted {result['deleted']} blobs, repaired {result['repaired']} reference counts")
+        elif args.command == 'recount':
+            print(f"Corrected {recount(engine)} reference counts")
+        elif args.command == 'stats':
+            stats = blob_stats(engine)
+            print(f"{stats['blobs']} blobs, {stats['characters']} characters, "
+                  f"{stats['references']} references, {stats['unreferenced']} unreferenced")
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,397 @@
+"""
+Write-behind buffer for scan history and suggestion inserts
+
+With WRITE_BEHIND_ENABLED=1 a scan request no longer inserts and commits its
+ScanHistory row itself. The row gets a public_id token, is appended to a local
+spool file and queued in memory; the request returns the token straight away.
+A background thread inserts the queued rows every WRITE_BEHIND_FLUSH_MS
+milliseconds (or as soon as WRITE_BEHIND_MAX_ROWS are waiting) with one
+executemany per table, folding new scans into the user_stats rollup in the
+same transaction.
+
+Crash safety: each process appends to its own spool segment and holds an
+exclusive flock on it until the rows in it are committed, then deletes it.
+Segments nobody holds a lock on belong to a process that died; they are
+replayed on startup. Rows that are already in the table (crash between the
+commit and the delete) are skipped by public_id, so a replay never inserts or
+counts a row twice.
+
+Rows queued here are visible to list endpoints only after the next flush;
+GET /api/scan/<public_id> flushes this process's queue first.
+"""
+import os
+import json
+import glob
+import atexit
+import secrets
+import logging
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from backend.models import (db, ScanHistory, Suggestion, new_public_id, apply_scan_rows, backfill_user_stats,
+                            store_scan_texts)
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default limits (overridable from the Flask config)
+DEFAULT_FLUSH_INTERVAL_MS = 200
+DEFAULT_MAX_BATCH_ROWS = 100
+
+SPOOL_PATTERN = 'write-behind-*.jsonl'
+REJECTED_FILE = 'rejected.jsonl'
+
+# Existing public_ids are looked up this many at a time
+LOOKUP_BATCH_SIZE = 500
+
+# Tables the buffer accepts rows for
+MODELS = {model.__tablename__: model for model in (ScanHistory, Suggestion)}
+
+
+def _encode(model, values):
+    """One spool line for a queued row"""
+    record = {
+        'table': model.__tablename__,
+        'values': {key: value.isoformat() if isinstance(value, datetime) else value
+                   for key, value in values.items()}
+    }
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _decode(line):
+    """Queued row from a spool line, or None for a torn or unknown record"""
+    try:
+        record = json.loads(line)
+        model = MODELS[record['table']]
+        values = record['values']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    columns = model.__table__.c
+    for key, value in values.items():
+        if isinstance(value, str) and key in columns and isinstance(columns[key].type, db.DateTime):
+            values[key] = datetime.fromisoformat(value)
+    return model, values
+
+
+def _lock_file(handle):
+    """Take an exclusive lock without waiting; False if another process holds it"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def insert_rows(connection, rows):
+    """
+    Insert queued rows that are not in their table yet
+
+    Args:
+        connection: Connection inside the transaction to insert in
+        rows: List of (model, values) with a public_id in every values dict
+
+    Returns:
+        int: Number of rows inserted
+    """
+    by_model = {}
+    for model, values in rows:
+        # Copied: the queued rows must stay intact if this transaction fails
+        by_model.setdefault(model, {})[values['public_id']] = dict(values)
+
+    inserted = 0
+    for model, queued in by_model.items():
+        table = model.__table__
+        tokens = list(queued)
+        for start in range(0, len(tokens), LOOKUP_BATCH_SIZE):
+            chunk = tokens[start:start + LOOKUP_BATCH_SIZE]
+            for token in connection.execute(db.select(table.c.public_id).where(table.c.public_id.in_(chunk))).scalars():
+                queued.pop(token, None)
+        if not queued:
+            continue
+        if model is ScanHistory:
+            store_scan_texts(connection, list(queued.values()))
+
+        # executemany needs the same columns in every row
+        by_columns = {}
+        for values in queued.values():
+            by_columns.setdefault(tuple(sorted(values)), []).append(values)
+        for batch in by_columns.values():
+            connection.execute(table.insert(), batch)
+        inserted += len(queued)
+
+        if model is ScanHistory:
+            scans_by_user = {}
+            for values in queued.values():
+                scans_by_user.setdefault(int(values['user_id']), []).append(
+                    (values['overall_match_score'], values['created_at'], values.get('resume_id')))
+            for user_id, scans in scans_by_user.items():
+                if not apply_scan_rows(connection, user_id, scans):
+                    backfill_user_stats(connection, user_id)
+
+    return inserted
+
+
+class WriteBehindBuffer:
+    """Per-process queue of rows waiting to be batch-inserted"""
+
+    def __init__(self, app, spool_folder, flush_interval_ms=DEFAULT_FLUSH_INTERVAL_MS,
+                 max_batch_rows=DEFAULT_MAX_BATCH_ROWS, fsync=True):
+        self.app = app
+        self.spool_folder = spool_folder
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+        self.fsync = fsync
+        os.makedirs(spool_folder, exist_ok=True)
+
+        self._lock = threading.Lock()        # queue and current segment
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._reset()
+
+    @classmethod
+    def from_config(cls, app):
+        """Build the buffer from the app's Flask config"""
+        config = app.config
+        return cls(
+            app,
+            config['WRITE_BEHIND_SPOOL_FOLDER'],
+            flush_interval_ms=config.get('WRITE_BEHIND_FLUSH_MS', DEFAULT_FLUSH_INTERVAL_MS),
+            max_batch_rows=config.get('WRITE_BEHIND_MAX_ROWS', DEFAULT_MAX_BATCH_ROWS),
+            fsync=config.get('WRITE_BEHIND_FSYNC', True)
+        )
+
+    def _reset(self):
+        # Also runs in a forked worker: the parent's queue, segment and thread are not ours
+        self._pid = os.getpid()
+        self._rows = []
+        self._pending = set()
+        self._segment = None   # (handle, path) being appended to
+        self._flushing = []    # segments whose rows are queued but not committed yet
+        self._thread = None
+
+    # ---------------- QUEUEING ----------------
+
+    def enqueue(self, model, values):
+        """
+        Spool a row and queue it for the next batch insert
+
+        Args:
+            model: ScanHistory or Suggestion
+            values (dict): Column values; public_id and timestamps are filled in
+
+        Returns:
+            str: The row's public_id
+        """
+        if model.__tablename__ not in MODELS:
+            raise ValueError(f'Write-behind does not handle {model.__tablename__}')
+
+        values = dict(values)
+        values.setdefault('public_id', new_public_id())
+        now = datetime.utcnow()
+        values.setdefault('created_at', now)
+        values.setdefault('updated_at', now)
+        line = _encode(model, values)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if self._thread is None:
+                self._start()
+            handle, _ = self._current_segment()
+            handle.write(line)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+            self._rows.append((model, values))
+            self._pending.add(values['public_id'])
+            full = len(self._rows) >= self.max_batch_rows
+
+        if full:
+            self._wake.set()
+        return values['public_id']
+
+    def is_pending(self, public_id):
+        """True while a row queued by this process is not inserted yet"""
+        return public_id in self._pending
+
+    def _current_segment(self):
+        if self._segment is None:
+            path = os.path.join(self.spool_folder, f'write-behind-{os.getpid()}-{secrets.token_hex(4)}.jsonl')
+            handle = open(path, 'ab')
+            _lock_file(handle)  # new file, nobody else can hold it
+            self._segment = (handle, path)
+        return self._segment
+
+    # ---------------- FLUSHING ----------------
+
+    def _start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='write-behind-flusher', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed, rows kept for retry: {e}")
+
+    def flush(self):
+        """
+        Insert everything queued so far
+
+        Returns:
+            int: Number of rows inserted
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                if self._segment is not None:
+                    self._flushing.append(self._segment)
+                    self._segment = None
+                segments = list(self._flushing)
+            if not rows:
+                return 0
+
+            try:
+                inserted = self._insert(rows)
+            except Exception:
+                # Back to the front of the queue; the segments stay locked on disk
+                with self._lock:
+                    self._rows[:0] = rows
+                raise
+
+            with self._lock:
+                self._flushing = [segment for segment in self._flushing if segment not in segments]
+                self._pending.difference_update(values['public_id'] for _, values in rows)
+            for handle, path in segments:
+                os.remove(path)
+                handle.close()
+            return inserted
+
+    def _insert(self, rows):
+        with self.app.app_context():
+            engine = db.engine
+        try:
+            with engine.begin() as connection:
+                return insert_rows(connection, rows)
+        except IntegrityError:
+            # One bad row (e.g. its resume was deleted) must not block the rest
+            inserted = 0
+            for row in rows:
+                try:
+                    with engine.begin() as connection:
+                        inserted += insert_rows(connection, [row])
+                except IntegrityError as e:
+                    self._reject(row, e)
+            return inserted
+
+    def _reject(self, row, error):
+        model, values = row
+        logger.error(f"Write-behind dropped {model.__tablename__} row {values['public_id']}: {error}")
+        with open(os.path.join(self.spool_folder, REJECTED_FILE), 'ab') as handle:
+            handle.write(_encode(model, values))
+
+    def close(self):
+        """Stop the flusher thread and insert what is left"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    # ---------------- REPLAY ----------------
+
+    def replay_spool(self):
+        """
+        Insert the rows of segments left behind by processes that died
+
+        Returns:
+            int: Number of rows inserted
+        """
+        inserted = 0
+        for path in sorted(glob.glob(os.path.join(self.spool_folder, SPOOL_PATTERN))):
+            try:
+                handle = open(path, 'rb')
+            except FileNotFoundError:
+                continue  # finished by its owner meanwhile
+            try:
+                if not _lock_file(handle):
+                    continue  # a live process owns it
+                # A torn last line is a row whose request never got its token
+                rows = [row for row in map(_decode, handle.read().splitlines()) if row is not None]
+                if rows:
+                    inserted += self._insert(rows)
+                os.remove(path)
+            finally:
+                handle.close()
+        if inserted:
+            logger.info(f"Write-behind replayed {inserted} spooled rows")
+        return inserted
+
+
+def save_scan(scan_values, charged):
+    """
+    Store a scan in the transaction that claimed its free scan
+
+    With write-behind on, the scan row is spooled and inserted by the next
+    batch; the quota decrement is committed after the spool write succeeded,
+    and rolled back (the error is raised) when it failed.
+
+    Args:
+        scan_values (dict): ScanHistory column values
+        charged (bool): A free scan was claimed and still needs committing
+
+    Returns:
+        tuple: (scan_id, scan_token) - scan_id is the token while the row is queued
+    """
+    buffer = get_write_behind()
+    if buffer is None:
+        scan_history = ScanHistory(**scan_values)
+        db.session.add(scan_history)
+        db.session.commit()
+        return scan_history.id, scan_history.public_id
+
+    # Spool first: a claim is only committed once its scan is safely queued
+    try:
+        scan_token = buffer.enqueue(ScanHistory, scan_values)
+    except Exception:
+        db.session.rollback()
+        raise
+    if charged:
+        db.session.commit()
+    return scan_token, scan_token
+
+
+def init_write_behind(app):
+    """
+    Create the app's buffer and replay spools left by crashed processes
+
+    Returns:
+        WriteBehindBuffer: The buffer (also in app.extensions['write_behind'])
+    """
+    buffer = WriteBehindBuffer.from_config(app)
+    buffer.replay_spool()
+    app.extensions['write_behind'] = buffer
+    atexit.register(buffer.close)
+    return buffer
+
+
+def get_write_behind():
+    """The current app's buffer, or None when write-behind is off"""
+    return current_app.extensions.get('write_behind')
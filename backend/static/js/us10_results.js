@@ -59,13 +59,21 @@ async function loadScanResults() {
         showNotification('Loading scan results from server...', 'info');
 
         try {
-            const response = await fetch(`${API_BASE_URL}/api/scan/${scanId}`, {
-                method: 'GET',
-                headers: {
-                    'Authorization': `Bearer ${token}`,
-                    'Content-Type': 'application/json'
-                }
-            });
+            // A write-behind scan id is a token whose row may still be queued
+            // in another worker for a moment - retry a 404 a few times
+            const isToken = !/^\d+$/.test(scanId);
+            let response;
+            for (let attempt = 0; attempt < 5; attempt++) {
+                response = await fetch(`${API_BASE_URL}/api/scan/${scanId}`, {
+                    method: 'GET',
+                    headers: {
+                        'Authorization': `Bearer ${token}`,
+                        'Content-Type': 'application/json'
+                    }
+                });
+                if (response.status !== 404 || !isToken) break;
+                await new Promise(resolve => setTimeout(resolve, 300));
+            }
 
             if (response.status === 401) {
                 handleAuthError();
@@ -2,6 +2,7 @@
 
 // Global variables
 let currentPage = 1;
+let pageCursors = [null];  // pageCursors[n] is the cursor that loads page n + 1
 let currentSort = 'created_at_desc';
 let currentFilter = '';
 
@@ -35,6 +36,7 @@ function addEventListeners() {
         sortSelect.addEventListener('change', function () {
             currentSort = this.value;
             currentPage = 1;
+            pageCursors = [null];
             loadScanHistory();
         });
     }
@@ -45,6 +47,7 @@ function addEventListeners() {
         scoreFilter.addEventListener('change', function () {
             currentFilter = this.value;
             currentPage = 1;
+            pageCursors = [null];
             loadScanHistory();
         });
     }
@@ -69,12 +72,15 @@ function loadScanHistory() {
 
     // Build query parameters
     const params = new URLSearchParams({
-        page: currentPage,
         per_page: 10,
         sort_by: actualSortBy,
         sort_order: sortOrder
     });
 
+    if (pageCursors[currentPage - 1]) {
+        params.append('cursor', pageCursors[currentPage - 1]);
+    }
+
     if (currentFilter) {
         params.append('filter_score', currentFilter);
     }
@@ -104,14 +110,17 @@ function loadScanHistory() {
 
             if (data.success && data.scans && data.scans.length > 0) {
                 displayScanHistory(data.scans);
-                // Mock pagination for now if count exists
+                // Remember the cursor for the following page
+                if (data.next_cursor) {
+                    pageCursors[currentPage] = data.next_cursor;
+                }
                 updatePagination({
                     page: currentPage,
                     per_page: 10,
                     total_items: data.count,
                     total_pages: Math.ceil(data.count / 10),
-                    has_next: false,
-                    has_prev: false
+                    has_next: data.has_more,
+                    has_prev: currentPage > 1
                 });
             } else {
                 // Show empty state
@@ -229,7 +238,9 @@ function updatePageNumbers(pagination) {
 
     pageNumbers.innerHTML = '';
 
-    for (let i = 1; i <= pagination.total_pages; i++) {
+    // Pages are reached by cursor, so only pages already seen (or the next one) are linkable
+    const reachable = Math.min(pagination.total_pages, pageCursors.length);
+    for (let i = 1; i <= reachable; i++) {
         const pageBtn = document.createElement('button');
         pageBtn.className = `page-number ${i === pagination.page ? 'active' : ''}`;
         pageBtn.textContent = i;
@@ -244,6 +255,7 @@ function changePage(direction) {
 }
 
 function goToPage(page) {
+    if (page > pageCursors.length) return;
     currentPage = page;
     loadScanHistory();
 }
@@ -0,0 +1,167 @@
+"""
+Bulk import tests - ZIP resume import and NDJSON/CSV job description import
+Runs against the Flask test client with a temporary database and upload folder
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription
+from backend.services.bulk_import_service import BulkImportService, process_job_description_batch
+
+
+JOB_TEXT = (
+    "We are hiring a backend engineer with Python, Flask, PostgreSQL and Docker "
+    "experience. Strong communication and teamwork skills are required."
+)
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(
+        TESTING=True,
+        RESUME_UPLOAD_FOLDER=tempfile.mkdtemp(dir=_tmp_dir),
+        BULK_IMPORT_WORKERS=1,
+        BULK_IMPORT_BATCH_SIZE=2,
+    )
+    # Tests import several times per user; COST_BULK is covered in test_rate_limiting
+    app.extensions["rate_limiter"].max_requests = 10 ** 6
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with app.app_context():
+        user = User.query.filter_by(email="bulk@example.com").first()
+        if not user:
+            user = User("Bulk", "Importer", "bulk@example.com", "Password123")
+            db.session.add(user)
+            db.session.commit()
+        token = create_access_token(identity=str(user.id))
+
+    test_client = app.test_client()
+    test_client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return test_client
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_bulk_resume_import_reports_every_member(app, client):
+    archive = make_zip({
+        "alice.txt": "Alice\nPython developer with Flask and SQL experience\n",
+        "bob.txt": "Bob\nJava engineer, Docker, Kubernetes, leadership\n",
+        "carol.txt": "Carol\nData analyst, pandas, numpy, communication\n",
+        "notes.exe": b"MZ",
+        "__MACOSX/._alice.txt": b"",
+        "empty.txt": "",
+    })
+
+    response = client.post("/api/bulk/resumes", data={"archive": (archive, "resumes.zip")},
+                           content_type="multipart/form-data")
+    body = response.get_json()
+
+    assert response.status_code == 201, body
+    assert body["summary"] == {"total": 6, "imported": 3, "failed": 1, "skipped": 2}
+    assert [item["index"] for item in body["items"]] == list(range(6))
+
+    imported = [item["id"] for item in body["items"] if item["status"] == "imported"]
+    with app.app_context():
+        resumes = Resume.query.filter(Resume.id.in_(imported)).all()
+        assert len(resumes) == 3
+        assert all(r.keywords_extracted and os.path.exists(r.file_path) for r in resumes)
+
+
+def test_bulk_resume_import_rejects_compression_bombs(app, client):
+    archive = make_zip({"bomb.txt": b"a" * (5 * 1024 * 1024)})
+    response = client.post("/api/bulk/resumes", data={"archive": (archive, "bomb.zip")},
+                           content_type="multipart/form-data")
+    body = response.get_json()
+
+    assert body["summary"]["failed"] == 1
+    assert "compression" in body["items"][0]["error"].lower()
+    assert os.listdir(app.config["RESUME_UPLOAD_FOLDER"]) == []
+
+
+def test_bulk_archives_may_exceed_max_content_length(app, client):
+    app.config.update(MAX_CONTENT_LENGTH=64 * 1024, BULK_IMPORT_MAX_SIZE=1024 * 1024)
+    files = {"alice.txt": "Alice\nPython developer with Flask and SQL experience\n",
+             "scans.bin": os.urandom(200 * 1024)}  # incompressible, skipped as unsupported
+
+    response = client.post("/api/bulk/resumes", data={"archive": (make_zip(files), "resumes.zip")},
+                           content_type="multipart/form-data")
+    body = response.get_json()
+    assert response.status_code == 201, body
+    assert body["summary"]["imported"] == 1
+
+    # Other routes keep MAX_CONTENT_LENGTH and point to the chunked upload
+    response = client.post("/api/upload_resume", data={"file": (make_zip(files), "cv.pdf")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 413
+    assert response.get_json()["max_content_length"] == 64 * 1024
+
+    files["more.bin"] = os.urandom(1024 * 1024)
+    response = client.post("/api/bulk/resumes", data={"archive": (make_zip(files), "resumes.zip")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 413
+    assert response.get_json()["max_content_length"] == 1024 * 1024
+
+
+def test_bulk_job_description_import_ndjson_and_csv(app, client):
+    ndjson = "\n".join([
+        json.dumps({"title": "Backend Engineer", "company_name": "Acme", "job_text": JOB_TEXT}),
+        json.dumps({"title": "QA", "job_text": JOB_TEXT}),
+        "not json",
+        json.dumps({"title": "Platform Engineer", "description": JOB_TEXT}),
+    ])
+    response = client.post("/api/bulk/job_descriptions",
+                           data={"file": (io.BytesIO(ndjson.encode()), "jobs.ndjson")},
+                           content_type="multipart/form-data")
+    body = response.get_json()
+    assert response.status_code == 201, body
+    assert body["summary"] == {"total": 4, "imported": 2, "failed": 2, "skipped": 0}
+
+    csv_text = "Title,Company,Description\nData Engineer,Initech,\"" + JOB_TEXT + "\"\n"
+    response = client.post("/api/bulk/job_descriptions",
+                           data={"file": (io.BytesIO(csv_text.encode()), "jobs.csv")},
+                           content_type="multipart/form-data")
+    body = response.get_json()
+    assert body["summary"]["imported"] == 1
+
+    with app.app_context():
+        jd = db.session.get(JobDescription, body["items"][0]["id"])
+        assert jd.company_name == "Initech"
+        assert "python" in jd.get_keywords()["technical_skills"]
+
+
+def test_process_pool_matches_inline_results():
+    items = [(i, JOB_TEXT) for i in range(4)]
+    inline = list(BulkImportService(workers=1, batch_size=2)._run(
+        process_job_description_batch, iter([items[:2], items[2:]])))
+    pooled = list(BulkImportService(workers=2, batch_size=2)._run(
+        process_job_description_batch, iter([items[:2], items[2:]])))
+
+    assert [index for batch in pooled for index, _ in batch] == [0, 1, 2, 3]
+    for (_, a), (_, b) in zip(
+            [r for batch in inline for r in batch], [r for batch in pooled for r in batch]):
+        assert sorted(a["technical_skills"]) == sorted(b["technical_skills"])
@@ -0,0 +1,96 @@
+"""
+Category score column tests - the columns follow category_scores on ORM and
+Core writes, and /api/history sorts and filters on them
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User, ScanHistory
+from backend.services.write_behind import insert_rows
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+def new_user():
+    user = User("Category", "Scores", f"cat{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    return user, {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+
+def add_scan(user, technical, education=60.0):
+    scan = ScanHistory(user_id=user.id, overall_match_score=65.0,
+                       category_scores={"technical_skills": technical, "soft_skills": 50.0,
+                                        "experience_match": 40.0, "education_match": education})
+    db.session.add(scan)
+    db.session.commit()
+    return scan.id
+
+
+def test_columns_follow_category_scores(app):
+    user, _ = new_user()
+    scan = db.session.get(ScanHistory, add_scan(user, 72.5))
+    assert (scan.technical_score, scan.soft_skills_score, scan.experience_score, scan.education_score) == \
+        (72.5, 50.0, 40.0, 60.0)
+
+    scan.category_scores = {"technical_skills": "88", "education_match": None}
+    db.session.commit()
+    db.session.expire_all()
+    scan = db.session.get(ScanHistory, scan.id)
+    assert (scan.technical_score, scan.soft_skills_score, scan.education_score) == (88.0, 0.0, 0.0)
+
+    values = {"public_id": f"cat-{os.urandom(4).hex()}", "user_id": user.id, "overall_match_score": 55.0,
+              "created_at": datetime.utcnow(), "category_scores": {"technical_skills": 33.0}}
+    with db.engine.begin() as connection:
+        insert_rows(connection, [(ScanHistory, values)])
+    stored = ScanHistory.query.filter_by(public_id=values["public_id"]).one()
+    assert stored.technical_score == 33.0 and stored.experience_score == 0.0
+
+
+def test_history_sorts_and_filters_on_category_scores(app):
+    user, headers = new_user()
+    for technical, education in ((90.0, 50.0), (40.0, 95.0), (75.0, 70.0), (60.0, 80.0)):
+        add_scan(user, technical, education)
+    client = app.test_client()
+
+    response = client.get("/api/history?sort_by=technical_score&sort_order=asc&limit=3", headers=headers).get_json()
+    assert [scan["technical_score"] for scan in response["scan_history"]] == [40.0, 60.0, 75.0]
+    cursor = response["pagination"]["next_cursor"]
+    response = client.get("/api/history", headers=headers, query_string={
+        "sort_by": "technical_score", "sort_order": "asc", "limit": 3, "cursor": cursor}).get_json()
+    assert [scan["technical_score"] for scan in response["scan_history"]] == [90.0]
+
+    response = client.get("/api/history?sort_by=technical_score&min_technical_score=60&max_education_score=75",
+                          headers=headers).get_json()
+    assert [scan["technical_score"] for scan in response["scan_history"]] == [90.0, 75.0]
+    assert response["pagination"]["total_items"] == 2
+
+    response = client.get("/api/history?min_technical_score=high", headers=headers)
+    assert response.status_code == 400
+
+
+def test_dashboard_averages_category_scores(app):
+    user, headers = new_user()
+    add_scan(user, 80.0)
+    add_scan(user, 61.0)
+    stats = app.test_client().get("/api/dashboard_stats", headers=headers).get_json()["stats"]
+    assert stats["category_averages"] == {"technical_score": 70.5, "soft_skills_score": 50.0,
+                                          "experience_score": 40.0, "education_score": 60.0}
@@ -0,0 +1,165 @@
+"""
+Chunked upload tests - resumable resume upload protocol
+Runs against the Flask test client with a temporary database and upload folder
+"""
+
+import hashlib
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User
+from backend.services.chunked_upload_service import ChunkedUploadService, ChunkedUploadError
+
+
+RESUME_BYTES = (
+    "Jane Smith\nSoftware Engineer\n"
+    "Skills: Python, Flask, SQL, Docker, AWS, communication, leadership\n"
+).encode("utf-8") * 50
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.config.update(
+        TESTING=True,
+        RESUME_UPLOAD_FOLDER=tempfile.mkdtemp(dir=_tmp_dir),
+        CHUNKED_UPLOAD_FOLDER=tempfile.mkdtemp(dir=_tmp_dir),
+        UPLOAD_CHUNK_SIZE=1024,
+    )
+
+    with app.app_context():
+        user = User.query.filter_by(email="chunked@example.com").first()
+        if not user:
+            user = User("Jane", "Smith", "chunked@example.com", "Password123")
+            db.session.add(user)
+            db.session.commit()
+        token = create_access_token(identity=str(user.id))
+
+    test_client = app.test_client()
+    test_client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return test_client
+
+
+def put_chunk(client, upload_id, start, data, total):
+    end = start + len(data) - 1
+    return client.put(
+        f"/api/upload_resume/{upload_id}",
+        data=data,
+        headers={"Content-Range": f"bytes {start}-{end}/{total}"},
+        content_type="application/octet-stream",
+    )
+
+
+def test_chunked_upload_resume_and_finalize(client):
+    total = len(RESUME_BYTES)
+    response = client.post("/api/upload_resume/init", json={
+        "filename": "jane.txt", "total_size": total, "title": "Jane"
+    })
+    assert response.status_code == 201
+    upload_id = response.get_json()["upload"]["upload_id"]
+
+    # First chunk, then an out-of-order chunk is rejected with the offset to resume from
+    assert put_chunk(client, upload_id, 0, RESUME_BYTES[:1000], total).status_code == 200
+    conflict = put_chunk(client, upload_id, 2000, RESUME_BYTES[2000:3000], total)
+    assert conflict.status_code == 409
+    assert conflict.get_json()["expected_offset"] == 1000
+
+    # Resume from the reported offset
+    offset = client.get(f"/api/upload_resume/{upload_id}").get_json()["upload"]["next_offset"]
+    while offset < total:
+        chunk = RESUME_BYTES[offset:offset + 1000]
+        assert put_chunk(client, upload_id, offset, chunk, total).status_code == 200
+        offset += len(chunk)
+
+    response = client.post(f"/api/upload_resume/{upload_id}/finalize", json={
+        "sha256": hashlib.sha256(RESUME_BYTES).hexdigest()
+    })
+    body = response.get_json()
+    assert response.status_code == 201, body
+    assert body["parsing_success"] is True
+    assert body["resume"]["file_size"] == total
+    assert client.get(f"/api/upload_resume/{upload_id}").status_code == 404
+
+
+def test_limits_are_enforced_before_reading(client):
+    too_big = client.post("/api/upload_resume/init", json={
+        "filename": "big.pdf", "total_size": 10 ** 9
+    })
+    assert too_big.status_code == 413
+
+    response = client.post("/api/upload_resume/init", json={
+        "filename": "jane.txt", "total_size": 5000
+    })
+    upload_id = response.get_json()["upload"]["upload_id"]
+
+    oversized_chunk = put_chunk(client, upload_id, 0, b"x" * 2048, 5000)
+    assert oversized_chunk.status_code == 413
+
+
+def test_finalize_rejects_incomplete_and_checksum_mismatch(tmp_path):
+    service = ChunkedUploadService(str(tmp_path / "incoming"), max_chunk_size=64)
+
+    upload_id = service.init_upload(1, "cv.txt", 10)["upload_id"]
+    with pytest.raises(ChunkedUploadError) as incomplete:
+        service.finalize(upload_id, 1, str(tmp_path / "resumes"))
+    assert incomplete.value.status_code == 409
+
+    class Body:
+        def __init__(self, data):
+            self.data = data
+
+        def read(self, size):
+            chunk, self.data = self.data[:size], self.data[size:]
+            return chunk
+
+    service.write_chunk(upload_id, 1, 0, 10, Body(b"0123456789"))
+
+    # Forget the in-process hasher, as if the chunks had gone to another worker
+    ChunkedUploadService._drop_hasher(upload_id)
+    with pytest.raises(ChunkedUploadError) as mismatch:
+        service.finalize(upload_id, 1, str(tmp_path / "resumes"), expected_sha256="0" * 64)
+    assert mismatch.value.status_code == 422
+    assert not os.listdir(tmp_path / "incoming")
+
+
+def test_cleanup_removes_stale_uploads_hashers_and_lock_files(tmp_path):
+    incoming = tmp_path / "incoming"
+    service = ChunkedUploadService(str(incoming), expiry_seconds=60)
+    stale = service.init_upload(1, "cv.txt", 10)["upload_id"]
+    # Upload expired by another worker: only this process's hasher is left
+    gone = service.init_upload(1, "cv.txt", 10)["upload_id"]
+    for suffix in (".json", ".part"):
+        os.remove(incoming / f"{gone}{suffix}")
+    # Lock file of an upload that no longer exists (e.g. a crashed worker)
+    (incoming / "0badc0de.lock").touch()
+
+    old = time.time() - 120
+    for name in os.listdir(incoming):
+        os.utime(incoming / name, (old, old))
+    for upload_id in (stale, gone):
+        offset, hasher, _ = ChunkedUploadService._hashers[upload_id]
+        ChunkedUploadService._hashers[upload_id] = (offset, hasher, old)
+
+    fresh = service.init_upload(1, "cv.txt", 10)["upload_id"]
+    assert sorted(os.listdir(incoming)) == [f"{fresh}.json", f"{fresh}.part"]
+    assert stale not in ChunkedUploadService._hashers and gone not in ChunkedUploadService._hashers
+    assert fresh in ChunkedUploadService._hashers
+
+
+def test_parse_content_range():
+    assert ChunkedUploadService.parse_content_range("bytes 0-99/200") == (0, 99, 200)
+    assert ChunkedUploadService.parse_content_range("bytes 100-199/*") == (100, 199, None)
+    for header in (None, "bytes 5-1/10", "items 0-1/2", "bytes a-b/c"):
+        with pytest.raises(ChunkedUploadError):
+            ChunkedUploadService.parse_content_range(header)
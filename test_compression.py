@@ -0,0 +1,148 @@
+"""
+Column compression tests - compressed columns round-trip, read values written
+before compression or with another dictionary, and the migration converts
+existing rows
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import json
+import pytest
+from flask import Flask
+from flask_migrate import upgrade
+from sqlalchemy import text
+
+from backend.app import create_app
+from backend.database import MIGRATIONS_DIR, init_database
+from backend.models import db, User, ScanHistory
+from backend.services.compression import ColumnCodec, get_codec, set_codec, train_dictionary, dictionary_id
+
+RESUME_TEXT = "Senior Python developer. Built Flask APIs, SQL reporting and Docker pipelines.\n" * 40
+ANALYSIS = {"matched_skills": ["python", "flask", "sql"] * 20, "missing_skills": ["aws"], "matched_count": 60}
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def codec():
+    previous = set_codec(ColumnCodec("zlib"))
+    yield get_codec()
+    set_codec(previous)
+
+
+def new_user():
+    user = User("Packed", "User", f"packed{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def stored(scan_id, column):
+    return db.session.execute(text(f"SELECT {column} FROM scan_history WHERE id = :id"), {"id": scan_id}).scalar()
+
+
+def test_columns_round_trip_compressed(app, codec):
+    user = new_user()
+    scan = ScanHistory(user_id=user.id, overall_match_score=70.0, resume_text=RESUME_TEXT,
+                       detailed_analysis=ANALYSIS, recommendations=[{"title": "Add AWS"}], keyword_analysis={})
+    db.session.add(scan)
+    db.session.commit()
+    scan_id = scan.id
+    db.session.expunge_all()
+
+    loaded = ScanHistory.query.options(*ScanHistory.with_details("analysis", "text")).filter_by(id=scan_id).one()
+    assert loaded.resume_text == RESUME_TEXT
+    assert loaded.detailed_analysis == ANALYSIS
+    assert loaded.recommendations == [{"title": "Add AWS"}] and loaded.recommendations_count == 1
+    assert loaded.keyword_analysis is None and stored(scan_id, "keyword_analysis") is None
+
+    raw = db.session.execute(text("SELECT content FROM text_blobs WHERE hash = :hash"),
+                             {"hash": loaded.resume_text_hash}).scalar()
+    assert isinstance(raw, bytes) and len(raw) * 10 < len(RESUME_TEXT)
+
+
+def test_legacy_plain_values_are_read(app, codec):
+    user = new_user()
+    scan = ScanHistory(user_id=user.id, overall_match_score=50.0)
+    db.session.add(scan)
+    db.session.commit()
+
+    # Rows written before the conversion hold plain text
+    db.session.execute(text("UPDATE scan_history SET detailed_analysis = :doc WHERE id = :id"),
+                       {"doc": json.dumps(ANALYSIS), "id": scan.id})
+    db.session.commit()
+    scan_id = scan.id
+    db.session.expunge_all()
+
+    loaded = db.session.get(ScanHistory, scan_id)
+    assert loaded.detailed_analysis == ANALYSIS
+
+
+def test_values_survive_a_dictionary_change(tmp_path):
+    first, second = tmp_path / "first.zdict", tmp_path / "second.zdict"
+    first.write_bytes(train_dictionary([RESUME_TEXT.encode()] * 3))
+    second.write_bytes(b"Unrelated dictionary line\n" * 100)
+
+    old = ColumnCodec("zlib", dictionary_path=str(first))
+    value = old.compress(RESUME_TEXT.encode())
+    assert old.dictionary == dictionary_id(first.read_bytes())
+
+    new = ColumnCodec("zlib", dictionary_path=str(second))
+    assert new.decompress(value).decode() == RESUME_TEXT
+    assert ColumnCodec("zlib").decompress(new.compress(b"short")) == b"short"
+
+    first.unlink()
+    with pytest.raises(ValueError):
+        ColumnCodec("zlib", dictionary_path=str(second)).decompress(value)
+
+
+def test_migration_compresses_existing_rows(codec):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tempfile.mktemp(dir=_tmp_dir, suffix='.db')}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        DB_SCHEMA_MODE="none",
+    )
+    init_database(app, db)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR, revision="0008_public_ids")
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO users (id, first_name, last_name, email, password_hash, "
+                "free_scans_remaining, total_scans_used) VALUES (1, 'A', 'B', 'a@b.c', 'x', 5, 0)"
+            ))
+            connection.execute(text(
+                "INSERT INTO scan_history (id, user_id, overall_match_score, resume_text, detailed_analysis, "
+                "recommendations, scan_type, created_at, updated_at) VALUES (1, 1, 60.0, :text, :doc, :recs, "
+                "'realtime', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ), {"text": RESUME_TEXT, "doc": "{}", "recs": json.dumps([{"title": "A"}, {"title": "B"}])})
+
+        upgrade(directory=MIGRATIONS_DIR, revision="0009_compressed_columns")
+
+        with db.engine.connect() as connection:
+            row = connection.execute(text(
+                "SELECT resume_text, detailed_analysis, recommendations_count FROM scan_history WHERE id = 1"
+            )).one()
+        assert isinstance(row.resume_text, bytes) and row.detailed_analysis is None
+        assert row.recommendations_count == 2
+
+        # Later revisions move the text into text_blobs
+        upgrade(directory=MIGRATIONS_DIR)
+
+        scan = ScanHistory.query.options(*ScanHistory.with_details("analysis", "text")).filter_by(id=1).one()
+        assert scan.resume_text == RESUME_TEXT
+        assert scan.recommendations == [{"title": "A"}, {"title": "B"}]
+        db.session.remove()
@@ -0,0 +1,121 @@
+"""
+Conditional GET tests - detail and history responses carry validators, a
+current If-None-Match / If-Modified-Since gets 304 after one indexed lookup
+and any change to the resource changes the ETag
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, ScanHistory
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def owner(app):
+    user = User("Etag", "User", f"etag{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.flush()
+    resume = Resume(user.id, "cv.pdf", "/tmp/cv.pdf", 100, "pdf", title="CV")
+    resume.extracted_text = "python " * 200
+    jd = JobDescription(user.id, "Engineer", "Python engineer building Flask APIs. " * 5, company_name="Acme")
+    db.session.add_all([resume, jd])
+    db.session.flush()
+    scan = ScanHistory(user_id=user.id, resume_id=resume.id, job_description_id=jd.id, overall_match_score=70.0,
+                       category_scores={"technical_skills": 70.0}, detailed_analysis={"matched_skills": ["python"]})
+    db.session.add(scan)
+    db.session.commit()
+    return {"headers": {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"},
+            "user_id": user.id, "resume_id": resume.id, "jd_id": jd.id, "scan_id": scan.id}
+
+
+def count_statements(app, client, url, headers):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return response, statements
+
+
+@pytest.mark.parametrize("url", ["/api/scan/{scan_id}", "/api/resumes/{resume_id}",
+                                 "/api/job_descriptions/{jd_id}", "/api/history"])
+def test_current_etag_gets_304_after_one_lookup(app, owner, url):
+    url = url.format(**owner)
+    client = app.test_client()
+    first = client.get(url, headers=owner["headers"])
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and first.headers["Last-Modified"]
+    assert "private" in first.headers["Cache-Control"]
+
+    response, statements = count_statements(app, client, url, {**owner["headers"], "If-None-Match": etag})
+    assert response.status_code == 304 and response.data == b""
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1
+
+    response = client.get(url, headers={**owner["headers"], "If-Modified-Since": first.headers["Last-Modified"]})
+    assert response.status_code == 304
+
+    response = client.get(url, headers={**owner["headers"], "If-None-Match": '"stale"'})
+    assert response.status_code == 200 and response.headers["ETag"] == etag
+
+
+def test_changes_change_the_etag(app, owner):
+    client = app.test_client()
+    headers = owner["headers"]
+    jd_url = f"/api/job_descriptions/{owner['jd_id']}"
+    jd_etag = client.get(jd_url, headers=headers).headers["ETag"]
+    history_etag = client.get("/api/history", headers=headers).headers["ETag"]
+
+    client.put(jd_url, headers=headers, json={"title": "Senior Engineer",
+                                              "job_text": "Python engineer building Flask APIs. " * 6})
+    response = client.get(jd_url, headers={**headers, "If-None-Match": jd_etag})
+    assert response.status_code == 200 and response.get_json()["job_description"]["title"] == "Senior Engineer"
+
+    # The history list shows the job title
+    response = client.get("/api/history", headers={**headers, "If-None-Match": history_etag})
+    assert response.status_code == 200
+    history_etag = response.headers["ETag"]
+
+    db.session.add(ScanHistory(user_id=owner["user_id"], overall_match_score=50.0))
+    db.session.commit()
+    response = client.get("/api/history", headers={**headers, "If-None-Match": history_etag})
+    assert response.status_code == 200 and len(response.get_json()["scan_history"]) == 2
+
+    # Each query string is its own representation
+    assert client.get("/api/history?limit=1", headers=headers).headers["ETag"] != response.headers["ETag"]
+
+
+def test_other_users_scans_are_not_revalidated(app, owner):
+    other = User("Other", "User", f"other{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(other)
+    db.session.commit()
+    client = app.test_client()
+    etag = client.get(f"/api/scan/{owner['scan_id']}", headers=owner["headers"]).headers["ETag"]
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(other.id))}", "If-None-Match": etag}
+    assert client.get(f"/api/scan/{owner['scan_id']}", headers=headers).status_code == 404
@@ -0,0 +1,68 @@
+"""
+Database engine configuration tests - URL handling, pool options, SQLite
+pragmas and concurrent scan writes
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from sqlalchemy import text
+
+from backend.app import create_app
+from backend.database import database_url, engine_options, benchmark
+from backend.models import db
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    return app
+
+
+@pytest.mark.parametrize("value,expected", [
+    (None, "sqlite:////srv/app.db"),
+    ("", "sqlite:////srv/app.db"),
+    ("/data/resume.db", "sqlite:////data/resume.db"),
+    ("sqlite:///relative.db", "sqlite:///relative.db"),
+    ("postgres://u:p@db:5432/resume", "postgresql://u:p@db:5432/resume"),
+    ("postgresql+psycopg2://u:p@db/resume", "postgresql+psycopg2://u:p@db/resume"),
+])
+def test_database_url(value, expected):
+    assert database_url(value, "/srv/app.db") == expected
+
+
+def test_postgres_engine_options():
+    options = engine_options("postgresql://u:p@db/resume", {"DB_POOL_SIZE": "12", "DB_STATEMENT_TIMEOUT_MS": "5000"})
+
+    assert options["pool_size"] == 12
+    assert options["max_overflow"] == 10
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_sqlite_engine_options_have_no_pool_sizing():
+    assert engine_options("sqlite:///x.db", {"DB_BUSY_TIMEOUT_MS": "2500"}) == {"connect_args": {"timeout": 2.5}}
+
+
+def test_sqlite_connections_get_pragmas(app):
+    with app.app_context():
+        with db.engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert connection.execute(text("PRAGMA mmap_size")).scalar() == 256 * 1024 * 1024
+
+
+def test_concurrent_scan_writers_do_not_hit_locks(tmp_path):
+    rows = dict(benchmark(workers=4, scans=25, directory=str(tmp_path)))
+
+    assert rows["tuned"]["scans_ok"] == 100
+    assert rows["tuned"]["database_locked"] == 0
@@ -0,0 +1,127 @@
+"""
+Deferred ScanHistory column tests - list queries never select the analysis
+JSON or text snapshots, detail endpoints load them in the same query
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, ScanHistory
+from backend.services.history_queries import benchmark
+
+HEAVY_COLUMNS = ("category_scores", "detailed_analysis", "recommendations", "keyword_analysis",
+                 "resume_text", "job_description_text")
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def seeded(app):
+    user = User("Deferred", "User", f"deferred{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.flush()
+    full = ScanHistory(user_id=user.id, overall_match_score=72.0, resume_text="Python " * 500,
+                       category_scores={"technical_skills": 81.256, "soft_skills": 64.0},
+                       detailed_analysis={"matched_skills": ["python"], "matched_count": 1},
+                       recommendations=[{"title": "Add Docker"}, {"title": "Add AWS"}],
+                       keyword_analysis={"python": 3})
+    empty = ScanHistory(user_id=user.id, overall_match_score=35.0, category_scores=None,
+                        detailed_analysis={}, recommendations=[])
+    db.session.add_all([full, empty])
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    return user, full.id, empty.id, headers
+
+
+def selects(statements):
+    return [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+
+
+def capture_sql(app, run):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = run()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, selects(statements)
+
+
+def test_heavy_columns_are_deferred(app, seeded):
+    _, full_id, _, _ = seeded
+    db.session.expunge_all()
+
+    scan, statements = capture_sql(app, lambda: db.session.get(ScanHistory, full_id))
+    assert not any(re.search(rf"scan_history\.{column}\b", statements[0]) for column in HEAVY_COLUMNS)
+
+    # One SELECT loads the whole analysis group on first access
+    _, statements = capture_sql(app, lambda: (scan.category_scores, scan.recommendations, scan.detailed_analysis))
+    assert len(statements) == 1 and "scan_history.keyword_analysis" in statements[0]
+    assert "scan_history.resume_text" not in statements[0]
+
+
+def test_detail_query_undefers_analysis(app, seeded):
+    _, full_id, _, _ = seeded
+    db.session.expunge_all()
+
+    def load():
+        scan = ScanHistory.query.options(*ScanHistory.with_details()).filter_by(id=full_id).one()
+        return scan.to_dict(include_details=True)
+
+    data, statements = capture_sql(app, load)
+    assert data["recommendations"] == [{"title": "Add Docker"}, {"title": "Add AWS"}]
+    assert len(statements) == 1
+
+
+def test_history_list_summarizes_json_in_sql(app, seeded):
+    _, full_id, empty_id, headers = seeded
+
+    selected = []
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM scan_history" in statement and "LIMIT" in statement:
+            selected.extend(column[0] for column in cursor.description)
+
+    event.listen(db.engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        response = app.test_client().get("/api/history", headers=headers)
+    finally:
+        event.remove(db.engine, "after_cursor_execute", after_cursor_execute)
+    assert selected and not set(selected) & set(HEAVY_COLUMNS)
+    assert "recommendations_count" in selected
+
+    scans = {scan["id"]: scan for scan in response.get_json()["scan_history"]}
+    assert scans[full_id]["technical_score"] == 81.26 and scans[full_id]["soft_skills_score"] == 64.0
+    assert scans[full_id]["experience_score"] == 0
+    assert (scans[full_id]["has_detailed_analysis"], scans[full_id]["recommendations_count"]) == (True, 2)
+    assert scans[empty_id]["technical_score"] == 0
+    assert (scans[empty_id]["has_detailed_analysis"], scans[empty_id]["has_recommendations"]) == (False, False)
+
+
+def test_benchmark_reports_smaller_pages():
+    rows = dict(benchmark(scans=20, page_size=10, pages=2))
+    # The documents are stored compressed, which narrows the gap
+    assert rows["summary"]["bytes_per_page"] * 4 < rows["json_columns"]["bytes_per_page"]
+    assert rows["json_columns"]["bytes_per_page"] < rows["entity"]["bytes_per_page"]
@@ -0,0 +1,128 @@
+"""
+Sparse fieldset tests - ?fields= trims both the response keys and the
+columns selected, unknown fields are rejected with 400
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from werkzeug.datastructures import MultiDict
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, ScanHistory
+from backend.services.fieldsets import Fieldset, Field, FieldsetError
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def seeded(app):
+    user = User("Fields", "User", f"fields{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.flush()
+    resume = Resume(user.id, "cv.pdf", "/tmp/cv.pdf", 2048, "pdf", title="Backend CV")
+    resume.extracted_text = "Python Flask SQL " * 200
+    job = JobDescription(user.id, "Backend Engineer", "Python Flask AWS " * 100, company_name="Acme")
+    db.session.add_all([resume, job])
+    db.session.flush()
+    scan = ScanHistory(user_id=user.id, resume_id=resume.id, job_description_id=job.id,
+                       overall_match_score=72.456, category_scores={"technical_skills": 80.0},
+                       detailed_analysis={"matched_skills": ["python"], "missing_skills": ["aws"]})
+    db.session.add(scan)
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    return resume.id, job.id, scan.id, headers
+
+
+def capture_selects(run):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = run()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+
+def test_parse_keeps_whitelist_order_and_rejects_unknown():
+    fieldset = Fieldset({"id": "id", "title": "title", "size": Field("file_size", value=lambda obj: 1)})
+    assert fieldset.parse(MultiDict()) is None
+    assert fieldset.parse(MultiDict({"fields": " size, id ,"})) == ("id", "size")
+    assert fieldset.columns(("id", "size")) == ["id", "file_size"]
+    with pytest.raises(FieldsetError, match="secret"):
+        fieldset.parse(MultiDict({"fields": "id,secret"}))
+
+
+def test_resume_list_returns_only_requested_fields(app, seeded):
+    resume_id, _, _, headers = seeded
+    client = app.test_client()
+
+    response, statements = capture_selects(lambda: client.get("/api/resumes?fields=id,title", headers=headers))
+    assert response.status_code == 200
+    assert response.get_json()["resumes"] == [{"id": resume_id, "title": "Backend CV"}]
+    assert not any(re.search(r"resumes\.(extracted_text|original_filename)\b", s) for s in statements)
+
+    response = client.get("/api/resumes?fields=id,password", headers=headers)
+    assert response.status_code == 400 and "password" in response.get_json()["message"]
+
+
+def test_resume_and_job_description_details(app, seeded):
+    resume_id, job_id, _, headers = seeded
+    client = app.test_client()
+
+    data = client.get(f"/api/resumes/{resume_id}?fields=id,text_length", headers=headers).get_json()["resume"]
+    assert data == {"id": resume_id, "text_length": len("Python Flask SQL " * 200)}
+
+    data = client.get(f"/api/job_descriptions/{job_id}?fields=title,company_name",
+                      headers=headers).get_json()["job_description"]
+    assert data == {"title": "Backend Engineer", "company_name": "Acme"}
+
+    # Without ?fields= the payload is unchanged
+    assert "job_text" in client.get(f"/api/job_descriptions/{job_id}", headers=headers).get_json()["job_description"]
+    assert client.get(f"/api/job_descriptions/{job_id}?fields=bogus", headers=headers).status_code == 400
+
+
+def test_scan_detail_fields_skip_the_analysis_columns(app, seeded):
+    _, _, scan_id, headers = seeded
+    client = app.test_client()
+
+    response, statements = capture_selects(lambda: client.get(f"/api/scan/{scan_id}?fields=id,score",
+                                                              headers=headers))
+    assert response.get_json()["scan"] == {"id": scan_id, "score": 72.46}
+    assert not any("detailed_analysis" in s for s in statements)
+
+    data = client.get(f"/api/scan/{scan_id}?fields=matched_skills", headers=headers).get_json()["scan"]
+    assert data == {"matched_skills": ["python"]}
+
+
+def test_scans_list_without_titles_skips_the_joins(app, seeded):
+    _, _, scan_id, headers = seeded
+    client = app.test_client()
+
+    response, statements = capture_selects(lambda: client.get("/api/scans?fields=id,score", headers=headers))
+    assert response.get_json()["scans"] == [{"id": scan_id, "score": 72.46}]
+    assert not any(re.search(r"\bJOIN\b", s) for s in statements)
+
+    scan = client.get("/api/scans?fields=id,job_title", headers=headers).get_json()["scans"][0]
+    assert scan == {"id": scan_id, "job_title": "Backend Engineer"}
@@ -0,0 +1,72 @@
+"""
+File parser tests - streaming text cleaner
+Checks that chunked cleaning matches whole-text cleaning and respects the length budget
+"""
+
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.services.file_parser import FileParser, MAX_TEXT_LENGTH, TRUNCATION_MARKER
+
+
+SAMPLE_TEXT = (
+    "  John   Doe\x00\n\n"
+    "Senior\tEngineer \x07 \r\n"
+    "Skills:  Python,   Flask,  ﬁne-tuning  café\n"
+    "\n\n   \n"
+    "Experience: 5 years"
+)
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_chunked_cleaning_matches_whole_text():
+    expected = FileParser._clean_extracted_text(SAMPLE_TEXT)
+    assert expected.split("\n")[0] == "John Doe"
+
+    for size in (1, 2, 3, 7, 64):
+        assert FileParser._clean_text_chunks(chunked(SAMPLE_TEXT, size)) == expected
+
+
+def test_length_budget_stops_consuming_chunks():
+    consumed = []
+
+    def pages():
+        for number in range(1000):
+            consumed.append(number)
+            yield ("lorem ipsum " * 100) + "\n"
+
+    text = FileParser._clean_text_chunks(pages())
+
+    assert text.endswith(TRUNCATION_MARKER)
+    assert len(text) == MAX_TEXT_LENGTH + len(TRUNCATION_MARKER)
+    assert len(consumed) < 1000
+
+
+def test_long_single_line_is_bounded():
+    line = "keyword " * 20000
+    text = FileParser._clean_text_chunks(chunked(line, 4096))
+    assert text == FileParser._clean_extracted_text(line)
+
+
+def test_uploaded_txt_is_decoded_incrementally():
+    raw = "Résumé — naïve façade\nPython  developer\n".encode("utf-8") * 3
+
+    class Upload(io.BytesIO):
+        filename = "resume.txt"
+
+    text = FileParser.extract_text_from_file(Upload(raw))
+    assert text == FileParser._clean_extracted_text(raw.decode("utf-8"))
+
+
+if __name__ == "__main__":
+    test_chunked_cleaning_matches_whole_text()
+    test_length_budget_stops_consuming_chunks()
+    test_long_single_line_is_bounded()
+    test_uploaded_txt_is_decoded_incrementally()
+    print("✅ All file parser tests passed")
@@ -0,0 +1,90 @@
+"""
+Keyword fingerprint tests - fixed-width sketch encoding, exact Jaccard and batch scoring
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from backend.services import keyword_fingerprint as kf
+
+
+def set_jaccard(a, b):
+    if not a and not b:
+        return 100.0
+    if not a or not b:
+        return 0.0
+    return round(len(a & b) / len(a | b) * 100, 2)
+
+
+def test_encode_round_trips_ids():
+    ids = [1, 63, 64, 65, 1000]
+    blob = kf.encode(ids + [64])
+    assert kf.keyword_ids(blob) == ids
+    assert kf.encode([]) == b""
+    assert len(kf.decode(b"").ids) == 0
+
+
+def test_width_does_not_grow_with_keyword_ids():
+    small = kf.encode([1, 2, 3])
+    large = kf.encode([10 ** 6, 10 ** 9, kf.MAX_KEYWORD_ID])
+    assert len(small) == len(large) == kf.SKETCH_WORDS * 8 + 3 * 4
+
+    stacked = kf.stack_documents([{c: large for c in kf.CATEGORIES}, {c: small for c in kf.CATEGORIES}])
+    assert stacked["technical_skills"][0].shape == (2, kf.SKETCH_WORDS)
+    with pytest.raises(ValueError):
+        kf.encode([kf.MAX_KEYWORD_ID + 1])
+
+
+def test_sketch_collisions_do_not_count_as_matches():
+    # Many more ids than sketch bits: the sketches overlap, the id sets do not
+    a = set(range(1, 2001, 2))
+    b = set(range(2, 2001, 2))
+    fa, fb = kf.decode(kf.encode(a)), kf.decode(kf.encode(b))
+    assert int(kf.popcount(fa.sketch & fb.sketch)) > 0
+    assert kf.overlap(fa, fb) == 0 and kf.jaccard(fa, fb) == 0.0
+    result = kf.score_many({c: fa for c in kf.CATEGORIES}, [{c: fb for c in kf.CATEGORIES}])
+    assert result["matched_keywords"][0] == 0 and result["overall_score"][0] == 0.0
+
+
+def test_jaccard_matches_set_semantics_for_any_ids():
+    rng = random.Random(7)
+    for _ in range(200):
+        a = set(rng.sample(range(1, 3 * 10 ** 9), rng.randint(0, 40))) | set(rng.sample(range(1, 300), rng.randint(0, 5)))
+        b = set(rng.sample(range(1, 300), rng.randint(0, 40)))
+        fa, fb = kf.decode(kf.encode(a)), kf.decode(kf.encode(b))
+        assert kf.jaccard(fa, fb) == set_jaccard(a, b)
+        assert kf.overlap(fa, fb) == len(a & b)
+
+
+def test_popcount_fallback_agrees():
+    words = np.array([0, 1, 2 ** 64 - 1, 0xF0F0], dtype="<u8")
+    lut = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    assert int(kf.popcount(words)) == int(lut[words.view(np.uint8)].sum()) == 1 + 64 + 8
+
+
+def test_score_many_matches_single_pair_scoring():
+    rng = random.Random(3)
+
+    def doc():
+        return {c: set(rng.sample(range(1, 500), rng.randint(0, 25))) for c in kf.CATEGORIES}
+
+    resume = doc()
+    jobs = [doc() for _ in range(50)]
+    result = kf.score_many(
+        {c: kf.encode(ids) for c, ids in resume.items()},
+        [{c: kf.encode(ids) for c, ids in job.items()} for job in jobs],
+    )
+
+    for i, job in enumerate(jobs):
+        expected = {c: set_jaccard(resume[c], job[c]) for c in kf.CATEGORIES}
+        for c in kf.CATEGORIES:
+            assert result[f"{c}_score"][i] == expected[c]
+        overall = round(sum(expected[c] * kf.CATEGORY_WEIGHTS[c] for c in kf.CATEGORIES), 2)
+        assert result["overall_score"][i] == overall
+        assert result["matched_keywords"][i] == sum(len(resume[c] & job[c]) for c in kf.CATEGORIES)
@@ -0,0 +1,123 @@
+"""
+Normalized keyword table tests - interning, link rows and id-based matching
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, Keyword, ResumeKeyword
+from backend.services.matching_service import MatchingService
+
+
+RESUME_KEYWORDS = {
+    "technical_skills": ["Python", "flask", " SQL ", "docker"],
+    "soft_skills": ["communication", "Leadership"],
+    "other_keywords": ["startup", "python"],
+}
+JD_KEYWORDS = {
+    "technical_skills": ["python", "Flask", "kubernetes"],
+    "soft_skills": ["leadership"],
+    "other_keywords": [],
+}
+
+
+@pytest.fixture
+def ctx():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        user = User.query.filter_by(email="keywords@example.com").first()
+        if not user:
+            user = User("Key", "Words", "keywords@example.com", "Password123")
+            db.session.add(user)
+            db.session.commit()
+        yield user
+
+
+def make_documents(user, resume_keywords, jd_keywords):
+    resume = Resume(user.id, "cv.txt", "/tmp/cv.txt", 10, "txt")
+    jd = JobDescription(user.id, "Backend Engineer", "x" * 60)
+    db.session.add_all([resume, jd])
+    db.session.flush()
+    resume.set_keywords(**resume_keywords)
+    jd.set_keywords(**jd_keywords)
+    db.session.commit()
+    return resume, jd
+
+
+def string_jaccard(a, b):
+    if not a and not b:
+        return 100.0
+    if not a or not b:
+        return 0.0
+    s1 = {k.lower().strip() for k in a}
+    s2 = {k.lower().strip() for k in b}
+    return round(len(s1 & s2) / len(s1 | s2) * 100, 2)
+
+
+def test_keywords_are_interned_once_and_linked(ctx):
+    resume, jd = make_documents(ctx, RESUME_KEYWORDS, JD_KEYWORDS)
+
+    ids = Keyword.intern_many(["PYTHON", "python ", "flask"])
+    assert set(ids) == {"python", "flask"}
+    assert Keyword.query.filter_by(term="python").count() == 1
+
+    resume_ids = resume.get_keyword_ids()
+    assert resume_ids["technical_skills"] == sorted(resume_ids["technical_skills"])
+    assert ids["python"] in resume_ids["technical_skills"]
+    assert ids["python"] in resume_ids["other_keywords"]
+    assert ids["python"] in jd.get_keyword_ids()["technical_skills"]
+
+
+def test_id_matching_matches_string_jaccard(ctx):
+    resume, jd = make_documents(ctx, RESUME_KEYWORDS, JD_KEYWORDS)
+
+    result = MatchingService().calculate_match_score(resume.id, jd.id, ctx.id)
+    assert result["success"], result
+
+    scores = result["detailed_scores"]
+    assert scores["technical_score"] == string_jaccard(RESUME_KEYWORDS["technical_skills"], JD_KEYWORDS["technical_skills"])
+    assert scores["soft_skills_score"] == string_jaccard(RESUME_KEYWORDS["soft_skills"], JD_KEYWORDS["soft_skills"])
+    assert scores["other_keywords_score"] == 0.0
+    assert result["keyword_analysis"]["matched_keywords"] == 3
+
+
+def test_rows_without_links_are_healed_on_first_match(ctx):
+    resume, jd = make_documents(ctx, RESUME_KEYWORDS, JD_KEYWORDS)
+
+    # Simulate a resume extracted before the keyword tables existed
+    ResumeKeyword.query.filter_by(resume_id=resume.id).delete()
+    resume.technical_skills_fingerprint = None
+    resume.soft_skills_fingerprint = None
+    resume.other_keywords_fingerprint = None
+    db.session.commit()
+    assert ResumeKeyword.ids_for(resume.id) == {}
+    assert json.loads(resume.technical_skills)
+
+    result = MatchingService().calculate_match_score(resume.id, jd.id, ctx.id)
+    assert result["success"], result
+    assert result["detailed_scores"]["technical_score"] == 40.0
+    assert ResumeKeyword.ids_for(resume.id)["soft_skills"]
+
+
+def test_batch_scoring_agrees_with_single_match(ctx):
+    resume, jd = make_documents(ctx, RESUME_KEYWORDS, JD_KEYWORDS)
+    service = MatchingService()
+
+    single = service.calculate_match_score(resume.id, jd.id, ctx.id)["detailed_scores"]
+    batch = service.score_against_job_descriptions(resume.id, ctx.id, [jd.id])
+
+    assert len(batch) == 1
+    assert batch[0]["overall_score"] == single["overall_score"]
+    assert batch[0]["technical_score"] == single["technical_score"]
+    assert batch[0]["matched_keywords"] == 3
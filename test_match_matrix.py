@@ -0,0 +1,98 @@
+"""
+Match matrix tests - all-pairs scoring endpoint and match score upserts
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, MatchScore
+from backend.services.matching_service import MatchingService
+
+
+RESUMES = [
+    {"technical_skills": ["python", "flask", "sql"], "soft_skills": ["communication"], "other_keywords": ["startup"]},
+    {"technical_skills": ["java", "spring"], "soft_skills": ["leadership"], "other_keywords": []},
+]
+JOBS = [
+    {"technical_skills": ["python", "django"], "soft_skills": ["communication"], "other_keywords": ["startup"]},
+    {"technical_skills": ["java", "kubernetes"], "soft_skills": ["leadership", "teamwork"], "other_keywords": []},
+    {"technical_skills": ["go"], "soft_skills": [], "other_keywords": ["fintech"]},
+]
+
+
+@pytest.fixture
+def setup():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        user = User("Matrix", "User", f"matrix{os.urandom(4).hex()}@example.com", "Password123")
+        db.session.add(user)
+        db.session.flush()
+        for i, keywords in enumerate(RESUMES):
+            resume = Resume(user.id, f"cv{i}.txt", f"/tmp/cv{i}.txt", 10, "txt")
+            db.session.add(resume)
+            resume.set_keywords(**keywords)
+        for i, keywords in enumerate(JOBS):
+            jd = JobDescription(user.id, f"Job {i}", "x" * 60)
+            db.session.add(jd)
+            jd.set_keywords(**keywords)
+        db.session.commit()
+        user_id = user.id
+        token = create_access_token(identity=str(user_id))
+
+    client = app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return app, client, user_id
+
+
+def test_matrix_scores_all_pairs_and_matches_single_calculation(setup):
+    app, client, user_id = setup
+
+    response = client.post("/api/calculate_match/matrix", json={})
+    body = response.get_json()
+    assert response.status_code == 200, body
+    assert body["pair_count"] == 6
+    assert len(body["matrix"]) == 2 and all(len(row) == 3 for row in body["matrix"])
+
+    with app.app_context():
+        service = MatchingService()
+        for i, resume in enumerate(body["resumes"]):
+            for j, jd in enumerate(body["job_descriptions"]):
+                single = service.calculate_match_score(resume["id"], jd["id"], user_id)
+                assert single["detailed_scores"]["overall_score"] == body["matrix"][i][j]
+        assert MatchScore.query.filter_by(user_id=user_id).count() == 6
+
+
+def test_matrix_upserts_instead_of_duplicating(setup):
+    app, client, user_id = setup
+
+    client.post("/api/calculate_match/matrix", json={})
+    with app.app_context():
+        first = {(m.resume_id, m.job_description_id): m.id for m in MatchScore.query.filter_by(user_id=user_id)}
+
+    response = client.post("/api/calculate_match/matrix", json={})
+    assert response.status_code == 200
+    with app.app_context():
+        second = {(m.resume_id, m.job_description_id): m.id for m in MatchScore.query.filter_by(user_id=user_id)}
+    assert first == second
+
+
+def test_matrix_validates_input_and_size(setup):
+    app, client, _ = setup
+
+    assert client.post("/api/calculate_match/matrix", json={"resume_ids": "1"}).status_code == 400
+
+    app.config["MATCH_MATRIX_MAX_PAIRS"] = 5
+    response = client.post("/api/calculate_match/matrix", json={})
+    assert response.status_code == 400
+    assert "exceeds" in response.get_json()["error"]
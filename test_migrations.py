@@ -0,0 +1,96 @@
+"""
+Migration tests - the Alembic history builds exactly the schema the models
+declare, and databases created by the old create_all() startup upgrade in place
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask import Flask
+from flask_migrate import upgrade
+from sqlalchemy import inspect, text
+
+from backend.database import MIGRATIONS_DIR, init_database, upgrade_database, is_unversioned_database
+from backend.models import db
+
+
+def make_app(mode="none"):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tempfile.mktemp(dir=_tmp_dir, suffix='.db')}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        DB_SCHEMA_MODE=mode,
+    )
+    init_database(app, db)
+    return app
+
+
+def current_revision(connection):
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def test_migrations_match_the_models():
+    app = make_app("migrate")
+    with app.app_context():
+        with db.engine.connect() as connection:
+            context = MigrationContext.configure(connection, opts={"compare_type": True})
+            assert compare_metadata(context, db.metadata) == []
+            assert current_revision(connection) == "0013_fingerprint_sketches"
+
+
+def test_create_all_database_is_stamped_and_upgraded():
+    app = make_app()
+    with app.app_context():
+        # What the old startup built: the baseline tables and no migration history
+        upgrade(directory=MIGRATIONS_DIR, revision="0001_baseline")
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE alembic_version"))
+            connection.execute(text(
+                "INSERT INTO users (id, first_name, last_name, email, password_hash, "
+                "free_scans_remaining, total_scans_used) VALUES (1, 'A', 'B', 'a@b.c', 'x', 5, 0)"
+            ))
+            connection.execute(text(
+                "INSERT INTO resumes (id, user_id, original_filename, file_path, file_size, file_type, is_active) "
+                "VALUES (1, 1, 'cv.pdf', '/tmp/cv.pdf', 1, 'pdf', 1)"
+            ))
+            connection.execute(text(
+                "INSERT INTO job_descriptions (id, user_id, title, job_text, is_active) VALUES (1, 1, 'Dev', 'Python', 1)"
+            ))
+            for score in (40.0, 70.0):  # duplicate pair rows from before the upsert
+                connection.execute(text(
+                    "INSERT INTO match_scores (user_id, resume_id, job_description_id, overall_score) "
+                    f"VALUES (1, 1, 1, {score})"
+                ))
+        assert is_unversioned_database(db.engine)
+
+        upgrade_database(db.engine)
+
+        with db.engine.connect() as connection:
+            assert current_revision(connection) == "0013_fingerprint_sketches"
+            assert connection.execute(text("SELECT overall_score FROM match_scores")).scalars().all() == [70.0]
+            assert connection.execute(text("SELECT scan_count FROM resumes")).scalar() == 0
+
+        indexes = {index["name"] for index in inspect(db.engine).get_indexes("resumes")}
+        assert "ix_resumes_user_active_created" in indexes
+
+
+def test_upgrade_is_a_no_op_when_current():
+    app = make_app("migrate")
+    with app.app_context():
+        upgrade_database(db.engine)
+        with db.engine.connect() as connection:
+            assert current_revision(connection) == "0013_fingerprint_sketches"
+
+
+def test_unknown_schema_mode_is_rejected():
+    with pytest.raises(ValueError):
+        make_app("drop_everything")
@@ -0,0 +1,53 @@
+"""
+NLP pipeline tests - trimmed spaCy artifact build and shared loader
+Uses a blank English pipeline as the base model so no downloaded model is needed
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from backend.services import nlp_pipeline
+
+
+@pytest.fixture
+def artifact(tmp_path, monkeypatch):
+    base = tmp_path / "base"
+    spacy.blank("en").to_disk(base)
+
+    output = tmp_path / "trimmed"
+    nlp_pipeline.build_pipeline(str(output), base_model=str(base))
+
+    monkeypatch.setenv("SPACY_PIPELINE_PATH", str(output))
+    monkeypatch.setattr(nlp_pipeline, "_models", {})
+    monkeypatch.setattr(nlp_pipeline, "_load_stats", {})
+    return output
+
+
+def test_artifact_keeps_tech_terms_as_single_tokens(artifact):
+    nlp = nlp_pipeline.load_nlp("lemma")
+    tokens = [t.text for t in nlp("Built APIs in C++, C# and Node.js with CI/CD on ASP.NET.")]
+
+    for term in ("C++", "C#", "Node.js", "CI/CD", "ASP.NET"):
+        assert term in tokens
+
+
+def test_loader_caches_per_process_and_records_stats(artifact):
+    full = nlp_pipeline.load_nlp("full")
+    assert nlp_pipeline.load_nlp("full") is full
+    # 'lemma' is served by the already loaded 'full' pipeline
+    assert nlp_pipeline.load_nlp("lemma") is full
+
+    stats = nlp_pipeline.get_load_stats()["full"]
+    assert stats["source"] == str(artifact)
+    assert stats["load_seconds"] >= 0
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        nlp_pipeline.load_nlp("everything")
@@ -0,0 +1,160 @@
+"""
+Keyset pagination tests - list endpoints page with opaque cursors
+
+Walking every page must return each row exactly once, cursors must be
+validated, and a deep page must cost the same number of queries as the first.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, ScanHistory
+from backend.services.pagination import PaginationError, encode_cursor, decode_cursor, parse_page_args
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    return app
+
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    """One user with 23 resumes, job descriptions and scans (several sharing a timestamp)"""
+    with app.app_context():
+        user = User("Page", "User", f"page{os.urandom(4).hex()}@example.com", "Password123")
+        db.session.add(user)
+        db.session.flush()
+        base = datetime(2024, 1, 1)
+        for i in range(23):
+            created = base + timedelta(minutes=i // 3)  # ties on created_at
+            resume = Resume(user.id, f"cv{i}.pdf", f"/tmp/cv{i}.pdf", 100, "pdf", title=f"CV {i}")
+            resume.created_at = created
+            jd = JobDescription(user.id, f"Engineer {i}", "Python engineer", company_name="Acme")
+            jd.created_at = created
+            db.session.add_all([resume, jd])
+            db.session.flush()
+            db.session.add(ScanHistory(
+                user_id=user.id, resume_id=resume.id, job_description_id=jd.id,
+                overall_match_score=float(i % 5) * 20, created_at=created
+            ))
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+
+def walk(client, headers, url, items_key, **params):
+    """Follow next_cursor until the last page, returning all ids and the page bodies"""
+    ids, bodies, cursor = [], [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(url, headers=headers, query_string=query)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        bodies.append(body)
+        page = body.get("pagination", body)
+        ids.extend(row["id"] for row in body[items_key])
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if not cursor:
+            return ids, bodies
+
+
+@pytest.mark.parametrize("url,items_key", [
+    ("/api/scans", "scans"),
+    ("/api/resumes", "resumes"),
+    ("/api/job_descriptions", "job_descriptions"),
+    ("/api/history", "scan_history"),
+])
+def test_walk_returns_every_row_once(app, seeded, url, items_key):
+    ids, bodies = walk(app.test_client(), seeded, url, items_key, limit=5)
+
+    assert len(ids) == 23 and len(set(ids)) == 23
+    assert len(bodies) == 5
+    total = bodies[0].get("count", bodies[0].get("pagination", {}).get("total_items"))
+    assert total == 23
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_history_score_sort_pages_in_order(app, seeded, order):
+    client = app.test_client()
+    ids, bodies = walk(client, seeded, "/api/history", "scan_history",
+                       limit=4, sort_by="overall_score", sort_order=order)
+    scores = [row["match_score"] for body in bodies for row in body["scan_history"]]
+
+    assert len(set(ids)) == 23
+    assert scores == sorted(scores, reverse=order == "desc")
+
+
+def test_history_filter_total_comes_from_rollup(app, seeded):
+    body = app.test_client().get("/api/history", headers=seeded,
+                                 query_string={"filter_score": "excellent"}).get_json()
+
+    assert body["pagination"]["total_items"] == 4  # scores of 80
+    assert all(row["match_score"] >= 80 for row in body["scan_history"])
+
+
+def test_invalid_cursor_and_limit_are_rejected(app, seeded):
+    client = app.test_client()
+    for query in ({"cursor": "not-a-cursor"}, {"limit": "abc"}, {"limit": "0"}):
+        response = client.get("/api/scans", headers=seeded, query_string=query)
+        assert response.status_code == 400, query
+        assert response.get_json()["success"] is False
+
+
+def test_cursor_is_bound_to_its_sort_order(app, seeded):
+    client = app.test_client()
+    first = client.get("/api/history", headers=seeded, query_string={"limit": 3}).get_json()
+    response = client.get("/api/history", headers=seeded, query_string={
+        "limit": 3, "sort_by": "overall_score", "cursor": first["pagination"]["next_cursor"]
+    })
+
+    assert response.status_code == 400
+
+
+def test_deep_page_costs_the_same_queries(app, seeded):
+    client = app.test_client()
+    with app.app_context():
+        engine = db.engine
+
+    def count(query):
+        statements = []
+        listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            assert client.get("/api/scans", headers=seeded, query_string=query).status_code == 200
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return statements
+
+    first = count({"limit": 2})
+    _, bodies = walk(client, seeded, "/api/scans", "scans", limit=2)
+    deep = count({"limit": 2, "cursor": bodies[-2]["next_cursor"]})
+
+    assert len(first) == len(deep)
+    # SQLite renders LIMIT ? OFFSET ?; the offset must stay 0 on every page
+    paged = [(sql, params) for sql, params in first + deep if "LIMIT" in sql]
+    assert len(paged) == 2
+    assert all(params[-1] == 0 for _, params in paged)
+    assert "scan_history.id <" in paged[1][0]
+
+
+def test_cursor_round_trip_and_limit_cap():
+    when = datetime(2024, 5, 1, 12, 30)
+    assert decode_cursor(encode_cursor("created_at", when, 7), "created_at") == (when, 7)
+    with pytest.raises(PaginationError):
+        decode_cursor(encode_cursor("created_at", when, 7), "overall_score")
+    assert parse_page_args({"per_page": "500"}) == (100, None)
+    assert parse_page_args({}, default_limit=10) == (10, None)
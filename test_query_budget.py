@@ -0,0 +1,122 @@
+"""
+Query budget tests - history and dashboard endpoints must not issue per-row queries
+
+Each endpoint is called for a user with a few scans and for one with many;
+the number of SQL statements has to stay the same and within its budget.
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, ScanHistory, MatchScore
+from backend.services.matching_service import MatchingService
+
+
+# Statements allowed per request (including the user lookup)
+BUDGETS = {
+    "/api/history": 3,
+    "/api/history?per_page=50&sort_by=overall_score": 3,
+    "/api/recent_activity": 4,
+    "/api/scans": 3,  # user, page, rollup total
+    "/api/dashboard_stats": 2,
+    "/api/dashboard/summary": 2,
+}
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    return app
+
+
+@contextmanager
+def count_queries(app):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def make_user_with_scans(app, scan_count):
+    with app.app_context():
+        user = User("Budget", "User", f"budget{os.urandom(4).hex()}@example.com", "Password123")
+        db.session.add(user)
+        db.session.flush()
+        for i in range(scan_count):
+            resume = Resume(user.id, f"cv{i}.pdf", f"/tmp/cv{i}.pdf", 100, "pdf", title=f"CV {i}")
+            resume.extracted_text = "python " * 1000
+            jd = JobDescription(user.id, f"Engineer {i}", "Python engineer " * 10, company_name="Acme")
+            db.session.add_all([resume, jd])
+            db.session.flush()
+            db.session.add(ScanHistory(
+                user_id=user.id,
+                resume_id=resume.id if i % 3 else None,  # some real-time scans
+                job_description_id=jd.id,
+                overall_match_score=10.0 * (i % 10),
+                category_scores={"technical_skills": 50.0},
+                detailed_analysis={"matched_skills": ["python"]},
+                recommendations=["Add Docker"],
+            ))
+            db.session.add(MatchScore(
+                user_id=user.id, resume_id=resume.id, job_description_id=jd.id, overall_score=50.0
+            ))
+        db.session.commit()
+        return user.id, create_access_token(identity=str(user.id))
+
+
+@pytest.mark.parametrize("url", sorted(BUDGETS))
+def test_endpoint_query_count_is_constant(app, url):
+    counts = []
+    for scan_count in (2, 12):
+        _, token = make_user_with_scans(app, scan_count)
+        client = app.test_client()
+        with count_queries(app) as statements:
+            response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200, response.get_json()
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1], f"{url} issues per-row queries: {counts}"
+    assert counts[1] <= BUDGETS[url], f"{url} used {counts[1]} queries (budget {BUDGETS[url]})"
+
+
+def test_history_rows_keep_resume_and_job_labels(app):
+    _, token = make_user_with_scans(app, 3)
+    body = app.test_client().get("/api/history?sort_order=asc",
+                                 headers={"Authorization": f"Bearer {token}"}).get_json()
+
+    realtime, stored = body["scan_history"][0], body["scan_history"][1]
+    assert realtime["resume"] == {"id": None, "title": "Real-time Scan",
+                                  "filename": "Real-time Resume", "upload_date": None}
+    assert stored["resume"]["title"] == "CV 1"
+    assert stored["job_description"]["company_name"] == "Acme"
+    assert stored["recommendations_count"] == 1 and stored["has_detailed_analysis"]
+
+
+def test_match_history_eager_loads_documents(app):
+    user_id, _ = make_user_with_scans(app, 8)
+    with app.app_context():
+        with count_queries(app) as statements:
+            history = MatchingService().get_match_history(user_id, limit=8)
+        assert len(history) == 8 and history[0]["job_title"].startswith("Engineer")
+        assert len(statements) == 1
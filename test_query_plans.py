@@ -0,0 +1,160 @@
+"""
+Query plan tests - route queries must be served by indexes
+
+Each route is called while its SQL is captured; every statement is then run
+through EXPLAIN QUERY PLAN with the same parameters and may not fall back to
+a full scan of a per-user table.
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, ScanHistory, Suggestion
+
+
+# Tables that grow with usage; users is looked up by primary key or email
+INDEXED_TABLES = {"users", "resumes", "job_descriptions", "scan_history", "match_scores",
+                  "resume_suggestions", "user_stats", "resume_keywords", "job_description_keywords"}
+
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    return app
+
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    with app.app_context():
+        user = User("Plan", "User", f"plan{os.urandom(4).hex()}@example.com", "Password123")
+        db.session.add(user)
+        db.session.flush()
+        ids = {"resumes": [], "job_descriptions": [], "scans": []}
+        for i in range(4):
+            resume = Resume(user.id, f"cv{i}.pdf", f"/tmp/cv{i}.pdf", 100, "pdf", title=f"CV {i}")
+            resume.set_keywords(["python", "sql"], ["teamwork"], ["agile"])
+            jd = JobDescription(user.id, f"Engineer {i}", "Python engineer", company_name="Acme")
+            jd.set_keywords(["python", "docker"], ["teamwork"], ["scrum"])
+            db.session.add_all([resume, jd])
+            db.session.flush()
+            scan = ScanHistory(user_id=user.id, resume_id=resume.id, job_description_id=jd.id,
+                               overall_match_score=20.0 * i)
+            db.session.add(scan)
+            if i < 3:  # the last resume / job description get deleted below
+                db.session.add(Suggestion(
+                    user_id=user.id, resume_id=resume.id, jd_id=jd.id, suggestion_type="technical_skills",
+                    priority="high", title="Add Docker", description="Mention Docker"
+                ))
+            db.session.flush()
+            ids["resumes"].append(resume.id)
+            ids["job_descriptions"].append(jd.id)
+            ids["scans"].append(scan.id)
+        db.session.commit()
+        ids["headers"] = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+        return ids
+
+
+def route_requests(ids):
+    resume_id, jd_id, scan_id = ids["resumes"][0], ids["job_descriptions"][0], ids["scans"][0]
+    return [
+        ("GET", "/api/resumes", None),
+        ("GET", f"/api/resumes/{resume_id}", None),
+        ("GET", "/api/job_descriptions", None),
+        ("GET", f"/api/job_descriptions/{jd_id}", None),
+        ("GET", "/api/jd/latest", None),
+        ("GET", "/api/scans", None),
+        ("GET", f"/api/scan/{scan_id}", None),
+        ("GET", "/api/history", None),
+        ("GET", "/api/history?sort_by=overall_score&filter_score=good", None),
+        ("GET", "/api/history?sort_by=technical_score&min_technical_score=50&max_education_score=90", None),
+        ("GET", "/api/recent_activity", None),
+        ("GET", "/api/dashboard_stats", None),
+        ("GET", "/api/dashboard/summary", None),
+        ("GET", "/api/account_info", None),
+        ("POST", "/api/calculate_match", {"resume_id": resume_id, "job_description_id": jd_id}),
+        ("POST", "/api/calculate_match/matrix", {"resume_ids": ids["resumes"][:2],
+                                                 "job_description_ids": ids["job_descriptions"][:2]}),
+        ("DELETE", f"/api/resumes/{ids['resumes'][-1]}", None),
+        ("DELETE", f"/api/job_descriptions/{ids['job_descriptions'][-1]}", None),
+    ]
+
+
+def capture(app, client, method, url, body, headers):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.open(url, method=method, json=body, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code < 400, (url, response.get_json())
+    return statements
+
+
+def full_scans(app, statement, parameters):
+    with app.app_context():
+        with db.engine.connect() as connection:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in plan:
+        match = FULL_SCAN.match(row[-1])
+        if match and match.group(1) in INDEXED_TABLES:
+            scans.append(row[-1])
+    return scans
+
+
+def test_route_queries_use_indexes(app, seeded):
+    client = app.test_client()
+    problems = []
+    for method, url, body in route_requests(seeded):
+        for statement, parameters in capture(app, client, method, url, body, seeded["headers"]):
+            for scan in full_scans(app, statement, parameters):
+                problems.append(f"{method} {url}: {scan}\n    {' '.join(statement.split())[:300]}")
+
+    assert not problems, "Full table scans:\n" + "\n".join(problems)
+
+
+def test_list_queries_walk_the_index_in_order(app, seeded):
+    """Keyset pages read the composite index in order - no sort step"""
+    client = app.test_client()
+    for url in ("/api/resumes", "/api/job_descriptions", "/api/scans",
+                "/api/history", "/api/history?sort_by=overall_score&sort_order=asc",
+                "/api/history?sort_by=technical_score&min_technical_score=50"):
+        for statement, parameters in capture(app, client, "GET", url, None, seeded["headers"]):
+            if "LIMIT" not in statement:
+                continue
+            with app.app_context():
+                with db.engine.connect() as connection:
+                    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            details = [row[-1] for row in plan]
+            assert not any("TEMP B-TREE" in detail for detail in details), (url, details)
+
+
+def test_suggestion_history_query_uses_index(app, seeded):
+    # The suggestions blueprint is optional, so check its history query directly
+    with app.app_context():
+        query = Suggestion.query.filter_by(user_id=1).order_by(Suggestion.created_at.desc()).limit(10)
+        compiled = query.statement.compile(db.engine)
+        parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+        assert not full_scans(app, str(compiled), parameters)
@@ -0,0 +1,231 @@
+"""
+Rate limiting tests - token buckets per user and per IP with per-route costs,
+429 + Retry-After when a bucket is short, and a SQLite store that workers
+share without handing out a token twice
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask import jsonify
+from flask_jwt_extended import create_access_token, jwt_required
+
+from backend.app import create_app
+from backend.middleware.auth_middleware import rate_limited_route
+from backend.models import db, User
+from backend.services.rate_limiter import (Bucket, MemoryBucketStore, SQLiteBucketStore, RateLimiter,
+                                           init_rate_limiter, take_tokens)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_app():
+    app = create_app()
+    app.config.update(TESTING=True, RATE_LIMIT_MAX_REQUESTS=20, RATE_LIMIT_WINDOW_MINUTES=1, RATE_LIMIT_IP_FACTOR=2)
+    clock = FakeClock()
+    init_rate_limiter(app).clock = clock
+    app.clock = clock
+
+    @app.route("/test/heavy", methods=["POST"])
+    @jwt_required(optional=True)
+    @rate_limited_route(cost=10)
+    def heavy():
+        return jsonify({"success": True})
+
+    @app.route("/test/light")
+    @jwt_required(optional=True)
+    @rate_limited_route(cost=1)
+    def light():
+        return jsonify({"success": True})
+
+    return app
+
+
+@pytest.fixture
+def app():
+    app = make_app()
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def headers(app):
+    user = User("Limited", "User", f"limited{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+
+def test_bucket_arithmetic():
+    bucket = Bucket("api:user:1", 20, 20 / 60)
+    result, states = take_tokens([bucket], {}, 10, now=0.0)
+    assert result.allowed and result.remaining == 10 and states == {"api:user:1": (10, 0.0)}
+
+    result, states = take_tokens([bucket], {"api:user:1": (4.0, 0.0)}, 10, now=6.0)
+    assert not result.allowed and states is None
+    assert result.retry_after == pytest.approx(12.0)  # 6 tokens short at 1 token / 3 s
+
+    # A cost above the capacity waits for a full bucket instead of failing forever
+    assert take_tokens([bucket], {}, 50, now=0.0)[0].allowed
+
+
+def test_expensive_route_costs_more_and_answers_429(app, headers):
+    client = app.test_client()
+    assert client.post("/test/heavy", headers=headers).status_code == 200
+    assert client.post("/test/heavy", headers=headers).status_code == 200
+
+    response = client.post("/test/heavy", headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"  # 10 tokens at 1 token / 3 s
+    assert response.get_json()["error"] == "rate_limited"
+
+    # Lists share the allowance: the user bucket is empty, a token refills in 3 s
+    assert client.get("/test/light", headers=headers).status_code == 429
+    app.clock.now += 3
+    assert client.get("/test/light", headers=headers).status_code == 200
+
+
+def test_users_are_limited_separately_and_ips_as_a_whole(app, headers):
+    client = app.test_client()
+    user = User("Other", "User", f"other{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    second = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+    for _ in range(2):
+        assert client.post("/test/heavy", headers=headers).status_code == 200
+    assert client.post("/test/heavy", headers=headers).status_code == 429
+
+    # Another user on the same IP still has tokens until the IP bucket (2 x 20) runs out
+    for _ in range(2):
+        assert client.post("/test/heavy", headers=second).status_code == 200
+    assert client.post("/test/heavy", headers=second).status_code == 429
+
+    # Anonymous callers are limited by IP; another address is untouched
+    assert client.get("/test/light").status_code == 429
+    assert client.get("/test/light", environ_base={"REMOTE_ADDR": "10.0.0.7"}).status_code == 200
+
+
+def test_real_routes_are_limited(app, headers):
+    app.extensions["rate_limiter"].max_requests = 2
+    client = app.test_client()
+    assert client.get("/api/scans", headers=headers).status_code == 200
+    assert client.get("/api/history", headers=headers).status_code == 200
+    assert client.get("/api/scans", headers=headers).status_code == 429
+
+    # Heavy endpoints are refused before any NLP work runs
+    response = client.post("/api/analyze_realtime", headers=headers,
+                           json={"resume_text": "x", "job_description_text": "y"})
+    assert response.status_code == 429 and "Retry-After" in response.headers
+
+
+def test_upload_and_bulk_routes_are_limited(app, headers):
+    app.extensions["rate_limiter"].max_requests = 55
+    client = app.test_client()
+
+    # A bulk import costs 50 tokens, so the second one is refused before the
+    # archive is read, and what is left does not cover an upload either
+    assert client.post("/api/bulk/resumes", headers=headers).status_code != 429
+    for path in ("/api/bulk/resumes", "/api/bulk/job_descriptions", "/api/upload_resume",
+                 "/api/upload_jd", "/api/jd"):
+        response = client.post(path, headers=headers)
+        assert response.status_code == 429 and "Retry-After" in response.headers
+
+
+def test_memory_store_is_per_process():
+    limiter = RateLimiter(MemoryBucketStore(), max_requests=5, window_minutes=60)
+    buckets = limiter.buckets("1", None)
+    assert [limiter.hit(buckets, 2).allowed for _ in range(3)] == [True, True, False]
+
+
+def _take_many(args):
+    path, attempts = args
+    limiter = RateLimiter(SQLiteBucketStore(path), max_requests=20, window_minutes=10 ** 6)
+    buckets = limiter.buckets("42", "10.0.0.1")
+    return sum(limiter.hit(buckets, 1).allowed for _ in range(attempts))
+
+
+def test_sqlite_store_is_shared_by_workers(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        allowed = pool.map(_take_many, [(path, 15)] * 4)
+    assert sum(allowed) == 20
+
+    store = SQLiteBucketStore(path)
+    tokens, _ = store.peek("api:user:42")
+    assert tokens == pytest.approx(0.0, abs=0.01)
+    assert store.prune(0, now=store.peek("api:ip:10.0.0.1")[1] + 1) == 2
+
+
+def test_sqlite_store_prunes_idle_buckets(tmp_path):
+    store = SQLiteBucketStore(str(tmp_path / "rate_limits.db"), prune_every=3)
+    limiter = RateLimiter(store, max_requests=20, window_minutes=1)
+    clock = FakeClock()
+    limiter.clock = clock
+
+    limiter.hit(limiter.buckets("1", "10.0.0.1"), 1)
+    clock.now += 30
+    limiter.hit(limiter.buckets("2", "10.0.0.2"), 1)
+    assert store.peek("api:user:1") is not None
+
+    # The third take prunes: user 1 has been idle for a full window, user 2 not
+    clock.now += 40
+    limiter.hit(limiter.buckets("3", None), 1)
+    assert store.peek("api:user:1") is None and store.peek("api:ip:10.0.0.1") is None
+    assert store.peek("api:user:2") is not None and store.peek("api:user:3") is not None
+
+
+def test_store_errors_let_requests_through(app, headers, tmp_path):
+    limiter = app.extensions["rate_limiter"]
+    limiter.store = SQLiteBucketStore(str(tmp_path / "rate_limits.db"), timeout=0)
+
+    # Another worker holds the write lock for longer than the store waits
+    blocker = sqlite3.connect(str(tmp_path / "rate_limits.db"), isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        client = app.test_client()
+        for _ in range(3):
+            assert client.post("/test/heavy", headers=headers).status_code == 200
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+
+def test_ip_buckets_use_the_forwarded_client_address(monkeypatch):
+    # Behind one trusted proxy every request comes from 127.0.0.1
+    monkeypatch.setenv("PROXY_FIX_X_FOR", "1")
+    app = make_app()
+    client = app.test_client()
+    proxy = {"REMOTE_ADDR": "127.0.0.1"}
+
+    for _ in range(40):  # the anonymous IP bucket holds 2 x 20 tokens
+        assert client.get("/test/light", headers={"X-Forwarded-For": "203.0.113.5"},
+                          environ_base=proxy).status_code == 200
+    assert client.get("/test/light", headers={"X-Forwarded-For": "203.0.113.5"},
+                      environ_base=proxy).status_code == 429
+    # Another client behind the same proxy has its own bucket, even when it
+    # prepends the first client's address to X-Forwarded-For
+    assert client.get("/test/light", headers={"X-Forwarded-For": "203.0.113.5, 198.51.100.9"},
+                      environ_base=proxy).status_code == 200
+
+    # Without a trusted proxy the header is ignored
+    monkeypatch.setenv("PROXY_FIX_X_FOR", "0")
+    client = make_app().test_client()
+    for _ in range(40):
+        client.get("/test/light", headers={"X-Forwarded-For": "192.0.2.1"})
+    assert client.get("/test/light", headers={"X-Forwarded-For": "192.0.2.2"}).status_code == 429
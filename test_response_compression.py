@@ -0,0 +1,90 @@
+"""
+Response compression tests - large text bodies are gzip/brotli encoded by
+negotiation, small ones are left alone, streamed bodies are compressed chunk
+by chunk and precompressed static variants are served as they are
+"""
+
+import os
+import sys
+import gzip
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask import Response, jsonify
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from backend.app import create_app
+from backend.middleware.response_compression import ResponseCompressor, precompress
+
+PAYLOAD = {"scans": [{"id": i, "summary": "Good match! Add Docker and AWS to your resume."} for i in range(100)]}
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+
+    @app.route("/test/large")
+    def large():
+        response = jsonify(PAYLOAD)
+        response.set_etag("v1")
+        return response
+
+    @app.route("/test/stream")
+    def stream():
+        return Response((f"line {i}\n" for i in range(500)), mimetype="text/plain")
+
+    return app
+
+
+def test_large_json_is_gzipped_and_small_is_not(app):
+    client = app.test_client()
+    response = client.get("/test/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data)) == PAYLOAD
+    assert int(response.headers["Content-Length"]) == len(response.data) < len(json.dumps(PAYLOAD)) / 4
+
+    # Compressed bodies carry a weak ETag that still revalidates
+    assert response.headers["ETag"] == 'W/"v1"'
+
+    assert "Content-Encoding" not in client.get("/api/ping", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/test/large").headers
+
+
+def test_streamed_body_is_compressed_per_chunk(app):
+    response = app.test_client().get("/test/stream", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip" and "Content-Length" not in response.headers
+    assert gzip.decompress(response.data).decode() == "".join(f"line {i}\n" for i in range(500))
+
+
+def test_negotiation_follows_quality():
+    accept = lambda header: parse_accept_header(header, Accept)
+    assert ResponseCompressor.negotiate(accept("gzip, br"), available=("br", "gzip")) == "br"
+    assert ResponseCompressor.negotiate(accept("gzip;q=1.0, br;q=0.5"), available=("br", "gzip")) == "gzip"
+    assert ResponseCompressor.negotiate(accept("identity"), available=("br", "gzip")) is None
+
+
+def test_precompressed_static_variant_is_served(app, tmp_path):
+    script = "function render() { return 'dashboard'; }\n" * 100
+    (tmp_path / "app.js").write_text(script)
+    assert precompress(str(tmp_path)) >= 1
+    app.static_folder = str(tmp_path)
+
+    client = app.test_client()
+    response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "javascript" in response.headers["Content-Type"]
+    assert gzip.decompress(response.data).decode() == script
+    response.close()
+
+    response = client.get("/static/app.js")
+    assert "Content-Encoding" not in response.headers and response.data.decode() == script
+    response.close()
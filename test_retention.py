@@ -0,0 +1,125 @@
+"""
+Retention tests - old scans move to the archive in batches keeping their
+summary columns, detail endpoints read archived documents back and stale
+match scores are pruned
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import (db, User, Resume, JobDescription, MatchScore, ScanHistory, ScanArchive, TextBlob,
+                            UserStats, text_hash)
+from backend.services.retention import RetentionCompactor, _single_runner
+
+ANALYSIS = {"matched_skills": ["python"], "missing_skills": ["aws"], "matched_count": 1, "missing_count": 1}
+RECOMMENDATIONS = [{"title": "Add AWS"}, {"title": "Add Docker"}]
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+def new_user():
+    user = User("Old", "Scans", f"old{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    return user, {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+
+def add_scans(user, ages_in_days, resume_text=None):
+    scans = [ScanHistory(user_id=user.id, overall_match_score=65.0, category_scores={"technical_skills": 70.0},
+                         detailed_analysis=ANALYSIS, recommendations=RECOMMENDATIONS, keyword_analysis={"python": 2},
+                         resume_text=resume_text, created_at=datetime.utcnow() - timedelta(days=age))
+             for age in ages_in_days]
+    db.session.add_all(scans)
+    db.session.commit()
+    return [scan.id for scan in scans]
+
+
+def compactor(**options):
+    # The test databases hold other tests' scans: retention far in the past
+    # archives only what these tests backdate
+    options.setdefault("scan_days", 3000)
+    options.setdefault("match_score_days", 0)
+    return RetentionCompactor(db.engine, batch_pause_ms=0, **options)
+
+
+def test_old_scans_are_archived_with_summary_kept(app):
+    user, headers = new_user()
+    resume_text = f"Resume {os.urandom(4).hex()} " * 100
+    old_id, recent_id = add_scans(user, [4000, 1], resume_text=resume_text)
+    scans_before = UserStats.for_user(user.id).scan_count
+
+    result = compactor().run_once()
+    assert result["archived_scans"] >= 1
+
+    db.session.expire_all()
+    old, recent = db.session.get(ScanHistory, old_id), db.session.get(ScanHistory, recent_id)
+    assert old.archived_at is not None and recent.archived_at is None
+    assert (old.detailed_analysis, old.recommendations, old.resume_text_hash) == (None, None, None)
+    assert old.overall_match_score == 65.0 and old.recommendations_count == 2
+    assert db.session.get(ScanArchive, old_id).has_detailed_analysis
+    assert old.resume_text == resume_text  # read back from the archive
+    assert db.session.get(TextBlob, text_hash(resume_text)).ref_count == 1  # only the recent scan
+    assert UserStats.for_user(user.id).scan_count == scans_before
+
+    client = app.test_client()
+    detail = client.get(f"/api/scan/{old_id}", headers=headers).get_json()["scan"]
+    assert detail["archived"] and detail["recommendations"] == RECOMMENDATIONS
+    assert detail["matched_skills"] == ["python"]
+
+    history = {scan["id"]: scan for scan in client.get("/api/history", headers=headers).get_json()["scan_history"]}
+    assert history[old_id]["has_detailed_analysis"] and history[old_id]["recommendations_count"] == 2
+    assert history[old_id]["technical_score"] == 70.0
+
+
+def test_archiving_runs_in_bounded_batches(app):
+    user, _ = new_user()
+    ids = add_scans(user, [5000, 5001, 5002, 5003, 5004])
+
+    first = compactor(scan_days=4500, batch_size=2).run_once(max_batches=1)
+    assert first["archived_scans"] == 2
+    assert ScanHistory.query.filter(ScanHistory.id.in_(ids), ScanHistory.archived_at.isnot(None)).count() == 2
+
+    second = compactor(scan_days=4500, batch_size=2).run_once()
+    assert second["archived_scans"] == 3
+    assert ScanArchive.query.filter(ScanArchive.scan_id.in_(ids)).count() == 5
+    assert compactor(scan_days=4500).run_once()["archived_scans"] == 0
+
+
+def test_stale_match_scores_are_pruned(app):
+    user, _ = new_user()
+    resume = Resume(user.id, "cv.txt", "/tmp/cv.txt", 10, "txt")
+    jds = [JobDescription(user.id, f"Job {i}", "x" * 60) for i in range(2)]
+    db.session.add_all([resume, *jds])
+    db.session.flush()
+    stale = MatchScore(user_id=user.id, resume_id=resume.id, job_description_id=jds[0].id, overall_score=40.0,
+                       updated_at=datetime.utcnow() - timedelta(days=4000))
+    fresh = MatchScore(user_id=user.id, resume_id=resume.id, job_description_id=jds[1].id, overall_score=60.0)
+    db.session.add_all([stale, fresh])
+    db.session.commit()
+
+    result = compactor(scan_days=0, match_score_days=3000).run_once()
+    assert result["pruned_match_scores"] >= 1
+    assert [score.overall_score for score in MatchScore.query.filter_by(user_id=user.id)] == [60.0]
+
+
+def test_one_compactor_at_a_time(app):
+    with _single_runner(db.engine) as acquired:
+        assert acquired
+        assert compactor().run_once() is None
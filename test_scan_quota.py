@@ -0,0 +1,121 @@
+"""
+Scan quota tests - a scan and its free scan decrement commit together, failed
+scans are never charged and the last free scan can only be taken once
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, ScanHistory
+from backend.routes import us05_scan_routes
+
+RESUME_TEXT = "Python developer with Flask, SQL and Docker experience. " * 3
+JD_TEXT = "We are hiring a Python engineer who knows Flask, SQL, Docker and AWS. " * 3
+
+
+def analysis_result(resume_text, jd_text):
+    return {
+        "success": True,
+        "overall_match_score": 72.0,
+        "category_scores": {"technical_skills": 70.0, "ats_compatibility": 80.0},
+        "detailed_analysis": {"matched_skills": ["python"], "missing_skills": ["aws"]},
+        "recommendations": [],
+        "keyword_analysis": {},
+    }
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+def new_user(free_scans):
+    user = User("Quota", "User", f"quota{os.urandom(4).hex()}@example.com", "Password123")
+    user.free_scans_remaining = free_scans
+    db.session.add(user)
+    db.session.commit()
+    return user, {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+
+
+def scan(client, headers):
+    return client.post("/api/scan", json={"resume_text": RESUME_TEXT, "job_description_text": JD_TEXT},
+                       headers=headers)
+
+
+def quota(user_id):
+    db.session.expire_all()
+    user = db.session.get(User, user_id)
+    return user.free_scans_remaining, user.total_scans_used, ScanHistory.query.filter_by(user_id=user_id).count()
+
+
+def test_scan_and_decrement_commit_once(app, monkeypatch):
+    monkeypatch.setattr(us05_scan_routes.llm_service, "analyze_resume_realtime", analysis_result)
+    user, headers = new_user(free_scans=1)
+
+    commits = []
+    listener = lambda connection: commits.append(connection)
+    event.listen(db.engine, "commit", listener)
+    try:
+        response = scan(app.test_client(), headers)
+    finally:
+        event.remove(db.engine, "commit", listener)
+
+    assert response.status_code == 200
+    assert response.get_json()["scan_balance"]["free_scans_remaining"] == 0
+    assert len(commits) == 1
+    assert quota(user.id) == (0, 1, 1)
+
+    assert scan(app.test_client(), headers).status_code == 403
+    assert quota(user.id) == (0, 1, 1)
+
+
+def test_failed_analysis_is_not_charged(app, monkeypatch):
+    def failing_analysis(resume_text, jd_text):
+        return {"success": False, "error": "model unavailable"}
+
+    monkeypatch.setattr(us05_scan_routes.llm_service, "analyze_resume_realtime", failing_analysis)
+    user, headers = new_user(free_scans=2)
+
+    assert scan(app.test_client(), headers).status_code == 500
+    assert quota(user.id) == (2, 0, 0)
+
+
+def test_last_free_scan_is_taken_once(app, monkeypatch):
+    user, headers = new_user(free_scans=1)
+
+    def racing_analysis(resume_text, jd_text):
+        # Another request takes the last free scan while this one is analysing
+        with db.engine.begin() as connection:
+            connection.execute(db.update(User).where(User.id == user.id).values(
+                free_scans_remaining=0, total_scans_used=1))
+        return analysis_result(resume_text, jd_text)
+
+    monkeypatch.setattr(us05_scan_routes.llm_service, "analyze_resume_realtime", racing_analysis)
+
+    response = scan(app.test_client(), headers)
+    assert response.status_code == 403
+    assert response.get_json()["scan_balance"]["free_scans_remaining"] == 0
+    assert quota(user.id) == (0, 1, 0)
+
+
+def test_claim_free_scan_is_conditional(app):
+    user, _ = new_user(free_scans=1)
+
+    assert user.claim_free_scan() is True
+    assert user.claim_free_scan() is False
+    db.session.commit()
+    assert (user.free_scans_remaining, user.total_scans_used) == (0, 1)
@@ -0,0 +1,79 @@
+"""
+Serialization tests - jsonify and JSON columns go through the fast codec,
+datetimes are encoded as ISO 8601 and MessagePack is negotiated by Accept
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User, Resume
+from backend.services import serialization
+
+CREATED = datetime(2026, 10, 18, 9, 30, 15, 250000)
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+
+    @app.route("/test/payload")
+    def payload():
+        return jsonify({"created_at": CREATED, "score": Decimal("72.5"), "skills": {"python"}, 3: "three"})
+
+    with app.app_context():
+        yield app
+
+
+def test_jsonify_encodes_datetimes_as_iso(app):
+    response = app.test_client().get("/test/payload")
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"created_at": CREATED.isoformat(), "score": 72.5, "skills": ["python"], "3": "three"}
+
+
+def test_to_dict_datetimes_keep_their_api_format(app):
+    user = User("Codec", "User", f"codec{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.flush()
+    resume = Resume(user.id, "cv.pdf", "/tmp/cv.pdf", 100, "pdf", title="CV")
+    db.session.add(resume)
+    db.session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    data = app.test_client().get(f"/api/resumes/{resume.id}", headers=headers).get_json()["resume"]
+    assert data["created_at"] == resume.created_at.isoformat()
+    assert data["updated_at"] == resume.updated_at.isoformat()
+
+
+def test_json_columns_use_the_codec(app):
+    assert db.engine.dialect._json_serializer is serialization.dumps_text
+    assert serialization.loads(serialization.dumps({"a": [1, 2.5, None]})) == {"a": [1, 2.5, None]}
+    assert json.loads(serialization.dumps_text({"at": CREATED})) == {"at": CREATED.isoformat()}
+
+
+def test_msgpack_is_negotiated(app):
+    client = app.test_client()
+    if serialization.msgpack is None:
+        # Without the optional package every client gets JSON
+        response = client.get("/test/payload", headers={"Accept": "application/msgpack"})
+        assert response.mimetype == "application/json"
+        return
+
+    response = client.get("/test/payload", headers={"Accept": "application/msgpack"})
+    assert response.mimetype == "application/msgpack" and "Accept" in response.headers["Vary"]
+    assert serialization.msgpack.unpackb(response.data)["created_at"] == CREATED.isoformat()
+    assert client.get("/test/payload", headers={"Accept": "*/*"}).mimetype == "application/json"
@@ -0,0 +1,131 @@
+"""
+Skill taxonomy tests - compiled matcher lookups, scopes and hot reload
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User
+from backend.services import skill_taxonomy
+from backend.services.skill_taxonomy import (
+    DEFAULT_TAXONOMY_PATH, SkillMatcher, compile_taxonomy, get_matcher, reload_matcher
+)
+
+
+@pytest.fixture
+def taxonomy(monkeypatch, tmp_path):
+    """Private copy of the taxonomy so tests can edit and reload it"""
+    path = tmp_path / "skill_taxonomy.json"
+    shutil.copy(DEFAULT_TAXONOMY_PATH, path)
+    monkeypatch.setenv("SKILL_TAXONOMY_PATH", str(path))
+    monkeypatch.setenv("SKILL_MATCHER_PATH", str(tmp_path / "skill_taxonomy.skm"))
+    monkeypatch.setattr(skill_taxonomy, "_matcher", None)
+    return path
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    artifact = str(tmp_path / "matcher.skm")
+    compile_taxonomy(DEFAULT_TAXONOMY_PATH, artifact)
+    return SkillMatcher(artifact)
+
+
+def test_find_reports_overlapping_terms_per_scope(matcher):
+    text = "Built APIs with ASP.NET Core, C#, Node.js and CI/CD pipelines"
+    terms = {hit.term for hit in matcher.find(text, "keyword_parser")}
+    assert {"asp.net core", "asp.net", "c#"} <= terms
+    assert "python" not in terms
+
+    # Each service only sees the vocabulary of its own scope
+    assert "node.js" in {hit.term for hit in matcher.find(text, "realtime")}
+    assert "asp.net" not in {hit.term for hit in matcher.find(text, "advanced")}
+
+    hit = matcher.find("Senior C# developer", "realtime", "technical")[0]
+    assert (hit.term, hit.text, hit.start, hit.end) == ("c#", "c#", 7, 9)
+
+
+COMPOUND_TEXT = ("Built Python-based microservices and React.js front ends; AWS-certified; "
+                 "Docker-compose; team-oriented leadership; SQL-heavy reporting")
+
+
+def test_compound_words_match_their_parts_like_the_old_regexes(matcher, monkeypatch):
+    from backend.services import enhanced_matching_service
+    from backend.services.enhanced_matching_service import RealTimeLLMService
+
+    # Results of the \b...\b regexes the taxonomy replaced
+    monkeypatch.setattr(enhanced_matching_service, "get_matcher", lambda: matcher)
+    service = RealTimeLLMService.__new__(RealTimeLLMService)
+    assert RealTimeLLMService._extract_skills(service, COMPOUND_TEXT, "technical") == {
+        "python": 1, "javascript": 2, "cloud": 1, "devops": 1, "database": 1}
+    assert RealTimeLLMService._extract_skills(service, COMPOUND_TEXT, "soft") == {"leadership": 1}
+
+    found = sorted(hit.text for hit in matcher.find(COMPOUND_TEXT, "suggestions", "technical"))
+    assert found == ["aws", "docker", "js", "microservices", "python", "react", "sql"]
+
+    # Compounds a scope has as keys stay whole; others are split
+    hits = [(hit.term, hit.text) for hit in matcher.find("Vue.js and Node.js", "realtime")]
+    assert hits == [("vue", "vue"), ("javascript", "js"), ("node.js", "node.js")]
+
+
+def test_aliases_and_families_normalize_terms(matcher):
+    assert matcher.canonical("JS", "advanced") == "javascript"
+    assert "csharp" in matcher.variations("c#")
+    assert matcher.family("node.js") == "javascript"
+    assert matcher.family("typescript") == "javascript"
+    assert matcher.priority("python") == "critical"
+
+
+def test_reload_swaps_matcher_and_keeps_previous_on_error(taxonomy):
+    first = get_matcher()
+    assert first.lookup("haskell") == []
+
+    data = json.loads(taxonomy.read_text())
+    data["version"] += 1
+    data["skills"].append({"term": "haskell", "scopes": {"advanced": "technical"}})
+    taxonomy.write_text(json.dumps(data))
+
+    second = reload_matcher()
+    assert second is not first
+    assert second.version == first.version + 1
+    assert [hit.term for hit in second.find("Haskell and Python", "advanced", "technical")] == ["haskell", "python"]
+
+    taxonomy.write_text("{ not json")
+    assert reload_matcher() is second
+
+
+def test_reload_endpoint_requires_admin(taxonomy):
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        user = User.query.filter_by(email="taxonomy@example.com").first()
+        if not user:
+            user = User("Tax", "Onomy", "taxonomy@example.com", "Password123")
+            db.session.add(user)
+            db.session.commit()
+        token = create_access_token(identity=str(user.id))
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.post("/api/admin/skill_taxonomy/reload", headers=headers).status_code == 403
+
+    with app.app_context():
+        user = User.query.filter_by(email="taxonomy@example.com").first()
+        user.role = "admin"
+        db.session.commit()
+
+    response = client.post("/api/admin/skill_taxonomy/reload", headers=headers)
+    body = response.get_json()
+    assert response.status_code == 200, body
+    assert body["taxonomy"]["source_sha256"] == get_matcher().source_sha256
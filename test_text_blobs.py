@@ -0,0 +1,117 @@
+"""
+Text blob tests - scans of the same text share one reference-counted blob,
+the sweeper removes only unreferenced blobs and write-behind replays never
+count a reference twice
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from datetime import datetime
+
+from backend.app import create_app
+from backend.models import db, User, ScanHistory, TextBlob, text_hash
+from backend.services.text_blobs import sweep
+from backend.services.write_behind import insert_rows
+
+
+def document(kind):
+    """A long text no other test stores"""
+    return f"{kind} {os.urandom(4).hex()}: Python, Flask, SQL, Docker and AWS. " * 50
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+def new_user():
+    user = User("Blob", "User", f"blob{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def ref_count(text):
+    db.session.expire_all()
+    blob = db.session.get(TextBlob, text_hash(text))
+    return blob.ref_count if blob is not None else None
+
+
+def scan(user, resume_text, jd_text=None):
+    return ScanHistory(user_id=user.id, overall_match_score=60.0, resume_text=resume_text,
+                       job_description_text=jd_text)
+
+
+def test_scans_of_one_text_share_a_blob(app):
+    user, resume_text, jd_text = new_user(), document("Resume"), document("Job")
+    scans = [scan(user, resume_text, jd_text), scan(user, resume_text, jd_text + " Remote.")]
+    db.session.add_all(scans)
+    db.session.commit()
+    db.session.add(scan(user, resume_text))
+    db.session.commit()
+
+    assert ref_count(resume_text) == 3
+    assert ref_count(jd_text) == 1 and ref_count(jd_text + " Remote.") == 1
+    assert scans[0].resume_text_hash == scans[1].resume_text_hash
+
+    scan_id = scans[1].id
+    db.session.expunge_all()
+    loaded = ScanHistory.query.options(*ScanHistory.with_details("text")).filter_by(id=scan_id).one()
+    assert loaded.resume_text == resume_text and loaded.job_description_text == jd_text + " Remote."
+
+
+def test_sweeper_deletes_only_unreferenced_blobs(app):
+    user, resume_text, jd_text = new_user(), document("Resume"), document("Job")
+    kept, dropped = scan(user, resume_text, jd_text), scan(user, resume_text, jd_text + " Contract.")
+    db.session.add_all([kept, dropped])
+    db.session.commit()
+
+    db.session.delete(dropped)
+    db.session.commit()
+    assert ref_count(resume_text) == 1 and ref_count(jd_text + " Contract.") == 0
+
+    # Inside the grace period nothing goes
+    assert sweep(db.engine, grace_seconds=3600)["deleted"] == 0
+    assert sweep(db.engine, grace_seconds=0)["deleted"] >= 1
+    assert ref_count(jd_text + " Contract.") is None
+    assert ref_count(resume_text) == 1 and ref_count(jd_text) == 1
+
+
+def test_sweeper_repairs_drifted_counts(app):
+    user, resume_text = new_user(), document("Resume")
+    db.session.add(scan(user, resume_text + " Drift."))
+    db.session.commit()
+
+    blob = db.session.get(TextBlob, text_hash(resume_text + " Drift."))
+    blob.ref_count = 0
+    db.session.commit()
+
+    assert sweep(db.engine, grace_seconds=0)["repaired"] >= 1
+    assert ref_count(resume_text + " Drift.") == 1
+
+
+def test_write_behind_rows_reference_blobs_once(app):
+    user, resume_text = new_user(), document("Resume")
+    values = {"public_id": f"blob-{os.urandom(4).hex()}", "user_id": user.id, "overall_match_score": 55.0,
+              "created_at": datetime.utcnow(), "resume_text": resume_text + " Spool.", "job_description_text": None}
+    rows = [(ScanHistory, values)]
+
+    for _ in range(2):  # the second pass is a replay of a committed segment
+        with db.engine.begin() as connection:
+            insert_rows(connection, rows)
+
+    assert "resume_text" in values  # queued rows are not modified
+    assert ref_count(resume_text + " Spool.") == 1
+    stored = ScanHistory.query.filter_by(public_id=values["public_id"]).one()
+    assert stored.resume_text == resume_text + " Spool." and stored.job_description_text is None
@@ -0,0 +1,127 @@
+"""
+User stats rollup tests - incremental maintenance, backfill and dashboard output
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from backend.app import create_app
+from backend.models import db, User, Resume, JobDescription, ScanHistory, UserStats, backfill_user_stats
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+def new_user():
+    user = User("Stats", "User", f"stats{os.urandom(4).hex()}@example.com", "Password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def add_scan(user, score, resume=None, days_ago=0):
+    scan = ScanHistory(user_id=user.id, resume_id=resume.id if resume else None,
+                       overall_match_score=score,
+                       created_at=datetime.utcnow() - timedelta(days=days_ago))
+    db.session.add(scan)
+    return scan
+
+
+def snapshot(user_id):
+    stats = db.session.get(UserStats, user_id)
+    db.session.refresh(stats)
+    return {c.name: getattr(stats, c.name) for c in UserStats.__table__.columns if c.name != "updated_at"}
+
+
+def recomputed(user_id):
+    backfill_user_stats(db.session.connection(), user_id)
+    values = snapshot(user_id)
+    db.session.rollback()
+    return values
+
+
+def test_rollup_tracks_writes_incrementally(app):
+    user = new_user()
+    resume = Resume(user.id, "cv.pdf", "/tmp/cv.pdf", 1, "pdf", title="Main CV")
+    db.session.add_all([resume, JobDescription(user.id, "Engineer", "x" * 60)])
+    db.session.commit()
+
+    for score, days_ago in ((85.0, 0), (65.0, 1), (45.0, 10), (10.0, 2)):
+        add_scan(user, score, resume, days_ago)
+    db.session.commit()
+
+    stats = snapshot(user.id)
+    assert stats["resume_count"] == 1 and stats["job_description_count"] == 1
+    assert stats["scan_count"] == 4 and stats["score_sum"] == 205.0
+    assert (stats["score_max"], stats["score_min"]) == (85.0, 10.0)
+    assert [stats[c] for c in ("excellent_count", "good_count", "fair_count", "poor_count")] == [1, 1, 1, 1]
+    assert stats["last_scan_score"] == 85.0
+    assert stats == recomputed(user.id)
+
+    # Deleting a scan falls back to a recompute of that user
+    db.session.delete(ScanHistory.query.filter_by(user_id=user.id, overall_match_score=85.0).one())
+    db.session.commit()
+    stats = snapshot(user.id)
+    assert stats["score_max"] == 65.0 and stats["last_scan_score"] == 65.0
+    assert stats == recomputed(user.id)
+
+
+def test_missing_rollup_is_backfilled(app):
+    user = new_user()
+    add_scan(user, 70.0)
+    db.session.commit()
+
+    db.session.execute(UserStats.__table__.delete().where(UserStats.user_id == user.id))
+    db.session.commit()
+
+    stats = UserStats.for_user(user.id, persist=True)
+    assert stats.scan_count == 1 and stats.good_count == 1
+
+    add_scan(user, 90.0)
+    db.session.commit()
+    assert snapshot(user.id)["scan_count"] == 2
+
+
+def test_dashboard_endpoints_read_the_rollup(app):
+    user = new_user()
+    top = Resume(user.id, "top.pdf", "/tmp/top.pdf", 1, "pdf", title="Top CV")
+    other = Resume(user.id, "other.pdf", "/tmp/other.pdf", 1, "pdf")
+    db.session.add_all([top, other])
+    db.session.commit()
+    add_scan(user, 90.0, top)
+    add_scan(user, 70.0, top, days_ago=30)
+    add_scan(user, 50.0, other)
+    add_scan(user, 20.0)
+    db.session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    client = app.test_client()
+
+    stats = client.get("/api/dashboard_stats", headers=headers).get_json()["stats"]
+    assert stats["total_resumes"] == 2 and stats["total_scans"] == 4
+    assert stats["recent_scans_7_days"] == 3
+    assert stats["score_statistics"] == {"average_score": 57.5, "highest_score": 90.0, "lowest_score": 20.0}
+    assert stats["score_distribution"] == {"excellent": 1, "good": 1, "fair": 1, "poor": 1}
+    assert stats["top_performing_resume"] == {
+        "id": top.id, "title": "Top CV", "filename": "top.pdf", "average_score": 80.0, "scan_count": 2
+    }
+
+    summary = client.get("/api/dashboard/summary", headers=headers).get_json()
+    assert (summary["total_scans"], summary["average_score"], summary["last_scan_score"]) == (4, 57.5, 20.0)
+
+    assert db.session.get(User, user.id).to_dict()["resume_count"] == 2
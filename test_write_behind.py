@@ -0,0 +1,184 @@
+"""
+Write-behind buffer tests - batched inserts with rollup deltas, spool replay
+after a crash and scan routes returning a token
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="dr_resume_test_")
+os.environ.setdefault("DATABASE_URL", os.path.join(_tmp_dir, "test.db"))
+
+import glob
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from backend.app import create_app
+from backend.models import db, User, ScanHistory, UserStats
+from backend.routes import us05_scan_routes
+from backend.services.write_behind import WriteBehindBuffer, init_write_behind, SPOOL_PATTERN
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def buffer(app, tmp_path):
+    # Long interval: the tests flush explicitly
+    buffer = WriteBehindBuffer(app, str(tmp_path), flush_interval_ms=60000, max_batch_rows=1000)
+    yield buffer
+    buffer.close()
+
+
+def new_user(free_scans=5):
+    user = User("Spool", "User", f"spool{os.urandom(4).hex()}@example.com", "Password123")
+    user.free_scans_remaining = free_scans
+    db.session.add(user)
+    db.session.commit()
+    UserStats.for_user(user.id, persist=True)
+    return user
+
+
+def scan_values(user, score):
+    return {"user_id": user.id, "overall_match_score": score, "scan_type": "realtime",
+            "category_scores": {"technical_skills": score}}
+
+
+def stats(user_id):
+    db.session.expire_all()
+    row = db.session.get(UserStats, user_id)
+    return row.scan_count, row.score_sum, row.excellent_count
+
+
+def test_flush_batches_rows_and_updates_rollup(app, buffer):
+    user = new_user()
+    tokens = [buffer.enqueue(ScanHistory, scan_values(user, score)) for score in (90.0, 50.0, 85.0)]
+    assert ScanHistory.query.filter_by(user_id=user.id).count() == 0
+    assert buffer.is_pending(tokens[0])
+
+    inserts = []
+    listener = lambda conn, cursor, statement, parameters, context, executemany: \
+        inserts.append(executemany) if statement.startswith("INSERT INTO scan_history") else None
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        assert buffer.flush() == 3
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert inserts == [True]  # one executemany for the whole batch
+    assert not buffer.is_pending(tokens[0])
+    scan = ScanHistory.query.filter_by(public_id=tokens[1]).one()
+    assert scan.overall_match_score == 50.0 and scan.category_scores == {"technical_skills": 50.0}
+    assert stats(user.id) == (3, 225.0, 2)
+    assert not glob.glob(os.path.join(buffer.spool_folder, SPOOL_PATTERN))
+
+
+def test_orphaned_spool_is_replayed_once(app, buffer, tmp_path):
+    user = new_user()
+    tokens = [buffer.enqueue(ScanHistory, scan_values(user, score)) for score in (70.0, 30.0)]
+
+    # The worker dies: its queue is gone and the lock on its segment released
+    handle, path = buffer._segment
+    handle.close()
+    buffer._segment, buffer._rows = None, []
+    with open(path, "ab") as spool:
+        spool.write(b'{"table":"scan_history","values":{"user_id"')  # torn last write
+
+    replayer = WriteBehindBuffer(app, str(tmp_path))
+    assert replayer.replay_spool() == 2
+    assert {scan.public_id for scan in ScanHistory.query.filter_by(user_id=user.id)} == set(tokens)
+    assert stats(user.id) == (2, 100.0, 0)
+    assert not os.path.exists(path)
+
+
+def test_replay_skips_rows_already_committed(app, buffer, tmp_path):
+    user = new_user()
+    buffer.enqueue(ScanHistory, scan_values(user, 95.0))
+    handle, path = buffer._segment
+    with open(path, "rb") as spool:
+        segment = spool.read()
+    buffer.flush()
+
+    # Crash between the commit and deleting the segment
+    with open(path, "wb") as spool:
+        spool.write(segment)
+    assert WriteBehindBuffer(app, str(tmp_path)).replay_spool() == 0
+    assert ScanHistory.query.filter_by(user_id=user.id).count() == 1
+    assert stats(user.id) == (1, 95.0, 1)
+
+
+def test_live_segment_is_not_replayed(app, buffer, tmp_path):
+    user = new_user()
+    buffer.enqueue(ScanHistory, scan_values(user, 60.0))
+
+    assert WriteBehindBuffer(app, str(tmp_path)).replay_spool() == 0
+    assert buffer.flush() == 1
+    assert ScanHistory.query.filter_by(user_id=user.id).count() == 1
+
+
+def test_scan_route_returns_token(app, tmp_path, monkeypatch):
+    def analysis(resume_text, jd_text):
+        return {"success": True, "overall_match_score": 81.0, "category_scores": {},
+                "detailed_analysis": {"matched_skills": [], "missing_skills": []},
+                "recommendations": [], "keyword_analysis": {}}
+
+    monkeypatch.setattr(us05_scan_routes.llm_service, "analyze_resume_realtime", analysis)
+    app.config.update(WRITE_BEHIND_SPOOL_FOLDER=str(tmp_path), WRITE_BEHIND_FLUSH_MS=60000)
+    buffer = init_write_behind(app)
+    try:
+        user = new_user(free_scans=1)
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+        client = app.test_client()
+
+        response = client.post("/api/scan", json={"resume_text": "Python developer " * 20,
+                                                  "job_description_text": "Python engineer " * 20},
+                               headers=headers)
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body["scan_id"] == body["scan_token"] and buffer.is_pending(body["scan_token"])
+        assert body["scan_balance"]["free_scans_remaining"] == 0  # the quota is not deferred
+
+        detail = client.get(f"/api/scan/{body['scan_token']}", headers=headers)
+        assert detail.status_code == 200
+        assert detail.get_json()["scan"]["public_id"] == body["scan_token"]
+        assert stats(user.id)[0] == 1
+    finally:
+        app.extensions.pop("write_behind")
+        buffer.close()
+
+
+def test_failed_spool_write_does_not_charge(app, tmp_path, monkeypatch):
+    def analysis(resume_text, jd_text):
+        return {"success": True, "overall_match_score": 64.0, "category_scores": {},
+                "detailed_analysis": {"matched_skills": [], "missing_skills": []},
+                "recommendations": [], "keyword_analysis": {}}
+
+    def full_disk(model, values):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(us05_scan_routes.llm_service, "analyze_resume_realtime", analysis)
+    app.config.update(WRITE_BEHIND_SPOOL_FOLDER=str(tmp_path), WRITE_BEHIND_FLUSH_MS=60000)
+    buffer = init_write_behind(app)
+    monkeypatch.setattr(buffer, "enqueue", full_disk)
+    try:
+        user = new_user(free_scans=1)
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+        response = app.test_client().post("/api/scan", json={"resume_text": "Python developer " * 20,
+                                                             "job_description_text": "Python engineer " * 20},
+                                          headers=headers)
+        assert response.status_code == 500
+
+        db.session.expire_all()
+        assert db.session.get(User, user.id).free_scans_remaining == 1
+    finally:
+        app.extensions.pop("write_behind")
+        buffer.close()